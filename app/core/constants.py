@@ -15,6 +15,18 @@ WORKER_TIMEOUT_MS = 1000
 
 # Debounce delays (milliseconds)
 FILE_SYSTEM_DEBOUNCE_MS = 500
+STATE_WRITE_FLUSH_DELAY_MS = 100  # Coalescencia de escrituras de estado en segundo plano
+STATE_WRITE_RETRY_DELAY_MS = 200  # Espera antes de reintentar un lote de estados fallido
+STATE_WRITE_MAX_RETRIES = 3  # Reintentos de un lote antes de descartarlo (y reportarlo)
+
+# Filesystem watcher
+MAX_WATCHED_FOLDERS = 64  # Carpetas observadas a la vez (tab activo primero)
+FILE_SYSTEM_WATCHER_BACKEND = "auto"  # "auto" (inotify en Linux si está disponible) | "qt"
+
+# Global search
+MAX_SEARCH_WORKERS = 4  # Carpetas buscadas en paralelo
+SEARCH_RESULTS_BATCH_MS = 100  # Intervalo mínimo entre entregas parciales de resultados
+CONTENT_INDEX_DUTY_CYCLE = 0.3  # Fracción del tiempo que el indexador de contenido extrae texto
 
 # UI dimensions (pixels)
 SIDEBAR_MAX_WIDTH = 400
@@ -144,6 +156,20 @@ SCROLLBAR_HANDLE_PRESSED = "rgba(255, 255, 255, 0.30)"
 # Icon service limits
 MAX_CONCURRENT_ICON_WORKERS = 4
 MAX_ICON_CACHE_SIZE_MB = 500
+MAX_GRID_ICON_CACHE_SIZE_MB = 128  # Cache de QImage de GridIconLoader
+MAX_THUMBNAIL_DISK_CACHE_MB = 256  # Cache persistente de miniaturas en storage/thumbnails
+MAX_OPEN_PDF_DOCUMENTS = 4  # Documentos PyMuPDF abiertos a la vez (preview y miniaturas)
+MAX_PDF_THUMBNAIL_PROCESSES = 4  # Procesos que reparten las miniaturas de páginas PDF
+QUICK_PREVIEW_CACHE_MB = 128  # Previews de la vista rápida en memoria
+QUICK_PREVIEW_PREFETCH_AHEAD = 3  # Archivos precargados en el sentido de navegación
+QUICK_PREVIEW_PREFETCH_WORKERS = 2  # Hilos de renderizado de la vista rápida
+IMAGE_THUMBNAIL_BATCH_WORKERS = 4  # Hilos que decodifican miniaturas de imagen por lotes
+TILED_IMAGE_MIN_MEGAPIXELS = 12  # Imágenes que la vista rápida muestra por tiles (zoom real)
+IMAGE_TILE_SIZE = 256  # Lado de los tiles del visor de imágenes grandes
+IMAGE_TILE_CACHE_MB = 64  # Tiles decodificados en memoria del visor de imágenes grandes
+MAX_DOCX_PDF_CACHE_MB = 500  # PDFs convertidos desde DOCX para la vista rápida
+DOCX_PRECONVERT_IDLE_SECONDS = 3.0  # Inactividad antes de preconvertir el siguiente DOCX
+DOCX_PRECONVERT_MAX_FILES = 50  # DOCX preconvertidos como máximo por carpeta
 
 # UI feedback delays (milliseconds)
 CURSOR_BUSY_TIMEOUT_MS = 180
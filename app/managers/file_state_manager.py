@@ -3,10 +3,17 @@ FileStateManager - Manager for file state persistence with SQLite.
 
 Orchestrates state management: cache + SQLite storage sync.
 Emits signals to notify UI of state changes.
+
+A single process-wide instance (get_file_state_manager) is shared by every
+TabManager and view; states are loaded lazily, one folder at a time.
+Writes go through a write-behind queue: cache and signals update at once,
+SQLite is written in batches on a worker thread. Reads never wait for it:
+the writes still queued are layered over what SQLite returns.
 """
 
 import os
-from typing import List, Optional
+import sys
+from typing import Iterable, List, Optional
 
 from PySide6.QtCore import QObject, Signal
 
@@ -14,18 +21,25 @@ from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+from app.services.file_identity_cache import get_file_id as get_identity_file_id, get_file_info
 from app.services.file_state_storage import (
-    get_file_id_from_path,
+    get_folder_states,
     get_state_by_path,
+    get_states_batch as storage_get_states_batch,
     initialize_database,
-    load_all_states,
     remove_missing_files,
-    remove_state as storage_remove_state,
-    remove_states_batch as storage_remove_states_batch,
-    set_state as storage_set_state,
-    set_states_batch as storage_set_states_batch,
 )
+from app.services.file_state_storage_helpers import compute_path_key
 from app.services.file_state_storage_query import get_items_by_state as query_get_items_by_state
+from app.services.file_state_write_queue import get_state_write_queue
+from app.services.path_utils import normalize_path
+
+# Más carpetas sin cargar que esto en una sola consulta (ej: vista por estado con
+# archivos repartidos por todo el disco) se resuelven con get_states_batch
+MAX_FOLDER_LOADS_PER_LOOKUP = 64
+
+# last_update de las escrituras en cola: más recientes que cualquier fila guardada
+_PENDING_LAST_UPDATE = sys.maxsize
 
 
 class FileStateManager(QObject):
@@ -36,27 +50,173 @@ class FileStateManager(QObject):
     states_changed = Signal(list)  # List of (file_path, state) tuples
     
     def __init__(self):
-        """Initialize manager and load states from database."""
+        """Initialize manager; states are loaded per folder on first access."""
         super().__init__()
-        # Cache: file_id -> state (loaded from DB on startup)
+        # Cache: file_id -> state (solo carpetas ya consultadas y escrituras propias)
+        # path -> file_id vive en file_identity_cache (compartido y alimentado por los listados)
         self._state_cache: dict[str, str] = {}
-        # Cache: file_path -> file_id (for fast lookups)
-        self._path_to_id_cache: dict[str, str] = {}
+        # path_key -> state de carpetas cargadas (respaldo si el file_id cambió)
+        self._path_key_cache: dict[str, str] = {}
+        # Carpetas (normalizadas) cuyos estados ya están en memoria
+        self._loaded_folders: set[str] = set()
+        # Escrituras diferidas (compartidas por el proceso)
+        self._write_queue = get_state_write_queue()
         
         # Initialize database
         initialize_database()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Commit every queued state write to SQLite and wait for it.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+            
+        Returns:
+            True if no write is pending anymore.
+        """
+        return self._write_queue.flush(timeout)
+    
+    def pending_write_count(self) -> int:
+        """Number of state writes queued but not yet committed."""
+        return self._write_queue.pending_count()
+    
+    def _pending_writes(self) -> dict[str, tuple[str, str, Optional[str]]]:
+        """
+        Queued writes not yet in SQLite, by path_key (last write wins).
+        
+        Must be taken before querying the storage (see
+        StateWriteQueue.pending_states). Storing a state replaces every row
+        of its path, so the path_key decides what a read returns.
+        
+        Returns:
+            path_key -> (file_id, path, state); state None is a removal.
+        """
+        return {
+            path_key: (file_id, path, state)
+            for file_id, (path, path_key, state) in self._write_queue.pending_states().items()
+        }
+    
+    def _reset_cache(self) -> None:
+        """Forget every cached state; folders are reloaded on next access."""
+        self._state_cache.clear()
+        self._path_key_cache.clear()
+        self._loaded_folders.clear()
+    
+    def _ensure_folders_loaded(self, file_paths: Iterable[str]) -> set[str]:
+        """
+        Load states of the parent folders of `file_paths` not yet in memory.
+        
+        Returns:
+            Folder keys that remain unloaded (too many folders for one lookup).
+        """
+        pending = []
+        seen = set()
+        for file_path in file_paths:
+            folder_key = normalize_path(os.path.dirname(file_path))
+            if folder_key and folder_key not in self._loaded_folders and folder_key not in seen:
+                seen.add(folder_key)
+                pending.append(folder_key)
+        
+        if len(pending) > MAX_FOLDER_LOADS_PER_LOOKUP:
+            return seen
+        
+        for folder_key in pending:
+            self._load_folder(folder_key)
+        return set()
+    
+    def _load_folder(self, folder_key: str) -> None:
+        """Load states of the direct children of a folder (single range query)."""
+        pending = self._pending_writes()
+        latest: dict[str, tuple[str, int]] = {}
+        for file_id, path_key, state, last_update in get_folder_states(folder_key):
+            if path_key in pending:
+                # La escritura en cola reemplaza la fila guardada
+                continue
+            self._state_cache[file_id] = state
+            # Quedarse con la entrada más reciente por path_key
+            current = latest.get(path_key)
+            if current is None or last_update > current[1]:
+                latest[path_key] = (state, last_update)
+        folder_path_key = compute_path_key(folder_key)
+        for path_key, (file_id, _path, state) in pending.items():
+            if state is not None and os.path.dirname(path_key) == folder_path_key:
+                self._state_cache[file_id] = state
+                latest[path_key] = (state, _PENDING_LAST_UPDATE)
+        for path_key, (state, _) in latest.items():
+            self._path_key_cache[path_key] = state
+        self._loaded_folders.add(folder_key)
+    
+    def _is_folder_loaded(self, file_path: str) -> bool:
+        """True if states of the folder containing `file_path` are in memory."""
+        return normalize_path(os.path.dirname(file_path)) in self._loaded_folders
+    
+    def _cache_state(self, file_path: str, file_id: str, state: Optional[str]) -> None:
+        """Update both caches after a write (state None removes)."""
+        path_key = compute_path_key(file_path)
+        if state is None:
+            self._state_cache.pop(file_id, None)
+            self._path_key_cache.pop(path_key, None)
+        else:
+            self._state_cache[file_id] = state
+            self._path_key_cache[path_key] = state
+    
+    def _lookup_cached(self, file_path: str, file_id: str) -> tuple[bool, Optional[str]]:
+        """
+        Resolve a state from memory.
         
-        # Load all states from database into cache
-        self._load_cache_from_db()
+        Returns:
+            (found, state): found is False when the storage must be queried.
+        """
+        state = self._state_cache.get(file_id)
+        if state is not None:
+            return True, state
+        if self._is_folder_loaded(file_path):
+            return True, self._path_key_cache.get(compute_path_key(file_path))
+        return False, None
     
-    def _load_cache_from_db(self) -> None:
-        """Load all states from database into cache."""
-        db_states = load_all_states()
-        self._state_cache = db_states
+    def record_rename(
+        self,
+        old_path: str,
+        old_file_id: Optional[str],
+        new_path: str,
+        new_file_id: str,
+        state: str
+    ) -> None:
+        """Move a cached state after its storage row was migrated to a new path."""
+        if old_file_id:
+            self._cache_state(old_path, old_file_id, None)
+        self._cache_state(new_path, new_file_id, state)
+    
+    def get_memory_usage(self) -> dict[str, int]:
+        """
+        Report how much memory the state cache holds.
+        
+        Returns:
+            Dict with loaded_folders, cached_states, path_keys and approx_bytes
+            (dicts plus key strings; state strings are shared).
+        """
+        approx_bytes = (
+            sys.getsizeof(self._state_cache)
+            + sys.getsizeof(self._path_key_cache)
+            + sys.getsizeof(self._loaded_folders)
+            + sum(sys.getsizeof(key) for key in self._state_cache)
+            + sum(sys.getsizeof(key) for key in self._path_key_cache)
+            + sum(sys.getsizeof(key) for key in self._loaded_folders)
+        )
+        return {
+            'loaded_folders': len(self._loaded_folders),
+            'cached_states': len(self._state_cache),
+            'path_keys': len(self._path_key_cache),
+            'approx_bytes': approx_bytes,
+        }
     
     def _get_file_id(self, file_path: str) -> Optional[str]:
         """
-        Get file_id for a path, using cache if available.
+        Get file_id for a path from the shared identity cache.
+        
+        The cache is fed by folder listings (os.scandir) and invalidated by
+        FileSystemWatcherService, so cache hits need no stat calls.
         
         Args:
             file_path: Full path to file.
@@ -64,26 +224,7 @@ class FileStateManager(QObject):
         Returns:
             file_id or None if file doesn't exist.
         """
-        # Check cache first
-        if file_path in self._path_to_id_cache:
-            cached_id = self._path_to_id_cache[file_path]
-            # Verify file still exists and metadata matches
-            current_id = get_file_id_from_path(file_path)
-            if current_id == cached_id:
-                return cached_id
-            # Metadata changed, update cache
-            if current_id:
-                self._path_to_id_cache[file_path] = current_id
-                return current_id
-            # File deleted, remove from cache
-            self._path_to_id_cache.pop(file_path, None)
-            return None
-        
-        # Compute and cache
-        file_id = get_file_id_from_path(file_path)
-        if file_id:
-            self._path_to_id_cache[file_path] = file_id
-        return file_id
+        return get_identity_file_id(file_path)
     
     def get_file_state(self, file_path: str) -> Optional[str]:
         """
@@ -103,23 +244,71 @@ class FileStateManager(QObject):
             logger.debug(f"get_file_state: NO file_id for '{file_path}'")
             return None
         
-        # Check cache first
-        if file_id in self._state_cache:
-            cached_state = self._state_cache[file_id]
+        self._ensure_folders_loaded((file_path,))
+        found, cached_state = self._lookup_cached(file_path, file_id)
+        if found:
             logger.debug(f"get_file_state: CACHED state='{cached_state}' for '{os.path.basename(file_path)}' (id={file_id})")
             return cached_state
         
-        # Fallback to DB lookup (for files not in cache)
-        state = get_state_by_path(file_path)
+        # Fallback to DB lookup (folder not loaded), unless the write is still queued
+        pending = self._pending_writes().get(compute_path_key(file_path))
+        if pending is not None:
+            return pending[2]
+        state = get_state_by_path(file_path, file_id=file_id)
         logger.debug(f"get_file_state: DB LOOKUP state='{state}' for '{os.path.basename(file_path)}' (id={file_id})")
         if state and file_id:
             self._state_cache[file_id] = state
         return state
     
+    def get_states_for_paths(self, file_paths: List[str]) -> dict[str, Optional[str]]:
+        """
+        Get states for a whole listing at once.
+        
+        States of each parent folder are loaded once (one range query per
+        folder) and answered from memory afterwards. When a listing spans too
+        many unloaded folders, the remaining paths are resolved with a single
+        batched storage query instead.
+        
+        Args:
+            file_paths: List of file paths.
+            
+        Returns:
+            Dictionary mapping each path to its state (None if no state).
+        """
+        states: dict[str, Optional[str]] = {}
+        pending: list[tuple[str, str]] = []
+        
+        self._ensure_folders_loaded(file_paths)
+        for file_path in file_paths:
+            file_id = self._get_file_id(file_path)
+            if not file_id:
+                states[file_path] = None
+                continue
+            found, cached_state = self._lookup_cached(file_path, file_id)
+            if found:
+                states[file_path] = cached_state
+            else:
+                pending.append((file_path, file_id))
+        
+        if pending:
+            queued = self._pending_writes()
+            db_states = storage_get_states_batch(pending)
+            for file_path, file_id in pending:
+                queued_write = queued.get(compute_path_key(file_path))
+                state = queued_write[2] if queued_write is not None else db_states.get(file_path)
+                states[file_path] = state
+                if state:
+                    self._state_cache[file_id] = state
+        
+        return states
+    
     def set_file_state(self, file_path: str, state: Optional[str]) -> None:
         """
         Set state for a file.
         
+        The cache and state_changed update immediately; the SQLite write is
+        queued (see flush).
+        
         Args:
             file_path: Full path to the file.
             state: State constant or None to remove state.
@@ -128,23 +317,27 @@ class FileStateManager(QObject):
         if not file_id:
             return
         
+        # Cargar la carpeta antes de escribir: luego se responde desde memoria sin flush
+        self._ensure_folders_loaded((file_path,))
         if state is None:
-            self._state_cache.pop(file_id, None)
-            storage_remove_state(file_id)
+            self._cache_state(file_path, file_id, None)
+            self._write_queue.enqueue_remove(file_id, file_path)
         else:
-            self._state_cache[file_id] = state
-            try:
-                stat = os.stat(file_path)
-                storage_set_state(file_id, file_path, stat.st_size, int(stat.st_mtime), state)
-            except OSError:
-                self._state_cache.pop(file_id, None)
+            info = get_file_info(file_path)
+            if info is None:
                 return
+            size, mtime, _ = info
+            self._cache_state(file_path, file_id, state)
+            self._write_queue.enqueue_set(file_id, file_path, size, int(mtime), state)
         
         self.state_changed.emit(file_path, state)
     
     def set_files_state(self, file_paths: list[str], state: Optional[str]) -> int:
         """
-        Set state for multiple files using batch transaction for atomicity.
+        Set state for multiple files.
+        
+        The cache and states_changed update immediately; the SQLite writes are
+        queued and committed together in a batched transaction (see flush).
         
         Args:
             file_paths: List of file paths.
@@ -156,37 +349,39 @@ class FileStateManager(QObject):
         if not file_paths:
             return 0
         batch_states = []
-        batch_remove_ids = []
+        batch_remove = []
         updated_paths = []
         
+        # Cargar carpetas para que la comparación con el estado actual sea fiable
+        self._ensure_folders_loaded(file_paths)
+        
         for file_path in file_paths:
             file_id = self._get_file_id(file_path)
             if not file_id:
                 continue
             
-            if self._state_cache.get(file_id) == state:
+            found, current_state = self._lookup_cached(file_path, file_id)
+            if found and current_state == state:
                 continue
             
-            try:
-                stat = os.stat(file_path)
-                if state is None:
-                    batch_remove_ids.append(file_id)
-                else:
-                    batch_states.append((file_id, file_path, stat.st_size, int(stat.st_mtime), state))
-                updated_paths.append((file_path, state))
-            except OSError:
+            info = get_file_info(file_path)
+            if info is None:
                 continue
+            if state is None:
+                batch_remove.append((file_path, file_id))
+            else:
+                batch_states.append((file_id, file_path, info[0], int(info[1]), state))
+            updated_paths.append((file_path, state))
         
-        count = 0
-        if batch_remove_ids:
-            count += storage_remove_states_batch(batch_remove_ids)
-            for file_id in batch_remove_ids:
-                self._state_cache.pop(file_id, None)
+        for file_path, file_id in batch_remove:
+            self._cache_state(file_path, file_id, None)
+            self._write_queue.enqueue_remove(file_id, file_path)
         
-        if batch_states:
-            count += storage_set_states_batch(batch_states)
-            for file_id, _, _, _, state_val in batch_states:
-                self._state_cache[file_id] = state_val
+        for file_id, file_path, size, modified, state_val in batch_states:
+            self._cache_state(file_path, file_id, state_val)
+            self._write_queue.enqueue_set(file_id, file_path, size, modified, state_val)
+        
+        count = len(batch_remove) + len(batch_states)
         
         # Emit batch signal if any changes
         if updated_paths:
@@ -204,14 +399,13 @@ class FileStateManager(QObject):
         Returns:
             Number of entries removed.
         """
+        self.flush()
         removed_count = remove_missing_files(existing_paths)
         
         # Update cache: remove entries for missing files
         if removed_count > 0:
-            # Rebuild cache from DB
-            self._load_cache_from_db()
-            # Clear path cache (will be rebuilt on demand)
-            self._path_to_id_cache.clear()
+            # Las carpetas se vuelven a cargar bajo demanda
+            self._reset_cache()
         
         return removed_count
     
@@ -227,5 +421,22 @@ class FileStateManager(QObject):
         Returns:
             Lista de paths de archivos y carpetas con el estado especificado.
         """
-        return query_get_items_by_state(state)
+        pending = self._pending_writes()
+        items = query_get_items_by_state(state)
+        if not pending:
+            return items
+        # Las escrituras en cola sustituyen a las filas de su path
+        items = [path for path in items if compute_path_key(path) not in pending]
+        items.extend(path for _, path, queued_state in pending.values() if queued_state == state)
+        return sorted(set(items))
+
+
+_shared_manager: Optional[FileStateManager] = None
+
 
+def get_file_state_manager() -> FileStateManager:
+    """Get the process-wide FileStateManager shared by all TabManagers and views."""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = FileStateManager()
+    return _shared_manager
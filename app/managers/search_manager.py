@@ -2,14 +2,34 @@
 SearchManager - Manager for global workspace search.
 
 Coordinates search mode state and emits signals to UI.
-Separates search logic from UI. Executes searches off the UI thread.
+Separates search logic from UI. Executes searches off the UI thread:
+the index lookup and every open folder are searched in parallel, results
+are emitted in batches as they arrive, and a newer query cancels the work
+still queued for the previous one. Document contents are searched through
+the ContentIndex alongside file names.
+Keeps the FilenameIndex roots in sync with the workspaces and feeds both
+indexes the watcher's folder changes.
 """
 
+import threading
+
 from PySide6.QtCore import QObject, Signal, QTimer
-from typing import List, Dict
+from typing import List, Dict, Set
 from concurrent.futures import ThreadPoolExecutor, Future
 
-from app.services.search_service import search_in_workspaces, SearchResult
+from app.core.constants import MAX_SEARCH_WORKERS, SEARCH_RESULTS_BATCH_MS
+from app.services.content_index import get_content_index
+from app.services.filename_index import get_filename_index
+from app.services.path_utils import normalize_path
+from app.services.search_service import (
+    MAX_SEARCH_RESULTS,
+    SearchResult,
+    get_tab_search_folders,
+    get_workspace_search_roots,
+    search_content,
+    search_folder,
+    search_index
+)
 from app.core.logger import get_logger
 
 
@@ -18,8 +38,10 @@ class SearchManager(QObject):
     
     search_mode_changed = Signal(bool)
     search_results_changed = Signal(list)
+    # Lote de una tarea terminada (request_id, List[SearchResult]); emitido desde los workers
+    _batch_ready = Signal(int, list)
     
-    def __init__(self, workspace_manager, tab_manager=None):
+    def __init__(self, workspace_manager, tab_manager=None, index=None, content_index=None):
         super().__init__()
         self._workspace_manager = workspace_manager
         self._tab_manager = tab_manager
@@ -27,15 +49,55 @@ class SearchManager(QObject):
         self._current_query = ""
         self._current_results: List[SearchResult] = []
         self._cache: Dict[str, object] = {}
-        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
-        self._current_future: Future | None = None
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=MAX_SEARCH_WORKERS, thread_name_prefix="Search"
+        )
+        self._futures: List[Future] = []
+        self._cancel_event: threading.Event = threading.Event()
         self._last_request_id: int = 0
+        self._pending_tasks: int = 0
+        self._seen_paths: Set[str] = set()
         self._logger = get_logger(__name__)
+        self._batch_ready.connect(self._on_batch_ready)
+        
+        # Entregas parciales agrupadas: la vista se reconstruye con cada emisión
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._emit_results)
         
         self._debounce_timer = QTimer(self)
         self._debounce_timer.setSingleShot(True)
         self._debounce_timer.timeout.connect(self._execute_search)
         self._pending_query = ""
+        
+        # Índice de nombres: raíces = tabs y carpetas del árbol de cada workspace
+        self._index = index if index is not None else get_filename_index()
+        # Contenido de documentos: usa el índice de nombres como catálogo
+        self._content_index = content_index if content_index is not None else get_content_index()
+        self._connect_index_sources()
+        self._update_index_roots()
+    
+    def _connect_index_sources(self) -> None:
+        """Update the index when tabs/workspaces change and on watcher events."""
+        for signal_name in ('workspace_changed', 'workspace_created', 'workspace_deleted'):
+            signal = getattr(self._workspace_manager, signal_name, None)
+            if signal is not None:
+                signal.connect(self._update_index_roots)
+        if self._tab_manager is not None:
+            self._tab_manager.tabsChanged.connect(self._update_index_roots)
+            watcher = self._tab_manager.get_watcher()
+            if watcher is not None:
+                watcher.folder_delta.connect(self._index.apply_delta)
+                watcher.folder_delta.connect(self._content_index.apply_delta)
+    
+    def _update_index_roots(self, *_args) -> None:
+        """Index the tabs and focus tree folders of every workspace."""
+        try:
+            scopes = get_workspace_search_roots(self._workspace_manager, self._tab_manager)
+        except Exception as e:
+            self._logger.error(f"search index roots failed | error={e}", exc_info=True)
+            return
+        self._index.set_roots(folder for _, folders in scopes for folder in folders)
     
     def search(self, query: str) -> None:
         """
@@ -52,6 +114,10 @@ class SearchManager(QObject):
         
         if not self._is_search_mode:
             self._is_search_mode = True
+            # Recoger cambios fuera de las carpetas observadas (solo relee carpetas con otro mtime)
+            self._update_index_roots()
+            self._index.refresh()
+            self._content_index.refresh()
             self.search_mode_changed.emit(True)
         
         self._debounce_timer.stop()
@@ -63,39 +129,101 @@ class SearchManager(QObject):
         if not query:
             return
         
+        self._cancel_running_search()
         self._current_query = query
         self._last_request_id += 1
         request_id = self._last_request_id
-        self._logger.info(f"search started | req={request_id} | query='{query}'")
-
-        # Submit background search; we ignore stale results via request_id
-        future = self._executor.submit(
-            search_in_workspaces, query, self._workspace_manager, self._tab_manager, self._cache
+        self._current_results = []
+        self._seen_paths = set()
+        
+        # Workspaces y tabs se leen aquí (hilo de UI); los workers solo reciben rutas
+        # El índice cubre los subárboles; hasta que esté listo también se leen los tabs abiertos
+        try:
+            scopes = get_workspace_search_roots(self._workspace_manager, self._tab_manager)
+            folders = [] if self._index.is_ready() else get_tab_search_folders(
+                self._workspace_manager, self._tab_manager
+            )
+        except Exception as e:
+            self._logger.error(f"search planning failed | req={request_id} | error={e}", exc_info=True)
+            scopes = []
+            folders = []
+        self._logger.info(
+            f"search started | req={request_id} | query='{query}' | folders={len(folders)}"
         )
-        self._current_future = future
-        future.add_done_callback(lambda f, req=request_id: self._on_search_finished(req, f))
-
-    def _on_search_finished(self, request_id: int, future: Future) -> None:
-        """Handle completion of background search respecting request ordering."""
-        if request_id != self._last_request_id:
-            self._logger.info(f"search ignored (stale) | req={request_id} | last={self._last_request_id}")
+        
+        cancel_event = self._cancel_event
+        tasks = [
+            (search_index, query, scopes, self._index),
+            (search_content, query, scopes, self._content_index),
+        ]
+        tasks.extend(
+            (search_folder, query, folder_path, workspace_id, self._cache, cancel_event)
+            for workspace_id, folder_path in folders
+        )
+        self._pending_tasks = len(tasks)
+        self._futures = [
+            self._executor.submit(self._run_task, request_id, cancel_event, *task)
+            for task in tasks
+        ]
+    
+    def _run_task(self, request_id: int, cancel_event: threading.Event, func, *args) -> None:
+        """Run one search task on a worker and hand its results to the UI thread."""
+        if cancel_event.is_set():
             return
         try:
-            results = future.result()
+            results = func(*args)
         except Exception as e:
-            self._logger.error(f"search failed | req={request_id} | error={e}", exc_info=True)
+            self._logger.error(f"search task failed | req={request_id} | error={e}", exc_info=True)
             results = []
-
-        # Emit results; Qt will queue cross-thread signals automatically because
-        # SearchManager resides in the main thread.
-        self._current_results = results
-        self.search_results_changed.emit(results)
-        self._logger.info(f"search completed | req={request_id} | results={len(results)}")
+        if not cancel_event.is_set():
+            # Qt encola la señal: SearchManager vive en el hilo principal
+            self._batch_ready.emit(request_id, results)
+    
+    def _on_batch_ready(self, request_id: int, results: list) -> None:
+        """Merge a finished task's results (UI thread)."""
+        if request_id != self._last_request_id:
+            self._logger.debug(f"search batch ignored (stale) | req={request_id} | last={self._last_request_id}")
+            return
+        for result in results:
+            if len(self._current_results) >= MAX_SEARCH_RESULTS:
+                break
+            normalized_path = normalize_path(result.file_path)
+            if normalized_path not in self._seen_paths:
+                self._seen_paths.add(normalized_path)
+                self._current_results.append(result)
+        
+        self._pending_tasks -= 1
+        if self._pending_tasks <= 0 or len(self._current_results) >= MAX_SEARCH_RESULTS:
+            self._cancel_running_search()
+            self._emit_results()
+            self._logger.info(
+                f"search completed | req={request_id} | results={len(self._current_results)}"
+            )
+        elif results and not self._flush_timer.isActive():
+            self._flush_timer.start(SEARCH_RESULTS_BATCH_MS)
+    
+    def _emit_results(self) -> None:
+        """Emit the results gathered so far for the current query."""
+        self._flush_timer.stop()
+        if self._is_search_mode:
+            self.search_results_changed.emit(list(self._current_results))
+    
+    def _cancel_running_search(self) -> None:
+        """Stop tasks of the current request: queued ones never start, running scans stop."""
+        self._cancel_event.set()
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        self._pending_tasks = 0
+        self._flush_timer.stop()
+        self._cancel_event = threading.Event()
     
     def clear_search(self) -> None:
         """Clear search and return to previous context."""
         self._debounce_timer.stop()
         self._pending_query = ""
+        self._cancel_running_search()
+        self._last_request_id += 1
         
         if self._is_search_mode:
             self._is_search_mode = False
@@ -29,9 +29,13 @@ from app.managers.tab_manager_actions import (
     get_files_from_active_tab,
     activate_tab as action_activate_tab
 )
-from app.managers.tab_manager_signals import on_folder_changed, watch_and_emit as signal_watch_and_emit
+from app.managers.tab_manager_signals import (
+    on_folder_delta, watch_and_emit as signal_watch_and_emit
+)
 from app.managers.tab_manager_bootstrap import initialize_tab_manager
 from app.managers.tab_manager_restore import restore_tab_manager_state
+from app.services.filesystem_watcher_service import WATCH_PRIORITY_BACKGROUND, WATCH_PRIORITY_TAB
+from app.services.path_utils import normalize_path
 from app.services.state_view_mode_storage import get_view_mode, set_view_mode
 
 if TYPE_CHECKING:
@@ -45,6 +49,7 @@ class TabManager(QObject):
     tabsChanged = Signal(list)  # Emitted when tabs list changes
     activeTabChanged = Signal(int, str)  # Emitted when active tab changes (index, path)
     files_changed = Signal()  # Emitted when files in active folder change
+    files_delta = Signal(object)  # Emitted with a FolderDelta when the watcher sees changes
     focus_cleared = Signal()  # Emitted when active focus is removed (no active tab)
     view_mode_changed = Signal(str)  # Emitted when view mode changes (for state contexts)
 
@@ -57,23 +62,27 @@ class TabManager(QObject):
         
         Args:
             storage_path: Optional path to storage file.
-            file_state_manager: Optional FileStateManager instance. If None, creates one.
+            file_state_manager: Optional FileStateManager instance. If None, uses the shared one.
         """
         super().__init__()
         self._workspace_manager = None
         self._current_state_context: Optional[str] = None
         self._current_view_mode: Optional[str] = None  # Modo actual para guardar antes de cambiar estado
+        self._state_folders: set[str] = set()  # Carpetas (normalizadas) con items de la vista por estado
         
-        # FileStateManager para consultar archivos por estado
+        # FileStateManager para consultar archivos por estado (compartido por todo el proceso)
         if file_state_manager is None:
-            from app.managers.file_state_manager import FileStateManager
-            self._file_state_manager = FileStateManager()
+            from app.managers.file_state_manager import get_file_state_manager
+            self._file_state_manager = get_file_state_manager()
         else:
             self._file_state_manager = file_state_manager
         
         _, _, self._watcher = initialize_tab_manager(
             self, storage_path, self._load_state, self._watch_and_emit_internal
         )
+        # Observar todos los tabs abiertos, no solo el activo
+        self.tabsChanged.connect(self._update_watched_tabs)
+        self._update_watched_tabs()
     
     def set_workspace_manager(self, workspace_manager) -> None:
         """
@@ -83,6 +92,7 @@ class TabManager(QObject):
             workspace_manager: WorkspaceManager instance.
         """
         self._workspace_manager = workspace_manager
+        self._update_watched_tabs()
 
     def add_tab(self, folder_path: str) -> bool:
         """Add a folder as a tab and make it active."""
@@ -288,6 +298,7 @@ class TabManager(QObject):
         self._current_state_context = None
         self._current_view_mode = None  # Limpiar modo de estado
         # NO llamar a watch_and_emit() - no hay path que observar
+        self._watch_state_folders([])
 
     def get_files(self, extensions: Optional[set] = None, use_stacks: bool = False) -> List:
         """
@@ -299,6 +310,7 @@ class TabManager(QObject):
         if self._current_state_context:
             # Vista por estado: obtener archivos y carpetas con ese estado
             items = self._file_state_manager.get_items_by_state(self._current_state_context)
+            self._watch_state_folders(items)
             # Filtrar por extensiones si se especifican
             if extensions:
                 filtered = []
@@ -413,9 +425,33 @@ class TabManager(QObject):
                 # _watch_and_emit_internal emite activeTabChanged e inicia el watcher
                 self._watch_and_emit_internal(self._tabs[self._active_index])
 
-    def _on_folder_changed(self, folder_path: str) -> None:
-        """Handle folder change event from watcher."""
-        on_folder_changed(self, folder_path, self.files_changed)
+    def _on_folder_delta(self, delta) -> None:
+        """Handle incremental folder change (FolderDelta) from watcher."""
+        on_folder_delta(self, delta, self.files_delta)
+
+    def _update_watched_tabs(self, tabs: Optional[List[str]] = None) -> None:
+        """Watch every open tab: current workspace first, then the other workspaces."""
+        if not self._watcher:
+            return
+        # tabsChanged se emite antes de actualizar self._tabs
+        folders = list(tabs if tabs is not None else self._tabs)
+        if self._workspace_manager:
+            active_id = self._workspace_manager.get_active_workspace_id()
+            for workspace in self._workspace_manager.get_workspaces():
+                if workspace.id != active_id:
+                    folders.extend(workspace.tabs)
+        self._watcher.set_watched_folders("tabs", folders, WATCH_PRIORITY_TAB)
+    
+    def _watch_state_folders(self, items: List[str]) -> None:
+        """Watch the parent folders of the items shown by the state view."""
+        folders = list(dict.fromkeys(os.path.dirname(item) for item in items))
+        self._state_folders = {normalize_path(folder) for folder in folders}
+        if self._watcher:
+            self._watcher.set_watched_folders("state", folders, WATCH_PRIORITY_BACKGROUND)
+    
+    def is_state_folder(self, folder_path: str) -> bool:
+        """Check whether a folder holds items of the active state view."""
+        return normalize_path(folder_path) in self._state_folders
 
     def _watch_and_emit_internal(self, folder_path: str) -> None:
         """Start watching folder and emit active tab changed signal."""
@@ -11,26 +11,28 @@ from app.services.path_utils import is_state_context_path, normalize_path
 if TYPE_CHECKING:
     from PySide6.QtCore import Signal
     from app.managers.tab_manager import TabManager
+    from app.models.folder_delta import FolderDelta
     from app.services.filesystem_watcher_service import FileSystemWatcherService
 
 
-def on_folder_changed(
+def on_folder_delta(
     manager: "TabManager",
-    folder_path: str,
-    files_changed_signal: "Signal"
+    delta: "FolderDelta",
+    files_delta_signal: "Signal"
 ) -> None:
     """
-    Handle folder change event from watcher.
+    Handle incremental folder change from watcher.
     
-    Watcher already handles debounce and snapshot comparison,
-    so we just emit the signal.
+    Forwards the delta only if it belongs to the active folder. In a state
+    view, a removed or modified item in one of its folders refreshes the view.
     """
-    # Only process if it's the active folder (normalize for comparison)
-    normalized_path = normalize_path(folder_path)
+    if manager.has_state_context():
+        if (delta.removed or delta.modified) and manager.is_state_folder(delta.folder):
+            manager.files_changed.emit()
+        return
     active_folder = manager.get_active_folder()
-    if active_folder and normalize_path(active_folder) == normalized_path:
-        # Emit signal - watcher already filtered duplicates
-        files_changed_signal.emit()
+    if active_folder and normalize_path(active_folder) == normalize_path(delta.folder):
+        files_delta_signal.emit(delta)
 
 
 def watch_and_emit(
@@ -0,0 +1,20 @@
+"""
+FileEntry - Model for a scanned folder entry.
+
+Built from the cached os.scandir DirEntry data, so consumers never need to
+stat the entry again.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """File or folder found by a folder scan."""
+
+    path: str  # Full path
+    name: str  # Base name (with extension)
+    is_dir: bool
+    size: int
+    mtime: float
+    ext: str  # Lowercase extension ('' for folders and files without extension)
@@ -0,0 +1,26 @@
+"""
+FolderDelta - Model for incremental folder changes.
+
+Describes what changed in a watched folder between two watcher snapshots.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class FolderDelta:
+    """Entries added, removed or modified in a folder (full paths)."""
+
+    folder: str
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """True if nothing changed."""
+        return not (self.added or self.removed or self.modified)
+
+    def changed_paths(self) -> List[str]:
+        """Paths whose cached data (icons, identities) is no longer valid."""
+        return self.removed + self.modified
@@ -0,0 +1,253 @@
+"""
+ContentIndex - Background full-text index of document contents.
+
+Indexes the text of .txt/.json/.csv/.pdf/.docx files inside the
+FilenameIndex roots. The FilenameIndex is the file catalog: after each of
+its updates it reports the folders it re-read and the subtrees it dropped,
+and only those folders are reconciled here. Files edited in place (same
+folder listing) arrive through watcher deltas; refresh() reconciles every
+known document by mtime and size.
+
+A single daemon worker extracts and writes. It is throttled to spend at
+most CONTENT_INDEX_DUTY_CYCLE of its time extracting text, so a large
+first crawl does not saturate the CPU or the disk.
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional
+
+from app.core.constants import CONTENT_INDEX_DUTY_CYCLE
+from app.core.logger import get_logger
+from app.models.folder_delta import FolderDelta
+from app.services import content_index_storage as storage
+from app.services.content_text_extractor import (
+    CONTENT_EXTENSIONS,
+    extract_text,
+    is_content_indexable
+)
+from app.services.file_state_storage_helpers import compute_path_key
+from app.services.filename_index import FilenameIndex, get_filename_index
+
+logger = get_logger(__name__)
+
+# Documentos indexados por transacción
+DOCS_PER_COMMIT = 20
+
+
+class ContentIndex:
+    """Full-text index of documents in the FilenameIndex roots."""
+
+    def __init__(self, catalog: FilenameIndex):
+        """
+        Initialize index (schema and worker are created lazily).
+
+        Args:
+            catalog: FilenameIndex listing the files to index.
+        """
+        self._catalog = catalog
+        self._cond = threading.Condition()
+        self._initialized = False
+        self._available = False
+        self._pending_full = False
+        self._pending_folders: set[str] = set()
+        self._pending_removed: set[str] = set()
+        self._busy = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        catalog.add_listener(self._on_catalog_changed)
+
+    def refresh(self) -> None:
+        """Reconcile every indexed document with the catalog and the filesystem."""
+        with self._cond:
+            self._pending_full = True
+            self._wake()
+
+    def apply_delta(self, delta: FolderDelta) -> None:
+        """Re-index documents modified in place (watcher event)."""
+        if any(is_content_indexable(path) for path in delta.modified):
+            with self._cond:
+                self._pending_folders.add(compute_path_key(delta.folder))
+                self._wake()
+
+    def is_available(self) -> bool:
+        """False if SQLite has no FTS5 (content search disabled)."""
+        self._ensure_initialized()
+        return self._available
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """
+        Find documents containing every word of `query`.
+
+        Args:
+            query: Words to look for (case and accent insensitive).
+            limit: Maximum number of paths.
+
+        Returns:
+            Matching paths inside the catalog roots, best matches first.
+        """
+        if not self.is_available():
+            return []
+        return [path for path in storage.search_content(query, limit) if self._catalog.covers(path)]
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued update has been applied."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._has_work() and not self._busy, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker; unfinished documents are indexed on the next refresh."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_initialized(self) -> None:
+        with self._cond:
+            if not self._initialized:
+                self._available = storage.initialize_content_index()
+                self._initialized = True
+
+    def _on_catalog_changed(self, rescanned_keys: List[str], removed_keys: List[str]) -> None:
+        """FilenameIndex listener (called from its worker)."""
+        with self._cond:
+            self._pending_folders.update(rescanned_keys)
+            self._pending_removed.update(removed_keys)
+            self._wake()
+
+    def _has_work(self) -> bool:
+        return self._pending_full or bool(self._pending_folders) or bool(self._pending_removed)
+
+    def _wake(self) -> None:
+        """Start the worker if needed and notify it (caller holds the lock)."""
+        if self._stopped:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="ContentIndex", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _run(self) -> None:
+        """Worker loop: drop removed subtrees, then reconcile pending folders."""
+        try:
+            self._ensure_initialized()
+        except Exception as e:
+            logger.error(f"ContentIndex: cannot open index database: {e}")
+            self._available = False
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._has_work() or self._stopped)
+                if self._stopped:
+                    return
+                full = self._pending_full
+                folders = self._pending_folders
+                removed = self._pending_removed
+                self._pending_full = False
+                self._pending_folders = set()
+                self._pending_removed = set()
+                if not self._available:
+                    self._cond.notify_all()
+                    continue
+                self._busy = True
+            try:
+                for key in removed:
+                    storage.delete_subtree(key)
+                storage.commit()
+                if full:
+                    self._reconcile_all()
+                else:
+                    for key in folders:
+                        if not self._reconcile_folder(key):
+                            break
+            except Exception as e:
+                storage.rollback()
+                logger.error(f"ContentIndex: update failed: {e}", exc_info=True)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _reconcile_all(self) -> bool:
+        """Match every document against the whole catalog."""
+        files = {
+            path_key: (parent_key, path)
+            for path_key, parent_key, path in self._catalog.get_indexed_files(CONTENT_EXTENSIONS)
+        }
+        documents = storage.get_documents()
+        return self._reconcile(files, documents)
+
+    def _reconcile_folder(self, folder_key: str) -> bool:
+        """Match the documents of one folder against its catalog listing."""
+        files = {
+            path_key: (folder_key, path)
+            for path_key, (path, is_dir) in self._catalog.get_indexed_children(folder_key).items()
+            if not is_dir and is_content_indexable(path)
+        }
+        documents = storage.get_documents(folder_key)
+        return self._reconcile(files, documents)
+
+    def _reconcile(self, files: dict, documents: dict) -> bool:
+        """
+        Drop documents no longer in the catalog; (re)index new or changed ones.
+
+        Returns:
+            False if interrupted by shutdown.
+        """
+        for path_key in documents.keys() - files.keys():
+            storage.delete_document(path_key)
+        storage.commit()
+
+        indexed = 0
+        for path_key, (parent_key, path) in files.items():
+            if self._stopped:
+                storage.commit()
+                return False
+            try:
+                stat = os.stat(path)
+            except OSError:
+                storage.delete_document(path_key)
+                continue
+            if documents.get(path_key) == (stat.st_mtime, stat.st_size):
+                continue
+
+            start = time.perf_counter()
+            # Sin texto (PDF escaneado, archivo bloqueado): se guarda vacío hasta que cambie
+            text = extract_text(path) or ""
+            storage.store_document(path, path_key, parent_key, stat.st_mtime, stat.st_size, text)
+            indexed += 1
+            if indexed % DOCS_PER_COMMIT == 0:
+                storage.commit()
+            self._throttle(time.perf_counter() - start)
+        storage.commit()
+        return True
+
+    def _throttle(self, busy_seconds: float) -> None:
+        """Idle long enough to keep extraction within CONTENT_INDEX_DUTY_CYCLE."""
+        idle = busy_seconds * (1.0 - CONTENT_INDEX_DUTY_CYCLE) / CONTENT_INDEX_DUTY_CYCLE
+        if idle > 0:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stopped, idle)
+
+
+_shared_index: Optional[ContentIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_content_index() -> ContentIndex:
+    """Get the process-wide content index (catalog: the process-wide FilenameIndex)."""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = ContentIndex(get_filename_index())
+        return _shared_index
+
+
+def shutdown_content_index(timeout: Optional[float] = 5.0) -> None:
+    """Stop the process-wide content index worker (app exit hook; safe if never used)."""
+    with _shared_index_lock:
+        index = _shared_index
+    if index is not None:
+        index.shutdown(timeout)
@@ -0,0 +1,184 @@
+"""
+ContentIndexStorage - SQLite storage of the document content index.
+
+Lives in its own database file (content_index.db). Every indexed document
+has a row in `documents` (path_key, parent folder, mtime and size at
+indexing time) and its text in the FTS5 table `documents_fts` under the
+same rowid. The unicode61 tokenizer drops diacritics, so "examen" also
+finds "exámenes".
+
+Without FTS5 the content index is disabled (initialize_content_index()
+returns False).
+"""
+
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logger import get_logger
+from app.services.file_state_storage_helpers import (
+    get_pooled_connection,
+    rollback_quietly
+)
+from app.services.storage_path_service import get_storage_file
+
+logger = get_logger(__name__)
+
+CONTENT_DB_PATH = get_storage_file("content_index.db")
+
+# Longitud mínima de consulta para buscar en el contenido
+CONTENT_MIN_QUERY = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    path_key TEXT NOT NULL UNIQUE,
+    parent_key TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_parent ON documents(parent_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    text, tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_content_db_path() -> Path:
+    """Get content index database path."""
+    return CONTENT_DB_PATH
+
+
+def get_content_connection() -> sqlite3.Connection:
+    """Get the calling thread's pooled connection to the content index database."""
+    return get_pooled_connection(str(get_content_db_path()))
+
+
+def initialize_content_index() -> bool:
+    """
+    Create the content index schema if needed.
+
+    Returns:
+        False if this SQLite build has no FTS5 (content index disabled).
+    """
+    conn = get_content_connection()
+    try:
+        conn.executescript(_SCHEMA)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 unavailable, content index disabled: {e}")
+        rollback_quietly(conn)
+        return False
+    conn.commit()
+    return True
+
+
+def _subtree_range(key: str) -> Tuple[str, str]:
+    """path_key bounds (inclusive, exclusive) of everything below key."""
+    prefix = key.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def get_documents(parent_key: Optional[str] = None) -> Dict[str, Tuple[float, int]]:
+    """
+    Get indexed documents (path_key -> (mtime, size)).
+
+    Args:
+        parent_key: Only documents directly inside this folder (all if None).
+    """
+    conn = get_content_connection()
+    if parent_key is None:
+        rows = conn.execute("SELECT path_key, mtime, size FROM documents").fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT path_key, mtime, size FROM documents WHERE parent_key = ?", (parent_key,)
+        ).fetchall()
+    return {key: (mtime, size) for key, mtime, size in rows}
+
+
+def store_document(path: str, path_key: str, parent_key: str, mtime: float, size: int, text: str) -> None:
+    """Insert or replace a document and its text (commit is left to the caller)."""
+    conn = get_content_connection()
+    delete_document(path_key)
+    cursor = conn.execute(
+        "INSERT INTO documents (path, path_key, parent_key, mtime, size) VALUES (?, ?, ?, ?, ?)",
+        (path, path_key, parent_key, mtime, size)
+    )
+    conn.execute(
+        "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text)
+    )
+
+
+def delete_document(path_key: str) -> None:
+    """Drop a document and its text (commit is left to the caller)."""
+    conn = get_content_connection()
+    row = conn.execute("SELECT id FROM documents WHERE path_key = ?", (path_key,)).fetchone()
+    if row:
+        conn.execute("DELETE FROM documents_fts WHERE rowid = ?", row)
+        conn.execute("DELETE FROM documents WHERE id = ?", row)
+
+
+def delete_subtree(key: str) -> None:
+    """Drop the document at key and every document below it."""
+    low, high = _subtree_range(key)
+    conn = get_content_connection()
+    where = "path_key = ? OR (path_key >= ? AND path_key < ?)"
+    conn.execute(
+        f"DELETE FROM documents_fts WHERE rowid IN (SELECT id FROM documents WHERE {where})",
+        (key, low, high)
+    )
+    conn.execute(f"DELETE FROM documents WHERE {where}", (key, low, high))
+
+
+def commit() -> None:
+    """Commit the calling thread's pending content index writes."""
+    get_content_connection().commit()
+
+
+def rollback() -> None:
+    """Discard the calling thread's pending content index writes."""
+    rollback_quietly(get_content_connection())
+
+
+def count_documents() -> int:
+    """Number of indexed documents."""
+    return get_content_connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Every word must appear (as a word prefix), so partially typed words
+    already match. Returns None for queries shorter than CONTENT_MIN_QUERY.
+    """
+    terms = _TERM_PATTERN.findall(query)
+    if not terms or len("".join(terms)) < CONTENT_MIN_QUERY:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_content(query: str, limit: int) -> List[str]:
+    """
+    Find documents whose text contains every word of `query`.
+
+    Args:
+        query: Words to look for (case and accent insensitive).
+        limit: Maximum number of paths.
+
+    Returns:
+        Matching document paths, best matches first.
+    """
+    match = build_match_query(query)
+    if match is None:
+        return []
+    rows = get_content_connection().execute(
+        "SELECT d.path FROM documents_fts f JOIN documents d ON d.id = f.rowid "
+        "WHERE documents_fts MATCH ? ORDER BY f.rank LIMIT ?",
+        (match, limit)
+    ).fetchall()
+    return [path for (path,) in rows]
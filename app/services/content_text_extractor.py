@@ -0,0 +1,128 @@
+"""
+ContentTextExtractor - Plain text extraction for the content index.
+
+- .txt/.json/.csv: read directly (UTF-8, falling back to cp1252).
+- .pdf: page text through PyMuPDF (same import and FITZ_LOCK as pdf_renderer).
+- .docx: <w:t> runs of word/document.xml, read straight from the zip.
+
+Extracted text is capped at MAX_CONTENT_CHARS; files above
+MAX_CONTENT_FILE_BYTES are not read.
+"""
+
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+from app.core.logger import get_logger
+from app.services.preview_file_extensions import normalize_extension
+from app.services.pdf_renderer import FITZ_AVAILABLE, FITZ_LOCK, fitz
+
+logger = get_logger(__name__)
+
+PLAIN_TEXT_EXTENSIONS = frozenset({'.txt', '.json', '.csv'})
+CONTENT_EXTENSIONS = PLAIN_TEXT_EXTENSIONS | frozenset({'.pdf', '.docx'})
+
+MAX_CONTENT_FILE_BYTES = 50 * 1024 * 1024
+MAX_CONTENT_CHARS = 200_000
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def is_content_indexable(path: str) -> bool:
+    """Check whether the content index extracts text from this file type."""
+    return normalize_extension(path) in CONTENT_EXTENSIONS
+
+
+def extract_text(path: str) -> Optional[str]:
+    """
+    Extract the plain text of a document.
+
+    Args:
+        path: File path (.txt, .json, .csv, .pdf or .docx).
+
+    Returns:
+        Extracted text ('' if the document has none, e.g. a scanned PDF),
+        or None if the file cannot be read or is not supported.
+    """
+    ext = normalize_extension(path)
+    try:
+        if os.path.getsize(path) > MAX_CONTENT_FILE_BYTES:
+            return None
+        if ext in PLAIN_TEXT_EXTENSIONS:
+            return _read_plain_text(path)
+        if ext == '.pdf':
+            return _extract_pdf_text(path)
+        if ext == '.docx':
+            return _extract_docx_text(path)
+    except Exception as e:
+        logger.debug(f"Text extraction failed for '{path}': {e}")
+    return None
+
+
+def _read_plain_text(path: str) -> str:
+    """Read a text file, decoding UTF-8 or, failing that, cp1252."""
+    with open(path, 'rb') as f:
+        data = f.read(MAX_CONTENT_CHARS * 4)
+    try:
+        text = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = data.decode('cp1252', errors='replace')
+    return text[:MAX_CONTENT_CHARS]
+
+
+def _extract_pdf_text(path: str) -> Optional[str]:
+    """
+    Concatenate the text of every page (until MAX_CONTENT_CHARS).
+
+    The lock is taken per page so previews and thumbnails are not blocked
+    for the whole document.
+    """
+    if not FITZ_AVAILABLE:
+        return None
+    with FITZ_LOCK:
+        doc = fitz.open(path)
+    try:
+        with FITZ_LOCK:
+            if doc.needs_pass:
+                return None
+            page_count = len(doc)
+        parts = []
+        length = 0
+        for page_num in range(page_count):
+            with FITZ_LOCK:
+                text = doc[page_num].get_text()
+            parts.append(text)
+            length += len(text)
+            if length >= MAX_CONTENT_CHARS:
+                break
+        return "\n".join(parts)[:MAX_CONTENT_CHARS]
+    finally:
+        with FITZ_LOCK:
+            doc.close()
+
+
+def _extract_docx_text(path: str) -> Optional[str]:
+    """Read the text runs of word/document.xml, one line per paragraph."""
+    with zipfile.ZipFile(path) as archive:
+        try:
+            info = archive.getinfo("word/document.xml")
+        except KeyError:
+            return None
+        if info.file_size > MAX_CONTENT_FILE_BYTES:
+            return None
+        with archive.open(info) as document:
+            parts = []
+            length = 0
+            for _event, element in ET.iterparse(document):
+                if element.tag == _WORD_NS + "t" and element.text:
+                    parts.append(element.text)
+                    length += len(element.text)
+                elif element.tag == _WORD_NS + "tab":
+                    parts.append("\t")
+                elif element.tag == _WORD_NS + "p":
+                    parts.append("\n")
+                    element.clear()
+                if length >= MAX_CONTENT_CHARS:
+                    break
+    return "".join(parts)[:MAX_CONTENT_CHARS]
@@ -1,43 +1,68 @@
 """
 DOCX Converter - Converts DOCX files to PDF using docx2pdf.
 
-Handles conversion and caching of DOCX to PDF for preview rendering.
-Includes cache size management and auto-cleanup.
+Handles conversion of DOCX to PDF for preview rendering. Converted PDFs go
+to DocxPdfCache (keyed by path, size and mtime, with a byte budget).
+Conversions are serialized process-wide: docx2pdf drives a single Word
+instance, and background pre-conversion must never run two at once.
 
 Note: .doc (formato antiguo) NO está soportado porque docx2pdf solo acepta .docx.
 """
 
 import os
 import hashlib
-import tempfile
 import shutil
+import threading
 from pathlib import Path
+from typing import Optional
 
+from app.core.constants import MAX_DOCX_PDF_CACHE_MB
 from app.core.logger import get_logger
+from app.services import docx_pdf_cache
 from app.services.preview_file_extensions import normalize_extension
 
 logger = get_logger(__name__)
 
+# Una conversión a la vez en todo el proceso (vista rápida y preconversión)
+_conversion_lock = threading.Lock()
+
+
+def is_conversion_in_progress() -> bool:
+    """True while any DocxConverter is running docx2pdf."""
+    return _conversion_lock.locked()
+
+
+def is_docx2pdf_available() -> bool:
+    """True if docx2pdf can be imported (it needs Word on Windows/macOS)."""
+    try:
+        import docx2pdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
 
 class DocxConverter:
     """Converts DOCX files to PDF for preview rendering."""
     
-    # Maximum cache size: 500MB
-    MAX_CACHE_SIZE_MB = 500
+    # Maximum cache size (enforced by DocxPdfCache)
+    MAX_CACHE_SIZE_MB = MAX_DOCX_PDF_CACHE_MB
     MAX_CACHE_SIZE_BYTES = MAX_CACHE_SIZE_MB * 1024 * 1024
     
     def __init__(self):
         """Initialize converter with temporary cache directory."""
-        self._cache_dir = Path(tempfile.gettempdir()) / "claritydesk_previews"
+        self._cache_dir = docx_pdf_cache.get_docx_pdf_cache_dir()
         self._cache_dir.mkdir(exist_ok=True)
         # Directory for temporary copies with normalized extensions
         self._temp_dir = self._cache_dir / "temp_docx"
         self._temp_dir.mkdir(exist_ok=True)
     
-    def get_cached_pdf_path(self, docx_path: str) -> Path:
-        """Get cached PDF path for a DOCX file."""
-        file_hash = hashlib.md5(docx_path.encode()).hexdigest()
-        return self._cache_dir / f"{file_hash}.pdf"
+    def get_cached_pdf_path(self, docx_path: str) -> Optional[Path]:
+        """Get cached PDF path for the current version (size, mtime) of a DOCX file."""
+        return docx_pdf_cache.get_pdf_path(docx_path)
+    
+    def has_cached_pdf(self, docx_path: str) -> bool:
+        """True if the current version of a DOCX file is already converted."""
+        return docx_pdf_cache.has_pdf(docx_path)
     
     def _get_normalized_temp_path(self, original_path: str) -> str:
         """
@@ -132,27 +157,36 @@ class DocxConverter:
         if ext != '.docx':
             return ""
 
+        # Ya convertido (misma ruta, tamaño y mtime)
+        cached = docx_pdf_cache.lookup_pdf(docx_path)
+        if cached:
+            logger.debug(f"Using cached PDF for: {docx_path}")
+            return cached
+
         try:
             from docx2pdf import convert
         except ImportError as e:
             logger.error(f"Failed to import docx2pdf: {e}")
             return ""
 
+        with _conversion_lock:
+            # Otra conversión (p. ej. la preconversión) pudo terminar mientras esperábamos
+            cached = docx_pdf_cache.lookup_pdf(docx_path)
+            if cached:
+                return cached
+            return self._convert_locked(docx_path, convert)
+    
+    def _convert_locked(self, docx_path: str, convert) -> str:
+        """Run docx2pdf and store the result in the cache; caller holds _conversion_lock."""
+        partial_path = None
+        normalized_docx_path = docx_path
         try:
-            self._cleanup_cache_if_needed()
-
-            pdf_path = self.get_cached_pdf_path(docx_path)
-
-            if pdf_path.exists():
-                try:
-                    docx_mtime = os.path.getmtime(docx_path)
-                    pdf_mtime = os.path.getmtime(str(pdf_path))
-                    if pdf_mtime >= docx_mtime:
-                        logger.debug(f"Using cached PDF for: {docx_path}")
-                        return str(pdf_path)
-                except (OSError, ValueError) as e:
-                    logger.debug(f"Error checking PDF cache mtime: {e}")
-                    pass  # Continue to regenerate
+            # La clave se fija antes de convertir: si el archivo cambia durante la
+            # conversión, el PDF queda asociado a la versión que se convirtió
+            partial_path = docx_pdf_cache.new_partial_path(docx_path)
+            if partial_path is None:
+                logger.warning(f"Cannot prepare PDF cache entry for: {docx_path}")
+                return ""
 
             try:
                 # docx2pdf's Path.resolve() returns the actual filename from filesystem,
@@ -160,75 +194,39 @@ class DocxConverter:
                 normalized_docx_path = self._get_normalized_temp_path(docx_path)
 
                 logger.debug(f"Converting DOCX to PDF: {docx_path}")
-                convert(normalized_docx_path, str(pdf_path))
-                logger.debug(f"DOCX conversion completed: {pdf_path}")
+                convert(normalized_docx_path, str(partial_path))
+                logger.debug(f"DOCX conversion completed: {partial_path}")
             except Exception as e:
                 logger.error(f"DOCX conversion failed: {type(e).__name__}: {e}", exc_info=True)
+                docx_pdf_cache.discard_partial(partial_path)
                 return ""
 
-            try:
-                if pdf_path.exists():
-                    return str(pdf_path)
-                else:
-                    logger.warning(f"PDF does not exist after conversion: {docx_path}")
-            except (OSError, ValueError) as e:
-                logger.warning(f"Error checking PDF existence: {e}")
-                pass
-
-            return ""
+            if not partial_path.exists():
+                logger.warning(f"PDF does not exist after conversion: {docx_path}")
+                return ""
+            pdf_path = docx_pdf_cache.store_pdf(docx_path, partial_path)
+            if not pdf_path:
+                docx_pdf_cache.discard_partial(partial_path)
+                return ""
+            return pdf_path
         except Exception as e:
             logger.error(f"DOCX converter exception: {e}", exc_info=True)
+            docx_pdf_cache.discard_partial(partial_path)
             return ""
-    
-    def _get_cache_size(self) -> int:
-        """Calculate total size of cache directory in bytes."""
-        total_size = 0
-        try:
-            for file_path in self._cache_dir.iterdir():
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-        except Exception:
-            pass
-        return total_size
-    
-    def _cleanup_cache_if_needed(self) -> None:
-        """Cleanup cache if it exceeds maximum size limit."""
-        cache_size = self._get_cache_size()
-        
-        if cache_size <= self.MAX_CACHE_SIZE_BYTES:
-            return
-        
-        # Sort files by modification time (oldest first)
-        try:
-            files_with_mtime = []
-            for file_path in self._cache_dir.iterdir():
-                if file_path.is_file():
-                    files_with_mtime.append((file_path, file_path.stat().st_mtime))
-            
-            # Sort by mtime (oldest first)
-            files_with_mtime.sort(key=lambda x: x[1])
-            
-            # Delete oldest files until under limit
-            for file_path, _ in files_with_mtime:
-                if cache_size <= self.MAX_CACHE_SIZE_BYTES:
-                    break
-                
+        finally:
+            # El PDF ya está en caché: la copia temporal no vuelve a hacer falta
+            if normalized_docx_path != docx_path:
                 try:
-                    file_size = file_path.stat().st_size
-                    file_path.unlink()
-                    cache_size -= file_size
-                except Exception:
+                    os.remove(normalized_docx_path)
+                except OSError:
                     pass
-        except Exception:
-            pass
     
     def clear_cache(self) -> None:
         """Clear temporary PDF cache directory."""
         try:
-            import shutil
-            if self._cache_dir.exists():
-                shutil.rmtree(self._cache_dir)
-                self._cache_dir.mkdir(exist_ok=True)
+            docx_pdf_cache.clear_docx_pdf_cache()
+            self._cache_dir.mkdir(exist_ok=True)
+            self._temp_dir.mkdir(exist_ok=True)
         except Exception:
             pass
 
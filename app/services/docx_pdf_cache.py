@@ -0,0 +1,284 @@
+"""
+DocxPdfCache - Content-addressed cache of PDFs converted from DOCX.
+
+Converted PDFs are stored under <temp>/claritydesk_previews/, named by a hash
+of (normalized path, file size, mtime). An edited document gets a new key, so
+a stale PDF is never returned; the old one just ages out.
+
+index.json keeps, oldest first, the size and last access time of every
+entry. It is loaded once per process into an ordered dict, so a hit and an
+eviction are O(1) and enforcing MAX_DOCX_PDF_CACHE_MB never walks the
+directory. A missing or unreadable index is rebuilt from the directory once.
+index.json is written on store and eviction only; access-time updates from
+hits stay in memory until the next write or flush_docx_pdf_cache_index()
+(app exit), so a hit does no disk I/O.
+
+Safe to call from worker threads. Errors never escape: the cache is an
+optimization and a failure behaves like a miss.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.core.constants import MAX_DOCX_PDF_CACHE_MB
+from app.core.logger import get_logger
+from app.models.path_utils import normalize_path
+
+logger = get_logger(__name__)
+
+DOCX_PDF_CACHE_DIR_NAME = "claritydesk_previews"
+INDEX_FILE_NAME = "index.json"
+MAX_CACHE_BYTES = MAX_DOCX_PDF_CACHE_MB * 1024 * 1024
+
+# Sufijo de los PDFs a medio escribir (docx2pdf exige la extensión .pdf)
+_PARTIAL_SUFFIX = ".partial.pdf"
+
+_lock = threading.Lock()
+# key -> [bytes, último acceso], del menos al más reciente (se carga perezosamente)
+_index: Optional["OrderedDict[str, list]"] = None
+_index_dir: Optional[Path] = None
+_total_bytes = 0
+# Accesos (o entradas desaparecidas) aún no escritos en index.json
+_index_dirty = False
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+
+def get_docx_pdf_cache_dir() -> Path:
+    """Get the cache directory (in the system temp folder)."""
+    return Path(tempfile.gettempdir()) / DOCX_PDF_CACHE_DIR_NAME
+
+
+def compute_docx_pdf_key(path: str, file_size: int, mtime: float) -> str:
+    """Compute content-addressed key of a converted PDF."""
+    content = f"{normalize_path(path)}|{file_size}|{mtime!r}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _file_key(docx_path: str) -> Optional[str]:
+    """Key for the current version of a DOCX (None if it cannot be read)."""
+    try:
+        st = os.stat(docx_path)
+    except (OSError, ValueError):
+        return None
+    return compute_docx_pdf_key(docx_path, st.st_size, st.st_mtime)
+
+
+def _entry_path(base_dir: Path, key: str) -> Path:
+    return base_dir / f"{key}.pdf"
+
+
+def get_pdf_path(docx_path: str) -> Optional[Path]:
+    """Where the PDF of the current version of a DOCX is (or would be) stored."""
+    key = _file_key(docx_path)
+    return _entry_path(get_docx_pdf_cache_dir(), key) if key is not None else None
+
+
+def has_pdf(docx_path: str) -> bool:
+    """True if the current version of a DOCX is converted (does not count as an access)."""
+    key = _file_key(docx_path)
+    if key is None:
+        return False
+    with _lock:
+        index = _ensure_index_locked(get_docx_pdf_cache_dir())
+        return key in index
+
+
+def lookup_pdf(docx_path: str) -> Optional[str]:
+    """
+    Get the converted PDF of the current version of a DOCX.
+
+    Returns:
+        PDF path, or None on miss.
+    """
+    global _index_dirty
+    key = _file_key(docx_path)
+    if key is None:
+        return None
+    base_dir = get_docx_pdf_cache_dir()
+    entry = _entry_path(base_dir, key)
+    with _lock:
+        index = _ensure_index_locked(base_dir)
+        record = index.get(key)
+        if record is not None and not entry.exists():
+            _drop_locked(key)  # Borrado desde fuera (limpieza del sistema)
+            record = None
+        if record is None:
+            _stats['misses'] += 1
+            return None
+        # LRU: al final del índice (se persiste con la próxima escritura)
+        index.move_to_end(key)
+        record[1] = time.time()
+        _stats['hits'] += 1
+        _index_dirty = True
+    return str(entry)
+
+
+def new_partial_path(docx_path: str) -> Optional[Path]:
+    """Temporary PDF path for a conversion in progress (see store_pdf)."""
+    key = _file_key(docx_path)
+    if key is None:
+        return None
+    base_dir = get_docx_pdf_cache_dir()
+    try:
+        base_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return base_dir / f"{key}.{threading.get_ident()}{_PARTIAL_SUFFIX}"
+
+
+def store_pdf(docx_path: str, partial_path: Path) -> Optional[str]:
+    """
+    Move a finished conversion into the cache and evict down to the budget.
+
+    The key comes from partial_path (the DOCX version that was converted),
+    so a document edited during the conversion is not paired with it.
+
+    Returns:
+        Final PDF path, or None if it could not be stored.
+    """
+    global _total_bytes
+    key = partial_path.name.split(".", 1)[0]
+    base_dir = partial_path.parent
+    entry = _entry_path(base_dir, key)
+    try:
+        # Atómico: otro hilo nunca abre un PDF a medias
+        os.replace(partial_path, entry)
+        written = entry.stat().st_size
+    except OSError as e:
+        logger.debug(f"Cannot store converted PDF for {docx_path}: {e}")
+        return None
+
+    with _lock:
+        index = _ensure_index_locked(base_dir)
+        previous = index.pop(key, None)
+        if previous is not None:
+            _total_bytes -= previous[0]
+        index[key] = [written, time.time()]
+        _total_bytes += written
+        _stats['writes'] += 1
+        while _total_bytes > MAX_CACHE_BYTES and len(index) > 1:
+            oldest = next(iter(index))
+            _drop_locked(oldest)
+            _stats['evictions'] += 1
+        _save_index_locked(base_dir)
+    return str(entry)
+
+
+def discard_partial(partial_path: Optional[Path]) -> None:
+    """Delete a failed conversion's partial file."""
+    if partial_path is None:
+        return
+    try:
+        partial_path.unlink()
+    except OSError:
+        pass
+
+
+def _drop_locked(key: str) -> None:
+    """Remove one entry and its file; caller holds _lock."""
+    global _total_bytes, _index_dirty
+    record = _index.pop(key, None)
+    if record is None:
+        return
+    _total_bytes -= record[0]
+    _index_dirty = True
+    try:
+        os.remove(_entry_path(_index_dir, key))
+    except OSError:
+        pass
+
+
+def _ensure_index_locked(base_dir: Path) -> "OrderedDict[str, list]":
+    """Load (or rebuild) the index the first time a directory is used; caller holds _lock."""
+    global _index, _index_dir, _total_bytes, _index_dirty
+    if _index is not None and _index_dir == base_dir:
+        return _index
+    entries = _read_index(base_dir)
+    if entries is None:
+        entries = _scan_entries(base_dir)
+    entries.sort(key=lambda item: item[2])
+    _index = OrderedDict((key, [size, accessed]) for key, size, accessed in entries)
+    _index_dir = base_dir
+    _total_bytes = sum(record[0] for record in _index.values())
+    _index_dirty = False
+    return _index
+
+
+def _read_index(base_dir: Path) -> Optional[list[tuple[str, int, float]]]:
+    """Read index.json as (key, bytes, last access); None if missing or invalid."""
+    try:
+        with open(base_dir / INDEX_FILE_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [(str(key), int(size), float(accessed)) for key, size, accessed in data['entries']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _scan_entries(base_dir: Path) -> list[tuple[str, int, float]]:
+    """Rebuild the entries from the PDFs on disk (mtime as last access)."""
+    entries = []
+    try:
+        with os.scandir(base_dir) as items:
+            for item in items:
+                name = item.name
+                if not name.endswith(".pdf") or name.endswith(_PARTIAL_SUFFIX):
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                entries.append((name[:-len(".pdf")], st.st_size, st.st_mtime))
+    except OSError:
+        pass
+    return entries
+
+
+def _save_index_locked(base_dir: Path) -> None:
+    """Write index.json atomically; caller holds _lock."""
+    global _index_dirty
+    _index_dirty = False
+    data = {'entries': [[key, size, accessed] for key, (size, accessed) in _index.items()]}
+    tmp_path = base_dir / f"{INDEX_FILE_NAME}.{threading.get_ident()}.tmp"
+    try:
+        base_dir.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, base_dir / INDEX_FILE_NAME)
+    except OSError as e:
+        logger.debug(f"Cannot write DOCX PDF cache index: {e}")
+
+
+def flush_docx_pdf_cache_index() -> None:
+    """Write pending access-time updates to index.json (app exit hook; safe if never used)."""
+    with _lock:
+        if _index is not None and _index_dirty:
+            _save_index_locked(_index_dir)
+
+
+def clear_docx_pdf_cache() -> None:
+    """Delete every converted PDF and reset counters."""
+    global _index, _index_dir, _total_bytes, _index_dirty
+    base_dir = get_docx_pdf_cache_dir()
+    with _lock:
+        shutil.rmtree(base_dir, ignore_errors=True)
+        _index = None
+        _index_dir = None
+        _total_bytes = 0
+        _index_dirty = False
+        for name in _stats:
+            _stats[name] = 0
+
+
+def get_docx_pdf_cache_stats() -> dict:
+    """Get counters for diagnostics (hits, misses, writes, evictions, bytes, entries)."""
+    with _lock:
+        index = _ensure_index_locked(get_docx_pdf_cache_dir())
+        return dict(_stats, bytes=_total_bytes, max_bytes=MAX_CACHE_BYTES, entries=len(index))
@@ -0,0 +1,207 @@
+"""
+DocxPreconverter - Background DOCX to PDF conversion of the active folder.
+
+Opt-in (setting PRECONVERT_DOCX_SETTING, toggled from the folder background
+context menu). When the active folder changes,
+its .docx files that are not converted yet are queued; a single daemon
+worker converts them one by one into DocxPdfCache, so quick preview opens
+them without waiting for docx2pdf.
+
+The worker only converts while the app is idle: it waits
+DOCX_PRECONVERT_IDLE_SECONDS after the last folder change, and never
+starts while another conversion (quick preview) is running. Conversions
+are serialized with quick preview by DocxConverter.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.constants import DOCX_PRECONVERT_IDLE_SECONDS, DOCX_PRECONVERT_MAX_FILES
+from app.core.logger import get_logger
+from app.services.docx_converter import (
+    DocxConverter,
+    is_conversion_in_progress,
+    is_docx2pdf_available,
+)
+from app.services.preview_file_extensions import normalize_extension, validate_file_for_preview
+from app.services.settings_service import SettingsService
+
+logger = get_logger(__name__)
+
+# Clave de SettingsService que activa la preconversión (desactivada por defecto)
+PRECONVERT_DOCX_SETTING = "preview.preconvert_docx"
+
+
+def list_convertible_docx(folder_path: str, limit: int = DOCX_PRECONVERT_MAX_FILES) -> list[str]:
+    """DOCX files of a folder that can be converted, by name (Word lock files "~$" excluded)."""
+    paths = []
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.name.startswith("~$") or normalize_extension(entry.name) != ".docx":
+                    continue
+                try:
+                    if entry.is_file():
+                        paths.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        return []
+    paths.sort(key=lambda path: os.path.basename(path).lower())
+    return paths[:limit]
+
+
+class DocxPreconverter:
+    """Converts the DOCX files of the active folder while the app is idle."""
+
+    def __init__(self, converter: Optional[DocxConverter] = None, idle_seconds: float = DOCX_PRECONVERT_IDLE_SECONDS):
+        """
+        Initialize pre-converter (the worker starts with the first folder).
+
+        Args:
+            converter: DocxConverter to use (a new one by default).
+            idle_seconds: Inactivity required before each conversion.
+        """
+        self._converter = converter
+        self._idle_seconds = idle_seconds
+        self._cond = threading.Condition()
+        self._queue: deque[str] = deque()
+        self._last_activity = 0.0
+        self._failed: set[tuple[str, int, float]] = set()
+        self._busy = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def set_folder(self, folder_path: Optional[str]) -> None:
+        """Replace the queue with the DOCX files of a folder (None: stop converting)."""
+        paths = list_convertible_docx(folder_path) if folder_path else []
+        with self._cond:
+            self._queue = deque(paths)
+            self._last_activity = time.monotonic()
+            if paths:
+                self._wake()
+            self._cond.notify_all()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queue is empty and no conversion is running."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker (a conversion in progress finishes first)."""
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _wake(self) -> None:
+        """Start the worker if needed (caller holds the lock)."""
+        if self._stopped:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="DocxPreconverter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: wait for idle, convert the next queued file."""
+        if not is_docx2pdf_available():
+            logger.info("DocxPreconverter: docx2pdf not available, pre-conversion disabled")
+            with self._cond:
+                self._queue.clear()
+                self._cond.notify_all()
+            return
+        if self._converter is None:
+            self._converter = DocxConverter()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopped)
+                if self._stopped:
+                    return
+                if not self._wait_until_idle():
+                    continue
+                path = self._queue.popleft()
+                self._busy = True
+            try:
+                self._convert(path)
+            except Exception as e:
+                logger.warning(f"DocxPreconverter: cannot convert {path}: {e}", exc_info=True)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _wait_until_idle(self) -> bool:
+        """
+        Wait for the idle delay and no running conversion (caller holds the lock).
+
+        Returns:
+            False if the queue changed or the worker stopped meanwhile.
+        """
+        queue = self._queue
+        while True:
+            if self._stopped or self._queue is not queue or not queue:
+                return False
+            remaining = self._last_activity + self._idle_seconds - time.monotonic()
+            if remaining <= 0 and not is_conversion_in_progress():
+                return True
+            self._cond.wait(max(remaining, self._idle_seconds / 4, 0.05))
+
+    def _convert(self, path: str) -> None:
+        """Convert one file unless it is converted already or failed before."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        version = (path, st.st_size, st.st_mtime)
+        if version in self._failed or self._converter.has_cached_pdf(path):
+            return
+        is_valid, error_msg = validate_file_for_preview(path)
+        if not is_valid:
+            logger.debug(f"DocxPreconverter: skipping {path}: {error_msg}")
+            return
+        logger.debug(f"DocxPreconverter: converting {path}")
+        if not self._converter.convert_to_pdf(path):
+            # No reintentar esta versión en la sesión (archivo protegido, Word sin licencia...)
+            self._failed.add(version)
+
+
+_shared_preconverter: Optional[DocxPreconverter] = None
+_shared_preconverter_lock = threading.Lock()
+
+
+def get_docx_preconverter() -> DocxPreconverter:
+    """Get the process-wide DOCX pre-converter."""
+    global _shared_preconverter
+    with _shared_preconverter_lock:
+        if _shared_preconverter is None:
+            _shared_preconverter = DocxPreconverter()
+        return _shared_preconverter
+
+
+def is_docx_preconversion_enabled() -> bool:
+    """Check whether the user opted in to DOCX pre-conversion."""
+    return bool(SettingsService().get_setting(PRECONVERT_DOCX_SETTING, False))
+
+
+def set_docx_preconversion_enabled(enabled: bool, active_folder: Optional[str]) -> None:
+    """Persist the opt-in and start (or stop) converting the active folder."""
+    SettingsService().set_setting(PRECONVERT_DOCX_SETTING, enabled)
+    get_docx_preconverter().set_folder(active_folder if enabled else None)
+
+
+def shutdown_docx_preconverter(timeout: Optional[float] = 5.0) -> None:
+    """Stop the process-wide pre-converter (app exit hook; safe if never used)."""
+    with _shared_preconverter_lock:
+        preconverter = _shared_preconverter
+    if preconverter is not None:
+        preconverter.shutdown(timeout)
@@ -7,6 +7,8 @@ Handles filtering files by extensions and detecting executables.
 import os
 from typing import List, Set
 
+from app.models.file_entry import FileEntry
+
 
 def is_executable(file_path: str) -> bool:
     """
@@ -67,42 +69,44 @@ def filter_files_by_extensions(files: List[str], extensions: Set[str]) -> List[s
     return filtered
 
 
-def filter_folder_files_by_extensions(
+def filter_folder_entries_by_extensions(
     folder_path: str,
     extensions: Set[str]
-) -> List[str]:
+) -> List[FileEntry]:
     """
-    Scan and filter files from a normal folder.
+    Scan and filter entries from a normal folder in a single directory read.
     
     Args:
         folder_path: Path to folder to scan.
         extensions: Set of file extensions to filter.
         
     Returns:
-        Filtered list of file paths.
+        Filtered list of FileEntry records.
     """
-    from app.services.file_scan_service import scan_folder_files
+    from app.services.file_scan_service import scan_folder_entries
     
     if not folder_path:
         return []
     
-    raw_files = scan_folder_files(folder_path)
-    return _filter_raw_folder_files(raw_files, extensions)
+    return filter_entries_by_extensions(scan_folder_entries(folder_path), extensions)
 
 
-def _filter_raw_folder_files(raw_files: List[str], extensions: Set[str]) -> List[str]:
-    """Filter raw folder files by extensions."""
+def filter_entries_by_extensions(
+    entries: List[FileEntry],
+    extensions: Set[str]
+) -> List[FileEntry]:
+    """
+    Filter scanned entries by extensions (includes folders and executables).
+    
+    Uses the type and extension already stored in each entry; only files
+    without extension are opened to check for a PE header.
+    """
     filtered = []
-    try:
-        for item_path in raw_files:
-            if os.path.isdir(item_path):
-                filtered.append(item_path)
-            elif os.path.isfile(item_path):
-                ext = os.path.splitext(os.path.basename(item_path))[1].lower()
-                is_exe = is_executable(item_path) if not ext else False
-                if ext in extensions or (not ext and is_exe):
-                    filtered.append(item_path)
-    except (OSError, PermissionError):
-        return []
+    for entry in entries:
+        if entry.is_dir:
+            filtered.append(entry)
+        elif entry.ext in extensions:
+            filtered.append(entry)
+        elif not entry.ext and is_executable(entry.path):
+            filtered.append(entry)
     return filtered
-
@@ -0,0 +1,147 @@
+"""
+FileIdentityCache - Process-wide cache of file identities (path -> file_id).
+
+Fed from the os.scandir stat results produced by folder listings, so state
+lookups need no extra stat calls. Entries are trusted until invalidated by
+FileSystemWatcherService events or replaced by the next listing of the folder.
+"""
+
+import os
+import threading
+from stat import S_ISDIR
+from typing import Iterable, Optional
+
+from app.models.path_utils import normalize_path
+from app.services.file_state_storage_helpers import compute_file_id
+
+# folder_key (normalized folder) -> {path: [size, mtime, is_dir, file_id | None]}
+_folders: dict[str, dict[str, list]] = {}
+_lock = threading.Lock()
+
+
+def _folder_key(path: str) -> str:
+    """Get bucket key (normalized parent folder) for a path."""
+    return normalize_path(os.path.dirname(path))
+
+
+def record_folder_entries(
+    folder_path: str,
+    entries: Iterable[tuple[str, int, float, bool]]
+) -> None:
+    """
+    Replace cached identities of a folder with fresh listing data.
+
+    Args:
+        folder_path: Listed folder.
+        entries: Iterable of (path, size, mtime, is_dir) from os.scandir.
+    """
+    bucket = {
+        path: [size, mtime, is_dir, None]
+        for path, size, mtime, is_dir in entries
+    }
+    with _lock:
+        _folders[normalize_path(folder_path)] = bucket
+
+
+def record_entry(path: str, size: int, mtime: float, is_dir: bool) -> None:
+    """Cache identity data for a single path."""
+    with _lock:
+        _folders.setdefault(_folder_key(path), {})[path] = [size, mtime, is_dir, None]
+
+
+def get_cached_file_id(path: str) -> Optional[str]:
+    """
+    Get file_id from cached listing data without touching the filesystem.
+
+    Returns:
+        file_id, or None if the path is not cached.
+    """
+    with _lock:
+        bucket = _folders.get(_folder_key(path))
+        entry = bucket.get(path) if bucket else None
+        if entry is None:
+            return None
+        if entry[3] is None:
+            size, mtime, is_dir, _ = entry
+            entry[3] = compute_file_id(path, size, int(mtime), is_dir=is_dir)
+        return entry[3]
+
+
+def get_file_id(path: str) -> Optional[str]:
+    """
+    Get file_id for a path, using the cache and falling back to a single stat.
+
+    Returns:
+        file_id, or None if the path does not exist.
+    """
+    if not path:
+        return None
+
+    file_id = get_cached_file_id(path)
+    if file_id is not None:
+        return file_id
+
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+    record_entry(path, st.st_size, st.st_mtime, S_ISDIR(st.st_mode))
+    return get_cached_file_id(path)
+
+
+def get_file_info(path: str) -> Optional[tuple[int, float, bool]]:
+    """
+    Get (size, mtime, is_dir) for a path, using the cache and falling back to a single stat.
+
+    Returns:
+        (size, mtime, is_dir), or None if the path does not exist.
+    """
+    if not path:
+        return None
+
+    with _lock:
+        bucket = _folders.get(_folder_key(path))
+        entry = bucket.get(path) if bucket else None
+        if entry is not None:
+            return entry[0], entry[1], entry[2]
+
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+    is_dir = S_ISDIR(st.st_mode)
+    record_entry(path, st.st_size, st.st_mtime, is_dir)
+    return st.st_size, st.st_mtime, is_dir
+
+
+def get_file_signature(path: str) -> Optional[tuple[int, float]]:
+    """
+    Get (size, mtime) for a path, using the cache and falling back to a single stat.
+    
+    Returns:
+        (size, mtime), or None if the path does not exist.
+    """
+    info = get_file_info(path)
+    return (info[0], info[1]) if info else None
+
+
+def invalidate_folder(folder_path: str) -> None:
+    """Drop cached identities for every entry of a folder."""
+    with _lock:
+        _folders.pop(normalize_path(folder_path), None)
+
+
+def invalidate_path(path: str) -> None:
+    """Drop cached identity for a single path."""
+    with _lock:
+        bucket = _folders.get(_folder_key(path))
+        if bucket:
+            bucket.pop(path, None)
+
+
+def clear_identity_cache() -> None:
+    """Drop every cached identity."""
+    with _lock:
+        _folders.clear()
@@ -13,16 +13,21 @@ This module orchestrates file listing by delegating to:
 
 import os
 import re
-from typing import List, Set, Union
+from typing import List, Optional, Set, Union
 
 from app.models.file_stack import FileStack
 from app.services.file_filter_service import (
     filter_files_by_extensions,
-    filter_folder_files_by_extensions,
+    filter_folder_entries_by_extensions,
     is_executable
 )
 from app.services.file_scan_service import scan_files
 from app.services.file_stack_service import create_file_stacks
+from app.services.folder_listing_cache import (
+    get_listing,
+    get_listing_signature,
+    store_listing
+)
 
 
 def _natural_sort_key(path: str) -> tuple:
@@ -74,6 +79,7 @@ def get_files(
     from app.services.desktop_path_helper import is_desktop_focus
     from app.services.trash_storage import TRASH_FOCUS_PATH
     
+    dir_paths = None
     if is_desktop_focus(folder_path):
         raw_files = scan_files(folder_path)
         filtered_files = filter_files_by_extensions(raw_files, extensions)
@@ -81,12 +87,34 @@ def get_files(
         raw_files = scan_files(folder_path)
         filtered_files = filter_files_by_extensions(raw_files, extensions)
     else:
-        # Normal folder: scan and filter in one pass
-        filtered_files = filter_folder_files_by_extensions(folder_path, extensions)
+        # Watched folder: reuse the listing until the watcher or its mtime says it changed
+        listing_key = (frozenset(extensions), use_stacks)
+        signature = get_listing_signature(folder_path)
+        if signature is not None:
+            cached = get_listing(folder_path, listing_key, signature)
+            if cached is not None:
+                return cached
+        # Normal folder: one scandir pass, type/extension reused from the entries
+        entries = filter_folder_entries_by_extensions(folder_path, extensions)
+        filtered_files = [entry.path for entry in entries]
+        dir_paths = {entry.path for entry in entries if entry.is_dir}
+        result = _build_listing(filtered_files, use_stacks, dir_paths)
+        if signature is not None:
+            store_listing(folder_path, listing_key, result, signature)
+        return result
     
+    return _build_listing(filtered_files, use_stacks, dir_paths)
+
+
+def _build_listing(
+    filtered_files: List[str],
+    use_stacks: bool,
+    dir_paths: Optional[Set[str]] = None
+) -> Union[List[str], List[FileStack]]:
+    """Sort files naturally, or group them into stacks."""
     # If not using stacks, return sorted flat list with natural sorting
     if not use_stacks:
         return sorted(filtered_files, key=_natural_sort_key)
     
     # Group files into stacks
-    return create_file_stacks(filtered_files, is_executable)
+    return create_file_stacks(filtered_files, is_executable, dir_paths)
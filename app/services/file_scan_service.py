@@ -5,36 +5,114 @@ Handles reading files from filesystem, Desktop Focus, and Trash Focus.
 """
 
 import os
+from stat import S_ISDIR, S_ISREG
+from typing import Optional
 
+from app.models.file_entry import FileEntry
 from app.services.desktop_path_helper import is_desktop_focus
 from app.services.desktop_operations import load_desktop_files
+from app.services.file_identity_cache import record_folder_entries
 from app.services.file_path_utils import validate_folder
 from app.services.trash_storage import TRASH_FOCUS_PATH, list_trash_files
 
 
-def scan_folder_files(folder_path: str) -> list[str]:
+def read_folder_entries(folder_path: str) -> list[FileEntry]:
     """
-    Scan files from a normal folder (not Desktop or Trash).
+    Read folder entries in a single os.scandir pass.
+    
+    Type, size and mtime come from the DirEntry cache (no extra stat on
+    Windows). Entries that are neither files nor folders are skipped.
     
     Args:
-        folder_path: Path to folder to scan.
+        folder_path: Path to folder to read.
         
     Returns:
-        List of file and folder paths.
+        List of FileEntry records (empty if the folder cannot be read).
     """
-    if not validate_folder(folder_path):
+    entries = []
+    try:
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                    if not (is_dir or entry.is_file()):
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                ext = '' if is_dir else os.path.splitext(entry.name)[1].lower()
+                entries.append(FileEntry(
+                    path=entry.path,
+                    name=entry.name,
+                    is_dir=is_dir,
+                    size=stat.st_size,
+                    mtime=stat.st_mtime,
+                    ext=ext,
+                ))
+    except (OSError, PermissionError, ValueError):
         return []
+    return entries
+
+
+def read_entry(path: str) -> Optional[FileEntry]:
+    """
+    Read a single entry with one stat (same rules as read_folder_entries).
     
-    files = []
+    Returns:
+        FileEntry, or None if the entry is missing or not a file/folder.
+    """
     try:
-        for item in os.listdir(folder_path):
-            item_path = os.path.join(folder_path, item)
-            if os.path.isdir(item_path) or os.path.isfile(item_path):
-                files.append(item_path)
-    except (OSError, PermissionError):
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    is_dir = S_ISDIR(stat.st_mode)
+    if not (is_dir or S_ISREG(stat.st_mode)):
+        return None
+    name = os.path.basename(path)
+    return FileEntry(
+        path=path,
+        name=name,
+        is_dir=is_dir,
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        ext='' if is_dir else os.path.splitext(name)[1].lower(),
+    )
+
+
+def scan_folder_entries(folder_path: str) -> list[FileEntry]:
+    """
+    Scan entries from a normal folder (not Desktop or Trash).
+    
+    Also feeds the identity cache, so state lookups need no stat.
+    
+    Args:
+        folder_path: Path to folder to scan.
+        
+    Returns:
+        List of FileEntry records.
+    """
+    if not validate_folder(folder_path):
         return []
     
-    return files
+    entries = read_folder_entries(folder_path)
+    record_folder_entries(
+        folder_path,
+        ((e.path, e.size, e.mtime, e.is_dir) for e in entries)
+    )
+    return entries
+
+
+def scan_folder_files(folder_path: str) -> list[str]:
+    """
+    Scan files from a normal folder (not Desktop or Trash).
+    
+    Args:
+        folder_path: Path to folder to scan.
+        
+    Returns:
+        List of file and folder paths.
+    """
+    return [entry.path for entry in scan_folder_entries(folder_path)]
 
 
 def scan_desktop_files() -> list[str]:
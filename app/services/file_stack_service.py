@@ -7,7 +7,7 @@ Handles grouping files into stacks by family/type.
 import os
 import re
 from collections import defaultdict
-from typing import List
+from typing import List, Optional, Set
 
 from app.models.file_stack import FileStack
 
@@ -85,18 +85,25 @@ FAMILY_ORDER = [
 ]
 
 
-def get_file_family(file_path: str, is_executable_func) -> str:
+def get_file_family(
+    file_path: str,
+    is_executable_func,
+    is_dir: Optional[bool] = None
+) -> str:
     """
     Get the family name for a file based on its extension.
     
     Args:
         file_path: Path to the file.
         is_executable_func: Function to check if file is executable.
+        is_dir: Known entry type from a scan (avoids an isdir call).
         
     Returns:
         Family name (e.g., 'pdf', 'documents', 'images', etc.).
     """
-    if os.path.isdir(file_path):
+    if is_dir is None:
+        is_dir = os.path.isdir(file_path)
+    if is_dir:
         return 'folder'
     
     ext = os.path.splitext(file_path)[1].lower()
@@ -149,7 +156,11 @@ def _natural_sort_key(path: str) -> tuple:
     return tuple(parts)
 
 
-def create_file_stacks(files: List[str], is_executable_func) -> List[FileStack]:
+def create_file_stacks(
+    files: List[str],
+    is_executable_func,
+    dir_paths: Optional[Set[str]] = None
+) -> List[FileStack]:
     """
     Group files into stacks by FAMILY (not individual extension).
     
@@ -159,6 +170,7 @@ def create_file_stacks(files: List[str], is_executable_func) -> List[FileStack]:
     Args:
         files: List of file paths.
         is_executable_func: Function to check if file is executable.
+        dir_paths: Folders among `files`, when known from a scan (no isdir per file).
         
     Returns:
         List of FileStack objects, ordered by FAMILY_ORDER, only including non-empty stacks.
@@ -167,7 +179,8 @@ def create_file_stacks(files: List[str], is_executable_func) -> List[FileStack]:
     stacks_dict = defaultdict(list)
     
     for file_path in files:
-        family = get_file_family(file_path, is_executable_func)
+        is_dir = (file_path in dir_paths) if dir_paths is not None else None
+        family = get_file_family(file_path, is_executable_func, is_dir)
         stacks_dict[family].append(file_path)
     
     # Create FileStack objects in fixed order, only for non-empty families
@@ -6,7 +6,7 @@ No UI logic, pure storage layer.
 
 This module re-exports all public APIs for backward compatibility.
 Actual implementations are in separate modules:
-- file_state_storage_helpers.py: Database path, connection, file ID computation
+- file_state_storage_helpers.py: Database path, pooled connections, file ID computation
 - file_state_storage_init.py: Database initialization and schema
 - file_state_storage_crud.py: Single file CRUD operations
 - file_state_storage_batch.py: Batch operations
@@ -15,6 +15,7 @@ Actual implementations are in separate modules:
 
 # Re-export public APIs for backward compatibility
 from app.services.file_state_storage_batch import (
+    get_states_batch,
     remove_missing_files,
     remove_states_batch,
     set_states_batch
@@ -26,11 +27,14 @@ from app.services.file_state_storage_crud import (
     remove_state,
     set_state
 )
+from app.services.file_state_storage_helpers import close_all_connections
 from app.services.file_state_storage_init import initialize_database
+from app.services.file_state_storage_query import get_folder_states
 from app.services.file_state_storage_rename import update_path_for_rename
 
 __all__ = [
     'initialize_database',
+    'close_all_connections',
     'load_all_states',
     'set_state',
     'set_states_batch',
@@ -39,5 +43,7 @@ __all__ = [
     'remove_missing_files',
     'get_file_id_from_path',
     'get_state_by_path',
+    'get_states_batch',
+    'get_folder_states',
     'update_path_for_rename',
 ]
@@ -7,23 +7,34 @@ Handles multiple file state operations in transactions.
 import os
 import sqlite3
 import time
+from typing import Optional
 
-from app.services.file_state_storage_helpers import get_connection
+from app.services.file_state_storage_helpers import (
+    compute_path_key,
+    get_connection,
+    rollback_quietly
+)
 
 
-def set_states_batch(file_states: list[tuple]) -> int:
+def set_states_batch(file_states: list[tuple], raise_on_error: bool = False) -> int:
     """
     Set multiple file states in a single atomic transaction.
     
     Args:
         file_states: List of tuples (file_id, path, size, modified, state).
+        raise_on_error: Roll back and re-raise on any error instead of
+            skipping failed entries (callers that must retry the batch).
     
     Returns:
         Number of states successfully written.
+    
+    Raises:
+        sqlite3.Error: Only if raise_on_error is True.
     """
     if not file_states:
         return 0
     
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -35,8 +46,10 @@ def set_states_batch(file_states: list[tuple]) -> int:
         count = 0
         for file_id, path, size, modified, state in file_states:
             try:
+                path_key = compute_path_key(path)
+                
                 # Check if old entry exists with same path but different file_id
-                cursor.execute("SELECT file_id FROM file_states WHERE path = ?", (path,))
+                cursor.execute("SELECT file_id FROM file_states WHERE path_key = ?", (path_key,))
                 old_row = cursor.fetchone()
                 
                 if old_row and old_row[0] != file_id:
@@ -45,43 +58,109 @@ def set_states_batch(file_states: list[tuple]) -> int:
                 
                 cursor.execute("""
                     INSERT OR REPLACE INTO file_states 
-                    (file_id, path, size, modified, state, last_update)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (file_id, path, size, modified, state, last_update))
+                    (file_id, path, size, modified, state, last_update, path_key)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (file_id, path, size, modified, state, last_update, path_key))
                 count += 1
             except sqlite3.Error:
+                if raise_on_error:
+                    raise
                 # Skip this entry but continue with others
                 continue
         
         # Commit transaction
         conn.commit()
-        conn.close()
         
         return count
         
     except sqlite3.Error:
         # Rollback on error
-        try:
-            conn.rollback()
-            conn.close()
-        except:
-            pass
+        if conn is not None:
+            rollback_quietly(conn)
+        if raise_on_error:
+            raise
         return 0
 
 
-def remove_states_batch(file_ids: list[str]) -> int:
+# Pares (file_id, path_key) por consulta: 2 variables por par, bajo el límite de 999 de SQLite
+STATE_LOOKUP_CHUNK_SIZE = 400
+# file_ids por DELETE ... IN: una variable por id, bajo el límite de 999 de SQLite
+STATE_REMOVE_CHUNK_SIZE = 900
+
+
+def get_states_batch(entries: list[tuple[str, str]]) -> dict[str, Optional[str]]:
+    """
+    Get states for many files with one chunked IN query.
+    
+    Matches by file_id first and falls back to path_key (file_id changed
+    because the file was modified), like get_state_by_path but read-only.
+    
+    Args:
+        entries: List of tuples (path, file_id).
+    
+    Returns:
+        Dictionary mapping each path to its state (None if not found).
+    """
+    states: dict[str, Optional[str]] = {path: None for path, _ in entries}
+    if not entries:
+        return states
+    
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        
+        for start in range(0, len(entries), STATE_LOOKUP_CHUNK_SIZE):
+            chunk = entries[start:start + STATE_LOOKUP_CHUNK_SIZE]
+            file_ids = [file_id for _, file_id in chunk]
+            path_keys = [compute_path_key(path) for path, _ in chunk]
+            placeholders = ','.join('?' * len(chunk))
+            
+            cursor.execute(f"""
+                SELECT file_id, path_key, state, last_update FROM file_states
+                WHERE file_id IN ({placeholders}) OR path_key IN ({placeholders})
+            """, (*file_ids, *path_keys))
+            
+            by_id = {}
+            by_key = {}
+            for row_id, row_key, state, last_update in cursor.fetchall():
+                by_id[row_id] = state
+                # Quedarse con la entrada más reciente por path_key
+                current = by_key.get(row_key)
+                if current is None or (last_update or 0) > current[1]:
+                    by_key[row_key] = (state, last_update or 0)
+            
+            for (path, file_id), path_key in zip(chunk, path_keys):
+                if file_id in by_id:
+                    states[path] = by_id[file_id]
+                elif path_key in by_key:
+                    states[path] = by_key[path_key][0]
+        
+        return states
+        
+    except sqlite3.Error:
+        return states
+
+
+def remove_states_batch(file_ids: list[str], raise_on_error: bool = False) -> int:
     """
     Remove multiple file states in a single atomic transaction.
     
+    The IN list is chunked so large batches stay under SQLite's variable limit.
+    
     Args:
         file_ids: List of file_id strings to remove.
+        raise_on_error: Roll back and re-raise on error instead of returning 0.
     
     Returns:
         Number of states successfully removed.
+    
+    Raises:
+        sqlite3.Error: Only if raise_on_error is True.
     """
     if not file_ids:
         return 0
     
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -89,25 +168,25 @@ def remove_states_batch(file_ids: list[str]) -> int:
         # Start transaction
         cursor.execute("BEGIN TRANSACTION")
         
-        placeholders = ','.join('?' * len(file_ids))
-        cursor.execute(f"DELETE FROM file_states WHERE file_id IN ({placeholders})", 
-                      tuple(file_ids))
-        
-        removed_count = cursor.rowcount
+        removed_count = 0
+        for start in range(0, len(file_ids), STATE_REMOVE_CHUNK_SIZE):
+            chunk = file_ids[start:start + STATE_REMOVE_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"DELETE FROM file_states WHERE file_id IN ({placeholders})", 
+                          tuple(chunk))
+            removed_count += cursor.rowcount
         
         # Commit transaction
         conn.commit()
-        conn.close()
         
         return removed_count
         
     except sqlite3.Error:
         # Rollback on error
-        try:
-            conn.rollback()
-            conn.close()
-        except:
-            pass
+        if conn is not None:
+            rollback_quietly(conn)
+        if raise_on_error:
+            raise
         return 0
 
 
@@ -124,6 +203,7 @@ def remove_missing_files(existing_paths: set[str]) -> int:
     Returns:
         Number of entries removed.
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -133,7 +213,6 @@ def remove_missing_files(existing_paths: set[str]) -> int:
         db_paths = [row[0] for row in cursor.fetchall()]
         
         if not db_paths:
-            conn.close()
             return 0
         
         # Verify each path actually exists on disk
@@ -143,7 +222,6 @@ def remove_missing_files(existing_paths: set[str]) -> int:
                 missing_paths.append(path)
         
         if not missing_paths:
-            conn.close()
             return 0
         
         # Remove entries for files that don't exist on disk
@@ -154,10 +232,11 @@ def remove_missing_files(existing_paths: set[str]) -> int:
         removed_count = cursor.rowcount
         
         conn.commit()
-        conn.close()
         
         return removed_count
         
     except sqlite3.Error:
+        if conn is not None:
+            rollback_quietly(conn)
         return 0
 
@@ -7,9 +7,15 @@ Handles single file state operations: set, get, remove.
 import os
 import sqlite3
 import time
+from stat import S_ISDIR
 from typing import Optional
 
-from app.services.file_state_storage_helpers import compute_file_id, get_connection
+from app.services.file_state_storage_helpers import (
+    compute_file_id,
+    compute_path_key,
+    get_connection,
+    rollback_quietly
+)
 from app.models.path_utils import normalize_path
 
 
@@ -24,17 +30,20 @@ def set_state(file_id: str, path: str, size: int, modified: int, state: str) ->
         modified: File modification timestamp.
         state: State constant.
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
         last_update = int(time.time())
         normalized_path = normalize_path(path)
         
+        path_key = compute_path_key(normalized_path)
+        
         # Comprobar si existe una entrada antigua con el mismo path (ignorando mayúsculas/minúsculas)
-        # Caso de cambio de file_id por metadatos o normalización
+        # Caso de cambio de file_id por metadatos o normalización (usa idx_path_key)
         cursor.execute(
-            "SELECT file_id, state FROM file_states WHERE lower(path) = lower(?)",
-            (normalized_path,)
+            "SELECT file_id, state FROM file_states WHERE path_key = ?",
+            (path_key,)
         )
         old_row = cursor.fetchone()
         
@@ -45,30 +54,32 @@ def set_state(file_id: str, path: str, size: int, modified: int, state: str) ->
         
         cursor.execute("""
             INSERT OR REPLACE INTO file_states 
-            (file_id, path, size, modified, state, last_update)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (file_id, normalized_path, size, modified, state, last_update))
+            (file_id, path, size, modified, state, last_update, path_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (file_id, normalized_path, size, modified, state, last_update, path_key))
         
         conn.commit()
-        conn.close()
         
     except sqlite3.Error:
         # Silently fail - state will be lost but app continues
-        pass
+        if conn is not None:
+            rollback_quietly(conn)
 
 
-def get_state_by_path(path: str) -> Optional[str]:
+def get_state_by_path(path: str, file_id: Optional[str] = None) -> Optional[str]:
     """
     Get state for a file by path (computes file_id and looks up).
     
     Args:
         path: Full file path.
+        file_id: Already known file_id (skips reading file metadata).
     
     Returns:
         State constant or None if not found.
     """
     normalized_path = normalize_path(path)
-    file_id = get_file_id_from_path(normalized_path)
+    if file_id is None:
+        file_id = get_file_id_from_path(normalized_path)
     if not file_id:
         return None
     
@@ -81,21 +92,18 @@ def get_state_by_path(path: str) -> Optional[str]:
         row = cursor.fetchone()
         
         if row:
-            conn.close()
             return row[0]
         
         # Fallback robusto: buscar por path (ignorando mayúsculas/minúsculas) si el file_id cambió
         cursor.execute(
-            "SELECT state, file_id FROM file_states WHERE lower(path) = lower(?) ORDER BY last_update DESC LIMIT 1",
-            (normalized_path,)
+            "SELECT state, file_id FROM file_states WHERE path_key = ? ORDER BY last_update DESC LIMIT 1",
+            (compute_path_key(normalized_path),)
         )
         fallback = cursor.fetchone()
         if not fallback:
-            conn.close()
             return None
         
         state, old_file_id = fallback[0], fallback[1]
-        conn.close()
         
         # Migración silenciosa del registro: reinsertar con el nuevo file_id
         # Comentario: esto elimina el registro antiguo para ese path y asegura consistencia futura
@@ -120,6 +128,7 @@ def remove_state(file_id: str) -> None:
     Args:
         file_id: Unique file identifier.
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -127,10 +136,10 @@ def remove_state(file_id: str) -> None:
         cursor.execute("DELETE FROM file_states WHERE file_id = ?", (file_id,))
         
         conn.commit()
-        conn.close()
         
     except sqlite3.Error:
-        pass
+        if conn is not None:
+            rollback_quietly(conn)
 
 
 def load_all_states() -> dict[str, str]:
@@ -147,8 +156,6 @@ def load_all_states() -> dict[str, str]:
         cursor.execute("SELECT file_id, state FROM file_states")
         rows = cursor.fetchall()
         
-        conn.close()
-        
         return {file_id: state for file_id, state in rows}
         
     except sqlite3.Error:
@@ -166,14 +173,12 @@ def get_file_id_from_path(path: str) -> Optional[str]:
         file_id if file exists, None otherwise.
     """
     try:
-        if not os.path.exists(path):
-            return None
-        
+        # Un único stat: OSError cubre el caso de archivo inexistente
         stat = os.stat(path)
         size = stat.st_size
         modified = int(stat.st_mtime)
         
-        return compute_file_id(path, size, modified)
+        return compute_file_id(path, size, modified, is_dir=S_ISDIR(stat.st_mode))
         
     except (OSError, ValueError):
         return None
@@ -2,11 +2,19 @@
 FileStateStorageHelpers - Helper functions for file state storage.
 
 Database path, connection, and file ID computation utilities.
+
+Connections are long-lived: each thread keeps one connection per database
+file (WAL journal, synchronous=NORMAL, prepared-statement cache) instead of
+opening and closing SQLite on every call. A thread's connections are closed
+when the thread exits; close_all_connections() is the shutdown hook.
 """
 
 import hashlib
 import sqlite3
+import threading
+import weakref
 from pathlib import Path
+from typing import Optional
 import os
 
 from app.services.storage_path_service import get_storage_file
@@ -15,22 +23,57 @@ from app.models.path_utils import normalize_path
 # Database file location
 DB_PATH = get_storage_file("claritydesk.db")
 
+# Tamaño de la cache de sentencias preparadas por conexión
+STATEMENT_CACHE_SIZE = 256
+
+# Conexiones por hilo: thread-local -> _ThreadConnections {db_path: connection}
+_thread_local = threading.local()
+# Registro global para el cierre ordenado: (owner_dict, db_path, connection)
+_registry: list[tuple[dict, str, sqlite3.Connection]] = []
+_registry_lock = threading.Lock()
+
+
+class _ThreadConnections:
+    """Per-thread holder; its finalizer closes the thread's connections on exit."""
+    
+    def __init__(self) -> None:
+        self.connections: dict[str, sqlite3.Connection] = {}
+        weakref.finalize(self, _release_connections, self.connections)
+
+
+def _release_connections(connections: dict) -> None:
+    """Close and unregister the connections of a thread that has exited."""
+    with _registry_lock:
+        _registry[:] = [entry for entry in _registry if entry[0] is not connections]
+        entries = list(connections.values())
+        connections.clear()
+    
+    for conn in entries:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
 
 def get_db_path() -> Path:
     """Get database file path."""
     return DB_PATH
 
 
-def compute_file_id(path: str, size: int, modified: int) -> str:
+def compute_file_id(path: str, size: int, modified: int, is_dir: Optional[bool] = None) -> str:
     """
     Calcular identificador único de archivo/carpeta.
     
     Regla clave:
     - Para carpetas: usar SOLO el path normalizado para evitar cambios de ID por mtime/size.
     - Para archivos: usar path + size + modified para detectar cambios reales de contenido.
+    
+    is_dir evita la llamada a os.path.isdir cuando ya se conoce (p. ej. desde os.scandir).
     """
     normalized_path = normalize_path(path)
-    if os.path.isdir(normalized_path):
+    if is_dir is None:
+        is_dir = os.path.isdir(normalized_path)
+    if is_dir:
         # Comentario: las carpetas cambian mtime con operaciones internas; no debe invalidar el estado
         content = normalized_path.encode('utf-8')
     else:
@@ -38,9 +81,69 @@ def compute_file_id(path: str, size: int, modified: int) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
+def compute_path_key(path: str) -> str:
+    """
+    Calcular la clave de búsqueda de un path (normalizado y en minúsculas).
+    
+    Se guarda en la columna indexada path_key para búsquedas sin distinguir
+    mayúsculas/minúsculas que usan índice en lugar de lower(path).
+    """
+    return normalize_path(path).lower()
+
+
+def open_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Open and configure a new SQLite connection (WAL, synchronous=NORMAL).
+    
+    Args:
+        db_path: Database file path.
+    
+    Returns:
+        Configured SQLite connection.
+    
+    Raises:
+        sqlite3.Error: If database cannot be opened or created.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        # WAL puede no estar disponible (p. ej. unidades de red): seguir en modo por defecto
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+    except sqlite3.Error:
+        pass
+    return conn
+
+
 def get_connection() -> sqlite3.Connection:
     """
-    Get database connection with error handling.
+    Get the calling thread's long-lived connection for the current database.
+    
+    The connection is owned by the pool: callers must commit or rollback
+    but never close it.
+    
+    Returns:
+        SQLite connection.
+    
+    Raises:
+        sqlite3.Error: If database cannot be opened or created.
+    """
+    return get_pooled_connection(str(get_db_path()))
+
+
+def get_pooled_connection(db_path: str) -> sqlite3.Connection:
+    """
+    Get the calling thread's long-lived connection for any database file.
+    
+    Same pool (and shutdown hook) as get_connection(); used by other
+    databases in the storage directory.
+    
+    Args:
+        db_path: Database file path.
     
     Returns:
         SQLite connection.
@@ -48,8 +151,68 @@ def get_connection() -> sqlite3.Connection:
     Raises:
         sqlite3.Error: If database cannot be opened or created.
     """
-    db_path = get_db_path()
-    conn = sqlite3.connect(str(db_path))
-    conn.execute("PRAGMA foreign_keys = ON")
+    holder = getattr(_thread_local, 'holder', None)
+    if holder is None:
+        holder = _ThreadConnections()
+        _thread_local.holder = holder
+    connections = holder.connections
+    
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = open_connection(db_path)
+        connections[db_path] = conn
+        with _registry_lock:
+            _registry.append((connections, db_path, conn))
     return conn
 
+
+def rollback_quietly(conn: sqlite3.Connection) -> None:
+    """Rollback pending transaction on a pooled connection, ignoring errors."""
+    try:
+        conn.rollback()
+    except sqlite3.Error:
+        pass
+
+
+def close_thread_connection(db_path: Optional[str] = None) -> None:
+    """
+    Close the calling thread's pooled connection to a database, if any.
+    
+    Connections of other threads are left open; the next call in this
+    thread transparently reopens one.
+    
+    Args:
+        db_path: Database file path (default: the current database).
+    """
+    if db_path is None:
+        db_path = str(get_db_path())
+    holder = getattr(_thread_local, 'holder', None)
+    conn = holder.connections.pop(db_path, None) if holder is not None else None
+    if conn is None:
+        return
+    with _registry_lock:
+        _registry[:] = [entry for entry in _registry if entry[2] is not conn]
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_all_connections() -> None:
+    """
+    Close every pooled connection in every thread (shutdown hook).
+    
+    Threads that use the storage afterwards transparently reopen a connection.
+    """
+    with _registry_lock:
+        entries = list(_registry)
+        _registry.clear()
+    
+    for connections, db_path, conn in entries:
+        if connections.get(db_path) is conn:
+            connections.pop(db_path, None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
@@ -1,12 +1,22 @@
 """
 FileStateStorageInit - Database initialization for file state storage.
 
-Handles database schema creation and initialization.
+Handles database schema creation, in-place migrations and initialization.
 """
 
 import sqlite3
+from pathlib import Path
 
-from app.services.file_state_storage_helpers import get_connection, get_db_path
+from app.services.file_state_storage_helpers import (
+    close_all_connections,
+    close_thread_connection,
+    compute_path_key,
+    get_connection,
+    get_db_path
+)
+
+# Versión actual del esquema (PRAGMA user_version)
+SCHEMA_VERSION = 1
 
 
 def create_schema(cursor: sqlite3.Cursor) -> None:
@@ -18,40 +28,75 @@ def create_schema(cursor: sqlite3.Cursor) -> None:
             size INTEGER,
             modified INTEGER,
             state TEXT NOT NULL,
-            last_update INTEGER
+            last_update INTEGER,
+            path_key TEXT
         )
     """)
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_path ON file_states(path)
     """)
+    migrate_schema(cursor)
+
+
+def migrate_schema(cursor: sqlite3.Cursor) -> None:
+    """
+    Migrate an existing database in place up to SCHEMA_VERSION.
+    
+    Version 1 adds the path_key column (normalized, lower-case path) with its
+    own index, backfilled from the existing rows without losing states.
+    """
+    cursor.execute("PRAGMA user_version")
+    version = cursor.fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    
+    cursor.execute("PRAGMA table_info(file_states)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'path_key' not in columns:
+        cursor.execute("ALTER TABLE file_states ADD COLUMN path_key TEXT")
+    
+    cursor.execute("SELECT file_id, path FROM file_states WHERE path_key IS NULL")
+    rows = cursor.fetchall()
+    cursor.executemany(
+        "UPDATE file_states SET path_key = ? WHERE file_id = ?",
+        [(compute_path_key(path), file_id) for file_id, path in rows]
+    )
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_path_key ON file_states(path_key, last_update)
+    """)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def initialize_database() -> None:
     """
     Initialize database and create table if not exists.
     
-    Handles corrupted database by recreating it.
+    Handles corrupted database by recreating it. The calling thread's pooled
+    connection is reopened first, so a database file deleted or replaced on
+    disk is not read through a stale handle; other threads (write queue,
+    index workers) keep theirs.
     """
+    close_thread_connection()
     try:
         conn = get_connection()
         cursor = conn.cursor()
         create_schema(cursor)
         conn.commit()
-        conn.close()
         
     except sqlite3.Error:
-        # If database is corrupted, delete and recreate
+        # If database is corrupted, drop pooled connections, delete and recreate
+        close_all_connections()
         db_path = get_db_path()
-        if db_path.exists():
-            try:
-                db_path.unlink()
-            except OSError:
-                pass
+        for path in (db_path, Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+            if path.exists():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
         
         # Retry initialization
         conn = get_connection()
         cursor = conn.cursor()
         create_schema(cursor)
         conn.commit()
-        conn.close()
 
@@ -4,10 +4,11 @@ FileStateStorageQuery - Query service for file states.
 Handles queries to retrieve files and folders by state.
 """
 
+import os
 import sqlite3
 from typing import List
 
-from app.services.file_state_storage_helpers import get_connection
+from app.services.file_state_storage_helpers import compute_path_key, get_connection
 
 
 def get_items_by_state(state: str) -> List[str]:
@@ -31,11 +32,42 @@ def get_items_by_state(state: str) -> List[str]:
         cursor.execute("SELECT DISTINCT path FROM file_states WHERE state = ? ORDER BY path", (state,))
         rows = cursor.fetchall()
         
-        conn.close()
-        
         # Extraer paths de las tuplas
         return [row[0] for row in rows]
         
     except sqlite3.Error:
         return []
 
+
+def get_folder_states(folder_path: str) -> list[tuple[str, str, str, int]]:
+    """
+    Obtener los estados de los elementos directos de una carpeta.
+    
+    Usa un rango sobre la columna indexada path_key (prefijo de la carpeta)
+    en lugar de leer toda la tabla.
+    
+    Args:
+        folder_path: Carpeta cuyos hijos directos se consultan.
+        
+    Returns:
+        Lista de tuplas (file_id, path_key, state, last_update).
+    """
+    prefix = compute_path_key(folder_path)
+    if not prefix:
+        return []
+    if not prefix.endswith(os.sep):
+        prefix += os.sep
+    # Límite superior del rango: el separador siguiente en orden de código
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT file_id, path_key, state, last_update FROM file_states
+            WHERE path_key >= ? AND path_key < ?
+              AND instr(substr(path_key, ?), ?) = 0
+        """, (prefix, upper, len(prefix) + 1, os.sep))
+        return [(row[0], row[1], row[2], row[3] or 0) for row in cursor.fetchall()]
+    except sqlite3.Error:
+        return []
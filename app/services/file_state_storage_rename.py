@@ -8,7 +8,11 @@ import sqlite3
 import time
 from typing import Optional
 
-from app.services.file_state_storage_helpers import get_connection
+from app.services.file_state_storage_helpers import (
+    compute_path_key,
+    get_connection,
+    rollback_quietly
+)
 
 
 def update_path_for_rename(old_path: str, new_path: str, new_file_id: str, 
@@ -26,6 +30,7 @@ def update_path_for_rename(old_path: str, new_path: str, new_file_id: str,
     Returns:
         State constant if migration successful, None otherwise.
     """
+    conn = None
     try:
         conn = get_connection()
         cursor = conn.cursor()
@@ -35,7 +40,6 @@ def update_path_for_rename(old_path: str, new_path: str, new_file_id: str,
         row = cursor.fetchone()
         
         if not row:
-            conn.close()
             return None
         
         state = row[0]
@@ -47,15 +51,17 @@ def update_path_for_rename(old_path: str, new_path: str, new_file_id: str,
         # Create new entry with new path and file_id
         cursor.execute("""
             INSERT INTO file_states 
-            (file_id, path, size, modified, state, last_update)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (new_file_id, new_path, size, modified, state, last_update))
+            (file_id, path, size, modified, state, last_update, path_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (new_file_id, new_path, size, modified, state, last_update,
+              compute_path_key(new_path)))
         
         conn.commit()
-        conn.close()
         
         return state
         
     except sqlite3.Error:
+        if conn is not None:
+            rollback_quietly(conn)
         return None
 
@@ -0,0 +1,246 @@
+"""
+FileStateWriteQueue - Write-behind queue for file state mutations.
+
+FileStateManager updates its cache and emits signals immediately; the SQLite
+writes are queued here, coalesced per file_id (last write wins) and flushed
+in batched transactions by a background worker thread, which uses its own
+pooled connection. flush() blocks until everything queued is durable;
+readers that must not block use pending_states() to see queued writes.
+
+A batch that fails is re-queued (newer writes of the same file_id win) and
+retried a few times; if it still fails it is dropped, logged, and the next
+flush() reports False.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.core.constants import (
+    STATE_WRITE_FLUSH_DELAY_MS,
+    STATE_WRITE_MAX_RETRIES,
+    STATE_WRITE_RETRY_DELAY_MS
+)
+from app.core.logger import get_logger
+from app.services.file_state_storage_batch import remove_states_batch, set_states_batch
+from app.services.file_state_storage_helpers import compute_path_key
+
+logger = get_logger(__name__)
+
+# (path, path_key, size, modified, state); state None elimina
+_WriteOp = tuple[str, str, int, int, Optional[str]]
+
+
+class StateWriteQueue:
+    """Coalescing queue of state writes drained by a daemon worker thread."""
+
+    def __init__(self, flush_delay_ms: int = STATE_WRITE_FLUSH_DELAY_MS):
+        """
+        Initialize queue (the worker starts on the first write).
+
+        Args:
+            flush_delay_ms: Time the worker waits for more writes before a batch.
+        """
+        self._flush_delay = flush_delay_ms / 1000
+        # file_id -> operación pendiente (orden de inserción = orden de escritura)
+        self._pending: dict[str, _WriteOp] = {}
+        # Lote que el worker está escribiendo
+        self._in_flight: dict[str, _WriteOp] = {}
+        self._flush_requested = False
+        # Reintentos consecutivos del lote actual y escrituras descartadas en total
+        self._retries = 0
+        self._failed_writes = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue_set(self, file_id: str, path: str, size: int, modified: int, state: str) -> None:
+        """Queue a state write for a file."""
+        self._enqueue(file_id, (path, compute_path_key(path), size, modified, state))
+
+    def enqueue_remove(self, file_id: str, path: str) -> None:
+        """Queue a state removal for a file."""
+        self._enqueue(file_id, (path, compute_path_key(path), 0, 0, None))
+
+    def pending_count(self) -> int:
+        """Number of writes not yet committed (queued + being written)."""
+        with self._cond:
+            return len(self._pending) + len(self._in_flight)
+
+    def pending_states(self) -> dict[str, tuple[str, str, Optional[str]]]:
+        """
+        Snapshot of the writes not yet committed, without waiting for them.
+
+        Take it before querying the storage: a batch committed in between is
+        then seen twice (same result) instead of missed.
+
+        Returns:
+            file_id -> (path, path_key, state) in write order (the batch being
+            written first); state None is a removal.
+        """
+        with self._cond:
+            snapshot = {
+                file_id: (op[0], op[1], op[4]) for file_id, op in self._in_flight.items()
+            }
+            for file_id, op in self._pending.items():
+                snapshot.pop(file_id, None)
+                snapshot[file_id] = (op[0], op[1], op[4])
+        return snapshot
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write every queued change now and wait until it is committed.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if nothing is pending anymore and no write was dropped
+            after failing while waiting.
+        """
+        with self._cond:
+            if not self._pending and not self._in_flight:
+                return True
+            failed_before = self._failed_writes
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+            return done and self._failed_writes == failed_before
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush pending writes and stop the worker (app exit).
+
+        Writes queued afterwards are committed synchronously.
+
+        Returns:
+            True if every pending write was committed.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return flushed
+
+    def _enqueue(self, file_id: str, op: _WriteOp) -> None:
+        """Replace any pending write of `file_id` and wake the worker."""
+        with self._cond:
+            if self._stopped:
+                stopped = True
+            else:
+                stopped = False
+                # Reinsertar para que la última escritura quede al final
+                self._pending.pop(file_id, None)
+                self._pending[file_id] = op
+                self._ensure_worker()
+                self._cond.notify_all()
+        if stopped:
+            try:
+                _write_batch({file_id: op})
+            except sqlite3.Error as e:
+                logger.error(f"StateWriteQueue: failed to write state after shutdown: {e}")
+
+    def _ensure_worker(self) -> None:
+        """Start the worker thread if needed (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="StateWriteQueue", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: wait, coalesce for a short delay, write a batch."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopped)
+                if not self._pending:
+                    return
+                if not self._flush_requested and not self._stopped:
+                    # Agrupar escrituras cercanas en una sola transacción
+                    self._cond.wait_for(
+                        lambda: self._flush_requested or self._stopped, self._flush_delay
+                    )
+                batch = self._pending
+                self._pending = {}
+                self._in_flight = batch
+                flush_requested = self._flush_requested
+                self._flush_requested = False
+            error = None
+            try:
+                _write_batch(batch)
+            except Exception as e:
+                error = e
+            with self._cond:
+                self._in_flight = {}
+                if error is None:
+                    self._retries = 0
+                else:
+                    self._handle_failed_batch(batch, error, flush_requested)
+                self._cond.notify_all()
+            if error is not None and self._pending:
+                time.sleep(STATE_WRITE_RETRY_DELAY_MS / 1000)
+
+    def _handle_failed_batch(self, batch: dict[str, _WriteOp], error: Exception,
+                             flush_requested: bool) -> None:
+        """Re-queue a failed batch or drop it after the last retry (caller holds the lock)."""
+        self._retries += 1
+        if self._retries > STATE_WRITE_MAX_RETRIES:
+            logger.error(
+                f"StateWriteQueue: dropping {len(batch)} states after "
+                f"{STATE_WRITE_MAX_RETRIES} retries: {error}"
+            )
+            self._failed_writes += len(batch)
+            self._retries = 0
+            return
+        
+        logger.warning(f"StateWriteQueue: failed to write {len(batch)} states, retrying: {error}")
+        # Delante de lo encolado después, sin pisar escrituras más nuevas
+        retry = {file_id: op for file_id, op in batch.items() if file_id not in self._pending}
+        retry.update(self._pending)
+        self._pending = retry
+        self._flush_requested = self._flush_requested or flush_requested
+
+
+def _write_batch(batch: dict[str, _WriteOp]) -> None:
+    """
+    Commit a coalesced batch: removals first, then writes (one transaction each).
+    
+    Raises:
+        sqlite3.Error: If either transaction fails (it is rolled back).
+    """
+    remove_ids = [file_id for file_id, op in batch.items() if op[4] is None]
+    states = [
+        (file_id, path, size, modified, state)
+        for file_id, (path, _path_key, size, modified, state) in batch.items()
+        if state is not None
+    ]
+    if remove_ids:
+        remove_states_batch(remove_ids, raise_on_error=True)
+    if states:
+        set_states_batch(states, raise_on_error=True)
+
+
+_shared_queue: Optional[StateWriteQueue] = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_state_write_queue() -> StateWriteQueue:
+    """Get the process-wide state write queue."""
+    global _shared_queue
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = StateWriteQueue()
+        return _shared_queue
+
+
+def shutdown_state_writes(timeout: Optional[float] = None) -> bool:
+    """Flush and stop the process-wide queue (app exit hook; safe if never used)."""
+    with _shared_queue_lock:
+        queue = _shared_queue
+    return queue.shutdown(timeout) if queue is not None else True
@@ -0,0 +1,342 @@
+"""
+FilenameIndex - Persistent, incrementally maintained index of file names.
+
+Covers the full subtree of every indexed root (workspace tabs and focus tree
+folders). A single daemon worker owns all writes:
+
+- set_roots(): new roots are crawled, dropped roots are pruned.
+- refresh(): reconcile every root; folders whose mtime did not change are
+  not re-read, so only their subfolders are visited.
+- apply_delta(): a watcher FolderDelta re-reads just that folder (new
+  subfolders are crawled).
+
+Listeners (add_listener) are told, after each update, which folders were
+re-read and which subtrees left the index.
+
+search() runs on the caller's thread with its own pooled connection.
+"""
+
+import os
+import threading
+from typing import Callable, Iterable, List, Optional
+
+from app.core.logger import get_logger
+from app.models.folder_delta import FolderDelta
+from app.services import filename_index_storage as storage
+from app.services.file_extensions import SUPPORTED_EXTENSIONS
+from app.services.file_filter_service import filter_entries_by_extensions
+from app.services.file_scan_service import read_folder_entries
+from app.services.file_state_storage_helpers import compute_path_key
+
+logger = get_logger(__name__)
+
+# Carpetas reescaneadas por transacción durante un rastreo
+DIRS_PER_COMMIT = 200
+
+# listener(rescanned_folder_keys, removed_keys): carpetas releídas y subárboles eliminados
+IndexListener = Callable[[List[str], List[str]], None]
+
+
+def _is_under(key: str, root_key: str) -> bool:
+    """True if path_key `key` is root_key or lies below it."""
+    return key == root_key or key.startswith(root_key.rstrip(os.sep) + os.sep)
+
+
+def reduce_roots(paths: Iterable[str]) -> dict[str, str]:
+    """
+    Deduplicate roots, dropping those already covered by another root.
+
+    Returns:
+        root_key -> path, in first-seen order.
+    """
+    roots: dict[str, str] = {}
+    for path in paths:
+        if not path or not os.path.isabs(path):
+            continue
+        key = compute_path_key(path)
+        if key not in roots:
+            roots[key] = path
+    return {
+        key: path for key, path in roots.items()
+        if not any(other != key and _is_under(key, other) for other in roots)
+    }
+
+
+class FilenameIndex:
+    """Filename index over workspace trees, maintained by a daemon worker."""
+
+    def __init__(self):
+        """Initialize index (schema and worker are created lazily)."""
+        self._cond = threading.Condition()
+        self._initialized = False
+        self._roots: dict[str, str] = {}  # Raíces configuradas (root_key -> path)
+        self._complete_roots: set[str] = set()  # Raíces rastreadas al menos una vez
+        self._pending_roots: Optional[dict[str, str]] = None
+        self._pending_reconcile = False
+        self._pending_folders: dict[str, str] = {}
+        self._busy = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[IndexListener] = []
+        # Cambios del ciclo en curso (solo los toca el worker)
+        self._rescanned_keys: List[str] = []
+        self._removed_keys: List[str] = []
+
+    def add_listener(self, listener: IndexListener) -> None:
+        """Call listener(rescanned_folder_keys, removed_keys) from the worker after each update."""
+        with self._cond:
+            self._listeners.append(listener)
+
+    def set_roots(self, paths: Iterable[str]) -> None:
+        """Index exactly these folder trees (nested roots are merged)."""
+        roots = reduce_roots(paths)
+        with self._cond:
+            if roots == self._roots and self._pending_roots is None:
+                return
+            self._roots = dict(roots)
+            self._pending_roots = dict(roots)
+            self._wake()
+
+    def refresh(self) -> None:
+        """Reconcile every root with the filesystem in the background."""
+        with self._cond:
+            self._pending_reconcile = True
+            self._wake()
+
+    def apply_delta(self, delta: FolderDelta) -> None:
+        """Re-read a changed folder (watcher event) if it lies inside a root."""
+        key = compute_path_key(delta.folder)
+        with self._cond:
+            if any(_is_under(key, root_key) for root_key in self._roots):
+                self._pending_folders[key] = delta.folder
+                self._wake()
+
+    def is_ready(self) -> bool:
+        """True once every configured root has been crawled at least once."""
+        self._ensure_initialized()
+        with self._cond:
+            return all(key in self._complete_roots for key in self._roots)
+
+    def search(self, query: str, limit: int) -> List[str]:
+        """
+        Find indexed paths whose name contains `query` (case-insensitive).
+
+        Args:
+            query: Substring to look for.
+            limit: Maximum number of paths.
+
+        Returns:
+            Matching paths inside the configured roots.
+        """
+        self._ensure_initialized()
+        paths = storage.search_names(query, limit)
+        # Entradas de raíces recién retiradas que el worker aún no ha podado
+        return [path for path in paths if self.covers(path)]
+
+    def covers(self, path: str) -> bool:
+        """True if path lies inside one of the configured roots."""
+        key = compute_path_key(path)
+        with self._cond:
+            return any(_is_under(key, root_key) for root_key in self._roots)
+
+    def get_indexed_files(self, extensions: Iterable[str]) -> List[tuple[str, str, str]]:
+        """Get indexed files with these extensions as (path_key, parent_key, path)."""
+        self._ensure_initialized()
+        return storage.get_files_with_extensions(extensions)
+
+    def get_indexed_children(self, folder_key: str) -> dict[str, tuple[str, bool]]:
+        """Get indexed children of a folder (path_key -> (path, is_dir))."""
+        self._ensure_initialized()
+        return storage.get_children(folder_key)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued update has been applied."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._has_work() and not self._busy, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker; an interrupted crawl resumes on the next start."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_initialized(self) -> None:
+        """Create the schema and load roots finished in a previous session."""
+        with self._cond:
+            if self._initialized:
+                return
+            storage.initialize_index()
+            self._complete_roots = set(storage.get_roots())
+            self._initialized = True
+
+    def _has_work(self) -> bool:
+        return (
+            self._pending_roots is not None
+            or self._pending_reconcile
+            or bool(self._pending_folders)
+        )
+
+    def _wake(self) -> None:
+        """Start the worker if needed and notify it (caller holds the lock)."""
+        if self._stopped:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="FilenameIndex", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _run(self) -> None:
+        """Worker loop: apply root changes, reconciles and folder updates."""
+        try:
+            self._ensure_initialized()
+        except Exception as e:
+            logger.error(f"FilenameIndex: cannot open index database: {e}")
+            return
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._has_work() or self._stopped)
+                if self._stopped:
+                    return
+                roots = self._pending_roots
+                reconcile = self._pending_reconcile
+                folders = self._pending_folders
+                self._pending_roots = None
+                self._pending_reconcile = False
+                self._pending_folders = {}
+                self._busy = True
+            try:
+                if roots is not None:
+                    self._apply_roots(roots)
+                if reconcile:
+                    self._crawl([(path, True) for path in self._current_roots().values()])
+                if folders:
+                    self._crawl([(path, False) for path in folders.values()])
+            except Exception as e:
+                storage.rollback()
+                logger.error(f"FilenameIndex: update failed: {e}", exc_info=True)
+            finally:
+                self._notify_listeners()
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _notify_listeners(self) -> None:
+        """Report the folders re-read and subtrees removed in this cycle."""
+        rescanned, removed = self._rescanned_keys, self._removed_keys
+        self._rescanned_keys, self._removed_keys = [], []
+        if not rescanned and not removed:
+            return
+        with self._cond:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(rescanned, removed)
+            except Exception as e:
+                logger.error(f"FilenameIndex: listener failed: {e}", exc_info=True)
+
+    def _current_roots(self) -> dict[str, str]:
+        with self._cond:
+            return dict(self._roots)
+
+    def _apply_roots(self, roots: dict[str, str]) -> None:
+        """Prune dropped roots, then reconcile (or first-crawl) every root."""
+        for root_key in storage.get_roots():
+            if root_key not in roots:
+                covered = any(_is_under(root_key, key) for key in roots)
+                storage.remove_root(root_key, keep_entries=covered)
+                if not covered:
+                    self._removed_keys.append(root_key)
+        storage.commit()
+        with self._cond:
+            self._complete_roots &= set(roots)
+
+        for root_key, path in roots.items():
+            if not self._crawl([(path, True)]):
+                return
+            storage.add_root(path)
+            storage.commit()
+            with self._cond:
+                self._complete_roots.add(root_key)
+
+    def _crawl(self, stack: list[tuple[str, bool]]) -> bool:
+        """
+        Re-read folders whose mtime changed since they were indexed.
+
+        Each stack item is (folder, deep): deep folders also visit their
+        existing subfolders; new subfolders are always crawled.
+
+        Returns:
+            False if interrupted by shutdown.
+        """
+        rescanned = 0
+        while stack:
+            if self._stopped:
+                storage.commit()
+                return False
+            folder, deep = stack.pop()
+            key = compute_path_key(folder)
+            try:
+                mtime = os.stat(folder).st_mtime
+            except OSError:
+                storage.delete_subtree(key)
+                self._removed_keys.append(key)
+                continue
+
+            children = storage.get_children(key)
+            if storage.get_dir_mtime(key) == mtime:
+                if deep:
+                    stack.extend(
+                        (path, True) for path, is_dir in children.values()
+                        if is_dir and not os.path.islink(path)
+                    )
+                continue
+
+            entries = filter_entries_by_extensions(read_folder_entries(folder), SUPPORTED_EXTENSIONS)
+            current = {compute_path_key(entry.path): entry for entry in entries}
+            added = [
+                entry for entry_key, entry in current.items()
+                if entry_key not in children or children[entry_key][1] != entry.is_dir
+            ]
+            removed = [
+                entry_key for entry_key, (path, is_dir) in children.items()
+                if entry_key not in current or current[entry_key].is_dir != is_dir
+            ]
+            storage.replace_children(key, mtime, added, removed)
+            self._rescanned_keys.append(key)
+            self._removed_keys.extend(removed)
+
+            new_dirs = {entry.path for entry in added if entry.is_dir}
+            stack.extend(
+                (entry.path, True) for entry in entries
+                if entry.is_dir and (deep or entry.path in new_dirs)
+                and not os.path.islink(entry.path)
+            )
+            rescanned += 1
+            if rescanned % DIRS_PER_COMMIT == 0:
+                storage.commit()
+        storage.commit()
+        return True
+
+
+_shared_index: Optional[FilenameIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_filename_index() -> FilenameIndex:
+    """Get the process-wide filename index."""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = FilenameIndex()
+        return _shared_index
+
+
+def shutdown_filename_index(timeout: Optional[float] = 5.0) -> None:
+    """Stop the process-wide index worker (app exit hook; safe if never used)."""
+    with _shared_index_lock:
+        index = _shared_index
+    if index is not None:
+        index.shutdown(timeout)
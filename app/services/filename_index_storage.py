@@ -0,0 +1,249 @@
+"""
+FilenameIndexStorage - SQLite storage of the global filename index.
+
+Lives in its own database file (filename_index.db) so the index never
+competes with file state writes. Names are indexed with an FTS5 trigram
+table: any substring of 3+ characters is an index lookup. Shorter queries,
+or SQLite builds without FTS5 trigram, fall back to LIKE over the names.
+
+Every entry stores its normalized, lowercase path_key; subtrees are
+path_key range queries (like file state folder lookups).
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.core.logger import get_logger
+from app.models.file_entry import FileEntry
+from app.services.file_state_storage_helpers import (
+    compute_path_key,
+    get_pooled_connection,
+    rollback_quietly
+)
+from app.services.storage_path_service import get_storage_file
+
+logger = get_logger(__name__)
+
+INDEX_DB_PATH = get_storage_file("filename_index.db")
+
+# Longitud mínima de consulta que resuelve el índice de trigramas
+TRIGRAM_MIN_QUERY = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    path_key TEXT NOT NULL UNIQUE,
+    parent_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_parent ON entries(parent_key);
+CREATE TABLE IF NOT EXISTS scanned_dirs (
+    dir_key TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roots (
+    root_key TEXT PRIMARY KEY,
+    path TEXT NOT NULL
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    name, content='entries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+# db_path -> FTS5 trigram disponible
+_fts_available: dict[str, bool] = {}
+
+
+def get_index_db_path() -> Path:
+    """Get filename index database path."""
+    return INDEX_DB_PATH
+
+
+def get_index_connection() -> sqlite3.Connection:
+    """Get the calling thread's pooled connection to the index database."""
+    return get_pooled_connection(str(get_index_db_path()))
+
+
+def initialize_index() -> bool:
+    """
+    Create the index schema if needed.
+
+    Returns:
+        True if the FTS5 trigram table is available.
+    """
+    conn = get_index_connection()
+    conn.executescript(_SCHEMA)
+    try:
+        conn.executescript(_FTS_SCHEMA)
+        available = True
+    except sqlite3.OperationalError as e:
+        # SQLite < 3.34 o compilado sin FTS5: búsqueda con LIKE
+        logger.warning(f"FTS5 trigram unavailable, filename index uses LIKE: {e}")
+        available = False
+    conn.commit()
+    _fts_available[str(get_index_db_path())] = available
+    return available
+
+
+def _subtree_range(dir_key: str) -> tuple[str, str]:
+    """path_key bounds (inclusive, exclusive) of everything below dir_key."""
+    prefix = dir_key.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def get_roots() -> dict[str, str]:
+    """Get indexed roots (root_key -> path)."""
+    rows = get_index_connection().execute("SELECT root_key, path FROM roots").fetchall()
+    return dict(rows)
+
+
+def add_root(path: str) -> None:
+    """Register an indexed root (commit is left to the caller)."""
+    get_index_connection().execute(
+        "INSERT OR REPLACE INTO roots (root_key, path) VALUES (?, ?)",
+        (compute_path_key(path), path)
+    )
+
+
+def remove_root(root_key: str, keep_entries: bool = False) -> None:
+    """Unregister a root and, unless still covered elsewhere, drop its subtree."""
+    conn = get_index_connection()
+    conn.execute("DELETE FROM roots WHERE root_key = ?", (root_key,))
+    if not keep_entries:
+        delete_subtree(root_key)
+
+
+def get_dir_mtime(dir_key: str) -> Optional[float]:
+    """Get the mtime a folder had when its children were last indexed."""
+    row = get_index_connection().execute(
+        "SELECT mtime FROM scanned_dirs WHERE dir_key = ?", (dir_key,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def get_children(dir_key: str) -> dict[str, tuple[str, bool]]:
+    """Get indexed children of a folder (path_key -> (path, is_dir))."""
+    rows = get_index_connection().execute(
+        "SELECT path_key, path, is_dir FROM entries WHERE parent_key = ?", (dir_key,)
+    ).fetchall()
+    return {key: (path, bool(is_dir)) for key, path, is_dir in rows}
+
+
+def replace_children(
+    dir_key: str,
+    mtime: float,
+    added: Iterable[FileEntry],
+    removed_keys: Iterable[str]
+) -> None:
+    """
+    Apply a folder rescan: insert new children, drop vanished ones (with subtrees).
+
+    Commit is left to the caller, so several folders can share a transaction.
+    """
+    conn = get_index_connection()
+    for key in removed_keys:
+        conn.execute("DELETE FROM entries WHERE path_key = ?", (key,))
+        delete_subtree(key)
+    conn.executemany(
+        "INSERT OR REPLACE INTO entries (path, path_key, parent_key, name, is_dir) VALUES (?, ?, ?, ?, ?)",
+        [
+            (entry.path, compute_path_key(entry.path), dir_key, entry.name, int(entry.is_dir))
+            for entry in added
+        ]
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO scanned_dirs (dir_key, mtime) VALUES (?, ?)", (dir_key, mtime)
+    )
+
+
+def get_files_with_extensions(extensions: Iterable[str]) -> List[tuple[str, str, str]]:
+    """
+    Get every indexed file with one of the given extensions.
+
+    Returns:
+        List of (path_key, parent_key, path).
+    """
+    patterns = ['%' + ext.replace('_', '\\_') for ext in extensions]
+    if not patterns:
+        return []
+    condition = " OR ".join("name LIKE ? ESCAPE '\\'" for _ in patterns)
+    return get_index_connection().execute(
+        f"SELECT path_key, parent_key, path FROM entries WHERE is_dir = 0 AND ({condition})",
+        patterns
+    ).fetchall()
+
+
+def delete_subtree(dir_key: str) -> None:
+    """Drop every entry and scanned folder below dir_key (not dir_key itself)."""
+    low, high = _subtree_range(dir_key)
+    conn = get_index_connection()
+    conn.execute("DELETE FROM entries WHERE path_key >= ? AND path_key < ?", (low, high))
+    conn.execute(
+        "DELETE FROM scanned_dirs WHERE dir_key = ? OR (dir_key >= ? AND dir_key < ?)",
+        (dir_key, low, high)
+    )
+
+
+def commit() -> None:
+    """Commit the calling thread's pending index writes."""
+    get_index_connection().commit()
+
+
+def rollback() -> None:
+    """Discard the calling thread's pending index writes."""
+    rollback_quietly(get_index_connection())
+
+
+def count_entries() -> int:
+    """Number of indexed entries."""
+    return get_index_connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def search_names(query: str, limit: int) -> List[str]:
+    """
+    Find indexed paths whose name contains `query` (case-insensitive).
+
+    Args:
+        query: Substring to look for.
+        limit: Maximum number of paths.
+
+    Returns:
+        Matching paths (unordered).
+    """
+    query = query.strip()
+    if not query:
+        return []
+    conn = get_index_connection()
+    use_fts = (
+        _fts_available.get(str(get_index_db_path()), False)
+        and len(query) >= TRIGRAM_MIN_QUERY
+    )
+    if use_fts:
+        phrase = '"' + query.replace('"', '""') + '"'
+        rows = conn.execute(
+            "SELECT e.path, e.name FROM entries_fts f JOIN entries e ON e.id = f.rowid "
+            "WHERE entries_fts MATCH ? LIMIT ?",
+            (phrase, limit)
+        ).fetchall()
+    else:
+        pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = conn.execute(
+            "SELECT path, name FROM entries WHERE name LIKE ? ESCAPE '\\' LIMIT ?",
+            (pattern, limit)
+        ).fetchall()
+    # LIKE solo ignora mayúsculas ASCII: confirmar con la misma regla que antes
+    query_lower = query.lower()
+    return [path for path, name in rows if query_lower in name.lower()]
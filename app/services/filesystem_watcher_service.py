@@ -1,47 +1,114 @@
 """
 FileSystemWatcherService - Real-time folder monitoring service.
 
-Wraps QFileSystemWatcher to monitor folder changes with debounce,
-event blocking, and snapshot comparison to prevent refresh storms.
+Wraps QFileSystemWatcher to monitor many folders at once (active tab, every
+open tab of every workspace, folders of state views). Each folder keeps its own
+snapshot and debounce timer; events are blocked on demand and only real
+snapshot differences are emitted, which prevents refresh storms.
+
+On Linux the native inotify backend reports the exact entries created,
+deleted, moved and modified: snapshots are updated by re-stat'ing only those
+entries and renames are paired by cookie instead of guessed from snapshots.
+Elsewhere (or with backend="qt") QFileSystemWatcher plus a full re-scan is used.
+
+Folders are registered in named sources (e.g. "active", "tabs", "state") with
+a priority; when the cap is reached the lowest-priority folders are dropped.
 """
 
 import os
+from dataclasses import dataclass, field
 from typing import Optional
 
-from app.core.constants import FILE_SYSTEM_DEBOUNCE_MS
-from app.services.path_utils import is_state_context_path
+from app.core.constants import (
+    FILE_SYSTEM_DEBOUNCE_MS,
+    FILE_SYSTEM_WATCHER_BACKEND,
+    MAX_WATCHED_FOLDERS
+)
+from app.models.folder_delta import FolderDelta
+from app.services.file_identity_cache import invalidate_folder
+from app.services.file_scan_service import read_entry, read_folder_entries
+from app.services.folder_listing_cache import invalidate_listing, track_folder, untrack_folder
+from app.services.icon_image_cache import evict_paths as evict_icon_paths
+from app.services.inotify_watch_backend import (
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    RESCAN_MASK,
+    InotifyEvent,
+    create_inotify_backend
+)
+from app.services.path_utils import is_state_context_path, normalize_path
 from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
 
+# Prioridades de las fuentes (menor = más importante)
+WATCH_PRIORITY_ACTIVE = 0
+WATCH_PRIORITY_TAB = 1
+WATCH_PRIORITY_BACKGROUND = 2
+
+ACTIVE_SOURCE = "active"
+
+# Mitades IN_MOVED_FROM recordadas para emparejar con su IN_MOVED_TO
+_MAX_PENDING_MOVES = 256
+
+
+@dataclass
+class _WatchedFolder:
+    """Watched folder with its own snapshot and debounce timer."""
+
+    path: str
+    timer: QTimer
+    priority: int
+    snapshot: list[tuple[str, float, bool, int]] = field(default_factory=list)
+    # Solo backend inotify: cambios exactos acumulados desde el último proceso
+    changed_names: dict[str, None] = field(default_factory=dict)
+    moves: list[tuple[str, str, bool]] = field(default_factory=list)  # (old_path, new_path, is_dir)
+    moved_away: set[str] = field(default_factory=set)  # Nombres movidos a otra carpeta observada
+    needs_rescan: bool = False
+
 
 class FileSystemWatcherService(QObject):
     """Service for monitoring folder changes in real-time."""
 
     filesystem_changed = Signal(str)  # Emitted when folder changes (folder path)
+    folder_delta = Signal(object)  # Emitted before filesystem_changed with the FolderDelta
     folder_renamed = Signal(str, str)  # Emitted when folder is renamed/moved (old_path, new_path)
     folder_disappeared = Signal(str)  # Emitted when folder disappears without replacement (folder_path)
     structural_change_detected = Signal(str)  # Emitted when structural changes detected (moves between parents)
     folder_created = Signal(str)  # Emitted when folder is created (folder_path)
     folder_deleted = Signal(str)  # Emitted when folder is deleted (folder_path)
 
-    def __init__(self, parent=None, debounce_delay: int = FILE_SYSTEM_DEBOUNCE_MS):
+    def __init__(
+        self,
+        parent=None,
+        debounce_delay: int = FILE_SYSTEM_DEBOUNCE_MS,
+        max_folders: int = MAX_WATCHED_FOLDERS,
+        backend: str = FILE_SYSTEM_WATCHER_BACKEND
+    ):
         """
         Initialize FileSystemWatcherService.
         
         Args:
             parent: Parent QObject.
             debounce_delay: Debounce delay in milliseconds (default from constants).
+            max_folders: Maximum number of folders watched at once.
+            backend: "auto" (inotify on Linux when available) or "qt".
         """
         super().__init__(parent)
         self._watcher = QFileSystemWatcher(self)
-        self._watched_folder: Optional[str] = None
+        self._watched_folder: Optional[str] = None  # Carpeta de la fuente "active"
         self._ignore_events: bool = False
         self._debounce_delay = debounce_delay
-        self._previous_snapshot: Optional[list[tuple[str, float, bool, int]]] = None
+        self._max_folders = max(1, max_folders)
+        # source -> (priority, paths en orden de preferencia)
+        self._sources: dict[str, tuple[int, list[str]]] = {}
+        # normalized path -> carpeta observada
+        self._folders: dict[str, _WatchedFolder] = {}
+        
+        # cookie -> (old_path, is_dir) de renames aún sin su IN_MOVED_TO
+        self._pending_moves: dict[int, tuple[str, bool]] = {}
         
-        # Debounce timer
-        self._debounce_timer = QTimer(self)
-        self._debounce_timer.setSingleShot(True)
-        self._debounce_timer.timeout.connect(self._on_debounce_timeout)
+        self._inotify = create_inotify_backend(self) if backend == "auto" else None
+        if self._inotify is not None:
+            self._inotify.events_ready.connect(self._on_inotify_events)
         
         # Connect watcher signals
         self._watcher.directoryChanged.connect(self._on_directory_changed)
@@ -49,10 +116,10 @@ class FileSystemWatcherService(QObject):
 
     def watch_folder(self, folder_path: str) -> bool:
         """
-        Start watching a folder for changes.
+        Make a folder the active watched folder.
 
-        ALWAYS stops previous watcher before adding new one.
-        Only watches the active folder.
+        Replaces the previous active folder; folders registered by other
+        sources (open tabs, state views) keep being watched.
 
         IMPORTANTE: Los contextos de estado (@state://...) NO son paths del filesystem.
         NO se observan. Se retorna True sin observar.
@@ -63,7 +130,7 @@ class FileSystemWatcherService(QObject):
         Returns:
             True if watching started successfully, False otherwise.
         """
-        # ALWAYS stop watching previous folder first
+        # ALWAYS replace the previous active folder first
         self.stop_watching()
 
         if not folder_path:
@@ -73,31 +140,69 @@ class FileSystemWatcherService(QObject):
         if is_state_context_path(folder_path):
             return True  # Retornar True sin observar
 
-        # Add folder to watcher
-        if self._watcher.addPath(folder_path):
+        self.set_watched_folders(ACTIVE_SOURCE, [folder_path], WATCH_PRIORITY_ACTIVE)
+        if self.is_watching(folder_path):
             self._watched_folder = folder_path
-            # Take initial snapshot - this is the baseline for comparison
-            # Any change from this point will emit filesystem_changed
-            self._previous_snapshot = self._take_snapshot(folder_path)
             return True
         return False
 
     def stop_watching(self) -> None:
-        """Stop watching the current folder and clear state."""
-        if self._watched_folder:
-            self._watcher.removePath(self._watched_folder)
-            self._watched_folder = None
-        
-        # Stop debounce timer
-        self._debounce_timer.stop()
-        
-        # Clear snapshot
-        self._previous_snapshot = None
+        """Stop watching the active folder (other sources are kept)."""
+        self._watched_folder = None
+        self.set_watched_folders(ACTIVE_SOURCE, [])
+
+    def stop_all(self) -> None:
+        """Stop watching every folder of every source."""
+        self._watched_folder = None
+        self._sources.clear()
+        self._sync_folders()
+
+    def set_watched_folders(
+        self,
+        source: str,
+        folder_paths: list[str],
+        priority: int = WATCH_PRIORITY_TAB
+    ) -> None:
+        """
+        Replace the folders registered by a source.
+
+        Folders already watched keep their snapshot, so no change is lost
+        while re-registering.
+
+        Args:
+            source: Source name (e.g. "tabs", "state").
+            folder_paths: Folders in order of preference (earlier survive the cap).
+            priority: Source priority (WATCH_PRIORITY_*; lower wins).
+        """
+        paths = [
+            path for path in folder_paths
+            if path and not is_state_context_path(path)
+        ]
+        if paths:
+            self._sources[source] = (priority, paths)
+        else:
+            self._sources.pop(source, None)
+        self._sync_folders()
 
     def get_watched_folder(self) -> Optional[str]:
-        """Get the currently watched folder path."""
+        """Get the active watched folder path."""
         return self._watched_folder
 
+    def get_watched_folders(self) -> list[str]:
+        """Get every watched folder, most important first."""
+        return [
+            folder.path
+            for folder in sorted(self._folders.values(), key=lambda f: f.priority)
+        ]
+
+    def get_backend(self) -> str:
+        """Get the change detection backend in use ("inotify" or "qt")."""
+        return "inotify" if self._inotify is not None else "qt"
+
+    def is_watching(self, folder_path: str) -> bool:
+        """Check whether a folder is currently watched."""
+        return bool(folder_path) and normalize_path(folder_path) in self._folders
+
     def ignore_events(self, ignore: bool) -> None:
         """
         Set flag to ignore filesystem events.
@@ -106,8 +211,63 @@ class FileSystemWatcherService(QObject):
         Se usa para evitar tormentas de eventos mientras se renombra una carpeta.
         """
         self._ignore_events = bool(ignore)
-        if ignore and self._debounce_timer.isActive():
-            self._debounce_timer.stop()
+        if ignore:
+            for folder in self._folders.values():
+                folder.timer.stop()
+
+    def _sync_folders(self) -> None:
+        """Watch the highest-priority folders of all sources, up to the cap."""
+        wanted: dict[str, tuple[str, int]] = {}
+        for priority, paths in sorted(self._sources.values(), key=lambda item: item[0]):
+            for path in paths:
+                if len(wanted) >= self._max_folders:
+                    break
+                key = normalize_path(path)
+                if key not in wanted:
+                    wanted[key] = (path, priority)
+
+        for key in [key for key in self._folders if key not in wanted]:
+            self._remove_folder(key)
+
+        for key, (path, priority) in wanted.items():
+            folder = self._folders.get(key)
+            if folder is not None:
+                folder.priority = priority
+            else:
+                self._add_folder(key, path, priority)
+
+    def _add_folder(self, key: str, folder_path: str, priority: int) -> None:
+        """Start watching a folder and take its baseline snapshot."""
+        if not os.path.isdir(folder_path):
+            return
+        if self._inotify is not None:
+            if not self._inotify.add_path(folder_path):
+                return
+        elif not self._watcher.addPath(folder_path):
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setProperty("folder_key", key)
+        timer.timeout.connect(self._on_folder_timeout)
+        # Any change from this snapshot on will emit filesystem_changed
+        self._folders[key] = _WatchedFolder(
+            path=folder_path,
+            timer=timer,
+            priority=priority,
+            snapshot=self._take_snapshot(folder_path)
+        )
+        track_folder(folder_path)
+
+    def _remove_folder(self, key: str) -> None:
+        """Stop watching a folder and drop its state."""
+        folder = self._folders.pop(key)
+        folder.timer.stop()
+        folder.timer.deleteLater()
+        if self._inotify is not None:
+            self._inotify.remove_path(folder.path)
+        else:
+            self._watcher.removePath(folder.path)
+        untrack_folder(folder.path)
 
     def _take_snapshot(self, folder_path: str) -> list[tuple[str, float, bool, int]]:
         """
@@ -130,17 +290,11 @@ class FileSystemWatcherService(QObject):
                 logger.debug(f"Watcher snapshot: path is not a directory: {folder_path}")
                 return snapshot
 
-            for item in os.listdir(folder_path):
-                item_path = os.path.join(folder_path, item)
-                try:
-                    stat = os.stat(item_path)
-                    mtime = stat.st_mtime
-                    is_dir = os.path.isdir(item_path)
-                    size = stat.st_size
-                    snapshot.append((item, mtime, is_dir, size))
-                except (OSError, PermissionError):
-                    # Skip items we can't access
-                    pass
+            # Una sola pasada de scandir: tipo, tamaño y mtime desde DirEntry
+            snapshot = [
+                (entry.name, entry.mtime, entry.is_dir, entry.size)
+                for entry in read_folder_entries(folder_path)
+            ]
         except (OSError, PermissionError):
             # Folder doesn't exist or no permission
             pass
@@ -261,6 +415,34 @@ class FileSystemWatcherService(QObject):
         
         return appeared_paths
     
+    def _compute_delta(
+        self,
+        old_snapshot: list[tuple[str, float, bool, int]],
+        new_snapshot: list[tuple[str, float, bool, int]],
+        watched_folder: str
+    ) -> FolderDelta:
+        """
+        Compute added, removed and modified entries between two snapshots.
+        
+        An entry is modified when its mtime, size or type (file/folder) changed.
+        """
+        old_entries = {name: (mtime, is_dir, size) for name, mtime, is_dir, size in old_snapshot}
+        new_entries = {name: (mtime, is_dir, size) for name, mtime, is_dir, size in new_snapshot}
+        delta = FolderDelta(folder=watched_folder)
+        
+        for name, (mtime, is_dir, size) in new_entries.items():
+            old = old_entries.get(name)
+            path = os.path.join(watched_folder, name)
+            if old is None:
+                delta.added.append(path)
+            elif old != (mtime, is_dir, size):
+                delta.modified.append(path)
+        
+        for name in old_entries.keys() - new_entries.keys():
+            delta.removed.append(os.path.join(watched_folder, name))
+        
+        return delta
+
     def _has_structural_changes(
         self,
         old_snapshot: list[tuple[str, float, bool, int]],
@@ -298,95 +480,229 @@ class FileSystemWatcherService(QObject):
 
     def _on_directory_changed(self, path: str) -> None:
         """Handle directory change event."""
-        # Only process if it's the watched folder
-        if path != self._watched_folder:
+        # Only process watched folders
+        folder = self._folders.get(normalize_path(path))
+        if folder is None:
             return
         
+        # El listado cacheado deja de ser fiable aunque se ignoren los eventos
+        invalidate_listing(folder.path)
+        
         # Ignore if events are blocked
         if self._ignore_events:
             return
         
-        # Restart debounce timer
-        self._debounce_timer.stop()
-        self._debounce_timer.start(self._debounce_delay)
+        # Restart this folder's debounce timer
+        folder.timer.start(self._debounce_delay)
 
     def _on_file_changed(self, path: str) -> None:
         """Handle file change event."""
-        # Only process if we have a watched folder
-        if not self._watched_folder:
-            return
-        
-        # Ignore if events are blocked
-        if self._ignore_events:
-            return
-        
-        # Restart debounce timer
-        self._debounce_timer.stop()
-        self._debounce_timer.start(self._debounce_delay)
+        self._on_directory_changed(os.path.dirname(path))
+
+    def _on_inotify_events(self, events: list[InotifyEvent]) -> None:
+        """
+        Record exact inotify changes per folder and restart their debounce.
 
-    def _on_debounce_timeout(self) -> None:
+        Changes are recorded even while events are ignored, so the incremental
+        snapshot never misses one.
+        """
+        touched: dict[str, _WatchedFolder] = {}
+        for event in events:
+            if not event.folder:
+                # Cola del kernel desbordada: releer todas las carpetas
+                for key, folder in self._folders.items():
+                    folder.needs_rescan = True
+                    touched[key] = folder
+                continue
+            key = normalize_path(event.folder)
+            folder = self._folders.get(key)
+            if folder is None:
+                continue
+            if event.mask & RESCAN_MASK:
+                folder.needs_rescan = True
+                touched[key] = folder
+                continue
+            if not event.name:
+                # IN_ATTRIB/IN_MODIFY sobre la propia carpeta: su listado no cambia
+                continue
+            touched[key] = folder
+            folder.changed_names[event.name] = None
+            path = os.path.join(folder.path, event.name)
+            if event.mask & IN_MOVED_FROM:
+                self._pending_moves[event.cookie] = (path, event.is_dir)
+                if len(self._pending_moves) > _MAX_PENDING_MOVES:
+                    self._pending_moves.pop(next(iter(self._pending_moves)))
+            elif event.mask & IN_MOVED_TO and event.cookie in self._pending_moves:
+                old_path, is_dir = self._pending_moves.pop(event.cookie)
+                folder.moves.append((old_path, path, is_dir))
+                source = self._folders.get(normalize_path(os.path.dirname(old_path)))
+                if source is not None and source is not folder:
+                    source.moved_away.add(os.path.basename(old_path))
+
+        for folder in touched.values():
+            # El listado cacheado deja de ser fiable aunque se ignoren los eventos
+            invalidate_listing(folder.path)
+            if not self._ignore_events:
+                folder.timer.start(self._debounce_delay)
+
+    def _apply_inotify_changes(self, folder: _WatchedFolder) -> list[tuple[str, float, bool, int]]:
+        """Build the new snapshot re-stat'ing only the entries inotify reported."""
+        entries = {name: (mtime, is_dir, size) for name, mtime, is_dir, size in folder.snapshot}
+        for name in folder.changed_names:
+            entry = read_entry(os.path.join(folder.path, name))
+            if entry is None:
+                entries.pop(name, None)
+            else:
+                entries[name] = (entry.mtime, entry.is_dir, entry.size)
+        return sorted(
+            (name, mtime, is_dir, size) for name, (mtime, is_dir, size) in entries.items()
+        )
+
+    def _on_folder_timeout(self) -> None:
+        """Handle the debounce timeout of the folder that owns the sender timer."""
+        timer = self.sender()
+        if timer is not None:
+            self._process_folder(timer.property("folder_key"))
+
+    def _process_folder(self, key: str) -> None:
         """
-        Handle debounce timeout - check snapshot and emit if changed.
+        Handle a folder's debounce timeout - check snapshot and emit if changed.
 
-        Only emits filesystem_changed if snapshot actually changed.
+        Only emits folder_delta/filesystem_changed if snapshot actually changed.
         Detects folder rename/move and emits folder_renamed signal.
         """
         from app.core.logger import get_logger
         logger = get_logger(__name__)
 
-        logger.debug(f"Watcher debounce timeout: ignore_events={self._ignore_events}, watched_folder={self._watched_folder}")
+        folder = self._folders.get(key)
+        logger.debug(f"Watcher debounce timeout: ignore_events={self._ignore_events}, folder={folder.path if folder else None}")
 
         if self._ignore_events:
             logger.debug("Watcher: skipping, events are being ignored")
             return
-        if not self._watched_folder:
-            logger.debug("Watcher: skipping, no watched folder")
+        if folder is None:
+            logger.debug("Watcher: skipping, folder is no longer watched")
+            return
+
+        folder_path = folder.path
+        previous_snapshot = folder.snapshot
+        moves = None
+        if self._inotify is not None:
+            # Recoger eventos aún no entregados por el bucle de eventos
+            self._inotify.read_events()
+        if self._inotify is not None and not folder.needs_rescan:
+            current_snapshot = self._apply_inotify_changes(folder)
+            moves, moved_away = folder.moves, folder.moved_away
+        else:
+            # Take new snapshot
+            current_snapshot = self._take_snapshot(folder_path)
+        folder.changed_names = {}
+        folder.moves = []
+        folder.moved_away = set()
+        folder.needs_rescan = False
+
+        # Only process if snapshot changed
+        if self._snapshots_equal(previous_snapshot, current_snapshot):
             return
 
-        # Take new snapshot
-        current_snapshot = self._take_snapshot(self._watched_folder)
-
-        # Only process if snapshot changed (and we have a previous snapshot)
-        if self._previous_snapshot is not None and not self._snapshots_equal(self._previous_snapshot, current_snapshot):
-            logger.debug("Watcher: snapshot changed, processing changes")
-            # Try to detect folder rename/move (simple rename in same directory)
-            rename_info = self._detect_folder_rename(
-                self._previous_snapshot,
-                current_snapshot,
-                self._watched_folder
+        logger.debug(f"Watcher: snapshot changed in '{folder_path}', processing changes")
+        if moves is not None:
+            self._emit_exact_folder_changes(
+                previous_snapshot, current_snapshot, folder_path, moves, moved_away
             )
+        else:
+            self._emit_snapshot_folder_changes(previous_snapshot, current_snapshot, folder_path)
+        
+        delta = self._compute_delta(previous_snapshot, current_snapshot, folder_path)
+        # Un manejador de las señales anteriores puede haber dejado de observar la carpeta
+        if key in self._folders:
+            folder.snapshot = current_snapshot
+        # Las identidades y listados cacheados de la carpeta ya no son fiables
+        invalidate_folder(folder_path)
+        invalidate_listing(folder_path)
+        # Miniaturas de archivos modificados o eliminados
+        evict_icon_paths(delta.changed_paths())
+        self.folder_delta.emit(delta)
+        self.filesystem_changed.emit(folder_path)
+
+    def _emit_exact_folder_changes(
+        self,
+        previous_snapshot: list[tuple[str, float, bool, int]],
+        current_snapshot: list[tuple[str, float, bool, int]],
+        folder_path: str,
+        moves: list[tuple[str, str, bool]],
+        moved_away: set[str]
+    ) -> None:
+        """
+        Emit folder signals from exact inotify changes.
 
-            if rename_info:
-                old_path, new_path = rename_info
-                logger.info(f"Watcher detected folder rename: '{old_path}' -> '{new_path}'")
-                self.folder_renamed.emit(old_path, new_path)
+        Renames and moves between watched folders are paired by cookie, so
+        any number of them is reported as folder_renamed (old_path, new_path).
+        """
+        old_folders = {name for name, mtime, is_dir, size in previous_snapshot if is_dir}
+        new_folders = {name for name, mtime, is_dir, size in current_snapshot if is_dir}
+        renamed_from: set[str] = set()
+        renamed_to: set[str] = set()
+        moved_between_folders = bool(moved_away)
+
+        for old_path, new_path, is_dir in moves:
+            if not is_dir:
+                continue
+            self.folder_renamed.emit(old_path, new_path)
+            renamed_to.add(os.path.basename(new_path))
+            if normalize_path(os.path.dirname(old_path)) == normalize_path(folder_path):
+                renamed_from.add(os.path.basename(old_path))
             else:
-                # Detect folders that disappeared without replacement (moved outside watched directory)
-                disappeared_folders = self._detect_disappeared_folders(
-                    self._previous_snapshot,
-                    current_snapshot,
-                    self._watched_folder
-                )
-                for folder_path in disappeared_folders:
-                    self.folder_deleted.emit(folder_path)
-                    self.folder_disappeared.emit(folder_path)
-                
-                # Detect folders that appeared (were created)
-                appeared_folders = self._detect_appeared_folders(
-                    self._previous_snapshot,
-                    current_snapshot,
-                    self._watched_folder
-                )
-                for folder_path in appeared_folders:
-                    self.folder_created.emit(folder_path)
-                
-                # Detect structural changes (moves between parents, multiple changes)
-                # Si hay cambios que no son renames simples, requiere resincronización estructural
-                if self._has_structural_changes(
-                    self._previous_snapshot,
-                    current_snapshot
-                ):
-                    self.structural_change_detected.emit(self._watched_folder)
+                moved_between_folders = True
+
+        disappeared = old_folders - new_folders - renamed_from - moved_away
+        for name in disappeared:
+            disappeared_path = os.path.join(folder_path, name)
+            self.folder_deleted.emit(disappeared_path)
+            self.folder_disappeared.emit(disappeared_path)
+
+        appeared = new_folders - old_folders - renamed_to
+        for name in appeared:
+            self.folder_created.emit(os.path.join(folder_path, name))
+
+        # Carpetas que entran o salen de esta carpeta: resincronización estructural
+        if disappeared or appeared or moved_between_folders:
+            self.structural_change_detected.emit(folder_path)
+
+    def _emit_snapshot_folder_changes(
+        self,
+        previous_snapshot: list[tuple[str, float, bool, int]],
+        current_snapshot: list[tuple[str, float, bool, int]],
+        folder_path: str
+    ) -> None:
+        """Emit folder signals guessed from a snapshot comparison."""
+        from app.core.logger import get_logger
+        logger = get_logger(__name__)
+
+        # Try to detect folder rename/move (simple rename in same directory)
+        rename_info = self._detect_folder_rename(previous_snapshot, current_snapshot, folder_path)
+
+        if rename_info:
+            old_path, new_path = rename_info
+            logger.info(f"Watcher detected folder rename: '{old_path}' -> '{new_path}'")
+            self.folder_renamed.emit(old_path, new_path)
+        else:
+            # Detect folders that disappeared without replacement (moved outside watched directory)
+            disappeared_folders = self._detect_disappeared_folders(
+                previous_snapshot, current_snapshot, folder_path
+            )
+            for disappeared_path in disappeared_folders:
+                self.folder_deleted.emit(disappeared_path)
+                self.folder_disappeared.emit(disappeared_path)
+            
+            # Detect folders that appeared (were created)
+            appeared_folders = self._detect_appeared_folders(
+                previous_snapshot, current_snapshot, folder_path
+            )
+            for appeared_path in appeared_folders:
+                self.folder_created.emit(appeared_path)
             
-            self._previous_snapshot = current_snapshot
-            self.filesystem_changed.emit(self._watched_folder)
+            # Detect structural changes (moves between parents, multiple changes)
+            # Si hay cambios que no son renames simples, requiere resincronización estructural
+            if self._has_structural_changes(previous_snapshot, current_snapshot):
+                self.structural_change_detected.emit(folder_path)
@@ -0,0 +1,104 @@
+"""
+FolderListingCache - Process-wide cache of folder listings for watched folders.
+
+Only folders currently tracked by a FileSystemWatcherService are cached: the
+watcher drops a folder's listings as soon as it sees an event there, so going
+back to a tab or searching its files needs no rescan. Each listing also keeps
+the folder mtime it was built from, which covers changes made by the app itself
+before the watcher event is delivered. Untracked folders are never cached.
+"""
+
+import os
+import threading
+from typing import Hashable, List, Optional
+
+from app.models.path_utils import normalize_path
+
+# folder_key -> número de watchers que la observan
+_tracked: dict[str, int] = {}
+# folder_key -> {listing_key: (signature, items)}
+_listings: dict[str, dict[Hashable, tuple[int, list]]] = {}
+_lock = threading.Lock()
+
+
+def track_folder(folder_path: str) -> None:
+    """Mark a folder as watched (its listings may be cached)."""
+    key = normalize_path(folder_path)
+    with _lock:
+        _tracked[key] = _tracked.get(key, 0) + 1
+
+
+def untrack_folder(folder_path: str) -> None:
+    """Stop caching a folder once no watcher observes it anymore."""
+    key = normalize_path(folder_path)
+    with _lock:
+        count = _tracked.get(key, 0) - 1
+        if count > 0:
+            _tracked[key] = count
+        else:
+            _tracked.pop(key, None)
+            _listings.pop(key, None)
+
+
+def is_tracked(folder_path: str) -> bool:
+    """True if a watcher currently observes the folder."""
+    with _lock:
+        return normalize_path(folder_path) in _tracked
+
+
+def get_listing_signature(folder_path: str) -> Optional[int]:
+    """
+    Get the signature a listing of this folder would be cached under.
+
+    Take it BEFORE scanning, so a change during the scan invalidates the result.
+
+    Returns:
+        Folder mtime in ns, or None if the folder is not watched or not accessible.
+    """
+    if not is_tracked(folder_path):
+        return None
+    try:
+        return os.stat(folder_path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_listing(folder_path: str, listing_key: Hashable, signature: int) -> Optional[List]:
+    """
+    Get a cached listing of a watched folder.
+
+    Args:
+        folder_path: Listed folder.
+        listing_key: Listing variant (e.g. extensions and stacking).
+        signature: Current signature from get_listing_signature().
+
+    Returns:
+        Copy of the cached items, or None on miss.
+    """
+    with _lock:
+        bucket = _listings.get(normalize_path(folder_path))
+        cached = bucket.get(listing_key) if bucket else None
+        if cached is None or cached[0] != signature:
+            return None
+        return list(cached[1])
+
+
+def store_listing(folder_path: str, listing_key: Hashable, items: List, signature: int) -> None:
+    """Cache a listing if the folder is still watched (no-op otherwise)."""
+    key = normalize_path(folder_path)
+    with _lock:
+        if key in _tracked:
+            _listings.setdefault(key, {})[listing_key] = (signature, list(items))
+
+
+def invalidate_listing(folder_path: str) -> None:
+    """Drop cached listings of a folder (it changed on disk)."""
+    with _lock:
+        _listings.pop(normalize_path(folder_path), None)
+
+
+def clear_listing_cache() -> None:
+    """Drop every cached listing and tracked folder."""
+    with _lock:
+        _tracked.clear()
+        _listings.clear()
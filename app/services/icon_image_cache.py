@@ -0,0 +1,167 @@
+"""
+IconImageCache - Byte-budgeted LRU cache for rendered icon images.
+
+Used by GridIconLoader to keep QImage results keyed by (file_path, width, height).
+Each entry remembers the file (size, mtime) it was rendered from and is dropped
+on lookup when the file changed. FileSystemWatcherService evicts changed paths
+through evict_paths(), which reaches every live cache.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from PySide6.QtGui import QImage
+
+from app.core.constants import MAX_GRID_ICON_CACHE_SIZE_MB
+from app.models.path_utils import normalize_path
+from app.services.file_identity_cache import get_file_signature
+
+# Caches vivas, para que el watcher pueda expulsar paths sin conocer los loaders
+_live_caches: "weakref.WeakSet[IconImageCache]" = weakref.WeakSet()
+_live_caches_lock = threading.Lock()
+
+
+class IconImageCache:
+    """Thread-safe LRU of QImage entries with byte accounting and (size, mtime) validation."""
+
+    def __init__(self, max_bytes: int = MAX_GRID_ICON_CACHE_SIZE_MB * 1024 * 1024):
+        """
+        Initialize cache.
+        
+        Args:
+            max_bytes: Byte budget; least recently used entries are evicted past it.
+        """
+        self._max_bytes = max_bytes
+        # (file_path, width, height) -> (image, signature, size_bytes)
+        self._entries: OrderedDict[tuple, tuple[QImage, Optional[tuple[int, float]], int]] = OrderedDict()
+        # normalized path -> keys (para expulsar todos los tamaños de un path)
+        self._keys_by_path: dict[str, set[tuple]] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        with _live_caches_lock:
+            _live_caches.add(self)
+
+    def get(self, file_path: str, width: int, height: int) -> Optional[QImage]:
+        """
+        Get cached image if the file did not change since it was rendered.
+        
+        Returns:
+            Cached QImage, or None on miss or stale entry.
+        """
+        key = (file_path, width, height)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        # Validación fuera del lock: puede requerir un stat
+        signature = get_file_signature(file_path)
+        with self._lock:
+            if signature != entry[1]:
+                if self._entries.get(key) is entry:
+                    self._remove_locked(key)
+                self._invalidations += 1
+                self._misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, file_path: str, width: int, height: int, image: QImage) -> None:
+        """Store an image rendered for the current (size, mtime) of the file."""
+        if image is None or image.isNull():
+            return
+        signature = get_file_signature(file_path)
+        size_bytes = image.sizeInBytes()
+        key = (file_path, width, height)
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._ensure_space_locked(size_bytes)
+            self._entries[key] = (image, signature, size_bytes)
+            self._keys_by_path.setdefault(normalize_path(file_path), set()).add(key)
+            self._total_bytes += size_bytes
+
+    def evict_paths(self, paths: Iterable[str]) -> int:
+        """
+        Drop every cached size of the given paths.
+        
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            for path in paths:
+                for key in list(self._keys_by_path.get(normalize_path(path), ())):
+                    self._remove_locked(key)
+                    removed += 1
+            self._invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Get counters for diagnostics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self._max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+            }
+
+    def _remove_locked(self, key: tuple) -> None:
+        """Remove entry and update accounting; caller holds _lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry[2]
+        path_key = normalize_path(key[0])
+        keys = self._keys_by_path.get(path_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_path[path_key]
+
+    def _ensure_space_locked(self, new_entry_size: int) -> None:
+        """
+        Evict least recently used entries when the budget would be exceeded.
+        
+        Like IconService, cleans down to 80% of the budget so eviction does
+        not run on every insert.
+        """
+        if self._total_bytes + new_entry_size <= self._max_bytes:
+            return
+        target = self._max_bytes * 0.8
+        while self._entries and self._total_bytes + new_entry_size > target:
+            oldest_key = next(iter(self._entries))
+            self._remove_locked(oldest_key)
+            self._evictions += 1
+
+
+def evict_paths(paths: Iterable[str]) -> None:
+    """Evict the given paths from every live IconImageCache (watcher hook)."""
+    paths = list(paths)
+    if not paths:
+        return
+    with _live_caches_lock:
+        caches = list(_live_caches)
+    for cache in caches:
+        cache.evict_paths(paths)
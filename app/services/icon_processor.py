@@ -80,10 +80,10 @@ def has_excessive_whitespace(pixmap: QPixmap, threshold: float = 0.4) -> bool:
     if total_pixels == 0:
         return False
     
-    from app.services.pixel_analyzer import count_content_pixels, find_content_bounds
+    from app.services.pixel_analyzer import analyze_content
     
-    min_x, min_y, max_x, max_y = find_content_bounds(image)
-    content_pixels = count_content_pixels(image)
+    # Bounds y conteo en una sola pasada sobre el buffer de la imagen
+    (min_x, min_y, max_x, max_y), content_pixels = analyze_content(image)
     
     if min_x >= max_x or min_y >= max_y:
         return True
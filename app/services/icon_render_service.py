@@ -6,16 +6,31 @@ optimizations (grid vs list). Uses IconService for raw Windows icons.
 """
 
 import os
-from typing import Optional
+import threading
+from typing import Iterable, Iterator, Optional
 
 from PySide6.QtCore import QFileInfo, QSize, Qt
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import QFileIconProvider
 
 from app.services.icon_service import IconService
 from app.services.icon_normalizer import apply_visual_normalization, normalize_for_list
 from app.services.preview_service import get_file_preview, get_windows_shell_icon
 from app.services.icon_fallback_helper import safe_pixmap
+from app.services.icon_renderer import has_embedded_thumbnail, render_image_previews_image
+from app.services.preview_file_extensions import (
+    OFFICE_THUMBNAIL_EXTENSIONS,
+    PREVIEW_IMAGE_EXTENSIONS,
+    RASTER_IMAGE_EXTENSIONS,
+    normalize_extension,
+)
+from app.services.thumbnail_disk_cache import load_thumbnail, store_thumbnail
+
+# Extensiones cuyo icono depende del archivo concreto (miniaturas, accesos
+# directos, iconos embebidos): nunca se cachean por extensión
+PER_FILE_PREVIEW_EXTENSIONS = PREVIEW_IMAGE_EXTENSIONS | frozenset({
+    '.lnk', '.url', '.cur', '.ani', '.appref-ms'
+})
 
 
 class IconRenderService:
@@ -24,6 +39,12 @@ class IconRenderService:
     
     Handles previews (PDF/DOCX), visual normalization, grid/list differences,
     and visual fallbacks. Uses IconService internally for raw Windows icons.
+    
+    Grid previews of generic extensions (.docx, .xlsx, ...) only depend on the
+    extension and size, so they are rendered once and kept as QImage in a
+    lock-protected cache. Per-file previews (images, folders, documents with
+    an embedded thumbnail) go to the persistent thumbnail store. One instance
+    can be shared by worker threads.
     """
 
     def __init__(self, icon_service: IconService):
@@ -35,13 +56,112 @@ class IconRenderService:
         """
         self._icon_service = icon_service
         self._icon_provider = QFileIconProvider()
+        self._extension_cache: dict[tuple[str, int, int], QImage] = {}
+        self._cache_lock = threading.Lock()
+
+    @property
+    def icon_provider(self) -> QFileIconProvider:
+        """QFileIconProvider shared by this render pipeline."""
+        return self._icon_provider
+
+    def _extension_cache_key(self, path: str, size: QSize) -> Optional[tuple[str, int, int]]:
+        """Get (ext, width, height) cache key, or None if preview is per-file."""
+        ext = normalize_extension(path)
+        if not ext or ext in PER_FILE_PREVIEW_EXTENSIONS:
+            return None
+        # Office/OpenDocument: por archivo solo si lleva miniatura embebida;
+        # los demás comparten el icono de su extensión
+        if ext in OFFICE_THUMBNAIL_EXTENSIONS and has_embedded_thumbnail(path):
+            return None
+        return ext, size.width(), size.height()
+
+    def _get_cached_extension_image(self, key: Optional[tuple[str, int, int]]) -> Optional[QImage]:
+        """Get cached preview image for an extension key."""
+        if key is None:
+            return None
+        with self._cache_lock:
+            return self._extension_cache.get(key)
+
+    def _store_extension_image(self, key: Optional[tuple[str, int, int]], pixmap: QPixmap) -> None:
+        """Cache a rendered preview for an extension key (R16: only valid pixmaps)."""
+        if key is None or not self._is_valid_pixmap(pixmap):
+            return
+        image = pixmap.toImage()
+        with self._cache_lock:
+            self._extension_cache.setdefault(key, image)
+
+    def clear_cache(self) -> None:
+        """Drop cached per-extension previews."""
+        with self._cache_lock:
+            self._extension_cache.clear()
+
+    def _lookup_preview(self, path: str, size: QSize, is_dir: bool) -> tuple[Optional[QImage], Optional[tuple[str, int, int]]]:
+        """
+        Look up a ready preview without rendering.
+        
+        Generic extensions use the in-memory per-extension cache; per-file
+        previews (images, folders, shortcuts) use the persistent thumbnail store.
+        
+        Returns:
+            (cached image or None, extension cache key or None).
+        """
+        cache_key = None if is_dir else self._extension_cache_key(path, size)
+        if cache_key is not None:
+            return self._get_cached_extension_image(cache_key), cache_key
+        return load_thumbnail(path, size), None
+
+    def _store_preview(self, path: str, size: QSize, cache_key: Optional[tuple[str, int, int]], pixmap: QPixmap) -> None:
+        """Keep a rendered preview in the extension cache or the persistent store."""
+        if cache_key is not None:
+            self._store_extension_image(cache_key, pixmap)
+        elif self._is_valid_pixmap(pixmap):
+            store_thumbnail(path, size, pixmap.toImage())
+
+    def get_file_preview_image(self, path: str, size: QSize) -> QImage:
+        """
+        Get grid preview as QImage (for worker threads).
+        
+        Same result as get_file_preview, but cached previews are returned
+        without a QPixmap round trip.
+        """
+        is_dir = os.path.isdir(path)
+        cached, cache_key = self._lookup_preview(path, size, is_dir)
+        if cached is not None:
+            return cached
+        pixmap = self._render_preview(path, size, is_dir, cache_key)
+        return pixmap.toImage() if self._is_valid_pixmap(pixmap) else QImage()
+
+    def get_file_preview_images(self, paths: Iterable[str], size: QSize) -> Iterator[tuple[str, QImage]]:
+        """
+        Get grid previews of many image files (e.g. a whole folder) as QImage.
+        
+        Previews already in the persistent thumbnail store are yielded first;
+        the rest are decoded in parallel (render_image_previews_image) and
+        normalized (with the same fallbacks) like get_file_preview_image.
+        Paths that are not raster images are skipped. Yields (path, QImage).
+        """
+        to_render = []
+        for path in paths:
+            if normalize_extension(path) not in RASTER_IMAGE_EXTENSIONS:
+                continue
+            cached = load_thumbnail(path, size)
+            if cached is not None:
+                yield path, cached
+            else:
+                to_render.append(path)
+        
+        for path, image in render_image_previews_image(to_render, size):
+            raw_pixmap = QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+            pixmap = self._finish_file_preview(path, size, raw_pixmap, None)
+            yield path, pixmap.toImage() if self._is_valid_pixmap(pixmap) else QImage()
 
     def get_file_preview(self, path: str, size: QSize) -> QPixmap:
         """
         Get file or folder preview with visual normalization.
         
         Returns preview with 90% scale, rounded corners, and fallbacks.
-        Optimized for grid view display.
+        Optimized for grid view display. Checks the per-extension cache and
+        the persistent thumbnail store before rendering.
         
         Args:
             path: File or folder path
@@ -50,34 +170,67 @@ class IconRenderService:
         Returns:
             QPixmap with normalized visual appearance
         """
-        if os.path.isdir(path):
-            return self._get_folder_preview(path, size)
+        is_dir = os.path.isdir(path)
+        cached, cache_key = self._lookup_preview(path, size, is_dir)
+        if cached is not None:
+            return QPixmap.fromImage(cached)
+        return self._render_preview(path, size, is_dir, cache_key)
+
+    def _render_preview(
+        self,
+        path: str,
+        size: QSize,
+        is_dir: bool,
+        cache_key: Optional[tuple[str, int, int]]
+    ) -> QPixmap:
+        """Render grid preview and keep it for next time (fallbacks are not kept)."""
+        if is_dir:
+            result = self._get_folder_preview(path, size)
+            self._store_preview(path, size, None, result)
+            return result
+
+        raw_pixmap = get_file_preview(path, size, self._icon_provider)
+        return self._finish_file_preview(path, size, raw_pixmap, cache_key)
+
+    def _finish_file_preview(
+        self,
+        path: str,
+        size: QSize,
+        raw_pixmap: QPixmap,
+        cache_key: Optional[tuple[str, int, int]]
+    ) -> QPixmap:
+        """Normalize a raw file preview for the grid and keep it (fallbacks are not kept)."""
+        _, ext = os.path.splitext(path)
+        ext = ext.lower() if ext else ""
+        
+        # Archivo inexistente o fuera de límites: no cachear el fallback
+        cacheable = self._is_valid_pixmap(raw_pixmap)
+        
+        # Para ejecutables: el SVG ya viene renderizado desde preview_service
+        # Nota: .lnk NO está incluido aquí - los accesos directos usan iconos nativos de Windows
+        # No aplicar normalización visual completa que puede hacerlo transparente
+        executable_extensions = {'.exe', '.msi', '.bat', '.cmd', '.ps1', '.sh'}
+        
+        if ext in executable_extensions:
+            # El SVG ya viene del tamaño correcto desde preview_service
+            # Solo aplicar escalado suave si es necesario
+            if raw_pixmap.width() != size.width() or raw_pixmap.height() != size.height():
+                scaled = raw_pixmap.scaled(
+                    size.width(), size.height(),
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                result = scaled if not scaled.isNull() else raw_pixmap
+            else:
+                result = raw_pixmap
         else:
-            _, ext = os.path.splitext(path)
-            ext = ext.lower() if ext else ""
-            
-            raw_pixmap = get_file_preview(path, size, self._icon_provider)
-            
-            # Para ejecutables: el SVG ya viene renderizado desde preview_service
-            # Nota: .lnk NO está incluido aquí - los accesos directos usan iconos nativos de Windows
-            # No aplicar normalización visual completa que puede hacerlo transparente
-            executable_extensions = {'.exe', '.msi', '.bat', '.cmd', '.ps1', '.sh'}
-            
-            if ext in executable_extensions:
-                # El SVG ya viene del tamaño correcto desde preview_service
-                # Solo aplicar escalado suave si es necesario
-                if raw_pixmap.width() != size.width() or raw_pixmap.height() != size.height():
-                    scaled = raw_pixmap.scaled(
-                        size.width(), size.height(),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    return scaled if not scaled.isNull() else raw_pixmap
-                return raw_pixmap
-            
             # Para otros archivos: aplicar normalización visual completa
             normalized = apply_visual_normalization(raw_pixmap, size)
-            return safe_pixmap(normalized, size.width(), ext)
+            result = safe_pixmap(normalized, size.width(), ext)
+        
+        if cacheable:
+            self._store_preview(path, size, cache_key, result)
+        return result
 
     def _is_valid_pixmap(self, pixmap: QPixmap) -> bool:
         """Validar pixmap según R16: no nulo, no 0x0, válido visualmente."""
@@ -8,6 +8,7 @@ Actual implementations are in separate modules:
 - icon_renderer_pdf.py: PDF preview rendering
 - icon_renderer_docx.py: DOCX preview rendering
 - icon_renderer_image.py: Image preview rendering
+- icon_renderer_office.py: Office/OpenDocument embedded thumbnails
 - icon_renderer_svg.py: SVG icon rendering
 - icon_renderer_constants.py: Constants and mappings
 """
@@ -15,7 +16,16 @@ Actual implementations are in separate modules:
 # Re-export public APIs for backward compatibility
 from app.services.icon_renderer_constants import POPPLER_PATH, SVG_COLOR_MAP, SVG_ICON_MAP
 from app.services.icon_renderer_docx import render_word_preview
-from app.services.icon_renderer_image import render_image_preview
+from app.services.icon_renderer_image import (
+    render_image_preview,
+    render_image_preview_image,
+    render_image_previews_image,
+)
+from app.services.icon_renderer_office import (
+    has_embedded_thumbnail,
+    render_office_thumbnail,
+    render_office_thumbnail_image,
+)
 from app.services.icon_renderer_pdf import render_pdf_preview
 from app.services.icon_renderer_svg import get_svg_for_extension, render_svg_icon
 
@@ -26,6 +36,11 @@ __all__ = [
     'render_pdf_preview',
     'render_word_preview',
     'render_image_preview',
+    'render_image_preview_image',
+    'render_image_previews_image',
+    'has_embedded_thumbnail',
+    'render_office_thumbnail',
+    'render_office_thumbnail_image',
     'get_svg_for_extension',
     'render_svg_icon',
 ]
@@ -3,30 +3,138 @@ IconRendererImage - Image preview rendering.
 
 Handles rendering of image files as thumbnails.
 
+JPEGs are never fully decoded for a thumbnail: the embedded EXIF thumbnail is
+used when it is big enough, otherwise the decoder scales down while loading
+(Pillow draft). EXIF orientation is applied to the small result only.
+
 R12: Hard file size limits prevent preview of oversized files.
 R13: Early existence validation before rendering.
 R14: Pixmap validation before returning.
 """
 
-from PIL import Image, ImageOps
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+
+from PIL import ExifTags, Image
 from PIL.ImageQt import ImageQt
 from PySide6.QtCore import QSize
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QImage, QPixmap
 
+from app.core.constants import IMAGE_THUMBNAIL_BATCH_WORKERS
 from app.services.preview_file_extensions import validate_file_for_preview, validate_pixmap
 
+# Transformación que normaliza cada valor de orientación EXIF (como ImageOps.exif_transpose)
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Orientaciones que intercambian ancho y alto
+_SWAPPED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+# Tolerancia de relación de aspecto de la miniatura EXIF (evita miniaturas con bandas)
+_EXIF_THUMBNAIL_ASPECT_TOLERANCE = 0.02
+
+# Decodificar al doble del tamaño final y reducir con LANCZOS (reducing_gap de Pillow)
+_DRAFT_REDUCING_GAP = 2
+
+_JPEG_INTERCHANGE_FORMAT = 0x0201
+_JPEG_INTERCHANGE_FORMAT_LENGTH = 0x0202
+
 
-def _normalize_exif_orientation(img: Image.Image) -> Image.Image:
+def _get_exif_orientation(img: Image.Image) -> int:
+    """Read the EXIF orientation tag (1 if missing or unreadable)."""
+    try:
+        orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+    except Exception:
+        return 1
+    return orientation if orientation in _ORIENTATION_TRANSPOSE else 1
+
+
+def _apply_exif_orientation(img: Image.Image, orientation: int) -> Image.Image:
     """
-    Normaliza la orientación EXIF de la imagen aplicando la rotación/espejo real.
-    
-    Lee el metadato EXIF de orientación, aplica la transformación al bitmap
-    y devuelve una imagen ya normalizada sin metadatos de orientación.
+    Normaliza la orientación EXIF aplicando la rotación/espejo real.
+
+    Se aplica sobre la miniatura ya reducida, no sobre la imagen completa.
     """
+    method = _ORIENTATION_TRANSPOSE.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+
+def _fit_size(width: int, height: int, max_width: int, max_height: int) -> tuple[int, int]:
+    """Size of (width, height) scaled to fit the box, keeping aspect ratio."""
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _load_exif_thumbnail(img: Image.Image, min_width: int, min_height: int) -> Optional[Image.Image]:
+    """
+    Get the JPEG thumbnail embedded in the EXIF block if it can be used.
+
+    Only used when it covers the requested size and has the same aspect ratio
+    as the full image (some cameras pad the thumbnail with black bands).
+    """
+    exif_bytes = img.info.get("exif")
+    if not exif_bytes:
+        return None
     try:
-        return ImageOps.exif_transpose(img)
-    except (AttributeError, TypeError, ValueError):
-        return img
+        ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset = ifd1.get(_JPEG_INTERCHANGE_FORMAT)
+        length = ifd1.get(_JPEG_INTERCHANGE_FORMAT_LENGTH)
+        if not offset or not length:
+            return None
+        # Los offsets son relativos a la cabecera TIFF, tras "Exif\0\0"
+        start = offset + (6 if exif_bytes.startswith(b"Exif\x00\x00") else 0)
+        thumbnail = Image.open(io.BytesIO(exif_bytes[start:start + length]))
+        thumbnail.load()
+    except Exception:
+        return None
+
+    thumb_width, thumb_height = thumbnail.size
+    if thumb_width < min_width or thumb_height < min_height:
+        return None
+    aspect = img.width / img.height
+    if abs(thumb_width / thumb_height - aspect) > aspect * _EXIF_THUMBNAIL_ASPECT_TOLERANCE:
+        return None
+    return thumbnail
+
+
+def _open_thumbnail_source(path: str, size: QSize) -> Image.Image:
+    """
+    Open an image reduced as close as possible to size, already oriented.
+
+    JPEG: EXIF thumbnail if big enough, else DCT scaling while decoding.
+    Other formats are decoded at full resolution.
+    """
+    img = Image.open(path)
+    orientation = _get_exif_orientation(img)
+
+    # La caja se expresa en la orientación almacenada en el archivo
+    box_width, box_height = size.width(), size.height()
+    if orientation in _SWAPPED_ORIENTATIONS:
+        box_width, box_height = box_height, box_width
+    fit_width, fit_height = _fit_size(img.width, img.height, box_width, box_height)
+
+    if img.format == "JPEG":
+        source = _load_exif_thumbnail(img, fit_width, fit_height)
+        if source is not None:
+            img = source
+        else:
+            img.draft("RGB", (fit_width * _DRAFT_REDUCING_GAP, fit_height * _DRAFT_REDUCING_GAP))
+
+    if img.mode == 'RGBA':
+        pass
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    img.thumbnail((box_width, box_height), Image.Resampling.LANCZOS)
+    return _apply_exif_orientation(img, orientation)
 
 
 def render_image_preview(path: str, size: QSize) -> QPixmap:
@@ -37,30 +145,71 @@ def render_image_preview(path: str, size: QSize) -> QPixmap:
     R13: Early existence validation before rendering.
     R14: Pixmap validation before returning.
     """
+    image = render_image_preview_image(path, size)
+    if image.isNull():
+        return QPixmap()  # R4: Fallback
+    
+    pixmap = QPixmap.fromImage(image)
+    
+    # R14: Validate pixmap before returning
+    if not validate_pixmap(pixmap):
+        return QPixmap()  # R4: Fallback
+    
+    return pixmap
+
+
+def render_image_preview_image(path: str, size: QSize) -> QImage:
+    """
+    Render image file as preview QImage (safe outside the GUI thread).
+    
+    R12: Hard file size limits prevent preview of oversized files.
+    R13: Early existence validation before rendering.
+    R14: Image validation before returning.
+    """
     # R13: Early existence and type validation
     # R12: Hard size limit check
     is_valid, error_msg = validate_file_for_preview(path)
     if not is_valid:
-        return QPixmap()  # R4: Fallback
+        return QImage()  # R4: Fallback
     
     try:
-        img = Image.open(path)
-        
-        img = _normalize_exif_orientation(img)
-        
-        if img.mode == 'RGBA':
-            pass
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        img = _open_thumbnail_source(path, size)
+        # copy(): el QImage no depende del buffer de PIL
+        image = ImageQt(img).copy()
         
-        img.thumbnail((size.width(), size.height()), Image.Resampling.LANCZOS)
-        pixmap = QPixmap.fromImage(ImageQt(img))
+        # R14: Validate image before returning
+        if not validate_pixmap(image):
+            return QImage()  # R4: Fallback
         
-        # R14: Validate pixmap before returning
-        if not validate_pixmap(pixmap):
-            return QPixmap()  # R4: Fallback
-        
-        return pixmap
+        return image
     except Exception:
-        return QPixmap()  # R4: Fallback
+        return QImage()  # R4: Fallback
+
 
+def render_image_previews_image(
+    paths: Iterable[str],
+    size: QSize,
+    max_workers: int = IMAGE_THUMBNAIL_BATCH_WORKERS
+) -> Iterator[tuple[str, QImage]]:
+    """
+    Render a batch of image previews (e.g. a whole folder) in parallel.
+
+    Pillow releases the GIL while decoding, so the files are spread over a
+    thread pool. Yields (path, QImage) as each one finishes; failed files
+    yield an empty QImage (R4).
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(paths))),
+        thread_name_prefix="ImageThumbnails"
+    ) as executor:
+        futures = {executor.submit(render_image_preview_image, path, size): path for path in paths}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Consumidor que abandona el lote: no decodificar el resto
+            for future in futures:
+                future.cancel()
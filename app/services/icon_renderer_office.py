@@ -0,0 +1,165 @@
+"""
+IconRendererOffice - Office and OpenDocument preview rendering.
+
+Uses the thumbnail that Office (docProps/thumbnail.jpeg) and LibreOffice
+(Thumbnails/thumbnail.png) store inside the document package. Only that zip
+member is read: no extraction, no Word/Excel automation. Files without an
+embedded thumbnail give an empty result so callers fall back to the icon.
+Whether a file has a thumbnail is remembered per file version, so repeated
+lookups (grid cache hits, list rows) do not reopen the package.
+
+R4: Empty pixmap/QImage on failure.
+R13: Early existence validation before rendering.
+R14: Pixmap validation before returning.
+"""
+
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Optional
+
+from PIL import Image
+from PIL.ImageQt import ImageQt
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPixmap
+
+from app.services.file_identity_cache import get_file_signature
+from app.services.preview_file_extensions import (
+    OFFICE_THUMBNAIL_EXTENSIONS,
+    normalize_extension,
+    validate_file_for_preview,
+    validate_pixmap,
+)
+
+# Miembros del paquete que pueden contener la miniatura, por preferencia.
+# Las miniaturas WMF/EMF de Office antiguo no las decodifica Pillow en
+# todas las plataformas: se ignoran y se usa el icono.
+_THUMBNAIL_MEMBERS = (
+    'docProps/thumbnail.jpeg',
+    'docProps/thumbnail.jpg',
+    'docProps/thumbnail.png',
+    'Thumbnails/thumbnail.png',
+)
+
+# Límite de la miniatura descomprimida (evita zips malformados o bombas)
+_MAX_THUMBNAIL_BYTES = 4 * 1024 * 1024
+
+# (path, size, mtime) -> tiene miniatura; LRU acotado
+_MAX_CACHED_PACKAGES = 4096
+_has_thumbnail_cache: "OrderedDict[tuple[str, int, float], bool]" = OrderedDict()
+_has_thumbnail_lock = threading.Lock()
+
+
+def _find_thumbnail_member(archive: zipfile.ZipFile) -> Optional[zipfile.ZipInfo]:
+    """Get the embedded thumbnail entry, if any and within the size limit."""
+    for name in _THUMBNAIL_MEMBERS:
+        try:
+            info = archive.getinfo(name)
+        except KeyError:
+            continue
+        if 0 < info.file_size <= _MAX_THUMBNAIL_BYTES:
+            return info
+    return None
+
+
+def has_embedded_thumbnail(path: str) -> bool:
+    """
+    True if an Office/OpenDocument file carries a usable thumbnail.
+
+    Only the zip directory is read, once per file version (size + mtime,
+    taken from the folder listing when available).
+    """
+    if normalize_extension(path) not in OFFICE_THUMBNAIL_EXTENSIONS:
+        return False
+    signature = get_file_signature(path)
+    if signature is None:
+        return False
+    key = (path, *signature)
+    with _has_thumbnail_lock:
+        cached = _has_thumbnail_cache.get(key)
+        if cached is not None:
+            _has_thumbnail_cache.move_to_end(key)
+            return cached
+
+    try:
+        with zipfile.ZipFile(path) as archive:
+            result = _find_thumbnail_member(archive) is not None
+    except (OSError, zipfile.BadZipFile, ValueError):
+        result = False
+
+    with _has_thumbnail_lock:
+        _has_thumbnail_cache[key] = result
+        if len(_has_thumbnail_cache) > _MAX_CACHED_PACKAGES:
+            _has_thumbnail_cache.popitem(last=False)
+    return result
+
+
+def clear_embedded_thumbnail_cache() -> None:
+    """Forget which files have an embedded thumbnail."""
+    with _has_thumbnail_lock:
+        _has_thumbnail_cache.clear()
+
+
+def _load_embedded_thumbnail(path: str) -> Optional[Image.Image]:
+    """Decode the embedded thumbnail (None if missing or unreadable)."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            info = _find_thumbnail_member(archive)
+            if info is None:
+                return None
+            data = archive.read(info)
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+    return img
+
+
+def render_office_thumbnail(path: str, size: QSize) -> QPixmap:
+    """
+    Render an Office/OpenDocument file from its embedded thumbnail.
+
+    R13: Early existence validation before rendering.
+    R14: Pixmap validation before returning.
+    """
+    image = render_office_thumbnail_image(path, size)
+    if image.isNull():
+        return QPixmap()  # R4: Fallback
+
+    pixmap = QPixmap.fromImage(image)
+    if not validate_pixmap(pixmap):
+        return QPixmap()  # R4: Fallback
+    return pixmap
+
+
+def render_office_thumbnail_image(path: str, size: QSize) -> QImage:
+    """
+    Render an Office/OpenDocument thumbnail as QImage (safe outside the GUI thread).
+
+    The thumbnail is scaled down to fit size, never up: callers that need a
+    bigger preview scale the result themselves.
+    """
+    if normalize_extension(path) not in OFFICE_THUMBNAIL_EXTENSIONS:
+        return QImage()
+    # R13: Early existence validation
+    is_valid, _error = validate_file_for_preview(path)
+    if not is_valid:
+        return QImage()  # R4: Fallback
+
+    img = _load_embedded_thumbnail(path)
+    if img is None:
+        return QImage()  # R4: Fallback (sin miniatura: icono)
+    try:
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+        img.thumbnail((size.width(), size.height()), Image.Resampling.LANCZOS)
+        # copy(): el QImage no depende del buffer de PIL
+        image = ImageQt(img).copy()
+    except Exception:
+        return QImage()  # R4: Fallback
+
+    # R14: Validate image before returning
+    if not validate_pixmap(image):
+        return QImage()
+    return image
@@ -10,6 +10,7 @@ normalization, use IconRenderService.
 """
 
 import os
+import threading
 import time
 from collections import deque
 from typing import Callable, List, Optional, Tuple
@@ -49,6 +50,8 @@ class IconService:
         # Cache de timestamps de verificación de mtime (optimización)
         self._mtime_cache_timestamp: dict[str, float] = {}  # Última vez que se verificó mtime
         self._mtime_check_interval: float = 5.0  # Verificar mtime máximo cada 5 segundos
+        # Protege las estructuras del cache: la instancia se comparte con workers de GridIconLoader
+        self._cache_lock = threading.RLock()
 
     def _is_valid_pixmap(self, pixmap: QPixmap) -> bool:
         """Validar pixmap según R16: no nulo, no 0x0, válido visualmente."""
@@ -59,10 +62,15 @@ class IconService:
         return True
 
     def get_file_icon(self, file_path: str, size: QSize = None) -> QIcon:
-        """Get native Windows icon for a file."""
+        """Get native Windows icon for a file (thread-safe cache)."""
         if not file_path or not os.path.isfile(file_path):
             return self._get_default_icon()
 
+        with self._cache_lock:
+            return self._get_file_icon_locked(file_path, size)
+
+    def _get_file_icon_locked(self, file_path: str, size: Optional[QSize]) -> QIcon:
+        """Implementation of get_file_icon; caller holds _cache_lock."""
         _, ext = os.path.splitext(file_path)
         ext = ext.lower() if ext else ""
 
@@ -387,12 +395,13 @@ class IconService:
     
     def clear_cache(self) -> None:
         """Clear icon cache to free memory."""
-        self._icon_cache.clear()
-        self._icon_cache_mtime.clear()
-        self._icon_cache_access.clear()
-        self._icon_cache_size.clear()
-        self._mtime_cache_timestamp.clear()
-        self._cache_access_counter = 0
+        with self._cache_lock:
+            self._icon_cache.clear()
+            self._icon_cache_mtime.clear()
+            self._icon_cache_access.clear()
+            self._icon_cache_size.clear()
+            self._mtime_cache_timestamp.clear()
+            self._cache_access_counter = 0
     
     def cancel_all_workers(self) -> None:
         """Cancel all active workers and clear pending jobs queue."""
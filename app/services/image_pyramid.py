@@ -0,0 +1,312 @@
+"""
+ImagePyramid - Multi-resolution tiles of a large image.
+
+Level 0 is the full image and each next level halves it, down to a top level
+that fits in _TOP_LEVEL_SIZE. Levels are decoded on demand, so a view that
+only needs a reduced level never decodes the full image. JPEG levels are
+decoded straight at 1/2, 1/4 or 1/8 scale (Pillow draft); other formats are
+decoded once and reduced. EXIF orientation is applied to each level.
+
+Decoded levels are kept as 32-bit rows; large ones in a temporary file mapped
+in memory, so the OS can page them out instead of the process holding them.
+Tiles are copied out of a level on request.
+
+Thread safety: build_level() and tile() may be called from worker threads.
+close() may be called while a level is being built; the level is dropped.
+"""
+
+import math
+import mmap
+import tempfile
+import threading
+
+from PIL import Image
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from app.core.constants import IMAGE_TILE_SIZE, TILED_IMAGE_MIN_MEGAPIXELS
+from app.services.icon_renderer_image import (
+    _SWAPPED_ORIENTATIONS,
+    _apply_exif_orientation,
+    _get_exif_orientation,
+)
+from app.services.preview_file_extensions import (
+    RASTER_IMAGE_EXTENSIONS,
+    normalize_extension,
+    validate_file_for_preview,
+)
+
+# Lado máximo del nivel superior (el que se dibuja mientras llegan los tiles)
+_TOP_LEVEL_SIZE = 1024
+
+# Niveles a partir de este tamaño van a un archivo temporal mapeado en memoria
+_MAPPED_LEVEL_BYTES = 16 * 1024 * 1024
+
+# Filas convertidas a la vez al copiar una imagen en un nivel
+_STRIP_ROWS = 256
+
+# Mayor reducción que aplica el decodificador JPEG (draft)
+_MAX_DRAFT_SCALE = 8
+
+_QIMAGE_FORMATS = {
+    'RGBX': QImage.Format.Format_RGBX8888,
+    'RGBA': QImage.Format.Format_RGBA8888,
+}
+
+
+def should_tile_image(path: str) -> bool:
+    """True for raster images big enough to be shown by tiles (reads the header only)."""
+    if normalize_extension(path) not in RASTER_IMAGE_EXTENSIONS:
+        return False
+    is_valid, _error = validate_file_for_preview(path)
+    if not is_valid:
+        return False
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+    except Exception:
+        return False
+    return width * height >= TILED_IMAGE_MIN_MEGAPIXELS * 1_000_000
+
+
+class _LevelBuffer:
+    """Rows of one decoded level (RGBX or RGBA), in memory or in a mapped temp file."""
+
+    def __init__(self, width: int, height: int, mode: str):
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.stride = width * 4
+        size = self.stride * height
+        self._file = None
+        if size >= _MAPPED_LEVEL_BYTES:
+            self._file = tempfile.TemporaryFile(prefix="claritydesk_tiles_")
+            self._file.truncate(size)
+            self._data = mmap.mmap(self._file.fileno(), size)
+        else:
+            self._data = bytearray(size)
+
+    @property
+    def is_mapped(self) -> bool:
+        return self._file is not None
+
+    def write_image(self, img: Image.Image) -> None:
+        """Copy an image of the level size, converting it strip by strip."""
+        base_mode = 'RGBA' if self.mode == 'RGBA' else 'RGB'
+        for top in range(0, self.height, _STRIP_ROWS):
+            bottom = min(top + _STRIP_ROWS, self.height)
+            strip = img.crop((0, top, self.width, bottom))
+            if strip.mode != base_mode:
+                strip = strip.convert(base_mode)
+            if strip.mode != self.mode:
+                strip = strip.convert(self.mode)
+            self._data[top * self.stride:bottom * self.stride] = strip.tobytes()
+
+    def region(self, x: int, y: int, width: int, height: int) -> bytes:
+        """Copy a rectangle as packed rows."""
+        row_bytes = width * 4
+        start = y * self.stride + x * 4
+        end = start + height * self.stride
+        if width == self.width:
+            return bytes(self._data[start:end])
+        return b"".join(
+            self._data[offset:offset + row_bytes] for offset in range(start, end, self.stride)
+        )
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+        self._data = bytearray()
+
+
+class ImagePyramid:
+    """Lazily decoded resolution levels of one image, cut into tiles."""
+
+    def __init__(self, path: str, tile_size: int = IMAGE_TILE_SIZE):
+        """
+        Read the image header (no pixels are decoded).
+
+        Raises:
+            OSError: If the file cannot be opened as an image.
+        """
+        self._path = path
+        self._tile_size = tile_size
+        with Image.open(path) as img:
+            self._format = img.format
+            self._orientation = _get_exif_orientation(img)
+            self._source_size = img.size
+            self._mode = 'RGBA' if img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info else 'RGBX'
+
+        width, height = self._source_size
+        if self._orientation in _SWAPPED_ORIENTATIONS:
+            width, height = height, width
+        self._size = QSize(width, height)
+
+        levels = 1
+        while max(width, height) > _TOP_LEVEL_SIZE:
+            width = math.ceil(width / 2)
+            height = math.ceil(height / 2)
+            levels += 1
+        self._level_count = levels
+
+        self._levels: dict[int, _LevelBuffer] = {}
+        self._lock = threading.Lock()  # _levels y _closed
+        self._build_lock = threading.Lock()  # Un nivel decodificándose a la vez
+        self._closed = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def size(self) -> QSize:
+        """Full image size (after EXIF orientation)."""
+        return QSize(self._size)
+
+    @property
+    def tile_size(self) -> int:
+        return self._tile_size
+
+    @property
+    def level_count(self) -> int:
+        return self._level_count
+
+    @property
+    def top_level(self) -> int:
+        """Smallest level (fits in _TOP_LEVEL_SIZE)."""
+        return self._level_count - 1
+
+    def level_size(self, level: int) -> QSize:
+        factor = 1 << level
+        return QSize(
+            math.ceil(self._size.width() / factor),
+            math.ceil(self._size.height() / factor)
+        )
+
+    def level_for_scale(self, scale: float) -> int:
+        """Coarsest level that still has at least one pixel per screen pixel at this scale."""
+        if scale >= 1.0:
+            return 0
+        level = int(math.floor(math.log2(1.0 / scale)))
+        return min(level, self.top_level)
+
+    def tile_grid(self, level: int) -> tuple[int, int]:
+        """(columns, rows) of tiles of a level."""
+        size = self.level_size(level)
+        return (
+            math.ceil(size.width() / self._tile_size),
+            math.ceil(size.height() / self._tile_size)
+        )
+
+    def is_level_ready(self, level: int) -> bool:
+        with self._lock:
+            return level in self._levels
+
+    def is_level_mapped(self, level: int) -> bool:
+        """True if the level lives in a mapped temporary file."""
+        with self._lock:
+            buffer = self._levels.get(level)
+            return buffer is not None and buffer.is_mapped
+
+    def build_level(self, level: int) -> bool:
+        """
+        Decode a level (blocking; call it from a worker thread).
+
+        Returns:
+            False if the pyramid was closed meanwhile.
+        """
+        if self.is_level_ready(level):
+            return True
+        with self._build_lock:
+            with self._lock:
+                if self._closed:
+                    return False
+                if level in self._levels:
+                    return True
+            buffers = {}
+            for built_level, img in self._decode_levels(level).items():
+                img = _apply_exif_orientation(img, self._orientation)
+                buffer = _LevelBuffer(img.width, img.height, self._mode)
+                buffer.write_image(img)
+                buffers[built_level] = buffer
+            with self._lock:
+                if not self._closed:
+                    self._levels.update(buffers)
+                    return True
+            for buffer in buffers.values():
+                buffer.close()
+            return False
+
+    def tile(self, level: int, column: int, row: int) -> QImage:
+        """Copy one tile of a built level (empty QImage if not built or closed)."""
+        with self._lock:
+            buffer = self._levels.get(level)
+            if buffer is None:
+                return QImage()
+            x = column * self._tile_size
+            y = row * self._tile_size
+            width = min(self._tile_size, buffer.width - x)
+            height = min(self._tile_size, buffer.height - y)
+            if width <= 0 or height <= 0:
+                return QImage()
+            data = buffer.region(x, y, width, height)
+            image_format = _QIMAGE_FORMATS[buffer.mode]
+        # copy(): el QImage no depende de los bytes temporales
+        return QImage(data, width, height, width * 4, image_format).copy()
+
+    def level_image(self, level: int) -> QImage:
+        """Copy a whole built level (meant for the small top level)."""
+        with self._lock:
+            buffer = self._levels.get(level)
+            if buffer is None:
+                return QImage()
+            data = buffer.region(0, 0, buffer.width, buffer.height)
+            width, height = buffer.width, buffer.height
+            image_format = _QIMAGE_FORMATS[buffer.mode]
+        return QImage(data, width, height, width * 4, image_format).copy()
+
+    def close(self) -> None:
+        """Release every level (temporary files included)."""
+        with self._lock:
+            self._closed = True
+            buffers = list(self._levels.values())
+            self._levels.clear()
+        for buffer in buffers:
+            buffer.close()
+
+    def _decode_levels(self, level: int) -> dict[int, Image.Image]:
+        """Decode a level; formats without reduced decoding also give the coarser ones."""
+        source_width, source_height = self._source_size
+        factor = 1 << level
+        target = (math.ceil(source_width / factor), math.ceil(source_height / factor))
+
+        # with: el archivo no queda abierto (bloqueado en Windows) tras decodificar
+        with Image.open(self._path) as source:
+            img = source
+            if self._format == "JPEG":
+                scale = 1
+                draft = img.draft('RGB', (max(1, source_width // factor), max(1, source_height // factor)))
+                if draft is not None:
+                    scale = min(_MAX_DRAFT_SCALE, max(1, round(source_width / draft[1][2])))
+                if factor > scale:
+                    img = img.reduce(factor // scale)
+                if img.size != target:
+                    img = img.resize(target, Image.Resampling.BOX)
+                img.load()
+                return {level: img}
+
+            # Sin decodificación reducida: una sola decodificación completa para
+            # este nivel y los más pequeños que falten
+            img.load()
+            base_mode = 'RGBA' if self._mode == 'RGBA' else 'RGB'
+            if img.mode != base_mode:
+                img = img.convert(base_mode)  # reduce() no admite paletas
+        with self._lock:
+            missing = [candidate for candidate in range(level, self._level_count) if candidate not in self._levels]
+        decoded = {}
+        for candidate in missing:
+            candidate_factor = 1 << candidate
+            decoded[candidate] = img.reduce(candidate_factor) if candidate_factor > 1 else img
+        return decoded
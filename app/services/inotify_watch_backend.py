@@ -0,0 +1,203 @@
+"""
+InotifyWatchBackend - Native Linux inotify backend for FileSystemWatcherService.
+
+Reports the exact entries created, deleted, moved (with the cookie that pairs
+both halves of a rename) and modified in each watched folder, so the watcher
+can update its snapshots without re-stat'ing every entry. The inotify fd is
+read from the Qt event loop through a QSocketNotifier.
+
+Only available on Linux; create_inotify_backend() returns None elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from PySide6.QtCore import QObject, QSocketNotifier, Signal
+
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+# La carpeta observada dejó de ser fiable: hay que releerla entera
+RESCAN_MASK = IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class InotifyEvent:
+    """Single inotify event resolved to its watched folder."""
+
+    folder: str  # Watched folder ('' for queue overflow)
+    name: str  # Entry name inside the folder ('' for events on the folder itself)
+    mask: int
+    cookie: int  # Pairs IN_MOVED_FROM with IN_MOVED_TO (0 otherwise)
+
+    @property
+    def is_dir(self) -> bool:
+        """True if the entry is a folder."""
+        return bool(self.mask & IN_ISDIR)
+
+
+class InotifyWatchBackend(QObject):
+    """Watches folders through one inotify fd and emits batches of events."""
+
+    events_ready = Signal(list)  # list[InotifyEvent] read in one batch
+
+    def __init__(self, libc: ctypes.CDLL, parent=None):
+        """
+        Initialize backend (use create_inotify_backend()).
+
+        Raises:
+            OSError: If inotify_init1 fails.
+        """
+        super().__init__(parent)
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Cerrar el fd aunque nadie llame a close()
+        self._finalizer = weakref.finalize(self, os.close, self._fd)
+        self._wd_to_path: dict[int, str] = {}
+        self._path_to_wd: dict[str, int] = {}
+        self._notifier = QSocketNotifier(self._fd, QSocketNotifier.Type.Read, self)
+        self._notifier.activated.connect(self.read_events)
+
+    def add_path(self, folder_path: str) -> bool:
+        """Start watching a folder (direct children only)."""
+        if folder_path in self._path_to_wd:
+            return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder_path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            logger.debug(f"inotify_add_watch failed for '{folder_path}': {os.strerror(errno)}")
+            return False
+        self._wd_to_path[wd] = folder_path
+        self._path_to_wd[folder_path] = wd
+        return True
+
+    def remove_path(self, folder_path: str) -> None:
+        """Stop watching a folder."""
+        wd = self._path_to_wd.pop(folder_path, None)
+        if wd is not None:
+            self._wd_to_path.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self, *_args) -> None:
+        """Read every queued event and emit them as one batch (non-blocking)."""
+        if self._fd < 0:
+            return
+        events: list[InotifyEvent] = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.warning(f"inotify read failed: {e}")
+                break
+            if not data:
+                break
+            events.extend(self._parse(data))
+        if events:
+            self.events_ready.emit(events)
+
+    def close(self) -> None:
+        """Release the inotify fd (every watch is dropped with it)."""
+        if self._fd < 0:
+            return
+        self._notifier.setEnabled(False)
+        self._finalizer()
+        self._fd = -1
+        self._wd_to_path.clear()
+        self._path_to_wd.clear()
+
+    def _parse(self, data: bytes) -> list[InotifyEvent]:
+        """Decode a raw read buffer into InotifyEvent records."""
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.append(InotifyEvent(folder="", name="", mask=mask, cookie=0))
+                continue
+            folder = self._wd_to_path.get(wd)
+            if folder is None:
+                continue
+            if mask & IN_IGNORED:
+                # El kernel ya retiró el watch (carpeta borrada o desmontada)
+                self._wd_to_path.pop(wd, None)
+                self._path_to_wd.pop(folder, None)
+            events.append(InotifyEvent(folder=folder, name=name, mask=mask, cookie=cookie))
+        return events
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Load libc with the inotify functions, or None if not on Linux."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_add_watch.restype = ctypes.c_int
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    libc.inotify_rm_watch.restype = ctypes.c_int
+    return libc
+
+
+def is_inotify_available() -> bool:
+    """Check whether the platform provides inotify."""
+    return _load_libc() is not None
+
+
+def create_inotify_backend(parent=None) -> Optional[InotifyWatchBackend]:
+    """
+    Create the inotify backend if the platform supports it.
+
+    Returns:
+        Backend instance, or None if not on Linux or inotify is unavailable.
+    """
+    libc = _load_libc()
+    if libc is None:
+        return None
+    try:
+        return InotifyWatchBackend(libc, parent)
+    except OSError as e:
+        logger.warning(f"inotify backend unavailable, using QFileSystemWatcher: {e}")
+        return None
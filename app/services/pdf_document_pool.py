@@ -0,0 +1,158 @@
+"""
+PdfDocumentPool - Bounded LRU of open PDF documents.
+
+Parsing a PDF is the expensive part of rendering one of its pages, so open
+documents are kept and shared by every render of the same file version
+(path + mtime + size). A changed file gets a fresh document; the stale one
+is closed.
+
+Thread safety: PyMuPDF documents must not be used by two threads at once.
+document() hands out a document under its own lock, so renders of one PDF
+are serialized. When the pool is given a process-wide lock (PyMuPDF itself
+is not thread-safe), opening, using and closing documents also hold it.
+Documents evicted or closed while in use are closed by their last user.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator, Optional
+
+from app.core.logger import get_logger
+from app.services.path_utils import normalize_path
+
+logger = get_logger(__name__)
+
+
+class _PooledDocument:
+    """Open document plus its usage bookkeeping (guarded by the pool lock)."""
+
+    def __init__(self, key: tuple, document: Any):
+        self.key = key
+        self.document = document
+        self.lock = threading.Lock()
+        self.users = 0
+        self.retired = False
+
+
+class PdfDocumentPool:
+    """Thread-safe LRU of open documents keyed by (path, mtime, size)."""
+
+    def __init__(
+        self,
+        open_document: Callable[[str], Any],
+        max_documents: int,
+        library_lock: Optional[threading.RLock] = None
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            open_document: Opens a document (fitz.open).
+            max_documents: Maximum number of documents kept open.
+            library_lock: Lock held around every call into the PDF library
+                (always taken before a document's own lock).
+        """
+        self._open_document = open_document
+        self._max_documents = max(1, max_documents)
+        self._library_lock = library_lock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, _PooledDocument]" = OrderedDict()
+
+    @contextmanager
+    def document(self, pdf_path: str) -> Iterator[Any]:
+        """
+        Borrow the open document of a PDF, opening it if needed.
+
+        Raises:
+            OSError: If the file cannot be accessed.
+            Exception: Whatever open_document raises for unreadable files.
+        """
+        entry = self._acquire(pdf_path)
+        try:
+            with self._library(), entry.lock:
+                yield entry.document
+        finally:
+            self._release(entry)
+
+    def close_all(self) -> None:
+        """Close every pooled document (documents in use close when released)."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            for entry in entries:
+                entry.retired = True
+            idle = [entry for entry in entries if entry.users == 0]
+        for entry in idle:
+            self._close(entry)
+
+    def open_count(self) -> int:
+        """Number of pooled documents."""
+        with self._lock:
+            return len(self._entries)
+
+    def _acquire(self, pdf_path: str) -> _PooledDocument:
+        stat = os.stat(pdf_path)
+        path_key = normalize_path(pdf_path)
+        key = (path_key, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.users += 1
+                return entry
+
+        # Abrir fuera del lock del pool: parsear un PDF grande no bloquea el LRU
+        with self._library():
+            document = self._open_document(pdf_path)
+        duplicate: Optional[Any] = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                duplicate = document
+                self._entries.move_to_end(key)
+            else:
+                entry = _PooledDocument(key, document)
+                self._entries[key] = entry
+                retired = [
+                    other for other_key, other in self._entries.items()
+                    if other_key[0] == path_key and other_key != key
+                ]
+                while len(self._entries) - len(retired) > self._max_documents:
+                    oldest = next(e for e in self._entries.values() if e not in retired)
+                    retired.append(oldest)
+                for other in retired:
+                    del self._entries[other.key]
+                    other.retired = True
+                retired = [other for other in retired if other.users == 0]
+            entry.users += 1
+        if duplicate is not None:
+            with self._library():
+                self._close_document(duplicate)
+        else:
+            for other in retired:
+                self._close(other)
+        return entry
+
+    def _release(self, entry: _PooledDocument) -> None:
+        with self._lock:
+            entry.users -= 1
+            close = entry.retired and entry.users == 0
+        if close:
+            self._close(entry)
+
+    def _close(self, entry: _PooledDocument) -> None:
+        # Esperar a que ningún hilo esté usando el documento
+        with self._library(), entry.lock:
+            self._close_document(entry.document)
+
+    def _library(self):
+        return self._library_lock if self._library_lock is not None else nullcontext()
+
+    def _close_document(self, document: Any) -> None:
+        try:
+            document.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled PDF document: {e}")
@@ -71,9 +71,10 @@ class PdfRenderWorker(QThread):
             if self._cancel_requested:
                 return
             
-            logger.debug(f"PdfRenderWorker.run: Calling PdfRenderer.render_page, request_id={self.request_id}, device_pixel_ratio={self.device_pixel_ratio}")
-            result = PdfRenderer.render_page(self.pdf_path, self.max_size, self.page_num, self.device_pixel_ratio)
-            logger.debug(f"PdfRenderWorker.run: PdfRenderer.render_page returned, null={result.isNull() if result else 'None'}, size={result.width()}x{result.height() if result and not result.isNull() else 'N/A'}, request_id={self.request_id}")
+            logger.debug(f"PdfRenderWorker.run: Calling PdfRenderer.render_page_image, request_id={self.request_id}, device_pixel_ratio={self.device_pixel_ratio}")
+            # Prioridad 1: QImage (thread-safe) directamente; el QPixmap se crea en el hilo GUI
+            result = PdfRenderer.render_page_image(self.pdf_path, self.max_size, self.page_num, self.device_pixel_ratio)
+            logger.debug(f"PdfRenderWorker.run: PdfRenderer.render_page_image returned, null={result.isNull() if result else 'None'}, size={result.width()}x{result.height() if result and not result.isNull() else 'N/A'}, request_id={self.request_id}")
             
             if self._cancel_requested:
                 logger.debug(f"PdfRenderWorker.run: CANCELLED after render, request_id={self.request_id}")
@@ -87,18 +88,11 @@ class PdfRenderWorker(QThread):
                 pass
             
             if not validate_pixmap(result):
-                logger.warning(f"PdfRenderWorker: Invalid pixmap, emitting error")
+                logger.warning(f"PdfRenderWorker: Invalid image, emitting error")
                 self.error.emit("Failed to render PDF page", self.request_id)
             else:
-                # Prioridad 1: Convertir QPixmap a QImage (thread-safe) antes de emitir
-                qimage = result.toImage()
-                logger.debug(f"PdfRenderWorker: Converted pixmap to QImage, null={qimage.isNull()}, size={qimage.width()}x{qimage.height() if not qimage.isNull() else 'N/A'}, request_id={self.request_id}")
-                if qimage.isNull():
-                    logger.warning(f"PdfRenderWorker: QImage is null after conversion, emitting error")
-                    self.error.emit("Failed to convert pixmap to image", self.request_id)
-                else:
-                    logger.debug(f"PdfRenderWorker: Emitting finished signal with QImage, request_id={self.request_id}")
-                    self.finished.emit(qimage, self.request_id)
+                logger.debug(f"PdfRenderWorker: Emitting finished signal with QImage, request_id={self.request_id}")
+                self.finished.emit(result, self.request_id)
         except Exception as e:
             logger.error(f"Exception in PDF render worker: {e}", exc_info=True)
             self.error.emit("Render error", self.request_id)
@@ -1,15 +1,30 @@
 """
 PDF Renderer - PDF page rendering using PyMuPDF.
 
-Handles rendering of PDF pages to QPixmap for previews and thumbnails.
+Handles rendering of PDF pages to QImage/QPixmap for previews and thumbnails.
+Documents are borrowed from a shared PdfDocumentPool, so page count, page
+renders and every thumbnail of a PDF reuse one parsed document.
+
+PyMuPDF is not thread-safe: every in-process call into it (pool, renders,
+content text extraction) holds FITZ_LOCK. Worker processes of
+pdf_thumbnail_pool do not need it.
+
+Pages are rendered as RGB pixmaps whose samples are wrapped directly in a
+QImage (no PPM encode/decode), and thumbnails are rendered at their final
+size instead of being scaled down from a larger render.
 """
 
 import sys
-from PySide6.QtCore import QSize, Qt
-from PySide6.QtGui import QPixmap
+import threading
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPixmap
 
+from app.core.constants import MAX_OPEN_PDF_DOCUMENTS
 from app.core.logger import get_logger
+from app.services.pdf_document_pool import PdfDocumentPool
+from app.services.pdf_thumbnail_pool import fit_zoom
 from app.services.preview_file_extensions import validate_file_for_preview, validate_pixmap
+from app.services.thumbnail_disk_cache import load_thumbnail, store_thumbnail
 
 logger = get_logger(__name__)
 
@@ -30,8 +45,29 @@ except ImportError as e:
         logger.error(f"Failed to import PyMuPDF as pymupdf: {e2}")
 
 
+# Un solo hilo a la vez dentro de PyMuPDF en todo el proceso (reentrante)
+FITZ_LOCK = threading.RLock()
+
+
+def _open_document(pdf_path: str):
+    return fitz.open(pdf_path)
+
+
+def image_from_samples(samples, width: int, height: int, stride: int) -> QImage:
+    """Build a QImage from RGB888 pixmap samples.
+
+    The QImage wraps the buffer without converting it; copy() detaches it
+    from memory owned by PyMuPDF (or by the process pool result).
+    """
+    return QImage(samples, width, height, stride, QImage.Format.Format_RGB888).copy()
+
+
+# Documentos abiertos compartidos por PdfRenderer, PdfRenderWorker y PdfThumbnailsWorker
+_document_pool = PdfDocumentPool(_open_document, MAX_OPEN_PDF_DOCUMENTS, FITZ_LOCK)
+
+
 class PdfRenderer:
-    """Renders PDF pages to QPixmap using PyMuPDF."""
+    """Renders PDF pages to QImage/QPixmap using PyMuPDF."""
     
     @staticmethod
     def get_page_count(pdf_path: str) -> int:
@@ -39,54 +75,58 @@ class PdfRenderer:
         if not FITZ_AVAILABLE:
             return 0
         
-        doc = None
         try:
-            doc = fitz.open(pdf_path)
-            return len(doc)
+            with _document_pool.document(pdf_path) as doc:
+                return len(doc)
         except Exception:
             return 0
-        finally:
-            if doc:
-                try:
-                    doc.close()
-                except Exception:
-                    pass
     
     @staticmethod
-    def _render_page_to_pixmap(doc, page_num: int, zoom: float) -> QPixmap:
-        """Render PDF page to QPixmap with given zoom, respecting orientation.
+    def close_documents() -> None:
+        """Close every pooled PDF document (preview closed)."""
+        _document_pool.close_all()
+    
+    @staticmethod
+    def _render_page_to_image(doc, page_num: int, zoom: float) -> QImage:
+        """Render PDF page to QImage with given zoom, respecting orientation.
         
         R5: All PyMuPDF access is encapsulated in try/except.
         """
         if not FITZ_AVAILABLE:
-            return QPixmap()
+            return QImage()
         
         if page_num < 0 or page_num >= len(doc):
-            return QPixmap()
+            return QImage()
         
         try:
             page = doc[page_num]
             mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("ppm")
-            qpixmap = QPixmap()
-            if not qpixmap.loadFromData(img_data, "PPM"):
-                logger.warning(f"R5: Failed to load pixmap from PPM data")
-                return QPixmap()
-            return qpixmap
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+            samples = getattr(pix, 'samples_mv', None) or pix.samples
+            return image_from_samples(samples, pix.width, pix.height, pix.stride)
         except Exception as e:
             # R5: No exception crosses renderer boundary
-            logger.error(f"R5: Exception in _render_page_to_pixmap: {e}", exc_info=True)
-            return QPixmap()
+            logger.error(f"R5: Exception in _render_page_to_image: {e}", exc_info=True)
+            return QImage()
     
     
     @staticmethod
     def render_page(pdf_path: str, max_size: QSize, page_num: int = 0, device_pixel_ratio: float = 1.0) -> QPixmap:
-        """Render specific page of PDF as pixmap using PyMuPDF.
+        """Render specific page of PDF as pixmap (see render_page_image)."""
+        image = PdfRenderer.render_page_image(pdf_path, max_size, page_num, device_pixel_ratio)
+        if image.isNull():
+            return QPixmap()
+        return QPixmap.fromImage(image)
+    
+    @staticmethod
+    def render_page_image(pdf_path: str, max_size: QSize, page_num: int = 0, device_pixel_ratio: float = 1.0) -> QImage:
+        """Render specific page of PDF as image using PyMuPDF.
+        
+        Safe to call from worker threads (QImage, not QPixmap).
         
         R12: Hard file size limits prevent preview of oversized files.
         R13: Early existence validation before rendering.
-        R14: Pixmap validation before returning.
+        R14: Image validation before returning.
         
         Args:
             pdf_path: Path to PDF file.
@@ -95,125 +135,126 @@ class PdfRenderer:
             device_pixel_ratio: Device pixel ratio for high-DPI displays (default: 1.0).
         
         Returns:
-            QPixmap with rendered page, or empty QPixmap on error.
+            QImage with rendered page, or empty QImage on error.
         """
         if not FITZ_AVAILABLE:
             logger.error("PyMuPDF (fitz) not available - module not imported")
-            return QPixmap()
+            return QImage()
         
         # Guarda B: El renderer asume que recibe max_size válido (validado por el caller)
-        # Si max_size es inválido, devolver QPixmap() vacío (error controlado)
+        # Si max_size es inválido, devolver QImage() vacío (error controlado)
         if max_size.width() < 50 or max_size.height() < 50:
-            logger.warning(f"PdfRenderer.render_page: Invalid max_size {max_size.width()}x{max_size.height()}, returning empty pixmap")
-            return QPixmap()
+            logger.warning(f"PdfRenderer.render_page: Invalid max_size {max_size.width()}x{max_size.height()}, returning empty image")
+            return QImage()
         
         # R13: Early existence validation
         # R12: Hard size limit check
         is_valid, error_msg = validate_file_for_preview(pdf_path)
         if not is_valid:
             logger.warning(f"R12/R13: Cannot render PDF {pdf_path}: {error_msg}")
-            return QPixmap()
+            return QImage()
         
         logger.debug(f"render_page: File validated, proceeding with render for {pdf_path}")
         
-        doc = None
         try:
             logger.debug(f"render_page: Opening PDF {pdf_path}, page {page_num}")
-            doc = fitz.open(pdf_path)
-            if len(doc) == 0:
-                logger.warning(f"render_page: PDF has 0 pages: {pdf_path}")
-                return QPixmap()
+            with _document_pool.document(pdf_path) as doc:
+                if len(doc) == 0:
+                    logger.warning(f"render_page: PDF has 0 pages: {pdf_path}")
+                    return QImage()
             
-            logger.debug(f"render_page: PDF has {len(doc)} pages, rendering page {page_num}")
+                logger.debug(f"render_page: PDF has {len(doc)} pages, rendering page {page_num}")
             
-            # Obtener tamaño de página PDF (en puntos, 72 DPI)
-            page = doc[page_num]
-            page_rect = page.rect
-            page_width_pt = page_rect.width
-            page_height_pt = page_rect.height
+                # Obtener tamaño de página PDF (en puntos, 72 DPI)
+                page = doc[page_num]
+                page_rect = page.rect
+                page_width_pt = page_rect.width
+                page_height_pt = page_rect.height
             
-            # Calcular zoom considerando DPI del dispositivo
-            target_width_px = max_size.width() * device_pixel_ratio
-            target_height_px = max_size.height() * device_pixel_ratio
+                # Calcular zoom considerando DPI del dispositivo
+                target_width_px = max_size.width() * device_pixel_ratio
+                target_height_px = max_size.height() * device_pixel_ratio
             
-            # Regla 1: Zoom base (fit)
-            zoom_x = target_width_px / page_width_pt
-            zoom_y = target_height_px / page_height_pt
-            zoom_fit = min(zoom_x, zoom_y)  # Mantener aspect ratio (fit completo)
+                # Regla 1: Zoom base (fit)
+                zoom_x = target_width_px / page_width_pt
+                zoom_y = target_height_px / page_height_pt
+                zoom_fit = min(zoom_x, zoom_y)  # Mantener aspect ratio (fit completo)
             
-            # Regla 2: Zoom mínimo de legibilidad (fill-ish)
-            ZOOM_MIN_FACTOR = 0.8
-            min_width_px = max_size.width() * ZOOM_MIN_FACTOR * device_pixel_ratio
-            min_height_px = max_size.height() * ZOOM_MIN_FACTOR * device_pixel_ratio
-            min_zoom_x = min_width_px / page_width_pt
-            min_zoom_y = min_height_px / page_height_pt
-            zoom_min = max(min_zoom_x, min_zoom_y)
+                # Regla 2: Zoom mínimo de legibilidad (fill-ish)
+                ZOOM_MIN_FACTOR = 0.8
+                min_width_px = max_size.width() * ZOOM_MIN_FACTOR * device_pixel_ratio
+                min_height_px = max_size.height() * ZOOM_MIN_FACTOR * device_pixel_ratio
+                min_zoom_x = min_width_px / page_width_pt
+                min_zoom_y = min_height_px / page_height_pt
+                zoom_min = max(min_zoom_x, min_zoom_y)
             
-            # Regla 3: Zoom final
-            zoom = max(zoom_fit, zoom_min)
+                # Regla 3: Zoom final
+                zoom = max(zoom_fit, zoom_min)
             
-            logger.debug(f"render_page: Calculated zoom - fit={zoom_fit:.3f}, min={zoom_min:.3f}, final={zoom:.3f}, dpr={device_pixel_ratio}")
+                logger.debug(f"render_page: Calculated zoom - fit={zoom_fit:.3f}, min={zoom_min:.3f}, final={zoom:.3f}, dpr={device_pixel_ratio}")
             
-            qpixmap = PdfRenderer._render_page_to_pixmap(doc, page_num, zoom)
+                image = PdfRenderer._render_page_to_image(doc, page_num, zoom)
             
-            # R14: Validate pixmap before returning
-            if validate_pixmap(qpixmap):
-                logger.debug(f"render_page: Page rendered, size: {qpixmap.width()}x{qpixmap.height()}")
-                return qpixmap
-            else:
-                logger.warning(f"R14: _render_page_to_pixmap returned invalid pixmap (size: {qpixmap.width()}x{qpixmap.height()}, null: {qpixmap.isNull()})")
+                # R14: Validate image before returning
+                if validate_pixmap(image):
+                    logger.debug(f"render_page: Page rendered, size: {image.width()}x{image.height()}")
+                    return image
+                else:
+                    logger.warning(f"R14: _render_page_to_image returned invalid image (size: {image.width()}x{image.height()}, null: {image.isNull()})")
             
-            return QPixmap()
+                return QImage()
         except Exception as e:
             logger.error(f"Error rendering PDF page {page_num} from {pdf_path}: {e}", exc_info=True)
-            return QPixmap()
-        finally:
-            if doc:
-                try:
-                    doc.close()
-                except Exception:
-                    pass
+            return QImage()
     
     @staticmethod
     def render_thumbnail(pdf_path: str, page_num: int, thumbnail_size: QSize) -> QPixmap:
+        """Get thumbnail of a specific PDF page as pixmap (see render_thumbnail_image)."""
+        image = PdfRenderer.render_thumbnail_image(pdf_path, page_num, thumbnail_size)
+        if image.isNull():
+            return QPixmap()
+        return QPixmap.fromImage(image)
+    
+    @staticmethod
+    def render_thumbnail_image(pdf_path: str, page_num: int, thumbnail_size: QSize) -> QImage:
         """Get thumbnail of a specific PDF page.
         
+        The page is rendered directly at the zoom that fits thumbnail_size.
+        Thumbnails are kept in the persistent thumbnail store, keyed by the
+        PDF version, page and size.
+        
         R5: All PyMuPDF access is encapsulated in try/except.
         """
         if not FITZ_AVAILABLE:
-            return QPixmap()
+            return QImage()
+        
+        variant = f"pdf-page-{page_num}"
+        cached = load_thumbnail(pdf_path, thumbnail_size, variant)
+        if cached is not None:
+            return cached
         
-        doc = None
         try:
             # R5: Encapsulate file access
             try:
-                doc = fitz.open(pdf_path)
+                with _document_pool.document(pdf_path) as doc:
+                    if page_num < 0 or page_num >= len(doc):
+                        return QImage()
+                    page_rect = doc[page_num].rect
+                    zoom = fit_zoom(
+                        page_rect.width, page_rect.height,
+                        thumbnail_size.width(), thumbnail_size.height()
+                    )
+                    thumbnail = PdfRenderer._render_page_to_image(doc, page_num, zoom)
             except Exception as e:
                 logger.warning(f"R5: Cannot open PDF for thumbnail: {e}")
-                return QPixmap()
+                return QImage()
             
-            qpixmap = PdfRenderer._render_page_to_pixmap(doc, page_num, 0.5)
+            if validate_pixmap(thumbnail):
+                store_thumbnail(pdf_path, thumbnail_size, thumbnail, variant)
+                return thumbnail
             
-            if not qpixmap.isNull():
-                try:
-                    return qpixmap.scaled(
-                        thumbnail_size,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                except Exception as e:
-                    logger.warning(f"R5: Failed to scale thumbnail: {e}")
-                    return QPixmap()
-            
-            return QPixmap()
+            return QImage()
         except Exception as e:
             # R5: No exception crosses renderer boundary
             logger.error(f"R5: Exception in render_thumbnail: {e}", exc_info=True)
-            return QPixmap()
-        finally:
-            if doc:
-                try:
-                    doc.close()
-                except Exception:
-                    pass
-
+            return QImage()
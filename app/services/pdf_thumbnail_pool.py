@@ -0,0 +1,114 @@
+"""
+PdfThumbnailPool - Process pool for rendering PDF page thumbnails.
+
+PyMuPDF does not run concurrently in threads, so thumbnails of long PDFs
+are spread across worker processes (spawn, like PyMuPDF's own
+multiprocessing helpers). Each job renders a chunk of pages straight at
+the thumbnail size and returns the raw RGB samples; the document is opened
+and closed per chunk so no process keeps the file locked.
+
+This module runs inside the worker processes: it must not import Qt.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from app.core.constants import MAX_PDF_THUMBNAIL_PROCESSES
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24
+    except ImportError:
+        fitz = None
+
+# (page_num, width, height, stride, RGB888 samples)
+ThumbnailSamples = Tuple[int, int, int, int, bytes]
+
+# Páginas por trabajo: el documento se abre una vez por bloque
+PAGES_PER_CHUNK = 8
+# Por debajo de este número de páginas sin miniatura no compensa usar procesos
+PARALLEL_MIN_PAGES = 16
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def fit_zoom(page_width: float, page_height: float, width: int, height: int) -> float:
+    """Zoom that fits a page (in points) inside width x height pixels."""
+    if page_width <= 0 or page_height <= 0:
+        return 1.0
+    return min(width / page_width, height / page_height)
+
+
+def render_thumbnail_chunk(
+    pdf_path: str,
+    pages: Sequence[int],
+    width: int,
+    height: int
+) -> List[ThumbnailSamples]:
+    """
+    Render pages of a PDF fitted to width x height (runs in a worker process).
+
+    Returns:
+        Samples of every page that could be rendered.
+    """
+    results = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in pages:
+            try:
+                page = doc[page_num]
+                zoom = fit_zoom(page.rect.width, page.rect.height, width, height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                results.append((page_num, pix.width, pix.height, pix.stride, pix.samples))
+            except Exception:
+                continue
+    finally:
+        doc.close()
+    return results
+
+
+def thumbnail_process_count() -> int:
+    """Worker processes used for thumbnails (0: render in the calling thread)."""
+    if fitz is None:
+        return 0
+    # Un núcleo queda para la interfaz; con un solo proceso no hay reparto
+    count = min(MAX_PDF_THUMBNAIL_PROCESSES, (os.cpu_count() or 1) - 1)
+    return count if count >= 2 else 0
+
+
+def get_thumbnail_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared process pool (started on first use), or None if not worth it."""
+    global _executor
+    count = thumbnail_process_count()
+    if count == 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=count, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def discard_thumbnail_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool; the next get_thumbnail_executor() starts a new one."""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_thumbnail_processes() -> None:
+    """Stop the worker processes (app exit hook; safe if never started)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
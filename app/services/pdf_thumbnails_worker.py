@@ -2,20 +2,39 @@
 PdfThumbnailsWorker - QThread worker para generar miniaturas de todas las páginas de un PDF.
 
 Emite progreso fluido por página para permitir actualizar una barra de progreso en UI.
+Las páginas se generan en orden de prioridad (las visibles primero) y, en PDFs
+largos, se reparten entre los procesos de pdf_thumbnail_pool.
 R5: All external access (PyMuPDF) is encapsulated in try/except.
 R2: Cooperative cancellation - marks request as invalid, ignores results.
 """
 
 import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, List, Optional, Set
+
 from PySide6.QtCore import QSize, QThread, Signal
-from PySide6.QtGui import QPixmap, QImage
+from PySide6.QtGui import QImage
 
 from app.core.logger import get_logger
-from app.services.pdf_renderer import PdfRenderer
-from app.services.preview_file_extensions import validate_file_for_preview, validate_pixmap
+from app.services.pdf_renderer import PdfRenderer, image_from_samples
+from app.services.pdf_thumbnail_pool import (
+    PAGES_PER_CHUNK,
+    PARALLEL_MIN_PAGES,
+    discard_thumbnail_executor,
+    get_thumbnail_executor,
+    render_thumbnail_chunk,
+    thumbnail_process_count,
+)
+from app.services.preview_file_extensions import validate_pixmap
+from app.services.thumbnail_disk_cache import load_thumbnail, store_thumbnail
 
 logger = get_logger(__name__)
 
+# Intervalo de comprobación de cancelación mientras se esperan procesos
+_POLL_SECONDS = 0.1
+
 
 class PdfThumbnailsWorker(QThread):
     """Genera miniaturas de páginas PDF en segundo plano."""
@@ -24,22 +43,36 @@ class PdfThumbnailsWorker(QThread):
     finished = Signal(object)  # request_id
     error = Signal(str, object)  # (error_msg, request_id)
 
-    def __init__(self, pdf_path: str, total_pages: int, thumbnail_size: QSize, request_id: str = None):
+    def __init__(
+        self,
+        pdf_path: str,
+        total_pages: int,
+        thumbnail_size: QSize,
+        request_id: str = None,
+        priority_pages: Optional[Iterable[int]] = None
+    ):
         super().__init__()
         self._pdf_path = pdf_path
         self._total_pages = total_pages
         self._size = thumbnail_size
         self.request_id = request_id
         self._cancel_requested = False
+        self._priority_lock = threading.Lock()
+        self._priority_pages: List[int] = list(priority_pages or [])
 
     def cancel(self) -> None:
         """Cooperative cancellation - mark request as invalid."""
         self._cancel_requested = True
 
+    def set_priority_pages(self, pages: Iterable[int]) -> None:
+        """Generar estas páginas antes que el resto (p. ej. las visibles); thread-safe."""
+        with self._priority_lock:
+            self._priority_pages = list(pages)
+
     def run(self) -> None:
         if self._cancel_requested:
             return
-        
+
         try:
             if not self._pdf_path or not os.path.exists(self._pdf_path):
                 logger.warning(f"Cannot generate thumbnails - file does not exist: {self._pdf_path}")
@@ -53,24 +86,104 @@ class PdfThumbnailsWorker(QThread):
             logger.warning(f"Cannot validate thumbnail file: {e}")
             self.error.emit(f"Cannot access file: {e}", self.request_id)
             return
-        
+
         try:
-            for page_num in range(self._total_pages):
-                if self._cancel_requested:
-                    return
-                
-                try:
-                    pixmap = PdfRenderer.render_thumbnail(self._pdf_path, page_num, self._size)
-                    if validate_pixmap(pixmap):
-                        # Prioridad 1: Convertir QPixmap a QImage (thread-safe) antes de emitir
-                        qimage = pixmap.toImage()
-                        if not qimage.isNull():
-                            self.progress.emit(page_num, qimage, self.request_id)
-                except Exception as e:
-                    logger.warning(f"Error rendering thumbnail page {page_num}: {e}")
-            
+            remaining = set(range(self._total_pages))
+            executor = get_thumbnail_executor() if self._total_pages >= PARALLEL_MIN_PAGES else None
+            if executor is not None:
+                self._render_in_processes(executor, remaining)
+            # Sin procesos (o si el pool falló): en este hilo, con el documento del pool de PdfRenderer
+            self._render_in_thread(remaining)
+            if self._cancel_requested:
+                return
+
             self.finished.emit(self.request_id)
         except Exception as e:
             logger.error(f"Exception in thumbnails worker: {e}", exc_info=True)
             self.error.emit("Thumbnails error", self.request_id)
 
+    def _next_page(self, remaining: Set[int]) -> int:
+        """Take the next page to generate: first pending priority page, else the lowest."""
+        with self._priority_lock:
+            priority = self._priority_pages
+        page_num = next((page for page in priority if page in remaining), None)
+        if page_num is None:
+            page_num = min(remaining)
+        remaining.discard(page_num)
+        return page_num
+
+    def _emit(self, page_num: int, qimage: QImage) -> None:
+        if validate_pixmap(qimage):
+            self.progress.emit(page_num, qimage, self.request_id)
+
+    def _render_in_thread(self, remaining: Set[int]) -> None:
+        while remaining and not self._cancel_requested:
+            page_num = self._next_page(remaining)
+            try:
+                self._emit(page_num, PdfRenderer.render_thumbnail_image(self._pdf_path, page_num, self._size))
+            except Exception as e:
+                logger.warning(f"Error rendering thumbnail page {page_num}: {e}")
+
+    def _next_chunk(self, remaining: Set[int]) -> List[int]:
+        """Pages for the next process job; pages already on disk are emitted directly."""
+        chunk = []
+        while remaining and len(chunk) < PAGES_PER_CHUNK and not self._cancel_requested:
+            page_num = self._next_page(remaining)
+            cached = load_thumbnail(self._pdf_path, self._size, f"pdf-page-{page_num}")
+            if cached is not None:
+                self._emit(page_num, cached)
+            else:
+                chunk.append(page_num)
+        return chunk
+
+    def _render_in_processes(self, executor, remaining: Set[int]) -> None:
+        # Pocos trabajos en vuelo: un cambio de prioridad (scroll) se aplica al siguiente bloque
+        max_in_flight = thumbnail_process_count()
+        in_flight = {}
+        accepting = True
+        try:
+            while (remaining or in_flight) and not self._cancel_requested:
+                while accepting and remaining and len(in_flight) < max_in_flight and not self._cancel_requested:
+                    chunk = self._next_chunk(remaining)
+                    if not chunk:
+                        continue
+                    try:
+                        future = executor.submit(
+                            render_thumbnail_chunk, self._pdf_path, chunk,
+                            self._size.width(), self._size.height()
+                        )
+                    except (BrokenProcessPool, RuntimeError) as e:
+                        # Pool roto o cerrado (salida de la app): el resto, en este hilo
+                        logger.warning(f"Thumbnail processes unavailable: {e}")
+                        remaining.update(chunk)
+                        accepting = False
+                        break
+                    in_flight[future] = chunk
+                if not in_flight:
+                    if not accepting:
+                        return
+                    continue
+
+                done, _ = wait(in_flight, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        # Proceso caído o PDF ilegible en el proceso: el resto, en este hilo
+                        logger.warning(f"Thumbnail process failed, rendering in thread: {e}")
+                        if isinstance(e, BrokenProcessPool):
+                            discard_thumbnail_executor(executor)
+                        for pending in in_flight.values():
+                            remaining.update(pending)
+                        in_flight.clear()
+                        remaining.update(chunk)
+                        return
+                    for page_num, width, height, stride, samples in results:
+                        qimage = image_from_samples(samples, width, height, stride)
+                        if validate_pixmap(qimage):
+                            store_thumbnail(self._pdf_path, self._size, qimage, f"pdf-page-{page_num}")
+                            self._emit(page_num, qimage)
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -2,53 +2,113 @@
 PixelAnalyzer - Pixel analysis utilities for icon processing.
 
 Extracted from icon_processor to reduce method size.
+
+Uses NumPy over the QImage buffer (one vectorized pass) when available and
+falls back to per-pixel loops otherwise. Both give identical results.
 """
 
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QImage
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _is_content_pixel(pixel: int) -> bool:
+    """Content pixel: not transparent (alpha > 5) and not near-white."""
+    alpha = (pixel >> 24) & 0xFF
+    red = (pixel >> 16) & 0xFF
+    green = (pixel >> 8) & 0xFF
+    blue = pixel & 0xFF
+    return alpha > 5 and not (red > 245 and green > 245 and blue > 245)
+
+
+def _content_mask(image: QImage):
+    """
+    Build boolean content mask (height x width) from the image buffer.
+
+    Reads ARGB32 pixels straight from constBits() (copy only if the image
+    has another format), matching the values returned by QImage.pixel().
+    """
+    if image.format() != QImage.Format.Format_ARGB32:
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+    width = image.width()
+    height = image.height()
+    words_per_line = image.bytesPerLine() // 4
+    pixels = np.frombuffer(image.constBits(), dtype=np.uint32, count=words_per_line * height)
+    pixels = pixels.reshape(height, words_per_line)[:, :width]
+
+    alpha = (pixels >> 24) & 0xFF
+    red = (pixels >> 16) & 0xFF
+    green = (pixels >> 8) & 0xFF
+    blue = pixels & 0xFF
+    return (alpha > 5) & ~((red > 245) & (green > 245) & (blue > 245))
+
+
+def analyze_content(image: QImage) -> tuple[tuple[int, int, int, int], int]:
+    """
+    Compute content bounds and content pixel count in a single pass.
+
+    Returns:
+        ((min_x, min_y, max_x, max_y), content_pixels). Without content,
+        bounds are (width, height, 0, 0) like find_content_bounds.
+    """
+    width = image.width()
+    height = image.height()
+    if not NUMPY_AVAILABLE or width == 0 or height == 0:
+        return _find_content_bounds_loop(image), _count_content_pixels_loop(image)
+
+    mask = _content_mask(image)
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return (width, height, 0, 0), 0
+    cols = np.flatnonzero(mask.any(axis=0))
+    bounds = (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
+    return bounds, int(np.count_nonzero(mask))
 
 
 def find_content_bounds(image):
     """Find content bounds (non-transparent, non-white pixels)."""
+    return analyze_content(image)[0]
+
+
+def count_content_pixels(image):
+    """Count content pixels (non-transparent, non-white)."""
+    return analyze_content(image)[1]
+
+
+def _find_content_bounds_loop(image):
+    """Find content bounds pixel by pixel (fallback without NumPy)."""
     width = image.width()
     height = image.height()
     min_x = width
     min_y = height
     max_x = 0
     max_y = 0
-    
+
     for y in range(height):
         for x in range(width):
-            pixel = image.pixel(x, y)
-            alpha = (pixel >> 24) & 0xFF
-            red = (pixel >> 16) & 0xFF
-            green = (pixel >> 8) & 0xFF
-            blue = pixel & 0xFF
-            
-            if alpha > 5 and not (red > 245 and green > 245 and blue > 245):
+            if _is_content_pixel(image.pixel(x, y)):
                 min_x = min(min_x, x)
                 min_y = min(min_y, y)
                 max_x = max(max_x, x)
                 max_y = max(max_y, y)
-    
+
     return min_x, min_y, max_x, max_y
 
 
-def count_content_pixels(image):
-    """Count content pixels (non-transparent, non-white)."""
+def _count_content_pixels_loop(image):
+    """Count content pixels pixel by pixel (fallback without NumPy)."""
     width = image.width()
     height = image.height()
     content_pixels = 0
-    
+
     for y in range(height):
         for x in range(width):
-            pixel = image.pixel(x, y)
-            alpha = (pixel >> 24) & 0xFF
-            red = (pixel >> 16) & 0xFF
-            green = (pixel >> 8) & 0xFF
-            blue = pixel & 0xFF
-            
-            if alpha > 5 and not (red > 245 and green > 245 and blue > 245):
+            if _is_content_pixel(image.pixel(x, y)):
                 content_pixels += 1
-    
-    return content_pixels
 
+    return content_pixels
@@ -16,6 +16,9 @@ PREVIEW_IMAGE_EXTENSIONS = frozenset({
     '.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp', '.tiff', '.ico', '.svg'
 })
 
+# Imágenes que decodifica Pillow (el SVG se renderiza aparte)
+RASTER_IMAGE_EXTENSIONS = PREVIEW_IMAGE_EXTENSIONS - {'.svg'}
+
 PREVIEW_TEXT_EXTENSIONS = frozenset({
     '.txt', '.md', '.py', '.js', '.ts', '.html', '.css', '.json', '.xml',
     '.yaml', '.yml', '.ini', '.log', '.csv', '.rtf'
@@ -24,6 +27,13 @@ PREVIEW_TEXT_EXTENSIONS = frozenset({
 # Nota: .doc (formato antiguo) NO está soportado porque docx2pdf solo acepta .docx
 PREVIEW_PDF_DOCX_EXTENSIONS = frozenset({'.pdf', '.docx'})
 
+# Paquetes zip OOXML y OpenDocument que suelen llevar una miniatura embebida
+# (docProps/thumbnail.jpeg o Thumbnails/thumbnail.png)
+OFFICE_THUMBNAIL_EXTENSIONS = frozenset({
+    '.docx', '.docm', '.dotx', '.xlsx', '.xlsm', '.xltx', '.pptx', '.pptm', '.ppsx', '.potx',
+    '.odt', '.ott', '.ods', '.ots', '.odp', '.otp', '.odg'
+})
+
 PREVIEWABLE_EXTENSIONS = (
     PREVIEW_IMAGE_EXTENSIONS | 
     PREVIEW_TEXT_EXTENSIONS | 
@@ -21,6 +21,7 @@ from app.services.pdf_render_worker import PdfRenderWorker
 from app.services.docx_convert_worker import DocxConvertWorker
 from app.services.pdf_thumbnails_worker import PdfThumbnailsWorker
 from app.services.preview_file_extensions import (
+    OFFICE_THUMBNAIL_EXTENSIONS,
     PREVIEW_IMAGE_EXTENSIONS,
     PREVIEW_TEXT_EXTENSIONS,
     is_previewable_image,
@@ -29,7 +30,11 @@ from app.services.preview_file_extensions import (
     validate_file_for_preview,
     validate_pixmap
 )
-from app.services.icon_renderer import render_image_preview
+from app.services.icon_renderer import (
+    render_image_preview,
+    render_image_preview_image,
+    render_office_thumbnail,
+)
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -232,6 +237,7 @@ class PreviewPdfService:
         on_progress,
         on_finished,
         on_error=None,
+        priority_pages=None,
     ) -> str:
         """Render thumbnails in background and emit progress.
 
@@ -243,6 +249,9 @@ class PreviewPdfService:
         on_finished(request_id: str)
         on_error(msg: str, request_id: str)
         
+        Pages arrive in priority order (priority_pages first, then ascending),
+        not necessarily page by page; see set_thumbnail_priority.
+        
         Returns:
             request_id: Unique identifier for this request.
         """
@@ -259,7 +268,7 @@ class PreviewPdfService:
         # R1: Generate unique request_id
         request_id = str(uuid.uuid4())
 
-        worker = PdfThumbnailsWorker(pdf_path, total_pages, thumbnail_size, request_id)
+        worker = PdfThumbnailsWorker(pdf_path, total_pages, thumbnail_size, request_id, priority_pages)
         self._active_thumbs_worker = worker
 
         def _on_progress(page_num: int, qimage: QImage, result_request_id: str):
@@ -321,6 +330,12 @@ class PreviewPdfService:
         
         return request_id
     
+    def set_thumbnail_priority(self, pages) -> None:
+        """Generate these thumbnails next (e.g. pages scrolled into view)."""
+        worker = self._active_thumbs_worker
+        if worker and worker.isRunning():
+            worker.set_priority_pages(pages)
+    
     def _convert_docx_to_pdf(self, docx_path: str) -> str:
         """Convert DOCX to PDF using docx2pdf (synchronous)."""
         return self._docx_converter.convert_to_pdf(docx_path)
@@ -421,6 +436,9 @@ class PreviewPdfService:
     def get_quicklook_pixmap(self, path: str, max_size: QSize) -> QPixmap:
         """Get pixmap for quick preview with real rendering for PDFs, DOCX, images, and text files.
         
+        Office/OpenDocument files (and DOCX that cannot be converted) use the
+        thumbnail embedded in the package before falling back to the icon.
+        
         R5: All external access is encapsulated in try/except.
         R4: Always returns valid pixmap (may be empty for fallback).
         R12: Hard file size limits prevent preview of oversized files.
@@ -452,6 +470,15 @@ class PreviewPdfService:
             except Exception as e:
                 logger.error(f"Exception converting DOCX: {e}", exc_info=True)
 
+        if ext in OFFICE_THUMBNAIL_EXTENSIONS:
+            # Miniatura embebida en el paquete (sin conversión ni Office)
+            try:
+                pixmap = render_office_thumbnail(path, max_size)
+                if validate_pixmap(pixmap):
+                    return pixmap
+            except Exception as e:
+                logger.error(f"Exception reading embedded thumbnail: {e}", exc_info=True)
+
         if is_previewable_image(ext):
             try:
                 pixmap = render_image_preview(path, max_size)
@@ -487,11 +514,48 @@ class PreviewPdfService:
             logger.error(f"Exception getting icon fallback: {e}", exc_info=True)
             return QPixmap()
     
+    def get_quicklook_image(self, path: str, max_size: QSize, device_pixel_ratio: float = 1.0) -> QImage:
+        """Get quick preview as QImage; safe to call from worker threads.
+        
+        Covers PDFs (first page), images and text files. Other types need the
+        GUI thread (DOCX conversion, icon fallback) and return an empty QImage:
+        use get_quicklook_pixmap for them.
+        
+        R12/R13: File validated before rendering.
+        R14: Image validation before returning.
+        """
+        is_valid, error_msg = validate_file_for_preview(path)
+        if not is_valid:
+            logger.warning(f"Cannot preview {path}: {error_msg}")
+            return QImage()
+        
+        ext = normalize_extension(path)
+        try:
+            if ext == ".pdf":
+                image = self._pdf_renderer.render_page_image(path, max_size, 0, device_pixel_ratio)
+            elif is_previewable_image(ext):
+                image = render_image_preview_image(path, max_size)
+            elif is_previewable_text(ext):
+                image = self._render_text_preview_image(path, max_size)
+            else:
+                return QImage()
+        except Exception as e:
+            logger.error(f"Exception rendering preview image for {path}: {e}", exc_info=True)
+            return QImage()
+        return image if validate_pixmap(image) else QImage()
+    
     def _render_text_preview(self, path: str, max_size: QSize) -> QPixmap:
         """Render text file content as preview image."""
+        image = self._render_text_preview_image(path, max_size)
+        if image.isNull():
+            return QPixmap()
+        return QPixmap.fromImage(image)
+    
+    def _render_text_preview_image(self, path: str, max_size: QSize) -> QImage:
+        """Render text file content as preview QImage (safe outside the GUI thread)."""
         if not PIL_AVAILABLE:
             logger.warning("PIL/Pillow not available, cannot render text preview")
-            return QPixmap()
+            return QImage()
         
         try:
             # Leer contenido del archivo
@@ -537,10 +601,11 @@ class PreviewPdfService:
                     draw.text((padding, y), text, fill=(0, 0, 0), font=font)
                     y += line_height
             
-            return QPixmap.fromImage(ImageQt(img))
+            # copy(): el QImage no depende del buffer de PIL
+            return ImageQt(img).copy()
         except Exception as e:
             logger.warning(f"Failed to render text preview for {path}: {e}")
-            return QPixmap()
+            return QImage()
     
     def clear_cache(self) -> None:
         """Clear temporary PDF cache directory."""
@@ -591,6 +656,8 @@ class PreviewPdfService:
             self._active_thumbs_worker.quit()
             self._active_thumbs_worker.wait()
             self._active_thumbs_worker = None
+        # Sin workers activos: liberar los documentos PDF abiertos
+        PdfRenderer.close_documents()
     
     @property
     def icon_service(self):
@@ -16,6 +16,7 @@ from app.services.icon_processor import has_excessive_whitespace
 from app.services.icon_renderer import (
     get_svg_for_extension,
     render_image_preview,
+    render_office_thumbnail,
     render_svg_icon,
 )
 from app.services.windows_icon_converter import hicon_to_qpixmap_at_size
@@ -25,9 +26,29 @@ from app.services.icon_extraction_fallbacks import (
 )
 from app.services.windows_icon_extractor import get_icon_via_imagelist
 from app.services.preview_scaling import scale_pixmap_to_size, scale_if_needed
-from app.services.preview_file_extensions import normalize_extension, validate_file_for_preview, validate_pixmap
+from app.services.preview_file_extensions import (
+    OFFICE_THUMBNAIL_EXTENSIONS,
+    normalize_extension,
+    validate_file_for_preview,
+    validate_pixmap,
+)
+
+# Resultado de has_excessive_whitespace por (extensión, ancho, alto):
+# el icono de shell depende solo de la extensión, no del archivo concreto
+_whitespace_by_extension: dict[tuple[str, int, int], bool] = {}
 
 
+def _has_excessive_whitespace_for_extension(ext: str, pixmap: QPixmap) -> bool:
+    """Memoized has_excessive_whitespace for shell icons of a given extension."""
+    if not ext:
+        return has_excessive_whitespace(pixmap, threshold=0.4)
+    key = (ext, pixmap.width(), pixmap.height())
+    result = _whitespace_by_extension.get(key)
+    if result is None:
+        result = has_excessive_whitespace(pixmap, threshold=0.4)
+        _whitespace_by_extension[key] = result
+    return result
+
 
 def get_file_preview(
     path: str, 
@@ -99,6 +120,13 @@ def _get_file_preview_impl_helper(path: str, size: QSize, icon_provider) -> QPix
     if ext in image_extensions:
         return render_image_preview(path, size)
     
+    # Documentos Office/OpenDocument: miniatura embebida en el paquete;
+    # sin miniatura, icono de Windows como el resto de documentos
+    if ext in OFFICE_THUMBNAIL_EXTENSIONS:
+        thumbnail = render_office_thumbnail(path, size)
+        if validate_pixmap(thumbnail):
+            return thumbnail
+    
     # Ejecutables: siempre usar SVG exe.svg en lugar del icono de Windows
     # Nota: .lnk NO está incluido aquí - los accesos directos usan iconos nativos de Windows
     executable_extensions = {'.exe', '.msi', '.bat', '.cmd', '.ps1', '.sh'}
@@ -120,7 +148,7 @@ def _get_file_preview_impl_helper(path: str, size: QSize, icon_provider) -> QPix
         folder_icon = icon_provider.icon(qfile_info)
         return folder_icon.pixmap(size)
     
-    if not skip_svg_fallback and not pixmap.isNull() and has_excessive_whitespace(pixmap, threshold=0.4):
+    if not skip_svg_fallback and not pixmap.isNull() and _has_excessive_whitespace_for_extension(ext, pixmap):
         svg_name = get_svg_for_extension(ext)
         svg_pixmap = render_svg_icon(svg_name, size, ext)
         # R14: Validate pixmap before using
@@ -1,21 +1,31 @@
 """
 SearchService - Global search service for workspaces.
 
-Searches files by name across all open tabs in all workspaces.
-Uses data already available in memory, does not scan filesystem in real-time.
+Searches files by name across all workspaces: the full subtree of their
+tabs and focus tree folders through the persistent FilenameIndex, or the
+listings of their open tabs while the index is being built. Documents are
+also searched by content through the ContentIndex.
 """
 
-from typing import List, Set, Dict, Optional
+from typing import TYPE_CHECKING, List, Set, Dict, Optional, Tuple
 from dataclasses import dataclass
 import os
+import threading
 
 from app.services.file_list_service import get_files
 from app.services.file_extensions import SUPPORTED_EXTENSIONS
+from app.services.folder_listing_cache import is_tracked
 from app.services.path_utils import normalize_path
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+if TYPE_CHECKING:
+    from app.services.content_index import ContentIndex
+    from app.services.filename_index import FilenameIndex
+
+MAX_SEARCH_RESULTS = 1000
+
 
 @dataclass
 class SearchResult:
@@ -50,6 +60,10 @@ def _get_folder_signature(folder_path: str) -> Optional[float]:
 
 def _get_files_cached(folder_path: str, cache: Dict[str, _CachedFolderListing]) -> List[str]:
     """Get file list with simple mtime-based cache to avoid repeat scans."""
+    if is_tracked(folder_path):
+        # Carpeta observada: get_files ya sirve el listado que invalida el watcher
+        cache.pop(folder_path, None)
+        return get_files(folder_path, SUPPORTED_EXTENSIONS, use_stacks=False)
     signature = _get_folder_signature(folder_path)
     cached = cache.get(folder_path)
     if cached and cached.mtime == signature:
@@ -59,21 +73,190 @@ def _get_files_cached(folder_path: str, cache: Dict[str, _CachedFolderListing])
     return files
 
 
+def get_workspace_search_roots(workspace_manager, tab_manager=None) -> List[Tuple[str, List[str]]]:
+    """
+    Get the folders searched for each workspace: its tabs and focus tree folders.
+    
+    Reads workspace and tab state: call it on the UI thread and hand the
+    result to search_index/search_content running on workers.
+    
+    Returns:
+        List of (workspace_id, folder paths) in workspace order.
+    """
+    workspaces = workspace_manager.get_workspaces()
+    active_workspace_id = workspace_manager.get_active_workspace_id()
+    scopes = []
+    for workspace in workspaces:
+        tabs = _get_tabs_for_workspace(workspace, active_workspace_id, tab_manager)
+        folders = [
+            path for path in list(tabs) + list(workspace.focus_tree_paths or [])
+            if path and os.path.isabs(path)
+        ]
+        scopes.append((workspace.id, folders))
+    return scopes
+
+
+def _find_workspace_id(file_path: str, scopes: List[Tuple[str, List[str]]]) -> Optional[str]:
+    """Return the first workspace whose searched folders contain file_path."""
+    normalized_path = normalize_path(file_path)
+    for workspace_id, folders in scopes:
+        for folder in folders:
+            normalized_folder = normalize_path(folder)
+            if normalized_path.startswith(normalized_folder.rstrip(os.sep) + os.sep):
+                return workspace_id
+    return None
+
+
+def get_tab_search_folders(workspace_manager, tab_manager=None) -> List[Tuple[str, str]]:
+    """
+    Get the open folders (tabs) searched from their listings.
+    
+    A folder open in several workspaces is searched once, for the first one.
+    
+    Returns:
+        List of (workspace_id, folder_path) in workspace order.
+    """
+    workspaces = workspace_manager.get_workspaces()
+    active_workspace_id = workspace_manager.get_active_workspace_id()
+    folders = []
+    seen_folders: Set[str] = set()
+    for workspace in workspaces:
+        tabs = _get_tabs_for_workspace(workspace, active_workspace_id, tab_manager)
+        logger.info(f"Workspace '{workspace.name}' tiene {len(tabs)} tabs en memoria")
+        for folder_path in tabs:
+            normalized_folder = normalize_path(folder_path)
+            if normalized_folder in seen_folders:
+                continue
+            seen_folders.add(normalized_folder)
+            folders.append((workspace.id, folder_path))
+    return folders
+
+
+def search_index(
+    query: str,
+    scopes: List[Tuple[str, List[str]]],
+    index: "FilenameIndex",
+    limit: int = MAX_SEARCH_RESULTS
+) -> List[SearchResult]:
+    """
+    Search the FilenameIndex, mapping each match to the workspace containing it.
+    
+    Args:
+        query: Text to search (case-insensitive, searches in filename)
+        scopes: Searched folders per workspace (get_workspace_search_roots)
+        index: FilenameIndex to query
+        limit: Maximum number of results
+        
+    Returns:
+        List of SearchResult (paths outside every workspace are skipped)
+    """
+    if not query or not query.strip():
+        return []
+    results = []
+    for file_path in index.search(query, limit):
+        workspace_id = _find_workspace_id(file_path, scopes)
+        if workspace_id is not None:
+            results.append(SearchResult(file_path=file_path, workspace_id=workspace_id))
+    return results
+
+
+def search_content(
+    query: str,
+    scopes: List[Tuple[str, List[str]]],
+    content_index: "ContentIndex",
+    limit: int = MAX_SEARCH_RESULTS
+) -> List[SearchResult]:
+    """
+    Search document contents, mapping each match to the workspace containing it.
+    
+    Args:
+        query: Words to search (every word must appear in the document)
+        scopes: Searched folders per workspace (get_workspace_search_roots)
+        content_index: ContentIndex to query
+        limit: Maximum number of results
+        
+    Returns:
+        List of SearchResult, best matches first
+    """
+    if not query or not query.strip():
+        return []
+    results = []
+    for file_path in content_index.search(query, limit):
+        workspace_id = _find_workspace_id(file_path, scopes)
+        if workspace_id is not None:
+            results.append(SearchResult(file_path=file_path, workspace_id=workspace_id))
+    return results
+
+
+def search_folder(
+    query: str,
+    folder_path: str,
+    workspace_id: str,
+    cache: Optional[Dict[str, _CachedFolderListing]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    limit: int = MAX_SEARCH_RESULTS
+) -> List[SearchResult]:
+    """
+    Search the listing of a single folder.
+    
+    Args:
+        query: Text to search (case-insensitive, searches in filename)
+        folder_path: Folder whose entries are matched
+        workspace_id: Workspace the results belong to
+        cache: Listing cache shared between searches
+        cancel_event: Set when the search is superseded; the scan stops
+        limit: Maximum number of results
+        
+    Returns:
+        List of SearchResult (empty if the folder cannot be read or the
+        search was cancelled)
+    """
+    query_lower = query.strip().lower()
+    if not query_lower:
+        return []
+    if cancel_event is not None and cancel_event.is_set():
+        return []
+    if cache is None:
+        cache = {}
+    try:
+        files = _get_files_cached(folder_path, cache)
+    except Exception as e:
+        logger.error(f"Error buscando en {folder_path}: {e}")
+        return []
+    logger.info(f"Carpeta '{folder_path}' tiene {len(files)} entradas cacheadas")
+    
+    results = []
+    for file_path in files:
+        if len(results) >= limit:
+            break
+        if cancel_event is not None and cancel_event.is_set():
+            return []
+        if query_lower in os.path.basename(file_path).lower():
+            results.append(SearchResult(file_path=file_path, workspace_id=workspace_id))
+    return results
+
+
 def search_in_workspaces(
     query: str,
     workspace_manager,
     tab_manager=None,
-    cache: Optional[Dict[str, _CachedFolderListing]] = None
+    cache: Optional[Dict[str, _CachedFolderListing]] = None,
+    index: Optional["FilenameIndex"] = None
 ) -> List[SearchResult]:
     """
     Search files by name across all workspaces.
     
-    Only searches in open folders (tabs) of each workspace.
-    Uses data already available in memory, does not scan filesystem.
+    With a FilenameIndex, searches the full subtree of every tab and focus
+    tree folder of each workspace through the index. Until the index has
+    crawled every folder once, the open folders (tabs) are also searched
+    from their listings.
     
     Args:
         query: Text to search (case-insensitive, searches in filename)
         workspace_manager: WorkspaceManager instance
+        tab_manager: Optional TabManager (live tabs of the active workspace)
+        cache: Listing cache for the tab listing search
+        index: Optional FilenameIndex
         
     Returns:
         List of SearchResult with matching files (max 1000)
@@ -84,49 +267,31 @@ def search_in_workspaces(
     if cache is None:
         cache = {}
 
-    query_lower = query.strip().lower()
     results = []
     seen_paths: Set[str] = set()  # Usar set para deduplicación por path normalizado
-    MAX_RESULTS = 1000
     
-    workspaces = workspace_manager.get_workspaces()
-    active_workspace_id = workspace_manager.get_active_workspace_id()
-    logger.info(f"Buscando '{query}' en {len(workspaces)} workspaces (in-memory tabs)")
+    def add_results(batch: List[SearchResult]) -> None:
+        for result in batch:
+            if len(results) >= MAX_SEARCH_RESULTS:
+                return
+            normalized_path = normalize_path(result.file_path)
+            if normalized_path not in seen_paths:
+                seen_paths.add(normalized_path)
+                results.append(result)
     
-    for workspace in workspaces:
-        tabs = _get_tabs_for_workspace(workspace, active_workspace_id, tab_manager)
-        logger.info(f"Workspace '{workspace.name}' tiene {len(tabs)} tabs en memoria")
-        
-        for folder_path in tabs:
-            if len(results) >= MAX_RESULTS:
-                break
-            
-            try:
-                files = _get_files_cached(folder_path, cache)
-                logger.info(f"Carpeta '{folder_path}' tiene {len(files)} entradas cacheadas")
-                
-                for file_path in files:
-                    if len(results) >= MAX_RESULTS:
-                        break
-                    
-                    # Normalizar path para deduplicación
-                    normalized_path = normalize_path(file_path)
-                    
-                    # Si ya fue añadido, saltar este archivo
-                    if normalized_path in seen_paths:
-                        continue
-                    
-                    filename = os.path.basename(file_path).lower()
-                    if query_lower in filename:
-                        seen_paths.add(normalized_path)
-                        results.append(SearchResult(
-                            file_path=file_path,
-                            workspace_id=workspace.id
-                        ))
-            except Exception as e:
-                logger.error(f"Error buscando en {folder_path}: {e}")
-                continue
+    if index is not None:
+        ready = index.is_ready()
+        scopes = get_workspace_search_roots(workspace_manager, tab_manager)
+        add_results(search_index(query, scopes, index))
+        if ready:
+            logger.info(f"Búsqueda en índice completada: {len(results)} resultados encontrados")
+            return results
+    
+    logger.info(f"Buscando '{query}' en workspaces (in-memory tabs)")
+    for workspace_id, folder_path in get_tab_search_folders(workspace_manager, tab_manager):
+        if len(results) >= MAX_SEARCH_RESULTS:
+            break
+        add_results(search_folder(query, folder_path, workspace_id, cache))
     
     logger.info(f"Búsqueda completada: {len(results)} resultados encontrados")
     return results
-
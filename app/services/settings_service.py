@@ -23,6 +23,7 @@ class SettingsService:
             "ui.theme": "dark",
             "ui.icon_size": 96,
             "preview.default_zoom": 1.0,
+            "preview.preconvert_docx": False,
             "trash.max_age_days": 30
         }
     
@@ -24,7 +24,8 @@ def setup_watcher_and_timer(tab_manager, debounce_delay: int = 200):
         Tuple of (watcher, None, None) - timer is now internal to watcher.
     """
     watcher = FileSystemWatcherService(tab_manager, debounce_delay=debounce_delay)
-    watcher.filesystem_changed.connect(tab_manager._on_folder_changed)
+    # El delta llega antes que filesystem_changed y permite refrescos incrementales
+    watcher.folder_delta.connect(tab_manager._on_folder_delta)
     
     # Timer is now internal to watcher, return None placeholders
     return watcher, None, None
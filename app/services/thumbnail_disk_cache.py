@@ -0,0 +1,210 @@
+"""
+ThumbnailDiskCache - Persistent content-addressed thumbnail store.
+
+Rendered previews are saved as PNG under <storage>/thumbnails/, named by a hash
+of (normalized path, file size, mtime, target size, variant). A changed file gets
+a new key, so stale entries are never read and simply age out. File mtimes of
+the cache entries act as LRU clock: hits touch them, and when the store grows
+past MAX_THUMBNAIL_DISK_CACHE_MB the oldest entries are deleted.
+
+Safe to call from worker threads. Errors never escape: the cache is an
+optimization and a failure behaves like a miss.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from app.core.constants import MAX_THUMBNAIL_DISK_CACHE_MB
+from app.core.logger import get_logger
+from app.models.path_utils import normalize_path
+from app.services.file_identity_cache import get_file_signature
+from app.services.storage_path_service import get_storage_dir
+
+logger = get_logger(__name__)
+
+THUMBNAIL_DIR_NAME = "thumbnails"
+MAX_CACHE_BYTES = MAX_THUMBNAIL_DISK_CACHE_MB * 1024 * 1024
+
+_lock = threading.Lock()
+# Bytes en disco del directorio contabilizado (se calcula perezosamente)
+_accounted_dir: Optional[Path] = None
+_total_bytes = 0
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+
+def get_thumbnail_dir() -> Optional[Path]:
+    """Get thumbnail store directory, or None if storage is unavailable."""
+    try:
+        return get_storage_dir() / THUMBNAIL_DIR_NAME
+    except RuntimeError:
+        return None
+
+
+def compute_thumbnail_key(
+    path: str,
+    file_size: int,
+    mtime: float,
+    width: int,
+    height: int,
+    variant: str = "grid"
+) -> str:
+    """Compute content-addressed key of a thumbnail."""
+    content = f"{normalize_path(path)}|{file_size}|{mtime!r}|{width}x{height}|{variant}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _entry_path(base_dir: Path, key: str) -> Path:
+    """Get on-disk path of an entry (two-level fan-out)."""
+    return base_dir / key[:2] / f"{key}.png"
+
+
+def _entry_for(path: str, size: QSize, variant: str) -> Optional[Path]:
+    """Resolve entry path for the current (size, mtime) of a file."""
+    base_dir = get_thumbnail_dir()
+    signature = get_file_signature(path)
+    if base_dir is None or signature is None:
+        return None
+    file_size, mtime = signature
+    key = compute_thumbnail_key(path, file_size, mtime, size.width(), size.height(), variant)
+    return _entry_path(base_dir, key)
+
+
+def load_thumbnail(path: str, size: QSize, variant: str = "grid") -> Optional[QImage]:
+    """
+    Load a stored thumbnail for the current version of a file.
+    
+    Returns:
+        QImage, or None on miss.
+    """
+    try:
+        entry = _entry_for(path, size, variant)
+        image = QImage(str(entry)) if entry is not None else QImage()
+    except Exception:
+        image = QImage()
+
+    if image.isNull():
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    try:
+        os.utime(entry)  # LRU: marcar como usado recientemente
+    except OSError:
+        pass
+    with _lock:
+        _stats['hits'] += 1
+    return image
+
+
+def store_thumbnail(path: str, size: QSize, image: QImage, variant: str = "grid") -> bool:
+    """
+    Store a rendered thumbnail for the current version of a file.
+    
+    Returns:
+        True if written.
+    """
+    global _total_bytes
+    if image is None or image.isNull():
+        return False
+
+    try:
+        entry = _entry_for(path, size, variant)
+        if entry is None:
+            return False
+        base_dir = entry.parent.parent
+        with _lock:
+            # Contabilizar lo existente antes de escribir para no contar dos veces
+            _ensure_accounted_locked(base_dir)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: otro hilo nunca lee un PNG a medias
+        tmp_path = entry.with_name(f"{entry.name}.{threading.get_ident()}.tmp")
+        if not image.save(str(tmp_path), "PNG"):
+            return False
+        os.replace(tmp_path, entry)
+        written = entry.stat().st_size
+    except Exception as e:
+        logger.debug(f"Cannot store thumbnail for {path}: {e}")
+        return False
+
+    with _lock:
+        _total_bytes += written
+        _stats['writes'] += 1
+        if _total_bytes > MAX_CACHE_BYTES:
+            _evict_locked(base_dir)
+    return True
+
+
+def _scan_entries(base_dir: Path) -> list[tuple[float, int, str]]:
+    """List (mtime, size, path) of every stored entry."""
+    entries = []
+    try:
+        with os.scandir(base_dir) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir():
+                    continue
+                with os.scandir(bucket.path) as files:
+                    for item in files:
+                        try:
+                            st = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, item.path))
+    except OSError:
+        pass
+    return entries
+
+
+def _ensure_accounted_locked(base_dir: Path) -> None:
+    """Compute bytes on disk the first time a directory is used; caller holds _lock."""
+    global _accounted_dir, _total_bytes
+    if _accounted_dir == base_dir:
+        return
+    _accounted_dir = base_dir
+    _total_bytes = sum(size for _, size, _ in _scan_entries(base_dir))
+
+
+def _evict_locked(base_dir: Path) -> None:
+    """Delete least recently used entries down to 80% of the cap; caller holds _lock."""
+    global _total_bytes
+    target = MAX_CACHE_BYTES * 0.8
+    entries = _scan_entries(base_dir)
+    entries.sort()
+    _total_bytes = sum(size for _, size, _ in entries)
+    for _, size, entry_path in entries:
+        if _total_bytes <= target:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        _total_bytes -= size
+        _stats['evictions'] += 1
+
+
+def clear_thumbnail_cache() -> None:
+    """Delete every stored thumbnail and reset counters."""
+    global _accounted_dir, _total_bytes
+    base_dir = get_thumbnail_dir()
+    with _lock:
+        if base_dir is not None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+        _accounted_dir = None
+        _total_bytes = 0
+        for name in _stats:
+            _stats[name] = 0
+
+
+def get_thumbnail_cache_stats() -> dict:
+    """Get counters for diagnostics (hits, misses, writes, evictions, bytes)."""
+    base_dir = get_thumbnail_dir()
+    with _lock:
+        if base_dir is not None:
+            _ensure_accounted_locked(base_dir)
+        return dict(_stats, bytes=_total_bytes, max_bytes=MAX_CACHE_BYTES)
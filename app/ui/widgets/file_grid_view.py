@@ -28,6 +28,7 @@ from app.ui.widgets.grid_tile_manager import TileManager
 from app.ui.widgets.file_grid_view_scroll import create_scroll_area, configure_scroll_area
 from app.ui.widgets.file_stack_tile import FileStackTile
 from app.ui.widgets.file_tile import FileTile
+from app.ui.widgets.file_tile_icon import reload_tile_icon
 from app.ui.widgets.grid_content_widget import GridContentWidget
 from app.ui.widgets.grid_layout_config import calculate_files_per_row, DOCK_DEFAULT_FILES_PER_ROW
 from app.ui.widgets.grid_layout_engine import build_dock_layout, build_normal_grid
@@ -41,9 +42,10 @@ from app.ui.widgets.file_view_utils import create_refresh_callback
 
 # Temporary import for state manager stub
 try:
-    from app.managers.file_state_manager import FileStateManager
+    from app.managers.file_state_manager import FileStateManager, get_file_state_manager
 except ImportError:
     FileStateManager = None
+    get_file_state_manager = None
 
 if TYPE_CHECKING:
     from app.ui.windows.desktop_window import DesktopWindow
@@ -110,7 +112,7 @@ class FileGridView(QWidget):
         self._use_stacks = False
         self._expanded_stacks: dict[str, list] = {}
         self._expanded_file_tiles: dict[str, list[FileTile]] = {}
-        self._state_manager = state_manager or (FileStateManager() if FileStateManager else None)
+        self._state_manager = state_manager or (get_file_state_manager() if get_file_state_manager else None)
         self._get_label_callback = get_label_callback
         # Flag explícito del modo - no se infiere desde la jerarquía
         self._is_desktop_window = is_desktop
@@ -322,6 +324,30 @@ class FileGridView(QWidget):
         self._refresh_tiles()
     
 
+    def apply_delta(self, file_list: list[str], modified_paths: list[str]) -> None:
+        """
+        Apply an incremental watcher change.
+
+        Tiles are added/removed through the incremental grid diff; only tiles
+        of modified files re-render their icon.
+        """
+        file_list_hash = hash(tuple(file_list) if file_list else ())
+        if self._stacks or self._cached_file_list_hash != file_list_hash:
+            self.update_files(file_list)
+        self.refresh_tile_icons(modified_paths)
+
+    def refresh_tile_icons(self, paths: list[str]) -> None:
+        """Reload icons of existing tiles whose file content changed."""
+        if not self._tile_manager:
+            return
+        for path in paths:
+            tile = self._tile_manager.get_tile(path)
+            if isinstance(tile, FileTile):
+                try:
+                    reload_tile_icon(tile, self._icon_service)
+                except RuntimeError:
+                    continue
+
     def _refresh_tiles(self) -> None:
         """Rebuild file tiles or stack tiles in grid layout."""
         # Si estamos en DesktopWindow y la ventana está animando altura,
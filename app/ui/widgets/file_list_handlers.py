@@ -8,9 +8,8 @@ import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional
 
-from PySide6.QtCore import QMimeData, QPoint, Qt
+from PySide6.QtCore import QMimeData, QModelIndex, QPoint, Qt
 from PySide6.QtGui import QDragEnterEvent, QDragMoveEvent, QDropEvent, QMouseEvent
-from PySide6.QtWidgets import QCheckBox, QTableWidgetItem
 
 from app.services.desktop_path_helper import is_desktop_focus
 from app.services.desktop_operations import is_file_in_dock, move_out_of_desktop
@@ -35,36 +34,39 @@ def start_drag(
     file_deleted_signal: Callable[[str], None]
 ) -> None:
     """Handle drag start for file copy or move using checkbox selection or traditional selection."""
-    selected_items = get_selected_items_for_drag(view)
-    if selected_items:
-        handle_start_drag(selected_items, icon_service)
+    selected_paths = get_selected_paths_for_drag(view)
+    if selected_paths:
+        handle_start_drag(view, selected_paths, icon_service)
 
 
-def get_selected_items_for_drag(view: 'FileListView') -> list[QTableWidgetItem]:
-    """Get selected items for drag operation - uses checkboxes if available, otherwise traditional selection."""
-    selected_items = []
+def get_selected_paths_for_drag(view: 'FileListView') -> list[str]:
+    """Get paths for drag operation - uses checkboxes if available, otherwise traditional selection."""
+    model = view.model()
+    selected_paths = []
     
     if view._checked_paths:
-        for row in range(view.rowCount()):
-            item = view.item(row, 1)
-            if item:
-                path = item.data(Qt.ItemDataRole.UserRole)
-                if path and path in view._checked_paths:
-                    selected_items.append(item)
+        selected_paths = [path for path in model.files() if path in view._checked_paths]
     
-    if not selected_items:
-        for item in view.selectedItems():
-            if item and item.column() == 1:
-                selected_items.append(item)
+    if not selected_paths:
+        for index in view.selectionModel().selectedRows(1):
+            path = index.data(Qt.ItemDataRole.UserRole)
+            if path:
+                selected_paths.append(path)
     
-    if not selected_items:
-        current_row = view.currentRow()
-        if current_row >= 0:
-            current_item = view.item(current_row, 1)
-            if current_item:
-                selected_items.append(current_item)
+    if not selected_paths:
+        path = model.path_at(view.currentIndex().row())
+        if path:
+            selected_paths.append(path)
     
-    return selected_items
+    return selected_paths
+
+
+def _path_at_position(view: 'FileListView', pos: QPoint) -> Optional[str]:
+    """Get file path of the row under a viewport position, or None over background."""
+    index = view.indexAt(pos)
+    if not index.isValid():
+        return None
+    return index.data(Qt.ItemDataRole.UserRole)
 
 
 def drag_enter_event(
@@ -78,18 +80,16 @@ def drag_enter_event(
         event.ignore()
         return
     
-    item = view.itemAt(event.pos())
-    if item:
-        item_path = item.data(Qt.ItemDataRole.UserRole)
-        if item_path and os.path.isdir(item_path):
-            for url in mime_data.urls():
-                file_path = url.toLocalFile()
-                if file_path and os.path.exists(file_path) and os.path.isdir(file_path):
-                    if is_folder_inside_itself(file_path, item_path):
-                        event.ignore()
-                        return
-            event.acceptProposedAction()
-            return
+    item_path = _path_at_position(view, event.pos())
+    if item_path and os.path.isdir(item_path):
+        for url in mime_data.urls():
+            file_path = url.toLocalFile()
+            if file_path and os.path.exists(file_path) and os.path.isdir(file_path):
+                if is_folder_inside_itself(file_path, item_path):
+                    event.ignore()
+                    return
+        event.acceptProposedAction()
+        return
     
     handle_drag_enter(event, mime_data, tab_manager)
 
@@ -105,12 +105,10 @@ def drag_move_event(
         event.ignore()
         return
     
-    item = view.itemAt(event.pos())
-    if item:
-        item_path = item.data(Qt.ItemDataRole.UserRole)
-        if item_path and os.path.isdir(item_path):
-            event.accept()
-            return
+    item_path = _path_at_position(view, event.pos())
+    if item_path and os.path.isdir(item_path):
+        event.accept()
+        return
     
     handle_drag_move(event, mime_data, tab_manager)
 
@@ -127,13 +125,11 @@ def drop_event(
         event.ignore()
         return
     
-    item = view.itemAt(event.pos())
+    item_path = _path_at_position(view, event.pos())
     target_folder_path = None
     
-    if item:
-        item_path = item.data(Qt.ItemDataRole.UserRole)
-        if item_path and os.path.isdir(item_path):
-            target_folder_path = item_path
+    if item_path and os.path.isdir(item_path):
+        target_folder_path = item_path
     
     if target_folder_path:
         _handle_drop_on_folder(view, event, mime_data, target_folder_path, file_dropped_signal)
@@ -157,37 +153,19 @@ def mouse_press_event(view: 'FileListView', event: QMouseEvent) -> None:
 
 def toggle_checkbox_at_position(view: 'FileListView', pos: QPoint) -> bool:
     """Toggle checkbox at given position. Returns True if toggled."""
-    item = view.itemAt(pos)
-    if not item:
+    index = view.indexAt(pos)
+    if not index.isValid():
         return False
-    checkbox = get_checkbox_from_row(view, item.row())
-    if checkbox:
-        checkbox.setChecked(not checkbox.isChecked())
-        return True
-    return False
-
-
-def get_checkbox_from_row(view: 'FileListView', row: int) -> Optional[QCheckBox]:
-    """Get checkbox widget from row's column 0."""
-    widget = view.cellWidget(row, 0)
-    if isinstance(widget, QCheckBox):
-        return widget
-    # Si es un contenedor, buscar el checkbox dentro
-    if widget:
-        # Buscar el checkbox dentro del contenedor usando findChild
-        checkbox = widget.findChild(QCheckBox)
-        if checkbox:
-            return checkbox
-    return None
+    return view.model().toggle_checked(index.row())
 
 
 def on_item_double_clicked(
     view: 'FileListView',
-    item: QTableWidgetItem,
+    index: QModelIndex,
     open_file_signal: Callable[[str], None]
 ) -> None:
     """Handle double-click on table row."""
-    file_path = item.data(Qt.ItemDataRole.UserRole)
+    file_path = index.data(Qt.ItemDataRole.UserRole)
     if file_path:
         open_file_signal.emit(file_path)
 
@@ -0,0 +1,372 @@
+"""
+FileListModel - Modelo virtualizado para FileListView.
+
+Guarda solo la lista de rutas; el contenido de cada fila (nombre, tipo, fecha,
+estado, checkbox e icono) se calcula bajo demanda en data(), así que solo se
+resuelven las filas que la vista pinta. Los resultados se cachean por ruta
+hasta el siguiente set_files(); apply_delta() inserta/elimina filas sueltas e
+invalida solo las rutas modificadas.
+"""
+
+import os
+from typing import Callable, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QIcon
+
+from app.services.file_identity_cache import get_file_info
+from app.services.icon_render_service import IconRenderService
+from app.services.icon_service import IconService
+from app.services.path_utils import normalize_path
+from app.ui.widgets.list_row_factory import (
+    format_date,
+    format_display_name,
+    format_extension,
+    get_list_icon,
+)
+from app.ui.widgets.list_state_delegate import STATE_ROLE
+
+LIST_COLUMN_HEADERS = ("", "Nombre", "Tipo", "Fecha", "Estado")
+CHECKBOX_COLUMN = 0
+NAME_COLUMN = 1
+TYPE_COLUMN = 2
+DATE_COLUMN = 3
+STATE_COLUMN = 4
+
+
+def sort_file_paths(
+    files: list[str],
+    column: int,
+    order: Qt.SortOrder,
+    states: Optional[dict[str, Optional[str]]] = None
+) -> list[str]:
+    """
+    Ordenar rutas por columna de la lista (1 nombre, 2 tipo, 3 fecha, 4 estado).
+
+    Columnas desconocidas (o estado sin mapa de estados) devuelven el orden original.
+    """
+    reverse = order == Qt.SortOrder.DescendingOrder
+    if column == NAME_COLUMN:
+        return sorted(files, key=lambda p: os.path.splitext(os.path.basename(p))[0].lower(), reverse=reverse)
+    if column == TYPE_COLUMN:
+        return sorted(files, key=lambda p: os.path.splitext(os.path.basename(p))[1].lower(), reverse=reverse)
+    if column == DATE_COLUMN:
+        def _mtime(path: str) -> float:
+            info = get_file_info(path)
+            return info[1] if info else 0.0
+        return sorted(files, key=_mtime, reverse=reverse)
+    if column == STATE_COLUMN and states is not None:
+        return sorted(files, key=lambda p: (states.get(p) or "").lower(), reverse=reverse)
+    return list(files)
+
+
+class FileListModel(QAbstractTableModel):
+    """Table model with lazily computed rows for FileListView."""
+
+    check_state_changed = Signal(str, int)  # (file_path, Qt.CheckState value)
+
+    def __init__(
+        self,
+        icon_service: IconService,
+        checked_paths: Optional[set[str]] = None,
+        parent=None
+    ):
+        """
+        Inicializa el modelo vacío.
+
+        Args:
+            icon_service: IconService usado para iconos de fallback.
+            checked_paths: Conjunto compartido de rutas marcadas (se muta in situ).
+            parent: QObject padre.
+        """
+        super().__init__(parent)
+        self._icon_service = icon_service
+        self._render_service: Optional[IconRenderService] = None
+        self._files: list[str] = []
+        self._states: dict[str, Optional[str]] = {}
+        self._checked_paths: set[str] = checked_paths if checked_paths is not None else set()
+        self._workspace_resolver: Optional[Callable[[str], Optional[str]]] = None
+        # Cachés por ruta, rellenadas solo para filas pintadas
+        self._rows: dict[str, tuple[str, str, str]] = {}
+        self._icons: dict[str, Optional[QIcon]] = {}
+        self._row_by_path: Optional[dict[str, int]] = None
+
+    # ─────────────────────────────────────────────────────────────
+    # Contenido
+    # ─────────────────────────────────────────────────────────────
+    def set_files(
+        self,
+        files: list[str],
+        states: Optional[dict[str, Optional[str]]] = None,
+        checked_paths: Optional[set[str]] = None,
+        workspace_resolver: Optional[Callable[[str], Optional[str]]] = None
+    ) -> None:
+        """
+        Reemplazar las filas del modelo sin calcular ninguna celda.
+
+        Args:
+            files: Rutas en el orden a mostrar.
+            states: Mapa path -> estado precalculado (get_states_for_paths).
+            checked_paths: Conjunto compartido de rutas marcadas.
+            workspace_resolver: Callback path -> nombre de workspace (modo estado).
+        """
+        self.beginResetModel()
+        self._files = list(files)
+        self._states = dict(states) if states else {}
+        if checked_paths is not None:
+            self._checked_paths = checked_paths
+        self._workspace_resolver = workspace_resolver
+        self._rows.clear()
+        self._icons.clear()
+        self._row_by_path = None
+        self.endResetModel()
+
+    def apply_delta(
+        self,
+        files: list[str],
+        added_states: Optional[dict[str, Optional[str]]] = None,
+        modified: Optional[list[str]] = None
+    ) -> None:
+        """
+        Llevar el modelo a `files` insertando/eliminando solo las filas necesarias.
+
+        Args:
+            files: Nueva lista completa, ya ordenada.
+            added_states: Estados de las rutas nuevas.
+            modified: Rutas cuyo contenido cambió (se recalculan textos e icono).
+        """
+        new_set = set(files)
+
+        # 1. Eliminar filas que ya no están (tramos contiguos, de abajo arriba)
+        row = len(self._files) - 1
+        while row >= 0:
+            if self._files[row] in new_set:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._files[row] not in new_set:
+                row -= 1
+            start = row + 1
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for path in self._files[start:end + 1]:
+                self._forget_path(path)
+            del self._files[start:end + 1]
+            self._row_by_path = None
+            self.endRemoveRows()
+
+        # 2. Reordenar supervivientes si el orden cambió (ej: orden por fecha)
+        old_set = set(self._files)
+        survivors = [path for path in files if path in old_set]
+        if survivors != self._files:
+            self._reorder(survivors)
+
+        # 3. Insertar rutas nuevas (tramos contiguos, de arriba abajo)
+        if added_states:
+            self._states.update(added_states)
+        index = 0
+        while index < len(files):
+            if files[index] in old_set:
+                index += 1
+                continue
+            start = index
+            while index < len(files) and files[index] not in old_set:
+                index += 1
+            self.beginInsertRows(QModelIndex(), start, index - 1)
+            self._files[start:start] = files[start:index]
+            self._row_by_path = None
+            self.endInsertRows()
+
+        # 4. Recalcular solo las filas modificadas
+        for path in modified or ():
+            self.invalidate_path(path)
+
+    def invalidate_path(self, file_path: str) -> bool:
+        """Descartar textos e icono cacheados de una ruta y repintar su fila."""
+        row = self.row_for_path(file_path)
+        if row < 0:
+            return False
+        path = self._files[row]
+        self._rows.pop(path, None)
+        self._icons.pop(path, None)
+        self.dataChanged.emit(self.index(row, NAME_COLUMN), self.index(row, DATE_COLUMN))
+        return True
+
+    def states(self) -> dict[str, Optional[str]]:
+        """Estados conocidos de las filas actuales."""
+        return dict(self._states)
+
+    def files(self) -> list[str]:
+        """Rutas en el orden mostrado."""
+        return list(self._files)
+
+    def path_at(self, row: int) -> Optional[str]:
+        """Ruta de una fila, o None si la fila no existe."""
+        if 0 <= row < len(self._files):
+            return self._files[row]
+        return None
+
+    def row_for_path(self, file_path: str) -> int:
+        """Fila de una ruta (comparando rutas normalizadas), -1 si no está."""
+        if self._row_by_path is None:
+            self._row_by_path = {}
+            for row, path in enumerate(self._files):
+                self._row_by_path.setdefault(normalize_path(path), row)
+        return self._row_by_path.get(normalize_path(file_path), -1)
+
+    def set_state(self, file_path: str, state: Optional[str]) -> bool:
+        """Actualizar el estado de una fila y repintar solo esa celda."""
+        row = self.row_for_path(file_path)
+        if row < 0:
+            return False
+        self._states[self._files[row]] = state
+        index = self.index(row, STATE_COLUMN)
+        self.dataChanged.emit(index, index, [STATE_ROLE])
+        return True
+
+    def set_checked(self, file_path: str, checked: bool) -> None:
+        """Marcar/desmarcar una ruta y notificar con check_state_changed."""
+        if checked:
+            self._checked_paths.add(file_path)
+        else:
+            self._checked_paths.discard(file_path)
+        row = self.row_for_path(file_path)
+        if row >= 0:
+            index = self.index(row, CHECKBOX_COLUMN)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        self.check_state_changed.emit(file_path, state.value)
+
+    def toggle_checked(self, row: int) -> bool:
+        """Alternar el checkbox de una fila. Devuelve False si la fila no existe."""
+        path = self.path_at(row)
+        if path is None:
+            return False
+        self.set_checked(path, path not in self._checked_paths)
+        return True
+
+    def refresh_checks(self) -> None:
+        """Repintar la columna de checkboxes tras cambios masivos del conjunto."""
+        if self._files:
+            self.dataChanged.emit(
+                self.index(0, CHECKBOX_COLUMN),
+                self.index(len(self._files) - 1, CHECKBOX_COLUMN),
+                [Qt.ItemDataRole.CheckStateRole]
+            )
+
+    # ─────────────────────────────────────────────────────────────
+    # QAbstractTableModel
+    # ─────────────────────────────────────────────────────────────
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._files)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(LIST_COLUMN_HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(LIST_COLUMN_HEADERS)
+        ):
+            return LIST_COLUMN_HEADERS[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+        flags = (
+            Qt.ItemFlag.ItemIsEnabled
+            | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsDragEnabled
+            | Qt.ItemFlag.ItemIsDropEnabled
+        )
+        if index.column() == CHECKBOX_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._files):
+            return None
+        path = self._files[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        if column == CHECKBOX_COLUMN:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                checked = path in self._checked_paths
+                return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+            return None
+        if column == STATE_COLUMN:
+            return self._states.get(path) if role == STATE_ROLE else None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._get_row_texts(path)[column - NAME_COLUMN]
+        if role == Qt.ItemDataRole.DecorationRole and column == NAME_COLUMN:
+            return self._get_icon(path)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (TYPE_COLUMN, DATE_COLUMN):
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if (
+            not index.isValid()
+            or index.column() != CHECKBOX_COLUMN
+            or role != Qt.ItemDataRole.CheckStateRole
+        ):
+            return False
+        path = self.path_at(index.row())
+        if path is None:
+            return False
+        self.set_checked(path, Qt.CheckState(value) == Qt.CheckState.Checked)
+        return True
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Reordenar filas con las mismas claves que refresh_table."""
+        self._reorder(sort_file_paths(self._files, column, order, self._states))
+
+    def _reorder(self, new_order: list[str]) -> None:
+        """Cambiar el orden de las filas actuales conservando selección/foco."""
+        self.layoutAboutToBeChanged.emit()
+        new_rows = {path: row for row, path in enumerate(new_order)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [
+            self.createIndex(new_rows[self._files[index.row()]], index.column())
+            for index in old_indexes
+        ]
+        self._files = list(new_order)
+        self._row_by_path = None
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _forget_path(self, path: str) -> None:
+        """Drop every cached value of a removed row."""
+        self._rows.pop(path, None)
+        self._icons.pop(path, None)
+        self._states.pop(path, None)
+        self._checked_paths.discard(path)
+
+    # ─────────────────────────────────────────────────────────────
+    # Cálculo perezoso de filas
+    # ─────────────────────────────────────────────────────────────
+    def _get_row_texts(self, path: str) -> tuple[str, str, str]:
+        """Textos (nombre, tipo, fecha) de una fila; tipo y fecha salen del escaneo de la carpeta."""
+        texts = self._rows.get(path)
+        if texts is None:
+            info = get_file_info(path)
+            is_dir, mtime = (info[2], info[1]) if info else (False, None)
+            workspace_name = self._workspace_resolver(path) if self._workspace_resolver else None
+            texts = (
+                format_display_name(path, workspace_name),
+                format_extension(path, is_dir),
+                format_date(mtime),
+            )
+            self._rows[path] = texts
+        return texts
+
+    def _get_icon(self, path: str) -> Optional[QIcon]:
+        """Icono de una fila, renderizado la primera vez que se pinta."""
+        if path not in self._icons:
+            if self._render_service is None:
+                self._render_service = IconRenderService(self._icon_service)
+            self._icons[path] = get_list_icon(path, self._icon_service, self._render_service)
+        return self._icons[path]
@@ -1,43 +1,26 @@
 """
 Renderizado para FileListView.
 
-Gestiona la configuración de UI y la creación de filas de la tabla.
+Gestiona la configuración de UI y la carga de filas en FileListModel.
 """
-import os
 
 from typing import Optional, Callable
-from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
-from PySide6.QtGui import QFont, QPalette, QColor
-from PySide6.QtWidgets import QCheckBox, QHeaderView, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+from PySide6.QtCore import Qt, QModelIndex, QTimer
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QCheckBox, QHeaderView, QTableView, QVBoxLayout, QWidget
 
 from app.models.file_stack import FileStack
 from app.ui.utils.font_manager import FontManager
+from app.ui.widgets.file_list_model import FileListModel, sort_file_paths
 from app.ui.widgets.list_checkbox import CustomCheckBox
 from app.ui.widgets.list_icon_delegate import ListViewDelegate
 from app.ui.widgets.list_name_delegate import ListNameDelegate
-from app.ui.widgets.list_row_factory import (
-    create_checkbox_cell,
-    create_date_cell,
-    create_extension_cell,
-    create_name_cell,
-    create_state_item,
-)
 from app.ui.widgets.list_styles import LIST_VIEW_STYLESHEET
-from app.core.constants import CENTRAL_AREA_BG
-from app.services.icon_service import IconService
 from app.managers.file_state_manager import FileStateManager
 from app.managers.tab_manager import TabManager
 
 
-def _ensure_column_count(view: QTableWidget, count: int) -> None:
-    """Asegurar que la tabla tenga exactamente el número de columnas especificado."""
-    if view.columnCount() > count:
-        view.setColumnCount(count)
-    for i in range(count, view.columnCount()):
-        view.setColumnHidden(i, True)
-
-
-def create_header_checkbox(view: QTableWidget, parent: Optional[QWidget] = None) -> QCheckBox:
+def create_header_checkbox(view: QTableView, parent: Optional[QWidget] = None) -> QCheckBox:
     """Crear checkbox para el header que selecciona/deselecciona todos los archivos."""
     checkbox = CustomCheckBox(parent)
     checkbox.setText("")
@@ -71,7 +54,7 @@ def _update_header_checkbox_position(container: QWidget, header: QHeaderView) ->
         container.setGeometry(section_x + 8, 2, max(section_width, 20), header_height)
 
 
-def _update_header_checkbox_visibility(container: QWidget, view: QTableWidget) -> None:
+def _update_header_checkbox_visibility(container: QWidget, view: QTableView) -> None:
     """Actualizar visibilidad del checkbox según el scroll horizontal."""
     scrollbar = view.horizontalScrollBar()
     if scrollbar:
@@ -83,7 +66,7 @@ def _update_header_checkbox_visibility(container: QWidget, view: QTableWidget) -
             container.setVisible(False)
 
 
-def setup_header_checkbox(view: QTableWidget, header: QHeaderView) -> None:
+def setup_header_checkbox(view: QTableView, header: QHeaderView) -> None:
     """Configurar widget checkbox en la primera sección del header."""
     # Crear contenedor primero para establecer el parent explícito del checkbox
     container = QWidget(header)
@@ -123,12 +106,15 @@ def setup_header_checkbox(view: QTableWidget, header: QHeaderView) -> None:
     _update_header_checkbox_visibility(container, view)
 
 
-def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int], None], double_click_callback: Callable[[QTableWidgetItem], None]) -> None:
+def setup_ui(view: QTableView, checkbox_changed_callback: Callable[[str, int], None], double_click_callback: Callable[[QModelIndex], None]) -> None:
     """Construir el layout de la UI."""
-    view.setColumnCount(5)
-    view.setHorizontalHeaderLabels(["", "Nombre", "Tipo", "Fecha", "Estado"])
-    view.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-    view.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    # Modelo virtualizado: las columnas/cabeceras vienen de FileListModel
+    model = FileListModel(view._icon_service, view._checked_paths, view)
+    model.check_state_changed.connect(checkbox_changed_callback)
+    view.setModel(model)
+    view._model = model
+    view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+    view.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
     view.setAlternatingRowColors(False)
     view.setShowGrid(False)
     
@@ -172,8 +158,6 @@ def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int],
     # Todas las columnas tienen ancho fijo manual - sin expansión automática
     header.setSectionsMovable(False)
     
-    _ensure_column_count(view, 5)
-    
     header.setStyleSheet("""
         QHeaderView::section {
             border-left: none !important;
@@ -186,6 +170,7 @@ def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int],
     
     header.setVisible(True)
     # Desactivar sorting interno; usaremos orden propio determinista
+    # (activarlo haría que el header llame también a FileListModel.sort)
     view.setSortingEnabled(False)
     header.setSortIndicatorShown(True)
     try:
@@ -198,8 +183,6 @@ def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int],
     vheader.setVisible(False)
     vheader.setDefaultSectionSize(56)
     vheader.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
-    
-    view.setSortingEnabled(True)
 
     view.setItemDelegateForColumn(0, ListViewDelegate(view, column_index=0))
     view.setItemDelegateForColumn(1, ListNameDelegate(view))  # Custom delegate for workspace text
@@ -215,8 +198,8 @@ def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int],
     view.setAttribute(Qt.WidgetAttribute.WA_MacShowFocusRect, False)
     view.setShowGrid(False)
     
-    view.setFrameShape(QTableWidget.Shape.NoFrame)
-    view.setFrameShadow(QTableWidget.Shadow.Plain)
+    view.setFrameShape(QTableView.Shape.NoFrame)
+    view.setFrameShadow(QTableView.Shadow.Plain)
     
     # Respetar atributos del view definidos por FileListView
     
@@ -239,7 +222,7 @@ def setup_ui(view: QTableWidget, checkbox_changed_callback: Callable[[str, int],
     )
     
     # Mantener estilo del viewport definido por FileListView
-    view.itemDoubleClicked.connect(double_click_callback)
+    view.doubleClicked.connect(double_click_callback)
     view.setDragEnabled(True)
     view.setAcceptDrops(True)
     view.setDropIndicatorShown(True)
@@ -257,28 +240,23 @@ def expand_stacks_to_files(file_list: list) -> list[str]:
 
 
 def refresh_table(
-    view: QTableWidget,
+    view: QTableView,
     files: list[str],
-    icon_service: Optional[IconService],
     state_manager: Optional[FileStateManager],
     checked_paths: set,
-    checkbox_changed_callback: Callable[[str, int], None],
-    get_label_callback: Optional[Callable] = None,
     tab_manager: Optional[TabManager] = None,
     workspace_manager: Optional['WorkspaceManager'] = None
 ) -> None:
-    """Reconstruir filas de la tabla a partir de la lista de archivos."""
+    """
+    Cargar la lista de archivos en el modelo de la tabla.
+
+    Solo ordena y consulta los estados en bloque; nombre, tipo, fecha e icono
+    se calculan en FileListModel.data() para las filas visibles.
+    """
     from app.core.logger import get_logger
     logger = get_logger(__name__)
 
     logger.debug(f"▶▶▶ refresh_table LLAMADO con {len(files)} archivos")
-    for idx, f in enumerate(files[:5]):  # Primeros 5
-        logger.debug(f"      [{idx}] {os.path.basename(f)}")
-
-    _ensure_column_count(view, 5)
-
-    # Eliminado el "Soft reveal" que ocultaba el viewport.
-    # Esto evita que se vea el escritorio a través de la transparencia del padre durante la navegación.
 
     # NO filtrar aquí - TabManager.get_files() es la única fuente de verdad.
     # El filtrado adicional causaba inconsistencias al cambiar entre contextos
@@ -292,87 +270,26 @@ def refresh_table(
 
     logger.debug(f"▶▶▶ Estado de ordenamiento: sort_section={sort_section}, sort_order={sort_order}")
 
+    # Estados de todo el listado en una sola consulta (orden por estado + columna Estado)
+    states = state_manager.get_states_for_paths(files) if state_manager else {}
+
     # Solo ordenar si hay preferencias de ordenamiento activas
     if sort_section is not None and sort_order is not None:
         try:
-            if sort_section == 1:
-                files = sorted(
-                    files,
-                    key=lambda p: os.path.splitext(os.path.basename(p))[0].lower(),
-                    reverse=sort_order == Qt.SortOrder.DescendingOrder
-                )
-            elif sort_section == 2:
-                files = sorted(
-                    files,
-                    key=lambda p: os.path.splitext(os.path.basename(p))[1].lower(),
-                    reverse=sort_order == Qt.SortOrder.DescendingOrder
-                )
-            elif sort_section == 3:
-                def _mtime(path: str) -> float:
-                    try:
-                        return os.path.getmtime(path)
-                    except Exception:
-                        return 0.0
-                files = sorted(
-                    files,
-                    key=lambda p: _mtime(p),
-                    reverse=sort_order == Qt.SortOrder.DescendingOrder
-                )
-            elif sort_section == 4 and state_manager:
-                def _state(path: str) -> str:
-                    try:
-                        s = state_manager.get_file_state(path)
-                        return (s or "").lower()
-                    except Exception:
-                        return ""
-                files = sorted(
-                    files,
-                    key=lambda p: _state(p),
-                    reverse=sort_order == Qt.SortOrder.DescendingOrder
-                )
+            files = sort_file_paths(files, sort_section, sort_order, states if state_manager else None)
         except Exception:
             pass
-
-        # DEBUG: Mostrar archivos después del ordenamiento
-        logger.debug(f"▶▶▶ Después del ordenamiento: {len(files)} archivos")
-        for idx, f in enumerate(files[:5]):  # Primeros 5
-            logger.debug(f"      [{idx}] {os.path.basename(f)}")
     else:
         logger.debug(f"▶▶▶ Sin ordenamiento activo - usando orden natural")
 
-    # CRÍTICO: Deshabilitar sorting ANTES de reconstruir la tabla
-    # setSortingEnabled(True) causa que Qt reordene automáticamente durante setItem(),
-    # lo cual corrompe los datos de STATE_ROLE al mezclar filas
-    view.setSortingEnabled(False)
-    
-    # CRÍTICO: Limpiar tabla completamente ANTES de establecer nuevas filas
-    # Esto previene que filas antiguas permanezcan visibles por bug de renderizado
-    view.clearContents()
-    view.setRowCount(0)
-    view.setRowCount(len(files))
-
-    logger.debug(f"▶▶▶ Tabla limpiada y redimensionada. Creando {len(files)} filas")
-    for row, file_path in enumerate(files):
-        create_row(
-            view,
-            row,
-            file_path,
-            icon_service,
-            state_manager,
-            checked_paths,
-            checkbox_changed_callback,
-            get_label_callback,
-            tab_manager,
-            workspace_manager
-        )
-    
-    # Rehabilitar sorting DESPUÉS de crear todas las filas
-    view.setSortingEnabled(True)
+    # Resolver workspace_name solo si estamos en modo navegación por estado (perezoso, por fila)
+    workspace_resolver = None
+    if tab_manager and hasattr(tab_manager, 'has_state_context'):
+        if tab_manager.has_state_context() and workspace_manager:
+            from app.services.workspace_path_resolver import get_workspace_name_for_path
+            workspace_resolver = lambda path: get_workspace_name_for_path(path, workspace_manager)
 
-    # OPTIMIZACIÓN: No ajustar columnas automáticamente para evitar recálculos costosos
-    # Los anchos iniciales ya están definidos en setup_ui() (líneas 147-150)
-    # El modo Interactive permite al usuario ajustar manualmente si lo necesita
-    # Esto elimina un punto de recálculo costoso durante cada navegación
+    view._model.set_files(files, states, checked_paths, workspace_resolver)
 
     # Solo asegurar que la columna 0 (checkbox) mantenga su ancho mínimo fijo
     view.setColumnWidth(0, 16)
@@ -406,47 +323,34 @@ def refresh_table(
         pass  # Silenciosamente ignorar si no se encuentra el header
 
 
-def create_row(
-    view: QTableWidget,
-    row: int,
-    file_path: str,
-    icon_service: Optional[IconService],
-    state_manager: Optional[FileStateManager],
-    checked_paths: set,
-    checkbox_changed_callback: Callable[[str, int], None],
-    get_label_callback: Optional[Callable] = None,
-    tab_manager: Optional[TabManager] = None,
-    workspace_manager: Optional['WorkspaceManager'] = None
+def apply_table_delta(
+    view: QTableView,
+    files: list[str],
+    modified: list[str],
+    state_manager: Optional[FileStateManager]
 ) -> None:
-    """Crear una fila de tabla con todas las columnas."""
-    font = view.font()
+    """
+    Aplicar un cambio incremental de la carpeta sin recargar el modelo.
 
-    # Resolver workspace_name solo si estamos en modo navegación por estado
-    workspace_name = None
+    Solo consulta el estado de las rutas nuevas; las filas existentes conservan
+    sus celdas cacheadas salvo las de `modified`.
+    """
+    model = view._model
+    current = set(model.files())
+    added = [path for path in files if path not in current]
+    added_states = state_manager.get_states_for_paths(added) if state_manager and added else {}
 
-    if tab_manager and hasattr(tab_manager, 'has_state_context'):
-        is_state_mode = tab_manager.has_state_context()
-
-        if is_state_mode and workspace_manager:
-            from app.services.workspace_path_resolver import get_workspace_name_for_path
-            workspace_name = get_workspace_name_for_path(file_path, workspace_manager)
+    sort_section = getattr(view, '_sort_column', None)
+    sort_order = getattr(view, '_sort_order', None)
+    if sort_section is not None and sort_order is not None:
+        states = model.states()
+        states.update(added_states)
+        try:
+            files = sort_file_paths(files, sort_section, sort_order, states if state_manager else None)
+        except Exception:
+            pass
 
-    view.setCellWidget(row, 0, create_checkbox_cell(
-        file_path, file_path in checked_paths, checkbox_changed_callback, view))
-    name_item = create_name_cell(file_path, icon_service, font, workspace_name)
-    name_item.setData(Qt.ItemDataRole.UserRole, file_path)
-    view.setItem(row, 1, name_item)
-    view.setItem(row, 2, create_extension_cell(file_path, font))
-    view.setItem(row, 3, create_date_cell(file_path, font))
+    model.apply_delta(files, added_states, modified)
 
-    state = state_manager.get_file_state(file_path) if state_manager else None
-    
-    # DEBUG: Log estado obtenido
-    from app.core.logger import get_logger
-    logger = get_logger(__name__)
-    if row < 5:  # Solo primeras 5 filas
-        logger.debug(f"create_row Row {row}: file='{os.path.basename(file_path)}', state='{state}'")
-    
-    state_item = create_state_item(state, font)
-    view.setItem(row, 4, state_item)
-    view.setRowHeight(row, 56)
+    if hasattr(view, '_update_header_checkbox_state'):
+        view._update_header_checkbox_state()
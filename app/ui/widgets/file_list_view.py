@@ -2,19 +2,21 @@
 FileListView - Vista de lista/tabla para mostrar archivos.
 
 Muestra archivos en una tabla con nombre, extensión y fecha de modificación.
+Las filas vienen de FileListModel (virtualizado): solo se calculan las visibles.
 Emite una señal en doble clic para abrir el archivo.
 """
 
 from typing import Optional, Callable
 
-from PySide6.QtCore import Qt, Signal, QEvent, QTimer, QElapsedTimer
+from PySide6.QtCore import Qt, Signal, QEvent, QTimer, QElapsedTimer, QModelIndex
 from PySide6.QtGui import QContextMenuEvent, QMouseEvent, QResizeEvent
-from PySide6.QtWidgets import QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView
+from PySide6.QtWidgets import QCheckBox, QTableView, QHeaderView
 
 try:
-    from app.managers.file_state_manager import FileStateManager
+    from app.managers.file_state_manager import FileStateManager, get_file_state_manager
 except ImportError:
     FileStateManager = None
+    get_file_state_manager = None
 
 from app.managers.tab_manager import TabManager
 from app.services.icon_service import IconService
@@ -22,8 +24,9 @@ from app.ui.widgets.file_list_handlers import (
     start_drag, drag_enter_event, drag_move_event, drop_event,
     mouse_press_event, on_item_double_clicked, on_checkbox_changed
 )
+from app.ui.widgets.file_list_model import FileListModel
 from app.ui.widgets.file_list_renderer import (
-    setup_ui, expand_stacks_to_files, refresh_table
+    setup_ui, expand_stacks_to_files, refresh_table, apply_table_delta
 )
 from app.ui.widgets.file_view_context_menu import show_background_menu, show_item_menu
 from app.ui.widgets.file_view_utils import create_refresh_callback
@@ -33,13 +36,14 @@ logger = get_logger(__name__)
 from app.managers.workspace_manager import WorkspaceManager
 
 
-class FileListView(QTableWidget):
+class FileListView(QTableView):
     """Table view widget displaying files as a list."""
 
     open_file = Signal(str)  # Emitted on double-click (file path)
     file_dropped = Signal(str)  # Emitted when file is dropped (source file path)
     file_deleted = Signal(str)  # Emitted when file is deleted (file path)
     folder_moved = Signal(str, str)  # Emitted when folder is moved (old_path, new_path)
+    itemSelectionChanged = Signal()  # Compatibilidad con la API de QTableWidget
 
     def __init__(
         self,
@@ -68,7 +72,7 @@ class FileListView(QTableWidget):
         self._tab_manager = tab_manager
         self._workspace_manager = workspace_manager
         self._checked_paths: set[str] = set()
-        self._state_manager = state_manager or (FileStateManager() if FileStateManager else None)
+        self._state_manager = state_manager or (get_file_state_manager() if get_file_state_manager else None)
         self._get_label_callback = get_label_callback
         self._header_checkbox: Optional[QCheckBox] = None
         self._hovered_row: int = -1
@@ -88,6 +92,7 @@ class FileListView(QTableWidget):
         self._sort_order: Optional[Qt.SortOrder] = None
         self._current_folder: Optional[str] = None  # Para rastrear cambios de carpeta
         self._update_generation: int = 0  # Counter para invalidar actualizaciones obsoletas
+        self._model: Optional[FileListModel] = None  # Creado en setup_ui
         self._setup_ui()
 
     def _setup_ui(self) -> None:
@@ -207,18 +212,38 @@ class FileListView(QTableWidget):
 
         self._refresh_table()
 
+    def apply_delta(self, file_list: list[str], modified_paths: list[str]) -> None:
+        """
+        Apply an incremental watcher change: insert/remove only changed rows.
+
+        Args:
+            file_list: New full file list of the current folder.
+            modified_paths: Paths whose content changed (text and icon are recomputed).
+        """
+        current_folder = None
+        if self._tab_manager and not self._tab_manager.has_state_context():
+            current_folder = self._tab_manager.get_active_folder()
+        if current_folder != self._current_folder:
+            # Otra carpeta: requiere recarga completa (preferencias de orden, filtrado)
+            self.update_files(file_list)
+            return
+
+        self._update_generation += 1
+        self._files = list(file_list)
+        apply_table_delta(self, self._files, modified_paths, self._state_manager)
+
     def _refresh_table(self) -> None:
         """Rebuild table rows from file list."""
         # Remove checked paths that no longer exist in the current file list
-        self._checked_paths = {path for path in self._checked_paths if path in self._files}
+        # (in place: the model shares this set)
+        self._checked_paths.intersection_update(self._files)
 
         # TabManager.get_files() es la única fuente de verdad - no se filtra aquí
         # self._files contiene exactamente los archivos que deben mostrarse
 
         refresh_table(
-            self, self._files, self._icon_service,
-            self._state_manager, self._checked_paths, self._on_checkbox_changed,
-            self._get_label_callback, self._tab_manager, self._workspace_manager
+            self, self._files, self._state_manager, self._checked_paths,
+            self._tab_manager, self._workspace_manager
         )
         try:
             from app.core.logger import get_logger
@@ -242,16 +267,7 @@ class FileListView(QTableWidget):
         Returns:
             True si se encontró la fila y se actualizó, False si no existe.
         """
-        from app.ui.widgets.list_state_delegate import STATE_ROLE
-        for row in range(self.rowCount()):
-            name_item = self.item(row, 1)
-            if name_item and name_item.data(Qt.ItemDataRole.UserRole) == file_path:
-                state_item = self.item(row, 4)
-                if state_item:
-                    state_item.setData(STATE_ROLE, new_state)
-                    self.viewport().update()
-                    return True
-        return False
+        return self._model.set_state(file_path, new_state)
     
     def refresh_state_labels(self, state_id: Optional[str]) -> None:
         """
@@ -339,16 +355,6 @@ class FileListView(QTableWidget):
         """Obsolete."""
         pass
 
-    def _set_row_widgets_visible(self, visible: bool) -> None:
-        try:
-            for row in range(self.rowCount()):
-                for col in (0, 4):
-                    w = self.cellWidget(row, col)
-                    if w:
-                        w.setVisible(visible)
-        except RuntimeError:
-            pass
-
     def viewportEvent(self, event: QEvent) -> bool:
         et = event.type()
         if DEBUG_LAYOUT:
@@ -369,8 +375,7 @@ class FileListView(QTableWidget):
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         super().mouseMoveEvent(event)
-        item = self.itemAt(event.pos())
-        new_hovered_row = item.row() if item else -1
+        new_hovered_row = self.indexAt(event.pos()).row()
         if new_hovered_row < 0:
             if self._hovered_row >= 0:
                 old_row = self._hovered_row
@@ -408,9 +413,25 @@ class FileListView(QTableWidget):
                     rect.setRight(last_rect.right())
             self.viewport().update(rect)
 
-    def _on_item_double_clicked(self, item: QTableWidgetItem) -> None:
+    def rowCount(self) -> int:
+        """Number of rows (QTableWidget-compatible helper)."""
+        return self._model.rowCount() if self._model else 0
+
+    def columnCount(self) -> int:
+        """Number of columns (QTableWidget-compatible helper)."""
+        return self._model.columnCount() if self._model else 0
+
+    def sortItems(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Sort visible rows once, without changing the saved folder preference."""
+        self._model.sort(column, order)
+
+    def selectionChanged(self, selected, deselected) -> None:
+        super().selectionChanged(selected, deselected)
+        self.itemSelectionChanged.emit()
+
+    def _on_item_double_clicked(self, index: QModelIndex) -> None:
         """Handle double-click on table row."""
-        on_item_double_clicked(self, item, self.open_file)
+        on_item_double_clicked(self, index, self.open_file)
 
     def _on_checkbox_changed(self, file_path: str, state: int) -> None:
         """Handle checkbox state change to update selection set."""
@@ -456,38 +477,16 @@ class FileListView(QTableWidget):
     
     def _update_all_checkboxes(self, checked: bool) -> None:
         """Update all checkboxes state and selection set."""
-        if self._header_checkbox:
-            self._header_checkbox.blockSignals(True)
-        
-        for file_path in self._files:
-            if checked:
-                self._checked_paths.add(file_path)
-            else:
-                self._checked_paths.discard(file_path)
-            
-            checkbox = self._get_checkbox_from_row(self.row_from_path(file_path))
-            if checkbox:
-                checkbox.setChecked(checked)
-        
-        if self._header_checkbox:
-            self._header_checkbox.blockSignals(False)
-    
-    def _get_checkbox_from_row(self, row: int) -> Optional[QCheckBox]:
-        """Get checkbox widget from row's column 0."""
-        from app.ui.widgets.file_list_handlers import get_checkbox_from_row
-        return get_checkbox_from_row(self, row)
+        if checked:
+            self._checked_paths.update(self._files)
+        else:
+            self._checked_paths.difference_update(self._files)
+        # Una sola notificación para toda la columna de checkboxes
+        self._model.refresh_checks()
     
     def row_from_path(self, file_path: str) -> int:
         """Get row index for a given file path."""
-        from app.services.path_utils import normalize_path
-        target = normalize_path(file_path)
-        for row in range(self.rowCount()):
-            item = self.item(row, 1)
-            if item:
-                path = item.data(Qt.ItemDataRole.UserRole)
-                if path and normalize_path(path) == target:
-                    return row
-        return -1
+        return self._model.row_for_path(file_path)
 
     def _load_folder_sort_preferences(self) -> None:
         """Cargar preferencias de ordenamiento para la carpeta actual."""
@@ -555,29 +554,23 @@ class FileListView(QTableWidget):
         if self._checked_paths:
             return list(self._checked_paths)
         selected_paths = []
-        for item in self.selectedItems():
-            if item:
-                path = item.data(Qt.ItemDataRole.UserRole)
-                if path:
-                    selected_paths.append(path)
+        for index in self.selectionModel().selectedRows(1):
+            path = index.data(Qt.ItemDataRole.UserRole)
+            if path:
+                selected_paths.append(path)
         if selected_paths:
             return selected_paths
-        # Fallback: usar currentItem cuando selectedItems() está vacío (problema de foco)
-        current_row = self.currentRow()
-        if current_row >= 0:
-            current_item = self.item(current_row, 1)
-            if current_item:
-                path = current_item.data(Qt.ItemDataRole.UserRole)
-                if path:
-                    return [path]
-        return []
+        # Fallback: usar currentIndex cuando la selección está vacía (problema de foco)
+        path = self._model.path_at(self.currentIndex().row())
+        return [path] if path else []
 
     def clear_selection(self) -> None:
         """Compatibility alias: call Qt's `clearSelection()` for consistency with grid view."""
-        # QTableWidget already exposes clearSelection(); provide snake_case alias
+        # QTableView already exposes clearSelection(); provide snake_case alias
         self.clearSelection()
         # Clear checkbox selection to prevent accumulation of old paths
         self._checked_paths.clear()
+        self._model.refresh_checks()
         # Update header checkbox state to reflect cleared selection
         self._update_header_checkbox_state()
 
@@ -639,23 +632,10 @@ class FileListView(QTableWidget):
         Returns:
             Ruta del archivo si el clic es sobre un item, None si es fondo.
         """
-        # itemAt retorna el QTableWidgetItem en esa posición, o None si es fondo
-        item = self.itemAt(pos)
-        
-        if not item:
+        # indexAt retorna un índice inválido si el clic es sobre el fondo
+        index = self.indexAt(pos)
+        if not index.isValid():
             return None
         
-        # Obtener ruta del archivo desde el item (columna 1 contiene el nombre con la ruta)
-        path = item.data(Qt.ItemDataRole.UserRole)
-        if path:
-            return path
-        
-        # Si no hay UserRole, intentar obtener desde la fila completa
-        row = item.row()
-        if row >= 0:
-            name_item = self.item(row, 1)  # Columna 1 contiene el nombre
-            if name_item:
-                path = name_item.data(Qt.ItemDataRole.UserRole)
-                return path if path else None
-        
-        return None
+        # Todas las columnas del modelo exponen la ruta en UserRole
+        return index.data(Qt.ItemDataRole.UserRole) or None
@@ -8,6 +8,7 @@ import hashlib
 import os
 from typing import List
 
+from app.services.file_identity_cache import invalidate_path
 from app.services.file_state_storage import update_path_for_rename
 
 
@@ -52,18 +53,16 @@ def migrate_states_on_rename(
         content = f"{new_path}|{size}|{modified}".encode('utf-8')
         new_file_id = hashlib.sha256(content).hexdigest()
         
-        # Migrate state in database
+        # Migrate state in database (queued writes must be committed first)
+        state_manager.flush()
         state = update_path_for_rename(old_path, new_path, new_file_id, size, modified)
         
         # Update cache after migration
         if state and state_manager:
-            # Remove old entry from cache
             old_file_id = state_manager._get_file_id(old_path)
-            if old_file_id:
-                state_manager._state_cache.pop(old_file_id, None)
-                state_manager._path_to_id_cache.pop(old_path, None)
+            state_manager.record_rename(old_path, old_file_id, new_path, new_file_id, state)
             
-            # Add new entry to cache
-            state_manager._state_cache[new_file_id] = state
-            state_manager._path_to_id_cache[new_path] = new_file_id
+            # Identities of both paths are recomputed on demand
+            invalidate_path(old_path)
+            invalidate_path(new_path)
 
@@ -18,6 +18,9 @@ from app.ui.widgets.state_badge_widget import STATE_COLORS
 if TYPE_CHECKING:
     from app.ui.widgets.file_tile import FileTile
 
+# Tamaño del icono de los tiles (grid y dock)
+TILE_ICON_SIZE = QSize(48, 48)
+
 
 def _create_icon_shadow(widget: QWidget) -> QGraphicsDropShadowEffect:
     """Create standard icon shadow effect."""
@@ -100,7 +103,7 @@ def _get_icon_loader(icon_service: IconService) -> GridIconLoader:
     Uses icon_service as key to ensure one loader per service instance.
     """
     if not hasattr(icon_service, '_grid_icon_loader'):
-        icon_service._grid_icon_loader = GridIconLoader(max_threads=5)
+        icon_service._grid_icon_loader = GridIconLoader(max_threads=5, icon_service=icon_service)
     return icon_service._grid_icon_loader
 
 
@@ -143,14 +146,26 @@ def _on_icon_loaded(
         pass
 
 
+def prefetch_tile_icons(file_paths: list[str], icon_service: IconService) -> int:
+    """
+    Render the icons of the image files of tiles about to be created in one batch.
+    
+    The tiles then pick them up from the shared loader as they are created.
+    
+    Returns:
+        Number of files batched
+    """
+    return _get_icon_loader(icon_service).prefetch_icons(file_paths, TILE_ICON_SIZE)
+
+
 def add_icon_zone(tile: 'FileTile', layout: QVBoxLayout, icon_service: IconService) -> None:
     """
     Add icon zone with shadow - carga asíncrona real usando QThreadPool.
     
     Muestra placeholder inmediatamente y carga icono en background thread.
     """
-    icon_width = 48
-    icon_height = 48
+    icon_width = TILE_ICON_SIZE.width()
+    icon_height = TILE_ICON_SIZE.height()
     icon_size = QSize(icon_width, icon_height)
     
     # Crear placeholder mientras se carga el icono
@@ -201,3 +216,23 @@ def add_icon_zone(tile: 'FileTile', layout: QVBoxLayout, icon_service: IconServi
 
 
 
+
+
+def reload_tile_icon(tile: 'FileTile', icon_service: IconService) -> bool:
+    """
+    Re-request the icon of an existing tile (file content changed).
+    
+    Keeps the current pixmap until the new one arrives; the loader's cache
+    validates (size, mtime), so a modified file is rendered again.
+    
+    Returns:
+        False if the tile never requested an icon.
+    """
+    tile_id = getattr(tile, '_icon_tile_id', None)
+    if not tile_id or not getattr(tile, '_file_path', None):
+        return False
+    icon_loader = _get_icon_loader(icon_service)
+    tile._icon_request_id = icon_loader.request_icon(
+        tile_id, tile._file_path, TILE_ICON_SIZE
+    )
+    return True
@@ -39,7 +39,7 @@ from app.core.logger import get_logger
 from app.managers.files_manager import FilesManager
 
 logger = get_logger(__name__)
-from app.managers.file_state_manager import FileStateManager
+from app.managers.file_state_manager import get_file_state_manager
 from app.managers.tab_manager import TabManager
 from app.services.desktop_path_helper import is_desktop_focus
 from app.services.icon_service import IconService
@@ -53,7 +53,7 @@ from app.ui.widgets.file_view_sync import (
     update_files, switch_view, get_selected_files, set_selected_states, clear_selection
 )
 from app.ui.widgets.file_view_tabs import (
-    connect_tab_signals, on_active_tab_changed, on_files_changed,
+    connect_tab_signals, on_active_tab_changed, on_files_changed, on_files_delta,
     update_nav_buttons_state, on_nav_back, on_nav_forward
 )
 from app.ui.widgets.focus_header_panel import FocusHeaderPanel
@@ -103,7 +103,7 @@ class FileViewContainer(QWidget):
         self._current_view: str = "grid"
         self._saved_selections: dict[str, list[str]] = {}  # Store selections per view
         
-        self._state_manager = FileStateManager()
+        self._state_manager = get_file_state_manager()
         self._get_label_callback = get_label_callback
         self._handlers = FileViewHandlers(tab_manager, lambda: update_files(self))
         self._workspace_selector = None
@@ -221,6 +221,10 @@ class FileViewContainer(QWidget):
         """Handle filesystem change event - only refresh if already in a tab."""
         on_files_changed(self)
 
+    def _on_files_delta(self, delta) -> None:
+        """Handle incremental filesystem change (only changed rows/tiles are updated)."""
+        on_files_delta(self, delta)
+
     def _on_focus_cleared(self) -> None:
         """Handle focus cleared - clean up views when active focus is removed."""
         self.clear_current_focus()
@@ -14,6 +14,10 @@ from PySide6.QtWidgets import QApplication, QDialog, QMenu, QWidget
 from app.core.logger import get_logger
 from app.managers.tab_manager import TabManager
 from app.managers.file_clipboard_manager import FileClipboardManager
+from app.services.docx_preconverter import (
+    is_docx_preconversion_enabled,
+    set_docx_preconversion_enabled
+)
 from app.services.folder_creation_service import create_folder
 from app.services.file_deletion_service import is_folder_empty
 from app.services.file_delete_service import delete_file
@@ -112,6 +116,15 @@ def show_background_menu(
     # Añadir submenú al menú principal
     menu.addMenu(new_submenu)
     
+    # Opción: preconvertir los DOCX de la carpeta activa para la vista rápida
+    menu.addSeparator()
+    preconvert_action = menu.addAction("Preconvertir documentos Word")
+    preconvert_action.setCheckable(True)
+    preconvert_action.setChecked(is_docx_preconversion_enabled())
+    preconvert_action.triggered.connect(
+        lambda checked: set_docx_preconversion_enabled(checked, active_folder)
+    )
+    
     # Mostrar menú en posición del evento
     menu.exec(event.globalPos())
 
@@ -7,10 +7,9 @@ Handles file updates, view switching, and state synchronization.
 import os
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Qt
-
 from app.core.constants import SELECTION_RESTORE_DELAY_MS
 from app.models.file_stack import FileStack
+from app.models.folder_delta import FolderDelta
 from app.services.path_utils import normalize_path
 from app.services.file_path_utils import is_office_temp_file
 
@@ -53,6 +52,34 @@ def update_files(container: 'FileViewContainer') -> None:
     # no durante la navegación normal entre carpetas.
 
 
+def apply_folder_delta(container: 'FileViewContainer', delta: FolderDelta) -> bool:
+    """
+    Apply a watcher delta to both views without rebuilding them.
+
+    The folder is listed once (same filters and natural order as update_files);
+    the views then only touch the rows/tiles that were added, removed or modified.
+
+    Returns:
+        False if the delta cannot be applied incrementally (caller must do a full refresh).
+    """
+    tab_manager = container._tab_manager
+    if getattr(container, '_is_search_mode', False) or getattr(container, '_is_navigating', False):
+        return False
+    # Desktop usa stacks: sin diff incremental por ahora
+    if _check_if_desktop_window(container) or tab_manager.has_state_context():
+        return False
+    active_folder = tab_manager.get_active_folder()
+    if not active_folder or normalize_path(active_folder) != normalize_path(delta.folder):
+        return False
+
+    items = tab_manager.get_files(use_stacks=False)
+    items = _filter_office_temp_files_from_items(items)
+
+    container._grid_view.apply_delta(items, delta.modified)
+    container._list_view.apply_delta(items, delta.modified)
+    return True
+
+
 def _update_workspace_view_buttons(container: 'FileViewContainer', is_grid: bool) -> None:
     """Update workspace selector view buttons state."""
     if container._workspace_grid_button:
@@ -192,16 +219,13 @@ def _restore_list_selection(view, paths: list[str]) -> None:
     view.clearSelection()
     view._checked_paths.clear()
     
-    for row in range(view.rowCount()):
-        item = view.item(row, 1)
-        if item:
-            path = item.data(Qt.ItemDataRole.UserRole)
-            if path and normalize_path(path) in path_set:
-                checkbox_item = view.item(row, 0)
-                if checkbox_item:
-                    checkbox_item.setCheckState(Qt.CheckState.Checked)
-                    view._checked_paths.add(path)
-                view.selectRow(row)
+    model = view.model()
+    for row in range(model.rowCount()):
+        path = model.path_at(row)
+        if path and normalize_path(path) in path_set:
+            view._checked_paths.add(path)
+            view.selectRow(row)
+    model.refresh_checks()
 
 
 def _check_if_desktop_window(container) -> bool:
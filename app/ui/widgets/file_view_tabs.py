@@ -5,7 +5,8 @@ Handles TabManager signal connections and tab change events.
 """
 
 from app.managers.tab_manager import TabManager
-from app.ui.widgets.file_view_sync import update_files
+from app.models.folder_delta import FolderDelta
+from app.ui.widgets.file_view_sync import apply_folder_delta, update_files
 
 
 def connect_tab_signals(container, tab_manager: TabManager) -> None:
@@ -14,6 +15,8 @@ def connect_tab_signals(container, tab_manager: TabManager) -> None:
     # files_changed solo para cambios en filesystem, NO para cambio de tab
     # Se mantiene para actualizar cuando los archivos cambian mientras estás en el mismo tab
     tab_manager.files_changed.connect(container._on_files_changed)
+    # files_delta: cambios del watcher aplicados de forma incremental
+    tab_manager.files_delta.connect(container._on_files_delta)
     tab_manager.focus_cleared.connect(container._on_focus_cleared)
 
 
@@ -46,6 +49,14 @@ def on_files_changed(container) -> None:
         update_files(container)
 
 
+def on_files_delta(container, delta: FolderDelta) -> None:
+    """Handle incremental filesystem change - falls back to a full refresh when needed."""
+    if container._tab_manager.get_active_index() < 0:
+        return
+    if not apply_folder_delta(container, delta):
+        update_files(container)
+
+
 def update_nav_buttons_state(container) -> None:
     """Update navigation buttons enabled state based on TabManager history."""
     can_back = container._tab_manager.can_go_back()
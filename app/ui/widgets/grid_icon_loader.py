@@ -2,17 +2,59 @@
 GridIconLoader - Asynchronous icon loading for grid tiles.
 
 Uses QThreadPool to load icons in background threads, preventing UI blocking.
+All workers share one long-lived IconRenderService owned by the loader, so the
+icon provider and per-extension caches survive across tiles.
+
+When a folder is laid out, prefetch_icons() renders all its images in one
+batch; tiles requesting one of those images wait for the batch instead of
+starting their own worker.
 """
 
-from typing import Dict, Optional
+import threading
+from typing import Iterable, Optional
 from PySide6.QtCore import QObject, QThreadPool, Signal, QRunnable, QSize, Qt
 from PySide6.QtGui import QImage
 
 from app.core.logger import get_logger
+from app.services.icon_image_cache import IconImageCache
+from app.services.preview_file_extensions import RASTER_IMAGE_EXTENSIONS, normalize_extension
 
 logger = get_logger(__name__)
 
 
+def _finish_icon_image(image: QImage, file_path: str, size: QSize, render_service) -> QImage:
+    """Fit a rendered icon to size, or fall back to the system icon (R16)."""
+    # R16: Validar imagen antes de usarla
+    if not image.isNull() and image.width() > 0 and image.height() > 0:
+        # Ensure image has correct size
+        if image.width() != size.width() or image.height() != size.height():
+            image = image.scaled(
+                size.width(), 
+                size.height(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        return image
+    
+    # R16: Pixmap inválido - aplicar fallback inmediato
+    # Intentar obtener icono directamente del sistema
+    try:
+        from PySide6.QtCore import QFileInfo
+        qfile_info = QFileInfo(file_path)
+        icon = render_service.icon_provider.icon(qfile_info)
+        fallback_pixmap = icon.pixmap(size)
+        
+        if fallback_pixmap and not fallback_pixmap.isNull() and fallback_pixmap.width() > 0 and fallback_pixmap.height() > 0:
+            return fallback_pixmap.toImage()
+    except Exception:
+        pass  # Error en fallback - imagen transparente
+    
+    # Último recurso: imagen transparente
+    image = QImage(size, QImage.Format.Format_ARGB32)
+    image.fill(0)  # Transparent
+    return image
+
+
 class IconLoadWorker(QRunnable):
     """
     Worker that loads icon in background thread.
@@ -26,7 +68,7 @@ class IconLoadWorker(QRunnable):
         file_path: str,
         size: QSize,
         request_id: int,
-        icon_provider,
+        render_service,
         callback
     ):
         """
@@ -37,7 +79,7 @@ class IconLoadWorker(QRunnable):
             file_path: Path to file/folder
             size: Target icon size
             request_id: Request ID to match with result
-            icon_provider: QFileIconProvider instance
+            render_service: Shared IconRenderService (thread-safe caches)
             callback: Function to call with result (tile_id, image, request_id)
         """
         super().__init__()
@@ -45,57 +87,16 @@ class IconLoadWorker(QRunnable):
         self._file_path = file_path
         self._size = size
         self._request_id = request_id
-        self._icon_provider = icon_provider
+        self._render_service = render_service
         self._callback = callback
     
     def run(self) -> None:
         """Load icon in background thread."""
         try:
-            from app.services.icon_render_service import IconRenderService
-            from app.services.icon_service import IconService
-            
-            # Usar IconRenderService para aprovechar validaciones R16 y fallbacks
-            icon_service = IconService()
-            render_service = IconRenderService(icon_service)
-            
-            # Load preview - returns QPixmap, convert to QImage for thread safety
-            pixmap = render_service.get_file_preview(self._file_path, self._size)
-            
-            # R16: Validar pixmap antes de convertir a QImage
-            if pixmap and not pixmap.isNull() and pixmap.width() > 0 and pixmap.height() > 0:
-                # Convert QPixmap to QImage (thread-safe, can be done in worker thread)
-                # QImage is thread-safe, QPixmap is not
-                image = pixmap.toImage()
-                
-                # Ensure image has correct size
-                if image.width() != self._size.width() or image.height() != self._size.height():
-                    image = image.scaled(
-                        self._size.width(), 
-                        self._size.height(),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-            else:
-                # R16: Pixmap inválido - aplicar fallback inmediato
-                # Intentar obtener icono directamente del sistema
-                try:
-                    from PySide6.QtCore import QFileInfo
-                    from PySide6.QtWidgets import QFileIconProvider
-                    qfile_info = QFileInfo(self._file_path)
-                    icon_provider = QFileIconProvider()
-                    icon = icon_provider.icon(qfile_info)
-                    fallback_pixmap = icon.pixmap(self._size)
-                    
-                    if fallback_pixmap and not fallback_pixmap.isNull() and fallback_pixmap.width() > 0 and fallback_pixmap.height() > 0:
-                        image = fallback_pixmap.toImage()
-                    else:
-                        # Último recurso: imagen transparente
-                        image = QImage(self._size, QImage.Format.Format_ARGB32)
-                        image.fill(0)  # Transparent
-                except Exception:
-                    # Error en fallback - imagen transparente
-                    image = QImage(self._size, QImage.Format.Format_ARGB32)
-                    image.fill(0)  # Transparent
+            # IconRenderService compartido: validaciones R16, fallbacks y cache por extensión
+            # Devuelve QImage (thread-safe), QPixmap no lo es
+            image = self._render_service.get_file_preview_image(self._file_path, self._size)
+            image = _finish_icon_image(image, self._file_path, self._size, self._render_service)
             
             # Call callback with result (pass file_path and size for caching)
             self._callback(self._tile_id, self._file_path, self._size, image, self._request_id)
@@ -108,6 +109,53 @@ class IconLoadWorker(QRunnable):
             self._callback(self._tile_id, self._file_path, self._size, image, self._request_id)
 
 
+class IconBatchWorker(QRunnable):
+    """
+    Worker that renders the previews of many image files in one pass.
+    
+    Feeds IconRenderService.get_file_preview_images (persistent store first,
+    then parallel draft/EXIF-thumbnail decoding) and reports each icon as it
+    finishes. Never creates QPixmap for the result - only QImage.
+    """
+    
+    def __init__(self, file_paths: list[str], size: QSize, render_service, callback):
+        """
+        Initialize worker.
+        
+        Args:
+            file_paths: Image files to render
+            size: Target icon size
+            render_service: Shared IconRenderService (thread-safe caches)
+            callback: Function to call per file with (file_path, size, image)
+        """
+        super().__init__()
+        self._file_paths = file_paths
+        self._size = size
+        self._render_service = render_service
+        self._callback = callback
+    
+    def run(self) -> None:
+        """Render the batch in background threads."""
+        pending = set(self._file_paths)
+        try:
+            for file_path, image in self._render_service.get_file_preview_images(self._file_paths, self._size):
+                pending.discard(file_path)
+                image = _finish_icon_image(image, file_path, self._size, self._render_service)
+                self._callback(file_path, self._size, image)
+        except Exception as e:
+            logger.error(f"Error loading icon batch: {e}")
+        finally:
+            # Los que el lote no entregó (error o no son imagen): uno a uno
+            for file_path in pending:
+                try:
+                    image = self._render_service.get_file_preview_image(file_path, self._size)
+                except Exception as e:
+                    logger.error(f"Error loading icon for {file_path}: {e}")
+                    image = QImage()
+                image = _finish_icon_image(image, file_path, self._size, self._render_service)
+                self._callback(file_path, self._size, image)
+
+
 class GridIconLoader(QObject):
     """
     Asynchronous icon loader using QThreadPool.
@@ -117,26 +165,34 @@ class GridIconLoader(QObject):
     
     icon_loaded = Signal(str, QImage, int)  # tile_id, image, request_id
     
-    def __init__(self, max_threads: int = 5):
+    def __init__(self, max_threads: int = 5, icon_service=None):
         """
         Initialize icon loader.
         
         Args:
             max_threads: Maximum number of concurrent worker threads
+            icon_service: Optional IconService to share (created lazily if None)
         """
         super().__init__()
         self._thread_pool = QThreadPool()
         self._thread_pool.setMaxThreadCount(max_threads)
         self._request_counter = 0
-        self._cache: Dict[tuple, QImage] = {}  # (file_path, width, height) -> QImage
-        self._icon_provider = None  # Lazy initialization
+        self._cache = IconImageCache()  # (file_path, width, height) -> QImage, LRU por bytes
+        self._icon_service = icon_service
+        self._render_service = None  # Lazy initialization (UI thread)
+        # (file_path, width, height) en un lote en curso -> [(tile_id, request_id)] que esperan
+        self._batch_waiters: dict[tuple[str, int, int], list[tuple[str, int]]] = {}
+        self._batch_lock = threading.Lock()
     
-    def _get_icon_provider(self):
-        """Get or create QFileIconProvider instance."""
-        if self._icon_provider is None:
-            from PySide6.QtWidgets import QFileIconProvider
-            self._icon_provider = QFileIconProvider()
-        return self._icon_provider
+    def _get_render_service(self):
+        """Get or create the IconRenderService shared by all workers."""
+        if self._render_service is None:
+            from app.services.icon_render_service import IconRenderService
+            if self._icon_service is None:
+                from app.services.icon_service import IconService
+                self._icon_service = IconService()
+            self._render_service = IconRenderService(self._icon_service)
+        return self._render_service
     
     def request_icon(
         self,
@@ -155,10 +211,9 @@ class GridIconLoader(QObject):
         Returns:
             Request ID for matching with result
         """
-        # Check cache first
-        cache_key = (file_path, size.width(), size.height())
-        if cache_key in self._cache:
-            cached_image = self._cache[cache_key]
+        # Check cache first (entries of files changed since rendering are dropped)
+        cached_image = self._cache.get(file_path, size.width(), size.height())
+        if cached_image is not None:
             request_id = self._request_counter
             self._request_counter += 1
             # Emit cached result immediately (in next event loop iteration)
@@ -170,13 +225,20 @@ class GridIconLoader(QObject):
         request_id = self._request_counter
         self._request_counter += 1
         
+        # Imagen de un lote en curso: esperar a que el lote la entregue
+        with self._batch_lock:
+            waiters = self._batch_waiters.get((file_path, size.width(), size.height()))
+            if waiters is not None:
+                waiters.append((tile_id, request_id))
+                return request_id
+        
         # Create and start worker
         worker = IconLoadWorker(
             tile_id,
             file_path,
             size,
             request_id,
-            self._get_icon_provider(),
+            self._get_render_service(),
             self._on_icon_loaded
         )
         
@@ -184,6 +246,46 @@ class GridIconLoader(QObject):
         
         return request_id
     
+    def prefetch_icons(self, file_paths: Iterable[str], size: QSize) -> int:
+        """
+        Render the icons of many image files (e.g. a folder being laid out) in one batch.
+        
+        Call it before the tiles request their icons: request_icon() for a
+        batched file waits for the batch instead of starting another worker.
+        Non-image files, cached icons and files already batched are skipped.
+        
+        Returns:
+            Number of files added to the batch
+        """
+        width, height = size.width(), size.height()
+        batch = []
+        with self._batch_lock:
+            for file_path in file_paths:
+                key = (file_path, width, height)
+                if key in self._batch_waiters or normalize_extension(file_path) not in RASTER_IMAGE_EXTENSIONS:
+                    continue
+                if self._cache.get(file_path, width, height) is not None:
+                    continue
+                self._batch_waiters[key] = []
+                batch.append(file_path)
+        
+        if batch:
+            worker = IconBatchWorker(batch, QSize(size), self._get_render_service(), self._on_batch_icon_loaded)
+            self._thread_pool.start(worker)
+        return len(batch)
+    
+    def _on_batch_icon_loaded(self, file_path: str, size: QSize, image: QImage) -> None:
+        """
+        Handle one icon of a batch (worker thread).
+        
+        Caches it and emits it for every tile that requested it meanwhile.
+        """
+        self._cache.put(file_path, size.width(), size.height(), image)
+        with self._batch_lock:
+            waiters = self._batch_waiters.pop((file_path, size.width(), size.height()), [])
+        for tile_id, request_id in waiters:
+            self.icon_loaded.emit(tile_id, image, request_id)
+    
     def _on_icon_loaded(self, tile_id: str, file_path: str, size: QSize, image: QImage, request_id: int) -> None:
         """
         Handle icon loaded callback from worker.
@@ -191,9 +293,12 @@ class GridIconLoader(QObject):
         Caches result and emits signal.
         """
         # Cache the result
-        cache_key = (file_path, size.width(), size.height())
-        self._cache[cache_key] = image
+        self._cache.put(file_path, size.width(), size.height(), image)
         
         # Emit signal (will be handled in UI thread)
         self.icon_loaded.emit(tile_id, image, request_id)
+    
+    def get_cache_stats(self) -> dict:
+        """Get icon cache counters (entries, bytes, hits, misses, evictions, invalidations)."""
+        return self._cache.get_stats()
 
@@ -216,9 +216,12 @@ def build_normal_grid(view: 'FileGridView', items_to_render: list, grid_layout:
             row, col = new_pos
             tile_manager.attach(tile, row, col + col_offset)
         
-        # 5. Create + attach added
+        # 5. Create + attach added (estados de todos los tiles nuevos en una consulta,
+        #    miniaturas de sus imágenes en un lote, de arriba abajo)
+        added_states = tile_manager.prefetch_states(diff.added)
+        tile_manager.prefetch_icons(sorted(diff.added, key=diff.new_state.get))
         for tile_id in diff.added:
-            tile = tile_manager.get_or_create(tile_id)
+            tile = tile_manager.get_or_create(tile_id, added_states)
             row, col = diff.new_state[tile_id]
             tile_manager.attach(tile, row, col + col_offset)
         
@@ -24,7 +24,8 @@ def create_file_tile(
     parent_view: 'FileGridView',
     icon_service: IconService,
     state_manager: Optional['FileStateManager'],
-    dock_style: bool = False
+    dock_style: bool = False,
+    states: Optional[dict] = None
 ) -> QWidget:
     """
     Create a tile widget for a file.
@@ -35,13 +36,17 @@ def create_file_tile(
         icon_service: IconService instance.
         state_manager: Optional FileStateManager instance.
         dock_style: If True, use dock style.
+        states: Optional path -> state map prefetched with get_states_for_paths.
 
     Returns:
         QWidget representing the file tile.
     """
     state = None
-    if state_manager and not dock_style:
-        state = state_manager.get_file_state(file_path)
+    if not dock_style:
+        if states is not None and file_path in states:
+            state = states[file_path]
+        elif state_manager:
+            state = state_manager.get_file_state(file_path)
 
     get_label_callback = getattr(parent_view, '_get_label_callback', None)
     tile = FileTile(
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import QWidget, QGridLayout
 
 from app.core.logger import get_logger
 from app.models.file_stack import FileStack
+from app.ui.widgets.file_tile_icon import prefetch_tile_icons
 from app.ui.widgets.grid_tile_builder import create_file_tile, create_stack_tile
 
 if TYPE_CHECKING:
@@ -52,12 +53,13 @@ class TileManager:
         self._content_widget = content_widget
         self._tiles_by_id: Dict[str, QWidget] = {}
     
-    def get_or_create(self, tile_id: str) -> QWidget:
+    def get_or_create(self, tile_id: str, states: Optional[dict] = None) -> QWidget:
         """
         Get existing tile or create new one.
         
         Args:
             tile_id: Unique identifier (file_path or f"stack:{stack_type}")
+            states: Optional path -> state map prefetched for new file tiles
             
         Returns:
             QWidget tile instance
@@ -77,7 +79,7 @@ class TileManager:
                 self._tiles_by_id.pop(tile_id, None)
         
         # Create new tile
-        tile = self._create_tile(tile_id)
+        tile = self._create_tile(tile_id, states)
         self._tiles_by_id[tile_id] = tile
         return tile
     
@@ -175,12 +177,13 @@ class TileManager:
                     return stack
         return None
     
-    def _create_tile(self, tile_id: str) -> QWidget:
+    def _create_tile(self, tile_id: str, states: Optional[dict] = None) -> QWidget:
         """
         Create new tile based on tile_id format.
         
         Args:
             tile_id: file_path or f"stack:{stack_type}"
+            states: Optional path -> state map prefetched for file tiles
             
         Returns:
             QWidget tile instance
@@ -207,7 +210,8 @@ class TileManager:
                 self._view,
                 self._icon_service,
                 self._state_manager,
-                dock_style=self._view._is_desktop_window
+                dock_style=self._view._is_desktop_window,
+                states=states
             )
     
     def get_tile(self, tile_id: str) -> Optional[QWidget]:
@@ -222,6 +226,43 @@ class TileManager:
         """
         return self._tiles_by_id.get(tile_id)
     
+    def prefetch_states(self, tile_ids: list) -> Optional[dict]:
+        """
+        Resolve states of the file tiles about to be created in one query.
+        
+        Args:
+            tile_ids: Tile ids that will be created (stack ids are skipped)
+            
+        Returns:
+            path -> state map, or None if states are not shown
+        """
+        if not self._state_manager or self._view._is_desktop_window:
+            return None
+        file_paths = [
+            tile_id for tile_id in tile_ids
+            if not tile_id.startswith("stack:") and tile_id not in self._tiles_by_id
+        ]
+        if not file_paths:
+            return None
+        return self._state_manager.get_states_for_paths(file_paths)
+    
+    def prefetch_icons(self, tile_ids: list) -> None:
+        """
+        Start rendering the image previews of the file tiles about to be created.
+        
+        One batch for the whole folder (draft/EXIF-thumbnail decoding in
+        parallel) instead of one worker per tile.
+        
+        Args:
+            tile_ids: Tile ids that will be created (stack ids are skipped)
+        """
+        file_paths = [
+            tile_id for tile_id in tile_ids
+            if not tile_id.startswith("stack:") and tile_id not in self._tiles_by_id
+        ]
+        if file_paths:
+            prefetch_tile_icons(file_paths, self._icon_service)
+    
     def clear_all(self) -> None:
         """Destroy all tiles."""
         tile_ids = list(self._tiles_by_id.keys())
@@ -9,7 +9,7 @@ from typing import Callable, Optional, Union
 
 from PySide6.QtCore import QMimeData, QPoint, QSize, Qt, QUrl
 from PySide6.QtGui import QDrag, QDragEnterEvent, QDragMoveEvent, QDropEvent
-from PySide6.QtWidgets import QTableWidgetItem
+from PySide6.QtWidgets import QWidget
 
 from app.managers.tab_manager import TabManager
 from app.services.icon_service import IconService
@@ -24,7 +24,8 @@ from app.ui.widgets.drag_preview_helper import (
 
 
 def handle_start_drag(
-    selected_items: list[QTableWidgetItem],
+    source: QWidget,
+    selected_paths: list[str],
     icon_service: IconService
 ) -> None:
     """
@@ -32,20 +33,17 @@ def handle_start_drag(
     
     Supports multiple file selection - includes all selected files in drag operation.
     """
-    if not selected_items:
-        return
-    
-    file_paths = _extract_file_paths_from_items(selected_items)
+    file_paths = _unique_paths(selected_paths)
     if not file_paths:
         return
     
-    drag = QDrag(selected_items[0].tableWidget())
+    drag = QDrag(source)
     mime_data = QMimeData()
     urls = [QUrl.fromLocalFile(path) for path in file_paths]
     mime_data.setUrls(urls)
     
     # Marcar como drag interno para que los drop handlers puedan detectarlo
-    mime_data.setProperty("internal_drag_source", id(selected_items[0].tableWidget()))
+    mime_data.setProperty("internal_drag_source", id(source))
     
     drag.setMimeData(mime_data)
     
@@ -59,13 +57,12 @@ def handle_start_drag(
     drag.exec(allowed_actions, Qt.DropAction.MoveAction)
 
 
-def _extract_file_paths_from_items(selected_items: list[QTableWidgetItem]) -> list[str]:
-    """Extract unique file paths from selected table items."""
+def _unique_paths(selected_paths: list[str]) -> list[str]:
+    """Extract unique file paths keeping selection order."""
     file_paths = []
     seen_paths = set()
     
-    for item in selected_items:
-        file_path = item.data(Qt.ItemDataRole.UserRole)
+    for file_path in selected_paths:
         if file_path and file_path not in seen_paths:
             file_paths.append(file_path)
             seen_paths.add(file_path)
@@ -4,15 +4,16 @@ ListIconDelegate - Professional delegate for list view rendering.
 Controls all drawing to prevent Qt's default selection borders.
 """
 
-from PySide6.QtCore import QRect, QSize, Qt
+from PySide6.QtCore import QEvent, QRect, QSize, Qt
 from PySide6.QtGui import QBrush, QColor, QIcon, QPainter, QPen
-from PySide6.QtWidgets import QStyle, QStyleOptionViewItem, QStyledItemDelegate, QTableWidget
+from PySide6.QtWidgets import QStyle, QStyleOptionViewItem, QStyledItemDelegate, QTableView
 
 from app.core.constants import (
     SELECTION_BORDER_COLOR,
     SELECTION_BG_COLOR,
     CENTRAL_AREA_BG,
     CENTRAL_AREA_BG_LIGHT,
+    CHECKBOX_BG_CHECKED,
 )
 
 
@@ -42,18 +43,23 @@ class ListViewDelegate(QStyledItemDelegate):
     HOVER_BG_COLOR = QColor(255, 255, 255, 20)
     CONTAINER_BG_COLOR = QColor(190, 190, 190)
     CONTAINER_BORDER_COLOR = QColor(160, 160, 160)
+    CHECKBOX_BORDER_COLOR = QColor(255, 255, 255, 77)  # CHECKBOX_BORDER
+    CHECKBOX_CHECKED_COLOR = QColor(CHECKBOX_BG_CHECKED)
+    CHECKMARK_COLOR = QColor(255, 255, 255)
 
     # ─────────────────────────────────────────────────────────────
     # Constants
     # ─────────────────────────────────────────────────────────────
     ROW_HEIGHT = 56  # Debe coincidir con vheader.setDefaultSectionSize(56)
+    CHECKBOX_SIZE = 11  # Igual que QCheckBox::indicator en LIST_VIEW_STYLESHEET
 
     def __init__(self, parent=None, column_index: int = 1):
         super().__init__(parent)
         self._column_index = column_index
         self._is_widget_column = column_index in (0, 4)  # checkbox / state
+        self._is_checkbox_column = column_index == 0
         self._is_name_column = column_index == 1
-        self._table_widget = parent if isinstance(parent, QTableWidget) else None
+        self._table_widget = parent if isinstance(parent, QTableView) else None
 
     # ─────────────────────────────────────────────────────────────
     # Size hint - CRÍTICO para que Qt pinte toda la fila
@@ -124,6 +130,11 @@ class ListViewDelegate(QStyledItemDelegate):
         else:
             painter.fillRect(opt.rect, base_color)
 
+        # Checkbox pintado (sin widgets por fila)
+        if self._is_checkbox_column:
+            self._draw_checkbox(painter, opt.rect, index)
+            return
+
         # Widget columns stop here
         if self._is_widget_column:
             return
@@ -135,6 +146,60 @@ class ListViewDelegate(QStyledItemDelegate):
         else:
             self._draw_text_column(painter, opt, index)
 
+    # ─────────────────────────────────────────────────────────────
+    # Checkbox
+    # ─────────────────────────────────────────────────────────────
+    def _checkbox_rect(self, cell_rect: QRect) -> QRect:
+        size = self.CHECKBOX_SIZE
+        return QRect(
+            cell_rect.left() + (cell_rect.width() - size) // 2,
+            cell_rect.top() + (cell_rect.height() - size) // 2,
+            size,
+            size,
+        )
+
+    def _draw_checkbox(self, painter: QPainter, cell_rect: QRect, index) -> None:
+        """Draw checkbox indicator (same look as CustomCheckBox)."""
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        rect = self._checkbox_rect(cell_rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        if checked:
+            painter.setPen(QPen(self.CHECKBOX_CHECKED_COLOR, 1))
+            painter.setBrush(QBrush(self.CHECKBOX_CHECKED_COLOR))
+        else:
+            painter.setPen(QPen(self.CHECKBOX_BORDER_COLOR, 1))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(rect, 2, 2)
+
+        if checked:
+            painter.setPen(QPen(
+                self.CHECKMARK_COLOR, 1.5, Qt.PenStyle.SolidLine,
+                Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin
+            ))
+            cx = rect.center().x()
+            cy = rect.center().y()
+            painter.drawLine(cx - 2, cy, cx - 1, cy + 2)
+            painter.drawLine(cx - 1, cy + 2, cx + 2, cy - 2)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Toggle checkbox on click in column 0; clicks there never select the row."""
+        if not self._is_checkbox_column:
+            return super().editorEvent(event, model, option, index)
+
+        event_type = event.type()
+        if event_type == QEvent.Type.MouseButtonRelease:
+            if event.button() == Qt.MouseButton.LeftButton and option.rect.contains(event.position().toPoint()):
+                checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+                new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+                model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+            return True
+        if event_type in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick):
+            return event.button() == Qt.MouseButton.LeftButton
+        return super().editorEvent(event, model, option, index)
+
     # ─────────────────────────────────────────────────────────────
     # Icon + container
     # ─────────────────────────────────────────────────────────────
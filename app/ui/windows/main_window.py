@@ -20,6 +20,7 @@ from app.managers.tab_manager import TabManager
 from app.managers.workspace_manager import WorkspaceManager
 from app.managers.search_manager import SearchManager
 from app.services.desktop_path_helper import is_desktop_focus
+from app.services.docx_preconverter import get_docx_preconverter, is_docx_preconversion_enabled
 from app.services.file_box_history_service import FileBoxHistoryService
 from app.services.file_box_service import FileBoxService
 from app.services.file_open_service import open_file_with_system
@@ -536,7 +537,9 @@ class MainWindow(QWidget):
 
     def _on_active_tab_changed(self, index: int, path: str) -> None:
         """Handle active tab change from TabManager."""
-        pass
+        # Preconversión opcional de los DOCX de la carpeta activa
+        if is_docx_preconversion_enabled():
+            get_docx_preconverter().set_folder(path or None)
     
     def _on_active_tab_changed_update_app_header(self, index: int, path: str) -> None:
         """Update AppHeader when active tab changes."""
@@ -1020,7 +1023,7 @@ class MainWindow(QWidget):
         if hasattr(self._tab_manager, 'get_watcher'):
             watcher = self._tab_manager.get_watcher()
             if watcher:
-                watcher.stop_watching()
+                watcher.stop_all()
         
         if self._workspace_manager:
             self._workspace_manager.save_current_state(self._tab_manager, self._sidebar)
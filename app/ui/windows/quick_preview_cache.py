@@ -1,21 +1,33 @@
 """
 Quick Preview Cache - Preview caching for instant navigation.
 
-Manages in-memory cache of preview pixmaps for adjacent files.
-Includes mtime validation to detect file changes.
+Manages in-memory cache of preview images keyed by file path and preview
+size. Entries are validated against the file (size, mtime) on lookup and
+evicted by a byte budget (IconImageCache), so reordering or refreshing the
+file list never hands back another file's preview.
+
+Previews are rendered on background threads. After each navigation a window
+of files ahead in the navigation direction (and one behind) is prefetched;
+queued renders that fall out of the window are cancelled.
 """
 
-import os
-from pathlib import Path
-from typing import Optional
-from PySide6.QtCore import QSize
-from PySide6.QtGui import QPixmap
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from PySide6.QtCore import QObject, QSize, Signal
+from PySide6.QtGui import QImage, QPixmap
 
+from app.core.constants import (
+    QUICK_PREVIEW_CACHE_MB,
+    QUICK_PREVIEW_PREFETCH_AHEAD,
+    QUICK_PREVIEW_PREFETCH_WORKERS,
+)
 from app.core.logger import get_logger
+from app.models.path_utils import normalize_path
+from app.services.icon_image_cache import IconImageCache
 from app.services.preview_file_extensions import (
     PREVIEW_IMAGE_EXTENSIONS,
     PREVIEW_TEXT_EXTENSIONS,
-    PREVIEW_PDF_DOCX_EXTENSIONS,
     normalize_extension,
     validate_file_for_preview,
     validate_pixmap
@@ -24,181 +36,233 @@ from app.services.icon_render_service import IconRenderService
 
 logger = get_logger(__name__)
 
+# Tipos que se renderizan en segundo plano (QImage, sin tocar el hilo GUI)
+_BACKGROUND_EXTENSIONS = PREVIEW_IMAGE_EXTENSIONS | PREVIEW_TEXT_EXTENSIONS
+
 
-class QuickPreviewCache:
-    """Manages preview cache for quick navigation."""
-    
-    def __init__(self, preview_service, max_size: Optional[QSize] = None):
+class QuickPreviewCache(QObject):
+    """Manages preview cache and background prefetch for quick navigation."""
+
+    # (pending key, path, QImage) - emitido desde hilos de renderizado
+    _image_ready = Signal(object, object, object)
+
+    def __init__(
+        self,
+        preview_service,
+        max_size: Optional[QSize] = None,
+        prefetch_ahead: int = QUICK_PREVIEW_PREFETCH_AHEAD,
+        max_bytes: int = QUICK_PREVIEW_CACHE_MB * 1024 * 1024,
+        parent: Optional[QObject] = None
+    ):
         """Initialize cache."""
+        super().__init__(parent)
         self._preview_service = preview_service
         self._max_size = max_size
-        self._cache: dict[int, QPixmap] = {}
-        self._cache_mtime: dict[int, float] = {}  # Track file mtime for cache validation
-    
+        self._prefetch_ahead = prefetch_ahead
+        self._images = IconImageCache(max_bytes)
+        self._executor = ThreadPoolExecutor(
+            max_workers=QUICK_PREVIEW_PREFETCH_WORKERS, thread_name_prefix="QuickPreview"
+        )
+        # pending key -> (future, callbacks a avisar al terminar); solo hilo GUI
+        self._pending: dict[tuple, tuple[Future, list[Callable[[str, QPixmap], None]]]] = {}
+        self._warming: dict[str, Future] = {}
+        self._last_index: Optional[int] = None
+        self._image_ready.connect(self._on_image_ready)
+
     def set_max_size(self, max_size: QSize) -> None:
         """Set maximum size for previews."""
         self._max_size = max_size
-    
+
     def get_max_size(self) -> Optional[QSize]:
         """Get maximum size for previews."""
         return self._max_size
-    
-    def get_cached_pixmap(self, index: int, paths: list[str]) -> QPixmap:
-        """Get pixmap from cache or generate and cache it.
-        
-        R8: Validates mtime, size, and integrity before returning cached result.
-        R4: Always returns valid pixmap (never null) or generates fallback.
+
+    @property
+    def preview_service(self):
+        """Get preview service."""
+        return self._preview_service
+
+    def get_cached_pixmap(self, path: str) -> Optional[QPixmap]:
+        """Get the cached preview of a file, or None if not rendered yet.
+
+        R8: Entry is dropped if the file changed (size/mtime) since rendering.
+        R14: Validates integrity before returning.
+        """
+        if not self._max_size:
+            return None
+        image = self._images.get(path, self._max_size.width(), self._max_size.height())
+        if image is None or not validate_pixmap(image):
+            return None
+        return QPixmap.fromImage(image)
+
+    def request_pixmap(self, path: str, on_ready: Callable[[str, QPixmap], None]) -> Optional[QPixmap]:
+        """Get a preview, rendering it in background if needed.
+
+        Returns the pixmap when it is cached (or renders synchronously, for
+        types that need the GUI thread). Otherwise returns None and calls
+        on_ready(path, pixmap) on the GUI thread when the render finishes;
+        the pixmap may be empty (R4: UI shows its fallback).
         """
-        if index < 0 or index >= len(paths) or not self._max_size:
+        if not self._max_size:
             return QPixmap()
-        
-        path = paths[index]
-        
-        # R8: Validate cache entry before returning
-        if index in self._cache:
-            cached_pixmap = self._cache[index]
-            cached_mtime = self._cache_mtime.get(index, 0)
-            
-            # R14: Validate pixmap integrity
-            if not validate_pixmap(cached_pixmap):
-                logger.debug(f"R14: Cached pixmap is invalid, invalidating")
-                self._invalidate_cache_entry(index)
-            else:
-                # R8: Validate file still exists and mtime matches
-                try:
-                    if os.path.exists(path):
-                        current_mtime = os.path.getmtime(path)
-                        if current_mtime == cached_mtime:
-                            # R8: Validate pixmap size (basic integrity check)
-                            if cached_pixmap.width() > 0 and cached_pixmap.height() > 0:
-                                return cached_pixmap
-                            else:
-                                logger.debug(f"R8: Cached pixmap has invalid size, invalidating")
-                                self._invalidate_cache_entry(index)
-                        else:
-                            # File changed, invalidate cache entry
-                            logger.debug(f"R8: File mtime changed, invalidating cache")
-                            self._invalidate_cache_entry(index)
-                    else:
-                        # File doesn't exist, invalidate cache
-                        logger.debug(f"R8: File no longer exists, invalidating cache")
-                        self._invalidate_cache_entry(index)
-                except (OSError, ValueError) as e:
-                    # Can't read mtime, invalidate cache
-                    logger.debug(f"R8: Cannot validate file, invalidating cache: {e}")
-                    self._invalidate_cache_entry(index)
-        
-        # R13: Early existence and type validation
-        # R12: Hard size limit check
+
+        cached = self.get_cached_pixmap(path)
+        if cached is not None:
+            return cached
+
+        if normalize_extension(path) not in _BACKGROUND_EXTENSIONS:
+            return self._render_sync(path)
+
+        # Una sola vista: la nueva petición sustituye a las anteriores, que pasan
+        # a ser precargas (prefetch puede cancelarlas si quedan fuera de la ventana)
+        for _future, callbacks in self._pending.values():
+            callbacks.clear()
+        pending = self._submit(path)
+        if pending is None:
+            return QPixmap()  # R4: Fallback
+        pending[1].append(on_ready)
+        return None
+
+    def update_cache_entry(self, path: str, pixmap: QPixmap) -> None:
+        """Store a preview rendered elsewhere (e.g. the PDF page handler)."""
+        if self._max_size and validate_pixmap(pixmap):
+            self._images.put(path, self._max_size.width(), self._max_size.height(), pixmap.toImage())
+
+    def prefetch(self, current_index: int, paths: list[str]) -> None:
+        """Render the previews around current_index ahead of navigation.
+
+        The window extends prefetch_ahead files in the direction of the last
+        move and one file the other way. Queued renders outside the window
+        are cancelled; renders already running are kept (and cached).
+        """
+        if not self._max_size or not paths:
+            return
+
+        step = -1 if self._last_index is not None and current_index < self._last_index else 1
+        self._last_index = current_index
+
+        window = [current_index + step * offset for offset in range(1, self._prefetch_ahead + 1)]
+        window.append(current_index - step)
+        window_paths = [paths[index] for index in window if 0 <= index < len(paths)]
+
+        # Lo que alguien espera (callbacks) no se cancela: es el archivo actual
+        keep = {self._pending_key(path) for path in window_paths}
+        for key, (future, callbacks) in list(self._pending.items()):
+            if key not in keep and not callbacks and future.cancel():
+                del self._pending[key]
+        for path_key, future in list(self._warming.items()):
+            if future.done() or (path_key not in {key[0] for key in keep} and future.cancel()):
+                del self._warming[path_key]
+
+        for position, path in enumerate(window_paths):
+            ext = normalize_extension(path)
+            if ext == ".pdf":
+                # La página la renderiza el visor de PDF; abrir de antemano el siguiente
+                # documento deja número de páginas y render listos en el pool de PdfRenderer
+                # (solo el siguiente: el pool de documentos abiertos es pequeño)
+                if position == 0:
+                    self._warm_pdf_async(path)
+            elif ext in _BACKGROUND_EXTENSIONS and not self._is_cached(path):
+                self._submit(path)
+
+    def shutdown(self) -> None:
+        """Cancel pending renders and stop the worker threads (preview closed)."""
+        for future, _callbacks in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._warming.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_cached(self, path: str) -> bool:
+        return self._images.get(path, self._max_size.width(), self._max_size.height()) is not None
+
+    def _pending_key(self, path: str) -> tuple:
+        return (normalize_path(path), self._max_size.width(), self._max_size.height())
+
+    def _submit(self, path: str) -> Optional[tuple]:
+        key = self._pending_key(path)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending
+        try:
+            future = self._executor.submit(self._render, key, path, QSize(self._max_size))
+        except RuntimeError:
+            return None  # Cache cerrada
+        pending = (future, [])
+        self._pending[key] = pending
+        return pending
+
+    def _warm_pdf_async(self, path: str) -> None:
+        path_key = normalize_path(path)
+        if path_key in self._warming:
+            return
+        try:
+            self._warming[path_key] = self._executor.submit(self._warm_pdf, path)
+        except RuntimeError:
+            pass  # Cache cerrada
+
+    def _render(self, key: tuple, path: str, max_size: QSize) -> None:
+        """Render a preview (worker thread)."""
+        try:
+            image = self._preview_service.get_quicklook_image(path, max_size)
+        except Exception as e:
+            # R5: No exception crosses cache boundary
+            logger.warning(f"R5: Error generating preview for {path}: {e}", exc_info=True)
+            image = QImage()
+        try:
+            self._image_ready.emit(key, path, image)
+        except RuntimeError:
+            pass  # Ventana de preview ya destruida
+
+    def _warm_pdf(self, path: str) -> None:
+        """Open a PDF in the shared document pool (worker thread)."""
+        try:
+            self._preview_service.get_pdf_page_count(path)
+        except Exception as e:
+            logger.debug(f"Cannot prefetch PDF {path}: {e}")
+
+    def _on_image_ready(self, key: tuple, path: str, image: QImage) -> None:
+        """Cache a finished render and notify waiters (GUI thread)."""
+        pending = self._pending.pop(key, None)
+        if validate_pixmap(image):
+            self._images.put(path, key[1], key[2], image)
+            pixmap = QPixmap.fromImage(image)
+        else:
+            logger.warning(f"Failed to generate preview for {path}")
+            pixmap = QPixmap()  # R4: Fallback visual (UI will show message)
+        if pending is None:
+            return
+        for callback in pending[1]:
+            try:
+                callback(path, pixmap)
+            except Exception as e:
+                logger.warning(f"Error in preview ready callback: {e}", exc_info=True)
+
+    def _render_sync(self, path: str) -> QPixmap:
+        """Render types that need the GUI thread (icon fallback for unknown files).
+
+        R12/R13: File validated before rendering.
+        R4: Always returns a pixmap (empty on failure).
+        """
         is_valid, error_msg = validate_file_for_preview(path)
         if not is_valid:
             logger.warning(f"R12/R13: Cannot preview {path}: {error_msg}")
             return QPixmap()  # R4: Fallback
-        
+
         # R5: Encapsulate all external access
         try:
-            # R11: Normalize extension in single entry point
-            ext = normalize_extension(path)
-            is_previewable_type = (
-                ext in PREVIEW_PDF_DOCX_EXTENSIONS or 
-                ext in PREVIEW_IMAGE_EXTENSIONS or 
-                ext in PREVIEW_TEXT_EXTENSIONS
-            )
-            
-            # Para PDFs/DOCX/imágenes/texto, usar get_quicklook_pixmap directamente
-            # NO usar fallback a iconos si falla
-            if is_previewable_type:
-                pixmap = self._preview_service.get_quicklook_pixmap(path, self._max_size)
-                if pixmap.isNull():
-                    logger.warning(f"Failed to generate preview for {ext} file: {path}")
-                    # R4: Fallback visual - empty pixmap (UI will show message)
-                    pixmap = QPixmap()
-                else:
-                    logger.debug(f"Successfully generated preview for {ext} file: {path}, size: {pixmap.width()}x{pixmap.height()}")
-            else:
-                # Para otros tipos de archivo, intentar get_quicklook_pixmap primero
-                pixmap = self._preview_service.get_quicklook_pixmap(path, self._max_size)
-                if pixmap.isNull():
-                    # Solo como último recurso para archivos desconocidos, usar icono
-                    try:
-                        render_service = IconRenderService(self._preview_service.icon_service)
-                        pixmap = render_service.get_file_preview(path, self._max_size)
-                        # R4: Fallback if icon also fails
-                        if pixmap.isNull():
-                            pixmap = QPixmap()
-                    except Exception as e:
-                        logger.warning(f"R5: Error getting icon fallback: {e}")
-                        pixmap = QPixmap()  # R4: Final fallback
-            
+            pixmap = self._preview_service.get_quicklook_pixmap(path, self._max_size)
+            if pixmap.isNull():
+                # Solo como último recurso para archivos desconocidos, usar icono
+                render_service = IconRenderService(self._preview_service.icon_service)
+                pixmap = render_service.get_file_preview(path, self._max_size)
+
             # R14: Validate before caching
             if validate_pixmap(pixmap):
-                self.update_cache_entry(index, path, pixmap)
-            else:
-                # R4: Don't cache invalid pixmaps, but return empty for UI fallback
-                logger.debug(f"R14: Not caching invalid pixmap")
-            
-            return pixmap
+                self.update_cache_entry(path, pixmap)
+                return pixmap
+            return QPixmap()
         except Exception as e:
             # R5: No exception crosses cache boundary
             logger.warning(f"R5: Error generating preview for {path}: {e}", exc_info=True)
-            # R4: Fallback visual
-            return QPixmap()
-    
-    def _invalidate_cache_entry(self, index: int) -> None:
-        """Invalidate cache entry for given index."""
-        if index in self._cache:
-            del self._cache[index]
-        if index in self._cache_mtime:
-            del self._cache_mtime[index]
-    
-    def update_cache_entry(self, index: int, path: str, pixmap: QPixmap) -> None:
-        """Update cache entry with pixmap and mtime."""
-        self._cache[index] = pixmap
-        try:
-            if os.path.exists(path):
-                self._cache_mtime[index] = os.path.getmtime(path)
-            else:
-                self._cache_mtime[index] = 0
-        except (OSError, ValueError):
-            self._cache_mtime[index] = 0
-    
-    @property
-    def preview_service(self):
-        """Get preview service."""
-        return self._preview_service
-    
-    def preload_neighbors(self, current_index: int, paths: list[str]) -> None:
-        """Preload previews for adjacent files."""
-        for neighbor_index in [current_index - 1, current_index + 1]:
-            if (0 <= neighbor_index < len(paths) and 
-                neighbor_index not in self._cache):
-                self.get_cached_pixmap(neighbor_index, paths)
-    
-    def cleanup(self, current_index: int, paths: list[str]) -> None:
-        """Keep only 10 cache entries around current index."""
-        try:
-            # Keep entries from index-5 to index+5 (10 entries total)
-            keep_indices = set()
-            for offset in range(-5, 6):  # -5 to +5 inclusive
-                idx = current_index + offset
-                if 0 <= idx < len(paths):
-                    keep_indices.add(idx)
-            
-            keys_to_remove = [
-                idx for idx in self._cache.keys()
-                if idx not in keep_indices or idx < 0 or idx >= len(paths)
-            ]
-            
-            for key in keys_to_remove:
-                if key in self._cache:
-                    del self._cache[key]
-                if key in self._cache_mtime:
-                    del self._cache_mtime[key]
-        except Exception:
-            pass
-        
-        # Safety limit: clear all if somehow exceeded
-        if len(self._cache) > 20:
-            self._cache.clear()
-            self._cache_mtime.clear()
-
+            return QPixmap()  # R4: Fallback
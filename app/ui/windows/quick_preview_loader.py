@@ -5,7 +5,7 @@ Handles loading previews from cache or PDF handler and displaying them.
 """
 
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import Callable, Optional, TYPE_CHECKING
 
 from PySide6.QtCore import QSize
 from PySide6.QtGui import QPixmap
@@ -33,9 +33,14 @@ class QuickPreviewLoader:
         index: int, 
         image_label: QLabel,
         use_crossfade: bool, 
-        animations: 'QuickPreviewAnimations'
-    ) -> tuple[QPixmap, str]:
-        """Load preview for current file."""
+        animations: 'QuickPreviewAnimations',
+        on_ready: Optional[Callable[[str, QPixmap], None]] = None
+    ) -> tuple[Optional[QPixmap], str]:
+        """Load preview for current file.
+        
+        Returns (None, header_text) while the preview renders in background;
+        on_ready(path, pixmap) is then called on the GUI thread.
+        """
         if not paths or index < 0 or index >= len(paths):
             return QPixmap(), ""
         
@@ -50,13 +55,16 @@ class QuickPreviewLoader:
                 if not pixmap.isNull():
                     header_text = self._pdf_handler.get_header_text(current_path)
                     # Actualizar el cache con el pixmap renderizado usando método público
-                    self._cache.update_cache_entry(index, current_path, pixmap)
+                    self._cache.update_cache_entry(current_path, pixmap)
                     return pixmap, header_text
         
-        # Para otros archivos, usar el cache normalmente
-        pixmap = self._cache.get_cached_pixmap(index, paths)
+        # Para otros archivos, usar el cache (renderiza en segundo plano si falta)
+        pixmap = self._cache.request_pixmap(current_path, on_ready or (lambda path, pixmap: None))
         header_text = Path(current_path).name
         
+        if pixmap is None:
+            return None, header_text
+        
         if pixmap.isNull():
             image_label.setText("No preview available")
             image_label.setStyleSheet(get_error_label_style())
@@ -65,7 +73,6 @@ class QuickPreviewLoader:
         return pixmap, header_text
     
     def preload_and_cleanup(self, index: int, paths: list[str]) -> None:
-        """Preload neighbors and cleanup cache."""
-        self._cache.preload_neighbors(index, paths)
-        self._cache.cleanup(index, paths)
+        """Prefetch the files around index (the cache evicts by its byte budget)."""
+        self._cache.prefetch(index, paths)
 
@@ -87,6 +87,40 @@ class QuickPreviewThumbnailWidget:
         
         return thumb_container
     
+    @staticmethod
+    def create_placeholder(page_num: int) -> QWidget:
+        """
+        Create a placeholder shown until the page thumbnail arrives.
+        
+        Same fixed size as a thumbnail, so the panel height (and scrolling)
+        is final before any thumbnail is rendered.
+        
+        Args:
+            page_num: Page number (0-indexed).
+            
+        Returns:
+            Placeholder widget.
+        """
+        placeholder = QWidget()
+        placeholder.setFixedSize(110, 135)
+        
+        placeholder_layout = QVBoxLayout(placeholder)
+        placeholder_layout.setContentsMargins(4, 4, 4, 4)
+        
+        page_num_label = QLabel(str(page_num + 1))
+        page_num_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        page_num_label.setStyleSheet("""
+            QLabel {
+                color: rgba(160, 160, 160, 255);
+                background-color: rgba(255, 255, 255, 160);
+                border: none;
+                border-radius: 2px;
+            }
+        """)
+        placeholder_layout.addWidget(page_num_label)
+        
+        return placeholder
+    
     @staticmethod
     def update_style(widget: QWidget, is_selected: bool) -> None:
         """
@@ -18,6 +18,9 @@ from app.ui.windows.quick_preview_thumbnail_widget import QuickPreviewThumbnailW
 
 logger = get_logger(__name__)
 
+# Alto de cada fila del panel: miniatura (135) + espaciado del layout (4)
+_THUMBNAIL_ROW_HEIGHT = 139
+
 
 class QuickPreviewThumbnails:
     """Manages PDF page thumbnail panel."""
@@ -71,6 +74,9 @@ class QuickPreviewThumbnails:
         self._scroll.setWidget(self._container)
         panel_layout.addWidget(self._scroll)
         
+        # Al desplazar, las miniaturas visibles pasan delante en la generación
+        self._scroll.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        
         return self._panel
     
     def load_thumbnails_async(self, pdf_path: str, total_pages: int, current_page: int, 
@@ -78,6 +84,9 @@ class QuickPreviewThumbnails:
         """
         Load all PDF page thumbnails.
         
+        Every page gets a placeholder up front; thumbnails replace them as
+        they arrive, visible pages first.
+        
         R1: Returns request_id for validation.
         R4: Ensures fallback visual for failed thumbnails.
         
@@ -101,9 +110,13 @@ class QuickPreviewThumbnails:
         self._total_pages = total_pages
         self._current_page = current_page
         
+        for page_num in range(total_pages):
+            self._layout.insertWidget(page_num, QuickPreviewThumbnailWidget.create_placeholder(page_num))
+        
         thumbnail_size = QSize(100, 120)
         
         request_id_holder = {"value": None}
+        received = {"count": 0}
         
         def on_progress(page_num: int, pixmap: QPixmap, result_request_id: str):
             try:
@@ -119,17 +132,19 @@ class QuickPreviewThumbnails:
                 if validate_pixmap(pixmap):
                     try:
                         thumb_container = QuickPreviewThumbnailWidget.create(
-                            pixmap, page_num, current_page, on_click_callback
+                            pixmap, page_num, self._current_page, on_click_callback
                         )
-                        self._layout.insertWidget(page_num, thumb_container)
+                        self._replace_placeholder(page_num, thumb_container)
                     except RuntimeError:
                         logger.debug("on_progress: Widget destroyed during thumbnail creation, ignoring")
                     except Exception as e:
                         logger.warning(f"Error creating thumbnail widget: {e}")
                 
+                received["count"] += 1
                 if progress_cb:
                     try:
-                        pct = int(((page_num + 1) / max(1, total_pages)) * 100)
+                        # Las páginas no llegan en orden: progreso por miniaturas recibidas
+                        pct = int((received["count"] / max(1, total_pages)) * 100)
                         progress_cb(pct, GENERATING_THUMBNAILS)
                     except RuntimeError:
                         logger.debug("on_progress: Widget destroyed during progress callback, ignoring")
@@ -202,12 +217,35 @@ class QuickPreviewThumbnails:
             on_progress,
             on_finished,
             on_error=on_error,
+            priority_pages=[current_page, *self._visible_pages()],
         )
         
         logger.debug(f"Started loading {total_pages} thumbnails for {pdf_path} with request_id: {request_id_holder['value']}")
         
         return request_id_holder["value"]
     
+    def _replace_placeholder(self, page_num: int, widget: QWidget) -> None:
+        """Put a page thumbnail in place of its placeholder."""
+        item = self._layout.itemAt(page_num)
+        placeholder = item.widget() if item else None
+        if placeholder is None:
+            self._layout.insertWidget(page_num, widget)
+            return
+        self._layout.replaceWidget(placeholder, widget)
+        placeholder.deleteLater()
+    
+    def _visible_pages(self) -> list:
+        """Pages whose thumbnail slots are in the scrolled viewport."""
+        if not self._total_pages or not self._scroll:
+            return []
+        first = self._scroll.verticalScrollBar().value() // _THUMBNAIL_ROW_HEIGHT
+        count = self._scroll.viewport().height() // _THUMBNAIL_ROW_HEIGHT + 2
+        return list(range(first, min(self._total_pages, first + count)))
+    
+    def _on_scroll(self, _value: int) -> None:
+        """Generate the thumbnails scrolled into view next."""
+        self._preview_service.set_thumbnail_priority(self._visible_pages())
+    
     def update_selection(self, current_page: int) -> None:
         """
         Update thumbnail selection highlight.
@@ -0,0 +1,345 @@
+"""
+Quick Preview Tiled View - Pan and zoom viewer for large images.
+
+Shows an ImagePyramid: paints the tiles of the level that matches the current
+zoom and only requests the tiles in view. Levels are decoded and tiles cut
+on background threads; until a tile arrives, the top (smallest) level is
+drawn scaled in its place. Tiles are kept in a byte-budgeted LRU.
+
+Zoom is relative to fit-to-view (1.0), like the rest of quick preview.
+Drag to pan, wheel to zoom around the cursor, double click to toggle
+between fit and real pixels.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from PySide6.QtCore import QPointF, QRectF, Qt, Signal
+from PySide6.QtGui import QImage, QMouseEvent, QPainter, QPaintEvent, QWheelEvent
+from PySide6.QtWidgets import QWidget
+
+from app.core.constants import IMAGE_TILE_CACHE_MB
+from app.core.logger import get_logger
+from app.services.image_pyramid import ImagePyramid
+
+logger = get_logger(__name__)
+
+# Hilos que decodifican niveles y recortan tiles
+_TILE_WORKERS = 2
+
+
+class QuickPreviewTiledView(QWidget):
+    """Tiled, multi-resolution viewer for one large image."""
+
+    zoom_changed = Signal(float)  # zoom relativo a ajustar a la vista
+
+    # (generación, clave del tile, QImage) - emitido desde hilos de trabajo
+    _tile_ready = Signal(object, object, object)
+    # (generación, nivel) - emitido desde hilos de trabajo
+    _level_ready = Signal(object, object)
+
+    MIN_ZOOM = 0.2
+    MAX_PIXEL_SCALE = 4.0  # Zoom máximo: 400% de los píxeles reales
+    WHEEL_ZOOM_STEP = 1.25
+
+    def __init__(self, parent: Optional[QWidget] = None, max_cache_bytes: int = IMAGE_TILE_CACHE_MB * 1024 * 1024):
+        super().__init__(parent)
+        # Las flechas siguen navegando entre archivos
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setCursor(Qt.CursorShape.OpenHandCursor)
+        self._executor = ThreadPoolExecutor(max_workers=_TILE_WORKERS, thread_name_prefix="ImageTiles")
+        self._pyramid: Optional[ImagePyramid] = None
+        self._generation = 0
+        self._zoom = 1.0
+        self._center = QPointF()
+        self._top_image = QImage()
+        # (nivel, columna, fila) -> QImage, LRU por bytes
+        self._tiles: OrderedDict[tuple[int, int, int], QImage] = OrderedDict()
+        self._tile_bytes = 0
+        self._max_cache_bytes = max_cache_bytes
+        self._pending: dict[tuple[int, int, int], Future] = {}
+        self._building: dict[int, Future] = {}
+        self._drag_start: Optional[tuple[QPointF, QPointF]] = None
+        self._tile_ready.connect(self._on_tile_ready)
+        self._level_ready.connect(self._on_level_ready)
+
+    @property
+    def pyramid(self) -> Optional[ImagePyramid]:
+        return self._pyramid
+
+    def set_image(self, path: str) -> bool:
+        """Show an image fitted to the view; False if it cannot be opened."""
+        self.clear()
+        try:
+            self._pyramid = ImagePyramid(path)
+        except Exception as e:
+            logger.warning(f"Cannot open image for tiled preview {path}: {e}")
+            return False
+        size = self._pyramid.size
+        self._center = QPointF(size.width() / 2, size.height() / 2)
+        self._set_zoom_value(1.0)
+        self._request_level(self._pyramid.top_level)
+        self.update()
+        return True
+
+    def clear(self) -> None:
+        """Drop the current image, its tiles and its pending work."""
+        self._generation += 1
+        for future in list(self._pending.values()) + list(self._building.values()):
+            future.cancel()
+        self._pending.clear()
+        self._building.clear()
+        self._tiles.clear()
+        self._tile_bytes = 0
+        self._top_image = QImage()
+        if self._pyramid is not None:
+            self._pyramid.close()
+            self._pyramid = None
+        self.update()
+
+    def shutdown(self) -> None:
+        """Release the image and stop the worker threads (preview closed)."""
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def zoom(self) -> float:
+        return self._zoom
+
+    def set_zoom(self, zoom: float, anchor: Optional[QPointF] = None) -> None:
+        """Set zoom (1.0 = fit), keeping the image point under anchor (view coords) in place."""
+        if self._pyramid is None:
+            return
+        zoom = max(self.MIN_ZOOM, min(zoom, self._max_zoom()))
+        if anchor is not None:
+            image_point = self._view_to_image(anchor)
+            self._set_zoom_value(zoom)
+            scale = self._scale()
+            view_center = QPointF(self.width() / 2, self.height() / 2)
+            self._center = image_point - (anchor - view_center) / scale
+        else:
+            self._set_zoom_value(zoom)
+        self._clamp_center()
+        self.update()
+
+    def zoom_by(self, factor: float, anchor: Optional[QPointF] = None) -> None:
+        self.set_zoom(self._zoom * factor, anchor)
+
+    def cache_bytes(self) -> int:
+        """Bytes of decoded tiles kept in memory."""
+        return self._tile_bytes
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.white)
+        if self._pyramid is None:
+            painter.end()
+            return
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        scale = self._scale()
+        size = self._pyramid.size
+
+        # Respaldo: nivel superior escalado bajo los tiles que aún no han llegado
+        if not self._top_image.isNull():
+            painter.drawImage(self._image_rect_to_view(QRectF(0, 0, size.width(), size.height()), scale), self._top_image)
+
+        level = self._pyramid.level_for_scale(scale)
+        if level != self._pyramid.top_level:
+            if self._pyramid.is_level_ready(level):
+                missing = []
+                for key in self._visible_tiles(level, scale):
+                    tile = self._tiles.get(key)
+                    if tile is None:
+                        missing.append(key)
+                        continue
+                    self._tiles.move_to_end(key)
+                    painter.drawImage(self._tile_rect_to_view(key, scale), tile)
+                self._request_tiles(missing)
+            else:
+                self._request_level(level)
+        painter.end()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._clamp_center()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.MouseButton.LeftButton and self._pyramid is not None:
+            self._drag_start = (event.position(), QPointF(self._center))
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        if self._drag_start is not None:
+            start_pos, start_center = self._drag_start
+            self._center = start_center - (event.position() - start_pos) / self._scale()
+            self._clamp_center()
+            self.update()
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.MouseButton.LeftButton and self._drag_start is not None:
+            self._drag_start = None
+            self.setCursor(Qt.CursorShape.OpenHandCursor)
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
+        if self._pyramid is None:
+            return
+        # Alternar entre ajustar a la vista y píxeles reales bajo el cursor
+        real_pixels = 1.0 / self._fit_scale()
+        self.set_zoom(1.0 if self._zoom > 1.0 else max(real_pixels, 1.0), event.position())
+        event.accept()
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        delta = event.angleDelta().y()
+        if self._pyramid is None or delta == 0:
+            super().wheelEvent(event)
+            return
+        self.zoom_by(self.WHEEL_ZOOM_STEP ** (delta / 120), event.position())
+        event.accept()
+
+    def _set_zoom_value(self, zoom: float) -> None:
+        if zoom != self._zoom:
+            self._zoom = zoom
+            self.zoom_changed.emit(zoom)
+
+    def _fit_scale(self) -> float:
+        size = self._pyramid.size
+        width = max(1, self.width())
+        height = max(1, self.height())
+        return min(width / size.width(), height / size.height())
+
+    def _scale(self) -> float:
+        """View pixels per image pixel."""
+        return self._fit_scale() * self._zoom
+
+    def _max_zoom(self) -> float:
+        return max(1.0, self.MAX_PIXEL_SCALE / self._fit_scale())
+
+    def _clamp_center(self) -> None:
+        if self._pyramid is None:
+            return
+        size = self._pyramid.size
+        self._center = QPointF(
+            max(0.0, min(self._center.x(), float(size.width()))),
+            max(0.0, min(self._center.y(), float(size.height())))
+        )
+
+    def _view_to_image(self, point: QPointF) -> QPointF:
+        view_center = QPointF(self.width() / 2, self.height() / 2)
+        return self._center + (point - view_center) / self._scale()
+
+    def _image_rect_to_view(self, rect: QRectF, scale: float) -> QRectF:
+        view_center = QPointF(self.width() / 2, self.height() / 2)
+        top_left = (rect.topLeft() - self._center) * scale + view_center
+        return QRectF(top_left.x(), top_left.y(), rect.width() * scale, rect.height() * scale)
+
+    def _tile_rect_to_view(self, key: tuple[int, int, int], scale: float) -> QRectF:
+        level, column, row = key
+        factor = 1 << level
+        tile_size = self._pyramid.tile_size
+        level_size = self._pyramid.level_size(level)
+        x = column * tile_size
+        y = row * tile_size
+        width = min(tile_size, level_size.width() - x)
+        height = min(tile_size, level_size.height() - y)
+        return self._image_rect_to_view(QRectF(x * factor, y * factor, width * factor, height * factor), scale)
+
+    def _visible_tiles(self, level: int, scale: float) -> list[tuple[int, int, int]]:
+        """Tiles of a level in view, nearest to the center first."""
+        size = self._pyramid.size
+        half_width = self.width() / 2 / scale
+        half_height = self.height() / 2 / scale
+        left = max(0.0, self._center.x() - half_width)
+        right = min(float(size.width()), self._center.x() + half_width)
+        top = max(0.0, self._center.y() - half_height)
+        bottom = min(float(size.height()), self._center.y() + half_height)
+        if right <= left or bottom <= top:
+            return []
+
+        span = self._pyramid.tile_size * (1 << level)  # lado de un tile en píxeles de la imagen
+        columns, rows = self._pyramid.tile_grid(level)
+        first_column, last_column = int(left // span), min(columns - 1, int(right // span))
+        first_row, last_row = int(top // span), min(rows - 1, int(bottom // span))
+        center_column = self._center.x() / span
+        center_row = self._center.y() / span
+        keys = [
+            (level, column, row)
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+        ]
+        keys.sort(key=lambda key: (key[1] + 0.5 - center_column) ** 2 + (key[2] + 0.5 - center_row) ** 2)
+        return keys
+
+    def _request_tiles(self, keys: list[tuple[int, int, int]]) -> None:
+        """Load missing tiles; queued tiles no longer in view are cancelled."""
+        wanted = set(keys)
+        for key, future in list(self._pending.items()):
+            if key not in wanted and future.cancel():
+                del self._pending[key]
+        for key in keys:
+            if key in self._pending:
+                continue
+            try:
+                self._pending[key] = self._executor.submit(self._load_tile, self._generation, self._pyramid, key)
+            except RuntimeError:
+                return  # Vista cerrada
+
+    def _request_level(self, level: int) -> None:
+        if level in self._building:
+            return
+        try:
+            self._building[level] = self._executor.submit(self._build_level, self._generation, self._pyramid, level)
+        except RuntimeError:
+            pass  # Vista cerrada
+
+    def _load_tile(self, generation: int, pyramid: ImagePyramid, key: tuple[int, int, int]) -> None:
+        """Cut one tile (worker thread)."""
+        try:
+            image = pyramid.tile(*key)
+        except Exception as e:
+            logger.warning(f"Error loading tile {key} of {pyramid.path}: {e}")
+            image = QImage()
+        try:
+            self._tile_ready.emit(generation, key, image)
+        except RuntimeError:
+            pass  # Vista ya destruida
+
+    def _build_level(self, generation: int, pyramid: ImagePyramid, level: int) -> None:
+        """Decode one level (worker thread)."""
+        try:
+            pyramid.build_level(level)
+        except Exception as e:
+            logger.warning(f"Error decoding level {level} of {pyramid.path}: {e}", exc_info=True)
+        try:
+            self._level_ready.emit(generation, level)
+        except RuntimeError:
+            pass  # Vista ya destruida
+
+    def _on_tile_ready(self, generation: int, key: tuple[int, int, int], image: QImage) -> None:
+        if generation != self._generation:
+            return
+        self._pending.pop(key, None)
+        if image.isNull():
+            return
+        self._tiles[key] = image
+        self._tile_bytes += image.sizeInBytes()
+        while self._tile_bytes > self._max_cache_bytes and len(self._tiles) > 1:
+            _key, evicted = self._tiles.popitem(last=False)
+            self._tile_bytes -= evicted.sizeInBytes()
+        self.update()
+
+    def _on_level_ready(self, generation: int, level: int) -> None:
+        if generation != self._generation or self._pyramid is None:
+            return
+        self._building.pop(level, None)
+        if level == self._pyramid.top_level:
+            self._top_image = self._pyramid.level_image(level)
+        self.update()
@@ -10,6 +10,7 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QScrollArea,
+    QStackedWidget,
     QVBoxLayout,
     QWidget,
 )
@@ -59,8 +60,17 @@ class QuickPreviewUISetup:
     
     
     @staticmethod
-    def create_content_area(thumbnails_panel: QWidget, image_label: QLabel) -> QHBoxLayout:
-        """Create content area with thumbnails and image scroll."""
+    def create_content_area(
+        thumbnails_panel: QWidget,
+        image_label: QLabel,
+        tiled_view: QWidget
+    ) -> tuple[QHBoxLayout, QStackedWidget]:
+        """
+        Create content area with thumbnails and image scroll.
+
+        The scroll (index 0) and the tiled view for large images (index 1)
+        share a stack; returns the layout and the stack.
+        """
         content_layout = QHBoxLayout()
         content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(0)
@@ -91,7 +101,11 @@ class QuickPreviewUISetup:
         container_layout.addWidget(image_label, 0, Qt.AlignmentFlag.AlignCenter)
         
         scroll.setWidget(container)
-        content_layout.addWidget(scroll, 1)
         
-        return content_layout
+        viewer_stack = QStackedWidget()
+        viewer_stack.addWidget(scroll)
+        viewer_stack.addWidget(tiled_view)
+        content_layout.addWidget(viewer_stack, 1)
+        
+        return content_layout, viewer_stack
 
@@ -12,6 +12,7 @@ from PySide6.QtCore import QEvent, QObject, QSize, Qt, QTimer, QPoint, Signal
 from PySide6.QtGui import QMouseEvent, QPixmap, QKeyEvent
 from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget, QStackedLayout, QProgressBar, QApplication
 
+from app.services.image_pyramid import should_tile_image
 from app.services.preview_pdf_service import PreviewPdfService
 from app.services.preview_file_extensions import validate_pixmap
 from app.ui.windows.quick_preview_cache import QuickPreviewCache
@@ -23,6 +24,7 @@ from app.ui.windows.quick_preview_pdf_handler import QuickPreviewPdfHandler
 from app.ui.windows.quick_preview_loader import QuickPreviewLoader
 from app.ui.windows.quick_preview_header import QuickPreviewHeader
 from app.ui.windows.quick_preview_styles import get_loading_label_style, get_error_label_style
+from app.ui.windows.quick_preview_tiled_view import QuickPreviewTiledView
 from pathlib import Path
 from app.ui.windows.quick_preview_constants import (
     LOADING_PREVIEW,
@@ -78,7 +80,7 @@ class QuickPreviewWindow(QWidget):
             self._paths = file_paths
             self._index = max(0, min(start_index, len(file_paths) - 1))
         
-        self._cache = QuickPreviewCache(preview_service)
+        self._cache = QuickPreviewCache(preview_service, parent=self)
         self._thumbnails = QuickPreviewThumbnails(preview_service)
         self._animations = QuickPreviewAnimations()
         self._pdf_handler = QuickPreviewPdfHandler(preview_service)
@@ -185,8 +187,11 @@ class QuickPreviewWindow(QWidget):
         self._image_label = QLabel()
         self._image_label.setText(LOADING_PREVIEW)
         self._image_label.setStyleSheet(get_loading_label_style())
-        content_layout = QuickPreviewUISetup.create_content_area(
-            thumbnails_panel, self._image_label
+        # Imágenes grandes: visor por tiles con zoom real en lugar del QLabel
+        self._tiled_view = QuickPreviewTiledView()
+        self._tiled_view.zoom_changed.connect(self._on_tiled_zoom_changed)
+        content_layout, self._viewer_stack = QuickPreviewUISetup.create_content_area(
+            thumbnails_panel, self._image_label, self._tiled_view
         )
         # Crear contenedor apilado para poder mostrar un overlay de carga
         stack_container = QWidget()
@@ -437,17 +442,40 @@ class QuickPreviewWindow(QWidget):
                 self._image_label.setText("No preview available")
                 self._image_label.setStyleSheet(get_error_label_style())
                 self._show_loading(False)
+            self._hide_tiled_image()
             self._pdf_handler.load_pdf_info_async(current_path, on_info_finished, on_info_error)
+        elif self._show_tiled_image(current_path):
+            return
         else:
             result = self._loader.load_preview(
-                self._paths, self._index, self._image_label, False, self._animations
+                self._paths, self._index, self._image_label, False, self._animations,
+                on_ready=self._on_preview_ready
             )
             pixmap, header_text = result
             self._header.update_file(current_path, header_text, self.close)
             self._header.set_zoom_percent(int(self._zoom * 100))
-            self._apply_pixmap(pixmap, use_crossfade=False)
+            if pixmap is None:
+                # Renderizando en segundo plano: _on_preview_ready lo muestra
+                self._show_loading(True, LOADING_PREVIEW)
+            else:
+                self._apply_pixmap(pixmap, use_crossfade=False)
+                self._content_rendered = True
+                self._show_loading(False)
+            self._loader.preload_and_cleanup(self._index, self._paths)
+    
+    def _on_preview_ready(self, path: str, pixmap: QPixmap) -> None:
+        """Show a preview rendered in background if it is still the current file."""
+        if self._is_closing or not self._paths or self._paths[self._index] != path:
+            return
+        if not self._safe_widget_check():
+            return
+        try:
+            self._apply_pixmap(pixmap, use_crossfade=True)
             self._content_rendered = True
-            self._show_loading(False)
+            if not self._thumbs_loading:
+                self._show_loading(False)
+        except RuntimeError:
+            pass
 
     def _apply_pixmap(self, pixmap: QPixmap, use_crossfade: bool) -> None:
         """Apply pixmap to UI with fallback visual guarantee.
@@ -591,6 +619,7 @@ class QuickPreviewWindow(QWidget):
         self._thumbnails.hide()
         
         if QuickPreviewPdfHandler.is_pdf_or_docx_file(current_path):
+            self._hide_tiled_image()
             self._show_loading(True, LOADING_DOCUMENT)
             self._load_pdf_info(current_path)
             max_size = self._effective_content_max_size()
@@ -687,9 +716,13 @@ class QuickPreviewWindow(QWidget):
         else:
             self._pdf_handler.reset_for_new_file()
         
+        if self._show_tiled_image(current_path):
+            return
+        
         result = self._loader.load_preview(
             self._paths, self._index, self._image_label,
-            use_crossfade, self._animations
+            use_crossfade, self._animations,
+            on_ready=self._on_preview_ready
         )
         
         pixmap, header_text = result
@@ -697,6 +730,13 @@ class QuickPreviewWindow(QWidget):
         self._header.update_file(current_path, header_text, self.close)
         self._header.set_zoom_percent(int(self._zoom * 100))
         
+        if pixmap is None:
+            # Renderizando en segundo plano (sin bloquear la navegación): _on_preview_ready lo muestra
+            self._show_loading(True, LOADING_PREVIEW)
+            self._loader.preload_and_cleanup(self._index, self._paths)
+            self._update_navigation_state()
+            return
+        
         # Marcar que el contenido principal ya se renderizó
         self._content_rendered = True
         
@@ -733,9 +773,40 @@ class QuickPreviewWindow(QWidget):
         self._loader.preload_and_cleanup(self._index, self._paths)
         self._update_navigation_state()
 
+    def _is_tiled_image_shown(self) -> bool:
+        return self._viewer_stack.currentWidget() is self._tiled_view
+
+    def _show_tiled_image(self, path: str) -> bool:
+        """Show a large image in the tiled view; False if it is not one (or cannot be opened)."""
+        if not should_tile_image(path) or not self._tiled_view.set_image(path):
+            self._hide_tiled_image()
+            return False
+        self._viewer_stack.setCurrentWidget(self._tiled_view)
+        self._header.update_file(path, Path(path).name, self.close)
+        self._header.set_zoom_percent(int(self._tiled_view.zoom() * 100))
+        self._content_rendered = True
+        self._show_loading(False)
+        self._loader.preload_and_cleanup(self._index, self._paths)
+        self._update_navigation_state()
+        return True
+
+    def _hide_tiled_image(self) -> None:
+        """Back to the regular preview, releasing the tiles of the previous image."""
+        if self._is_tiled_image_shown():
+            self._viewer_stack.setCurrentIndex(0)
+            self._tiled_view.clear()
+
+    def _on_tiled_zoom_changed(self, zoom: float) -> None:
+        if self._is_closing:
+            return
+        self._header.set_zoom_percent(int(zoom * 100))
+
     def _on_zoom_in(self) -> None:
         if self._is_closing:
             return
+        if self._is_tiled_image_shown():
+            self._tiled_view.zoom_by(1.25)
+            return
         self._zoom = min(self._zoom * 1.25, 6.0)
         self._header.set_zoom_percent(int(self._zoom * 100))
         self._load_preview(use_crossfade=False)
@@ -743,6 +814,9 @@ class QuickPreviewWindow(QWidget):
     def _on_zoom_out(self) -> None:
         if self._is_closing:
             return
+        if self._is_tiled_image_shown():
+            self._tiled_view.zoom_by(1 / 1.25)
+            return
         self._zoom = max(self._zoom / 1.25, 0.2)
         self._header.set_zoom_percent(int(self._zoom * 100))
         self._load_preview(use_crossfade=False)
@@ -750,6 +824,9 @@ class QuickPreviewWindow(QWidget):
     def _on_zoom_reset(self) -> None:
         if self._is_closing:
             return
+        if self._is_tiled_image_shown():
+            self._tiled_view.set_zoom(1.0)
+            return
         self._zoom = 1.0
         self._header.set_zoom_percent(100)
         self._load_preview(use_crossfade=False)
@@ -859,6 +936,10 @@ class QuickPreviewWindow(QWidget):
         """Cancel all ongoing operations (PDF rendering, thumbnails, DOCX conversion)."""
         self._is_closing = True
         self._current_request_id = None
+        if hasattr(self, '_cache') and self._cache:
+            self._cache.shutdown()
+        if hasattr(self, '_tiled_view') and self._tiled_view:
+            self._tiled_view.shutdown()
         if hasattr(self, '_preview_service') and self._preview_service:
             self._preview_service.stop_workers()
     
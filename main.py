@@ -5,6 +5,7 @@ Bootstrap application: creates QApplication and DesktopWindow (auto-start).
 MainWindow opens only when user requests it.
 """
 
+import multiprocessing
 import sys
 import traceback
 import logging
@@ -97,9 +98,28 @@ def main() -> int:
     # Connect DesktopWindow signal to open MainWindow
     desktop_window.open_main_window.connect(open_main_window)
     
+    # Al salir: escribir estados pendientes, parar los índices de búsqueda, la preconversión DOCX (y guardar el índice
+    # de su caché) y los procesos de miniaturas PDF, y cerrar conexiones SQLite del pool (checkpoint WAL limpio)
+    from app.services.file_state_storage import close_all_connections
+    from app.services.file_state_write_queue import shutdown_state_writes
+    from app.services.content_index import shutdown_content_index
+    from app.services.docx_pdf_cache import flush_docx_pdf_cache_index
+    from app.services.docx_preconverter import shutdown_docx_preconverter
+    from app.services.filename_index import shutdown_filename_index
+    from app.services.pdf_thumbnail_pool import shutdown_thumbnail_processes
+    app.aboutToQuit.connect(shutdown_state_writes)
+    app.aboutToQuit.connect(shutdown_content_index)
+    app.aboutToQuit.connect(shutdown_docx_preconverter)
+    app.aboutToQuit.connect(flush_docx_pdf_cache_index)
+    app.aboutToQuit.connect(shutdown_filename_index)
+    app.aboutToQuit.connect(shutdown_thumbnail_processes)
+    app.aboutToQuit.connect(close_all_connections)
+    
     return app.exec()
 
 
 if __name__ == "__main__":
+    # Los procesos de miniaturas PDF (spawn) arrancan este ejecutable en el build de PyInstaller
+    multiprocessing.freeze_support()
     sys.exit(main())
 
@@ -12,6 +12,24 @@ from pathlib import Path
 import pytest
 from PySide6.QtWidgets import QApplication
 
+# Los benchmarks (marca "benchmark") solo se ejecutan con CLARITYDESK_BENCHMARKS=1
+RUN_BENCHMARKS = os.environ.get("CLARITYDESK_BENCHMARKS") == "1"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: medición de rendimiento, fuera de la ejecución por defecto"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: ejecutar con CLARITYDESK_BENCHMARKS=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
 
 @pytest.fixture(scope="session")
 def qapp():
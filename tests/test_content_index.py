@@ -0,0 +1,217 @@
+"""
+Tests para el índice de contenido de documentos.
+
+Cubre la extracción de texto (texto plano, DOCX y PDF), la construcción de
+consultas FTS5, la indexación a partir del catálogo del índice de nombres,
+la reindexación de documentos modificados y la poda de subárboles borrados.
+"""
+
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.folder_delta import FolderDelta
+from app.services import content_index as content_index_module
+from app.services import content_index_storage, filename_index_storage
+from app.services.content_index import ContentIndex
+from app.services.content_text_extractor import FITZ_AVAILABLE, extract_text, fitz
+from app.services.file_state_storage_helpers import close_all_connections
+from app.services.filename_index import FilenameIndex
+from app.services.search_service import get_workspace_search_roots, search_content
+
+WAIT = 10
+
+_DOCX_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:body>{paragraphs}</w:body></w:document>'
+)
+
+
+def _write_docx(path, *paragraphs):
+    """DOCX mínimo: solo word/document.xml."""
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr("word/document.xml", _DOCX_XML.format(paragraphs=body))
+
+
+def _write(path, text, encoding='utf-8'):
+    with open(path, 'w', encoding=encoding) as f:
+        f.write(text)
+
+
+def _touch_dir(path):
+    """Forzar un mtime de carpeta distinto (resolución gruesa de algunos FS)."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _names(paths):
+    return sorted(os.path.basename(path) for path in paths)
+
+
+@pytest.fixture
+def index_dbs(monkeypatch):
+    """Bases de datos temporales de ambos índices."""
+    temp_dir = tempfile.mkdtemp()
+    monkeypatch.setattr(
+        filename_index_storage, 'get_index_db_path', lambda: Path(temp_dir) / 'names.db'
+    )
+    monkeypatch.setattr(
+        content_index_storage, 'get_content_db_path', lambda: Path(temp_dir) / 'content.db'
+    )
+    # Sin pausas entre documentos
+    monkeypatch.setattr(content_index_module, 'CONTENT_INDEX_DUTY_CYCLE', 1.0)
+    yield temp_dir
+    close_all_connections()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def indexes(index_dbs):
+    """Índice de nombres (catálogo) y de contenido."""
+    catalog = FilenameIndex()
+    content = ContentIndex(catalog)
+    yield catalog, content
+    content.shutdown(WAIT)
+    catalog.shutdown(WAIT)
+
+
+@pytest.fixture
+def docs(temp_folder):
+    """Documentos con contenido conocido."""
+    os.makedirs(os.path.join(temp_folder, "tema1"))
+    _write(os.path.join(temp_folder, "apuntes.txt"), "La fotosíntesis ocurre en los cloroplastos")
+    _write(os.path.join(temp_folder, "notas.csv"), "alumno,nota\nAna,7")
+    _write_docx(os.path.join(temp_folder, "tema1", "examen.docx"), "Examen de biología", "Pregunta 1")
+    _write(os.path.join(temp_folder, "tema1", "ficha.json"), '{"titulo": "Ficha de mitosis"}')
+    return temp_folder
+
+
+def _wait(catalog, content):
+    assert catalog.wait_idle(WAIT)
+    assert content.wait_idle(WAIT)
+
+
+class TestTextExtraction:
+    """Extracción de texto por tipo de archivo."""
+
+    def test_plain_text_fallback_encoding(self, temp_folder):
+        """Un .txt en cp1252 se decodifica sin perder acentos."""
+        path = os.path.join(temp_folder, "viejo.txt")
+        _write(path, "Señales y ecuaciones", encoding='cp1252')
+        assert extract_text(path) == "Señales y ecuaciones"
+
+    def test_docx_paragraphs(self, temp_folder):
+        """Los párrafos de word/document.xml se leen en líneas."""
+        path = os.path.join(temp_folder, "hoja.docx")
+        _write_docx(path, "Primera línea", "Segunda")
+        assert extract_text(path).split() == ["Primera", "línea", "Segunda"]
+
+    @pytest.mark.skipif(not FITZ_AVAILABLE, reason="PyMuPDF no disponible")
+    def test_pdf_text(self, temp_folder):
+        """El texto de las páginas de un PDF se extrae con PyMuPDF."""
+        path = os.path.join(temp_folder, "ficha.pdf")
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), "Ecuaciones de segundo grado")
+        doc.save(path)
+        doc.close()
+        assert "Ecuaciones de segundo grado" in extract_text(path)
+
+    def test_unreadable_file(self, temp_folder):
+        """Un DOCX corrupto no lanza excepción."""
+        path = os.path.join(temp_folder, "roto.docx")
+        _write(path, "no es un zip")
+        assert extract_text(path) is None
+
+
+class TestMatchQuery:
+    """Consultas del usuario a expresiones FTS5."""
+
+    def test_words_become_prefix_terms(self):
+        """Cada palabra es un prefijo obligatorio; la puntuación se ignora."""
+        assert content_index_storage.build_match_query('examen "final" 2º') == '"examen"* "final"* "2º"*'
+
+    def test_short_query_is_ignored(self):
+        """Consultas demasiado cortas no buscan en el contenido."""
+        assert content_index_storage.build_match_query("ab") is None
+
+
+class TestContentIndex:
+    """Indexación desde el catálogo y actualización incremental."""
+
+    def test_finds_documents_by_content(self, indexes, docs):
+        """Busca por palabras del contenido, sin distinguir acentos."""
+        catalog, content = indexes
+        catalog.set_roots([docs])
+        _wait(catalog, content)
+
+        assert _names(content.search("fotosintesis", 100)) == ["apuntes.txt"]
+        assert _names(content.search("biología pregunta", 100)) == ["examen.docx"]
+        assert _names(content.search("mitos", 100)) == ["ficha.json"]
+        assert content.search("cloroplastos examen", 100) == []
+
+    def test_modified_document_is_reindexed(self, indexes, docs):
+        """Un delta con el archivo modificado reindexa su texto."""
+        catalog, content = indexes
+        catalog.set_roots([docs])
+        _wait(catalog, content)
+
+        path = os.path.join(docs, "apuntes.txt")
+        _write(path, "La respiración celular ocurre en las mitocondrias")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        content.apply_delta(FolderDelta(folder=docs, modified=[path]))
+        _wait(catalog, content)
+
+        assert content.search("fotosintesis", 100) == []
+        assert _names(content.search("mitocondrias", 100)) == ["apuntes.txt"]
+
+    def test_refresh_skips_unchanged_documents(self, indexes, docs, monkeypatch):
+        """refresh no vuelve a extraer documentos con el mismo mtime y tamaño."""
+        catalog, content = indexes
+        catalog.set_roots([docs])
+        _wait(catalog, content)
+
+        extracted = []
+        monkeypatch.setattr(content_index_module, "extract_text", lambda path: extracted.append(path) or "")
+        new_path = os.path.join(docs, "nuevo.txt")
+        _write(new_path, "texto nuevo")
+        _touch_dir(docs)
+        catalog.refresh()
+        content.refresh()
+        _wait(catalog, content)
+
+        assert extracted == [new_path]
+
+    def test_removed_folder_drops_documents(self, indexes, docs):
+        """Borrar una carpeta elimina sus documentos del índice de contenido."""
+        catalog, content = indexes
+        catalog.set_roots([docs])
+        _wait(catalog, content)
+
+        shutil.rmtree(os.path.join(docs, "tema1"))
+        _touch_dir(docs)
+        catalog.refresh()
+        _wait(catalog, content)
+
+        assert content.search("biología", 100) == []
+        assert content_index_storage.count_documents() == 2
+
+    def test_search_content_maps_workspaces(self, indexes, docs):
+        """search_content asigna cada documento al workspace que lo contiene."""
+        catalog, content = indexes
+        tema1 = os.path.join(docs, "tema1")
+        workspaces = [SimpleNamespace(id="ws1", name="Uno", tabs=[tema1], focus_tree_paths=[])]
+        manager = SimpleNamespace(get_workspaces=lambda: workspaces, get_active_workspace_id=lambda: "ws1")
+        catalog.set_roots([tema1])
+        _wait(catalog, content)
+
+        results = search_content("examen", get_workspace_search_roots(manager), content)
+
+        assert [(os.path.basename(r.file_path), r.workspace_id) for r in results] == [("examen.docx", "ws1")]
@@ -0,0 +1,304 @@
+"""
+Tests para la caché de PDFs convertidos desde DOCX y la preconversión.
+
+Cubre las claves por ruta + tamaño + mtime (un documento editado no devuelve
+el PDF anterior), el índice persistente con expulsión LRU sin recorrer el
+directorio, la reconstrucción del índice, y DocxPreconverter convirtiendo
+la carpeta activa de uno en uno y solo en inactividad.
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from app.services import docx_pdf_cache
+from app.services.docx_converter import DocxConverter
+from app.services.docx_pdf_cache import (
+    clear_docx_pdf_cache,
+    flush_docx_pdf_cache_index,
+    get_docx_pdf_cache_stats,
+    has_pdf,
+    lookup_pdf,
+)
+from app.services import docx_preconverter
+from app.services.docx_preconverter import (
+    DocxPreconverter,
+    is_docx_preconversion_enabled,
+    list_convertible_docx,
+    set_docx_preconversion_enabled,
+)
+from app.services.settings_service import SettingsService
+
+WAIT = 5
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 1000
+
+
+class _FakeDocx2Pdf:
+    """docx2pdf falso: escribe un PDF, registra las conversiones y su concurrencia."""
+
+    def __init__(self):
+        self.converted = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def convert(self, input_path, output_path):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            with open(input_path, 'rb') as f:
+                content = f.read()
+            with open(output_path, 'wb') as f:
+                f.write(PDF_BYTES + content)
+            # La entrada es una copia temporal: se registra el contenido
+            self.converted.append(content.decode())
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def cache_dir(temp_folder, monkeypatch):
+    """Caché aislada en una carpeta temporal."""
+    path = os.path.join(temp_folder, "cache")
+    monkeypatch.setattr(docx_pdf_cache, 'get_docx_pdf_cache_dir', lambda: docx_pdf_cache.Path(path))
+    clear_docx_pdf_cache()
+    yield path
+    clear_docx_pdf_cache()
+
+
+@pytest.fixture
+def docx2pdf(monkeypatch):
+    fake = _FakeDocx2Pdf()
+    monkeypatch.setitem(sys.modules, 'docx2pdf', types.SimpleNamespace(convert=fake.convert))
+    return fake
+
+
+@pytest.fixture
+def documents(temp_folder):
+    folder = os.path.join(temp_folder, "docs")
+    os.makedirs(folder)
+    paths = []
+    for number in range(3):
+        path = os.path.join(folder, f"informe{number}.docx")
+        with open(path, 'wb') as f:
+            f.write(f"documento {number}".encode())
+        paths.append(path)
+    return paths
+
+
+def _edit(path, content):
+    """Cambiar contenido y mtime (sin depender de la resolución del reloj)."""
+    stat = os.stat(path)
+    with open(path, 'wb') as f:
+        f.write(content)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def _reload_index():
+    """Simular un proceso nuevo: olvidar el índice cargado en memoria."""
+    docx_pdf_cache._index = None
+    docx_pdf_cache._index_dir = None
+
+
+class TestDocxPdfCache:
+    """Claves por contenido e índice LRU."""
+
+    def test_conversion_is_cached(self, cache_dir, docx2pdf, documents):
+        """La segunda apertura no vuelve a convertir."""
+        converter = DocxConverter()
+
+        first = converter.convert_to_pdf(documents[0])
+        second = converter.convert_to_pdf(documents[0])
+
+        assert first and first == second
+        assert len(docx2pdf.converted) == 1
+        assert converter.has_cached_pdf(documents[0])
+        # La copia temporal con extensión normalizada no se queda en la caché
+        assert os.listdir(os.path.join(cache_dir, "temp_docx")) == []
+
+    def test_edited_document_is_converted_again(self, cache_dir, docx2pdf, documents):
+        """Editar el DOCX cambia la clave: nunca se devuelve el PDF anterior."""
+        converter = DocxConverter()
+        old_pdf = converter.convert_to_pdf(documents[0])
+
+        _edit(documents[0], b"version nueva")
+
+        assert lookup_pdf(documents[0]) is None
+        new_pdf = converter.convert_to_pdf(documents[0])
+        assert new_pdf != old_pdf
+        with open(new_pdf, 'rb') as f:
+            assert f.read().endswith(b"version nueva")
+
+    def test_same_name_in_other_folder_is_independent(self, cache_dir, docx2pdf, temp_folder, documents):
+        """La ruta forma parte de la clave."""
+        other = os.path.join(temp_folder, "informe0.docx")
+        with open(documents[0], 'rb') as src, open(other, 'wb') as dst:
+            dst.write(src.read())
+        converter = DocxConverter()
+
+        assert converter.convert_to_pdf(documents[0]) != converter.convert_to_pdf(other)
+        assert len(docx2pdf.converted) == 2
+
+    def test_budget_evicts_least_recently_used(self, cache_dir, docx2pdf, documents, monkeypatch):
+        """Por encima del presupuesto sale el menos usado, sin recorrer el directorio."""
+        converter = DocxConverter()
+        converter.convert_to_pdf(documents[0])
+        converter.convert_to_pdf(documents[1])
+        entry_bytes = os.path.getsize(lookup_pdf(documents[1]))
+        # Acceso reciente a 0: el menos usado pasa a ser 1
+        assert lookup_pdf(documents[0])
+
+        monkeypatch.setattr(docx_pdf_cache, 'MAX_CACHE_BYTES', entry_bytes * 2)
+        monkeypatch.setattr(docx_pdf_cache, '_scan_entries', lambda *args: pytest.fail("directory walk"))
+        converter.convert_to_pdf(documents[2])
+
+        assert has_pdf(documents[0]) and has_pdf(documents[2])
+        assert not has_pdf(documents[1])
+        stats = get_docx_pdf_cache_stats()
+        assert stats['evictions'] == 1
+        assert stats['bytes'] <= entry_bytes * 2
+        assert len([name for name in os.listdir(cache_dir) if name.endswith(".pdf")]) == 2
+
+    def test_index_survives_restart(self, cache_dir, docx2pdf, documents):
+        """El índice se persiste: un proceso nuevo conserva entradas y orden LRU."""
+        converter = DocxConverter()
+        for path in documents:
+            converter.convert_to_pdf(path)
+        lookup_pdf(documents[0])
+        flush_docx_pdf_cache_index()
+
+        _reload_index()
+
+        assert list(docx_pdf_cache._ensure_index_locked(docx_pdf_cache.Path(cache_dir))) == [
+            docx_pdf_cache._file_key(path) for path in (documents[1], documents[2], documents[0])
+        ]
+        assert get_docx_pdf_cache_stats()['entries'] == 3
+
+    def test_hit_does_not_write_index(self, cache_dir, docx2pdf, documents, monkeypatch):
+        """Un acierto no reescribe index.json; el acceso se guarda al salir."""
+        DocxConverter().convert_to_pdf(documents[0])
+        DocxConverter().convert_to_pdf(documents[1])
+        writes = []
+        save = docx_pdf_cache._save_index_locked
+        monkeypatch.setattr(docx_pdf_cache, '_save_index_locked', lambda base: writes.append(base) or save(base))
+
+        for _ in range(5):
+            assert lookup_pdf(documents[0])
+        assert writes == []
+
+        flush_docx_pdf_cache_index()
+        flush_docx_pdf_cache_index()
+        assert len(writes) == 1
+
+    def test_corrupt_index_is_rebuilt(self, cache_dir, docx2pdf, documents):
+        """Un índice ilegible se reconstruye desde los PDFs del directorio."""
+        DocxConverter().convert_to_pdf(documents[0])
+        with open(os.path.join(cache_dir, docx_pdf_cache.INDEX_FILE_NAME), 'w') as f:
+            f.write("{no es json")
+
+        _reload_index()
+
+        assert lookup_pdf(documents[0])
+        assert len(docx2pdf.converted) == 1
+
+    def test_failed_conversion_leaves_no_entry(self, cache_dir, documents, monkeypatch):
+        """Si docx2pdf falla no queda PDF parcial ni entrada en el índice."""
+        def failing_convert(input_path, output_path):
+            with open(output_path, 'wb') as f:
+                f.write(b"%PDF a medias")
+            raise RuntimeError("Word no disponible")
+        monkeypatch.setitem(sys.modules, 'docx2pdf', types.SimpleNamespace(convert=failing_convert))
+
+        assert DocxConverter().convert_to_pdf(documents[0]) == ""
+        assert not has_pdf(documents[0])
+        assert [name for name in os.listdir(cache_dir) if name.endswith(".pdf")] == []
+
+
+class TestDocxPreconverter:
+    """Preconversión de la carpeta activa."""
+
+    @pytest.fixture
+    def preconverter(self, cache_dir, docx2pdf):
+        preconverter = DocxPreconverter(idle_seconds=0.05)
+        yield preconverter
+        preconverter.shutdown(WAIT)
+
+    def test_converts_folder_one_at_a_time(self, preconverter, docx2pdf, documents):
+        """Convierte los DOCX de la carpeta, nunca dos a la vez; la vista rápida ya no espera."""
+        docx2pdf.delay = 0.02
+        lock_file = os.path.join(os.path.dirname(documents[0]), "~$forme0.docx")
+        with open(lock_file, 'wb') as f:
+            f.write(b"bloqueo de Word")
+
+        preconverter.set_folder(os.path.dirname(documents[0]))
+        assert preconverter.wait_idle(WAIT)
+
+        assert sorted(docx2pdf.converted) == ["documento 0", "documento 1", "documento 2"]
+        assert docx2pdf.max_active == 1
+        assert all(has_pdf(path) for path in documents)
+        DocxConverter().convert_to_pdf(documents[0])
+        assert len(docx2pdf.converted) == 3
+
+    def test_waits_for_idle(self, cache_dir, docx2pdf, documents):
+        """No empieza hasta que pasa el tiempo de inactividad."""
+        preconverter = DocxPreconverter(idle_seconds=0.5)
+        try:
+            preconverter.set_folder(os.path.dirname(documents[0]))
+            time.sleep(0.2)
+            assert docx2pdf.converted == []
+            assert preconverter.wait_idle(WAIT)
+            assert len(docx2pdf.converted) == 3
+        finally:
+            preconverter.shutdown(WAIT)
+
+    def test_already_converted_files_are_skipped(self, preconverter, docx2pdf, documents):
+        """Un documento ya convertido (p. ej. abierto en la vista rápida) no se repite."""
+        DocxConverter().convert_to_pdf(documents[1])
+
+        preconverter.set_folder(os.path.dirname(documents[0]))
+        assert preconverter.wait_idle(WAIT)
+
+        assert sorted(docx2pdf.converted) == ["documento 0", "documento 1", "documento 2"]
+
+    def test_leaving_folder_drops_queue(self, cache_dir, docx2pdf, documents):
+        """Cambiar de carpeta (o desactivar) descarta lo pendiente."""
+        preconverter = DocxPreconverter(idle_seconds=0.3)
+        try:
+            preconverter.set_folder(os.path.dirname(documents[0]))
+            assert preconverter.pending_count() == 3
+            preconverter.set_folder(None)
+            assert preconverter.wait_idle(WAIT)
+            time.sleep(0.4)
+            assert docx2pdf.converted == []
+        finally:
+            preconverter.shutdown(WAIT)
+
+    def test_opt_in_toggle(self, temp_folder, monkeypatch):
+        """El ajuste se guarda y arranca o detiene la carpeta activa."""
+        settings_path = os.path.join(temp_folder, "settings.json")
+        monkeypatch.setattr(docx_preconverter, 'SettingsService', lambda: SettingsService(settings_path))
+        folders = []
+        fake = types.SimpleNamespace(set_folder=folders.append)
+        monkeypatch.setattr(docx_preconverter, 'get_docx_preconverter', lambda: fake)
+
+        assert is_docx_preconversion_enabled() is False
+        set_docx_preconversion_enabled(True, temp_folder)
+        assert is_docx_preconversion_enabled() is True
+        set_docx_preconversion_enabled(False, temp_folder)
+
+        assert folders == [temp_folder, None]
+        assert is_docx_preconversion_enabled() is False
+
+    def test_list_convertible_docx_limit(self, documents):
+        """Orden por nombre, límite por carpeta y carpeta inexistente."""
+        folder = os.path.dirname(documents[0])
+        assert list_convertible_docx(folder, limit=2) == documents[:2]
+        assert list_convertible_docx(os.path.join(folder, "no_existe")) == []
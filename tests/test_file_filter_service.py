@@ -11,11 +11,11 @@ from pathlib import Path
 import pytest
 
 from app.services.file_filter_service import (
+    filter_entries_by_extensions,
     filter_files_by_extensions,
-    filter_folder_files_by_extensions,
-    is_executable,
-    _filter_raw_folder_files
+    is_executable
 )
+from app.services.file_scan_service import read_folder_entries
 
 
 def _create_pe_header():
@@ -171,85 +171,18 @@ class TestFilterFilesByExtensions:
         assert len(result) == 0
 
 
-class TestFilterFolderFilesByExtensions:
-    """Tests para filter_folder_files_by_extensions."""
+class TestFilterEntriesByExtensions:
+    """Tests para filter_entries_by_extensions."""
     
-    def test_filter_folder_files_by_extensions_success(self, temp_files):
-        """Filtrar archivos de carpeta por extensiones."""
+    def test_filter_entries_without_stat(self, temp_files, monkeypatch):
+        """Filtra por tipo y extensión de la entrada sin volver a consultar el disco."""
         _, temp_dir = temp_files
-        extensions = {'.pdf', '.docx'}
-        
-        result = filter_folder_files_by_extensions(temp_dir, extensions)
-        
-        assert isinstance(result, list)
-        assert any('.pdf' in f for f in result)
-        assert any('.docx' in f for f in result)
-    
-    def test_filter_folder_files_empty_folder(self):
-        """Filtrar carpeta vacía."""
-        temp_dir = tempfile.mkdtemp()
-        
-        try:
-            extensions = {'.pdf'}
-            result = filter_folder_files_by_extensions(temp_dir, extensions)
-            
-            assert isinstance(result, list)
-            assert len(result) == 0
-        finally:
-            try:
-                os.rmdir(temp_dir)
-            except OSError:
-                pass
-    
-    def test_filter_folder_files_nonexistent_folder(self):
-        """Filtrar carpeta inexistente."""
-        extensions = {'.pdf'}
-        result = filter_folder_files_by_extensions("/nonexistent/folder", extensions)
-        
-        assert isinstance(result, list)
-        assert len(result) == 0
-    
-    def test_filter_folder_files_empty_path(self):
-        """Filtrar con path vacío."""
-        extensions = {'.pdf'}
-        result = filter_folder_files_by_extensions("", extensions)
+        entries = read_folder_entries(temp_dir)
+        monkeypatch.setattr(os.path, 'isdir', lambda p: pytest.fail("isdir inesperado"))
+        monkeypatch.setattr(os.path, 'isfile', lambda p: pytest.fail("isfile inesperado"))
         
-        assert isinstance(result, list)
-        assert len(result) == 0
-
-
-class TestFilterRawFolderFiles:
-    """Tests para _filter_raw_folder_files."""
-    
-    def test_filter_raw_folder_files_success(self, temp_files):
-        """Filtrar lista raw de archivos."""
-        file_paths, _ = temp_files
-        extensions = {'.pdf', '.docx'}
+        result = filter_entries_by_extensions(entries, {'.pdf'})
         
-        result = _filter_raw_folder_files(file_paths, extensions)
-        
-        assert isinstance(result, list)
-        assert any('.pdf' in f for f in result)
-        assert any('.docx' in f for f in result)
-    
-    def test_filter_raw_folder_files_includes_folders(self, temp_files):
-        """Validar que incluye carpetas."""
-        file_paths, _ = temp_files
-        extensions = {'.pdf'}
-        
-        result = _filter_raw_folder_files(file_paths, extensions)
-        
-        folders = [f for f in result if os.path.isdir(f)]
-        assert len(folders) > 0
-    
-    def test_filter_raw_folder_files_permission_error(self):
-        """Manejar error de permisos."""
-        # Crear lista con path que puede causar error de permisos
-        files = ["/nonexistent/file.pdf"]
-        extensions = {'.pdf'}
-        
-        result = _filter_raw_folder_files(files, extensions)
-        
-        # No debe lanzar excepción
-        assert isinstance(result, list)
-
+        assert any(e.ext == '.pdf' for e in result)
+        assert all(e.is_dir or e.ext == '.pdf' for e in result)
+        assert any(e.is_dir for e in result)
@@ -0,0 +1,148 @@
+"""
+Tests para FileIdentityCache.
+
+Cubre la alimentación desde el listado de carpetas, la invalidación y que
+las consultas de estado no hagan stat adicionales.
+"""
+
+import os
+
+import pytest
+
+from app.services import file_identity_cache
+from app.services.file_identity_cache import (
+    clear_identity_cache,
+    get_cached_file_id,
+    get_file_id,
+    invalidate_folder,
+    invalidate_path,
+)
+from app.services.file_scan_service import scan_folder_files
+from app.services.file_state_storage import get_file_id_from_path
+
+
+@pytest.fixture
+def listed_folder(temp_folder):
+    """Carpeta con archivos ya listada (cache alimentada)."""
+    clear_identity_cache()
+    for i in range(20):
+        with open(os.path.join(temp_folder, f"file_{i}.txt"), 'w') as f:
+            f.write('content')
+    os.makedirs(os.path.join(temp_folder, "subfolder"))
+    paths = scan_folder_files(temp_folder)
+    yield temp_folder, paths
+    clear_identity_cache()
+
+
+class _StatCounter:
+    """Contar llamadas a os.stat."""
+    
+    def __init__(self, original):
+        self.calls = 0
+        self._original = original
+    
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self._original(*args, **kwargs)
+
+
+class _FolderStatCounter(_StatCounter):
+    """Contar solo las llamadas a os.stat sobre una carpeta."""
+    
+    def __init__(self, original, folder):
+        super().__init__(original)
+        self._folder = folder
+    
+    def __call__(self, path, *args, **kwargs):
+        if os.fspath(path).startswith(self._folder):
+            self.calls += 1
+        return self._original(path, *args, **kwargs)
+
+
+class TestFileIdentityCache:
+    """Tests para la cache de identidades."""
+    
+    def test_listing_feeds_cache(self, listed_folder):
+        """El listado deja en cache el file_id de cada entrada."""
+        _, paths = listed_folder
+        
+        assert len(paths) == 21
+        for path in paths:
+            assert get_cached_file_id(path) == get_file_id_from_path(path)
+    
+    def test_cached_lookup_does_not_stat(self, listed_folder, monkeypatch):
+        """Una consulta en cache no toca el sistema de archivos."""
+        _, paths = listed_folder
+        counter = _StatCounter(os.stat)
+        monkeypatch.setattr(os, 'stat', counter)
+        
+        for path in paths:
+            assert get_file_id(path) is not None
+        
+        assert counter.calls == 0
+    
+    def test_invalidate_folder(self, listed_folder):
+        """Invalidar la carpeta elimina sus identidades."""
+        folder, paths = listed_folder
+        
+        invalidate_folder(folder)
+        
+        assert all(get_cached_file_id(path) is None for path in paths)
+    
+    def test_invalidate_path(self, listed_folder):
+        """Invalidar un path elimina solo esa identidad."""
+        _, paths = listed_folder
+        
+        invalidate_path(paths[0])
+        
+        assert get_cached_file_id(paths[0]) is None
+        assert get_cached_file_id(paths[1]) is not None
+    
+    def test_miss_falls_back_to_stat(self, temp_file):
+        """Un path no listado se resuelve con stat y queda en cache."""
+        clear_identity_cache()
+        
+        assert get_cached_file_id(temp_file) is None
+        assert get_file_id(temp_file) == get_file_id_from_path(temp_file)
+        assert get_cached_file_id(temp_file) is not None
+    
+    def test_missing_file_returns_none(self):
+        """Un path inexistente no se cachea."""
+        assert get_file_id("/nonexistent/file.txt") is None
+
+
+class TestStateLookupWithoutStat:
+    """Las consultas de estado de un listado no hacen stat adicionales."""
+    
+    def test_get_file_state_zero_stat_calls(self, qapp, listed_folder, monkeypatch):
+        """FileStateManager.get_file_state no llama a os.stat tras el listado."""
+        from app.managers.file_state_manager import FileStateManager
+        
+        _, paths = listed_folder
+        manager = FileStateManager()
+        manager.set_file_state(paths[0], "pendiente")
+        
+        counter = _StatCounter(os.stat)
+        monkeypatch.setattr(os, 'stat', counter)
+        
+        states = [manager.get_file_state(path) for path in paths]
+        
+        assert states.count("pendiente") == 1
+        assert counter.calls == 0
+    
+    def test_get_file_state_does_not_stat_listed_entries(self, qapp, listed_folder, monkeypatch):
+        """Los stat ajenos a la carpeta (p. ej. imports diferidos) no tocan las entradas listadas."""
+        from app.managers.file_state_manager import FileStateManager
+        
+        folder, paths = listed_folder
+        manager = FileStateManager()
+        manager.set_file_state(paths[0], "pendiente")
+        
+        counter = _FolderStatCounter(os.stat, folder)
+        monkeypatch.setattr(os, 'stat', counter)
+        
+        os.stat(os.path.dirname(folder))
+        states = [manager.get_file_state(path) for path in paths]
+        
+        assert states.count("pendiente") == 1
+        assert counter.calls == 0
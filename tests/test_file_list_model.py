@@ -0,0 +1,203 @@
+"""
+Tests para FileListModel.
+
+Cubre el cálculo perezoso de filas (solo las pedidas por la vista), los
+checkboxes pintados vía CheckStateRole, el estado por fila y el ordenamiento.
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+from PySide6.QtCore import Qt
+
+from app.ui.widgets import file_list_model
+from app.ui.widgets.file_list_model import FileListModel, sort_file_paths
+from app.ui.widgets.list_state_delegate import STATE_ROLE
+
+
+@pytest.fixture
+def files(temp_folder):
+    """Archivos y una carpeta reales con mtimes distintos."""
+    names = ["b_doc.txt", "a_sheet.csv", "c_image.png"]
+    paths = []
+    for i, name in enumerate(names):
+        path = os.path.join(temp_folder, name)
+        with open(path, 'w') as f:
+            f.write(name)
+        os.utime(path, (1_700_000_000 + i * 100, 1_700_000_000 + i * 100))
+        paths.append(path)
+    folder = os.path.join(temp_folder, "carpeta.v2")
+    os.mkdir(folder)
+    paths.append(folder)
+    return paths
+
+
+@pytest.fixture
+def icon_calls(monkeypatch):
+    """Contar iconos renderizados sin tocar el pipeline real."""
+    calls = []
+
+    def _fake_icon(path, icon_service, render_service=None, is_dir=None):
+        calls.append(path)
+        return None
+
+    monkeypatch.setattr(file_list_model, "get_list_icon", _fake_icon)
+    return calls
+
+
+@pytest.fixture
+def model(qapp, files, icon_calls):
+    """Modelo cargado con los archivos de prueba."""
+    model = FileListModel(icon_service=None)
+    model.set_files(files, states={files[0]: "pending"})
+    return model
+
+
+class TestLazyRows:
+    """Las celdas se calculan solo cuando la vista las pide."""
+
+    def test_set_files_does_not_compute_rows(self, model, files, icon_calls):
+        """set_files solo guarda rutas: sin textos ni iconos calculados."""
+        assert model.rowCount() == len(files)
+        assert model._rows == {}
+        assert icon_calls == []
+
+    def test_only_requested_rows_are_computed(self, model, files, icon_calls):
+        """Pedir una fila calcula esa fila y ninguna otra."""
+        model.index(1, 1).data(Qt.ItemDataRole.DisplayRole)
+        model.index(1, 1).data(Qt.ItemDataRole.DecorationRole)
+
+        assert list(model._rows) == [files[1]]
+        assert icon_calls == [files[1]]
+
+    def test_icon_rendered_once_per_path(self, model, files, icon_calls):
+        """El icono de una fila se cachea tras el primer pintado."""
+        for _ in range(3):
+            model.index(0, 1).data(Qt.ItemDataRole.DecorationRole)
+        assert icon_calls == [files[0]]
+
+    def test_cell_texts(self, model, files):
+        """Nombre sin extensión, tipo en mayúsculas y fecha formateada."""
+        assert model.index(0, 1).data() == "b_doc"
+        assert model.index(0, 2).data() == ".TXT"
+        expected_date = datetime.fromtimestamp(1_700_000_000).strftime("%Y-%m-%d %H:%M")
+        assert model.index(0, 3).data() == expected_date
+
+    def test_folder_has_no_extension(self, model, files):
+        """Las carpetas muestran tipo vacío aunque tengan punto en el nombre."""
+        assert model.index(3, 2).data() == ""
+
+    def test_user_role_returns_path_in_every_column(self, model, files):
+        """Todas las columnas exponen la ruta en UserRole."""
+        for column in range(model.columnCount()):
+            assert model.index(2, column).data(Qt.ItemDataRole.UserRole) == files[2]
+
+    def test_workspace_resolver_is_lazy(self, qapp, files, icon_calls):
+        """El workspace se resuelve solo para las filas pintadas."""
+        resolved = []
+
+        def _resolver(path):
+            resolved.append(path)
+            return "Trabajo"
+
+        model = FileListModel(icon_service=None)
+        model.set_files(files, workspace_resolver=_resolver)
+        assert resolved == []
+        assert model.index(0, 1).data() == "b_doc (Workspace: Trabajo)"
+        assert resolved == [files[0]]
+
+
+class TestChecksAndStates:
+    """Checkboxes y estados sin widgets por fila."""
+
+    def test_set_data_toggles_shared_set(self, qapp, files, icon_calls):
+        """Marcar una fila actualiza el conjunto compartido y emite la señal."""
+        checked = set()
+        model = FileListModel(icon_service=None, checked_paths=checked)
+        model.set_files(files, checked_paths=checked)
+        emitted = []
+        model.check_state_changed.connect(lambda path, state: emitted.append((path, state)))
+
+        index = model.index(1, 0)
+        assert model.setData(index, Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
+
+        assert checked == {files[1]}
+        assert index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        assert emitted == [(files[1], Qt.CheckState.Checked.value)]
+
+    def test_toggle_checked(self, model, files):
+        """toggle_checked alterna la fila y falla fuera de rango."""
+        assert model.toggle_checked(0) is True
+        assert files[0] in model._checked_paths
+        assert model.toggle_checked(0) is True
+        assert files[0] not in model._checked_paths
+        assert model.toggle_checked(99) is False
+
+    def test_checkbox_column_is_user_checkable(self, model):
+        """Solo la columna 0 es marcable."""
+        assert model.flags(model.index(0, 0)) & Qt.ItemFlag.ItemIsUserCheckable
+        assert not model.flags(model.index(0, 1)) & Qt.ItemFlag.ItemIsUserCheckable
+
+    def test_state_role(self, model, files):
+        """El estado precalculado se expone en STATE_ROLE de la columna 4."""
+        assert model.index(0, 4).data(STATE_ROLE) == "pending"
+        assert model.index(1, 4).data(STATE_ROLE) is None
+
+    def test_set_state_updates_single_cell(self, model, files):
+        """set_state cambia el estado y notifica solo esa celda."""
+        changes = []
+        model.dataChanged.connect(lambda top, bottom, roles: changes.append((top.row(), top.column(), bottom.row())))
+
+        assert model.set_state(files[2], "done") is True
+        assert model.index(2, 4).data(STATE_ROLE) == "done"
+        assert changes == [(2, 4, 2)]
+        assert model.set_state(os.path.join(os.path.dirname(files[0]), "nope.txt"), "done") is False
+
+    def test_restore_selection_keeps_checks(self, qapp, files, icon_calls):
+        """Restaurar la selección tras switch_view vuelve a marcar las filas."""
+        from PySide6.QtWidgets import QTableView
+        from app.ui.widgets.file_view_sync import _restore_list_selection
+
+        checked = {files[2]}
+        model = FileListModel(icon_service=None, checked_paths=checked)
+        model.set_files(files, checked_paths=checked)
+        view = QTableView()
+        view.setModel(model)
+        view._checked_paths = checked
+
+        _restore_list_selection(view, [files[0], files[1]])
+
+        assert checked == {files[0], files[1]}
+        assert model.index(0, 0).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        assert model.index(2, 0).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+
+    def test_row_for_path(self, model, files):
+        """row_for_path encuentra filas y devuelve -1 si no existen."""
+        assert model.row_for_path(files[3]) == 3
+        assert model.row_for_path(files[0] + "_missing") == -1
+
+
+class TestSorting:
+    """Ordenamiento con las mismas claves que refresh_table."""
+
+    def test_sort_by_name(self, model, files):
+        """Ordenar por nombre reordena filas sin calcular celdas."""
+        model.sort(1, Qt.SortOrder.AscendingOrder)
+        assert model.files() == [files[1], files[0], files[2], files[3]]
+        assert model.row_for_path(files[1]) == 0
+
+    def test_sort_by_date_descending(self, files):
+        """Ordenar por fecha descendente pone primero el más reciente."""
+        ordered = sort_file_paths(files[:3], 3, Qt.SortOrder.DescendingOrder)
+        assert ordered == [files[2], files[1], files[0]]
+
+    def test_sort_by_state(self, files):
+        """Ordenar por estado usa el mapa de estados (sin estado primero)."""
+        states = {files[0]: "review", files[1]: "done"}
+        ordered = sort_file_paths(files[:3], 4, Qt.SortOrder.AscendingOrder, states)
+        assert ordered == [files[2], files[1], files[0]]
+
+    def test_unknown_column_keeps_order(self, files):
+        """Una columna sin ordenamiento conserva el orden natural."""
+        assert sort_file_paths(files, 0, Qt.SortOrder.AscendingOrder) == files
@@ -10,7 +10,10 @@ from pathlib import Path
 
 import pytest
 
+from app.services.file_identity_cache import get_file_info
 from app.services.file_scan_service import (
+    read_folder_entries,
+    scan_folder_entries,
     scan_folder_files,
     scan_desktop_files,
     scan_trash_files,
@@ -56,6 +59,39 @@ def empty_folder():
         pass
 
 
+class TestScanFolderEntries:
+    """Tests para los registros de entrada de una sola pasada de scandir."""
+    
+    def test_entries_carry_type_size_and_extension(self, temp_folder_with_files):
+        """Cada registro trae tipo, tamaño, mtime y extensión sin stat extra."""
+        entries = {e.name: e for e in read_folder_entries(temp_folder_with_files)}
+        
+        assert set(entries) == {'test1.txt', 'test2.pdf', 'document.docx', 'subfolder'}
+        pdf = entries['test2.pdf']
+        assert pdf.path == os.path.join(temp_folder_with_files, 'test2.pdf')
+        assert not pdf.is_dir
+        assert pdf.size == len(b'content')
+        assert pdf.ext == '.pdf'
+        assert pdf.mtime == os.stat(pdf.path).st_mtime
+        assert entries['subfolder'].is_dir
+        assert entries['subfolder'].ext == ''
+    
+    def test_scan_entries_feeds_identity_cache(self, temp_folder_with_files, monkeypatch):
+        """scan_folder_entries deja tamaño/mtime/tipo listos para la vista de lista."""
+        entries = scan_folder_entries(temp_folder_with_files)
+        
+        def _no_stat(*args, **kwargs):
+            raise AssertionError("stat inesperado")
+        
+        monkeypatch.setattr(os, 'stat', _no_stat)
+        for entry in entries:
+            assert get_file_info(entry.path) == (entry.size, entry.mtime, entry.is_dir)
+    
+    def test_read_entries_nonexistent(self):
+        """Carpeta inexistente devuelve lista vacía."""
+        assert read_folder_entries("/nonexistent/folder") == []
+
+
 class TestScanFolderFiles:
     """Tests para scan_folder_files."""
     
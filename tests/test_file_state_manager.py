@@ -11,7 +11,8 @@ from unittest.mock import MagicMock, patch
 import pytest
 from PySide6.QtCore import QObject
 
-from app.managers.file_state_manager import FileStateManager
+from app.managers.file_state_manager import FileStateManager, get_file_state_manager
+from app.services.file_identity_cache import clear_identity_cache
 
 
 @pytest.fixture
@@ -20,7 +21,7 @@ def file_state_manager(qapp):
     manager = FileStateManager()
     # Limpiar cache antes de cada test
     manager._state_cache.clear()
-    manager._path_to_id_cache.clear()
+    clear_identity_cache()
     return manager
 
 
@@ -185,6 +186,47 @@ class TestSetFilesState:
                     pass
 
 
+class TestGetStatesForPaths:
+    """Tests para get_states_for_paths."""
+    
+    def test_returns_state_per_path(self, file_state_manager, temp_files):
+        """Devuelve un estado (o None) por cada path."""
+        files, _ = temp_files
+        file_state_manager.set_file_state(files[0], "pendiente")
+        
+        states = file_state_manager.get_states_for_paths(files + ["/nonexistent/file.txt"])
+        
+        assert states[files[0]] == "pendiente"
+        assert all(states[f] is None for f in files[1:])
+        assert states["/nonexistent/file.txt"] is None
+    
+    def test_single_query_for_uncached_paths(self, file_state_manager, temp_folder):
+        """Los paths sin estado en cache se resuelven con una sola consulta."""
+        from app.services.file_state_storage_helpers import get_connection
+        
+        files = []
+        for i in range(50):
+            path = os.path.join(temp_folder, f"file_{i}.txt")
+            with open(path, 'w') as f:
+                f.write('content')
+            files.append(path)
+        file_state_manager.set_file_state(files[3], "entregado")
+        file_state_manager._reset_cache()
+        
+        statements = []
+        conn = get_connection()
+        conn.set_trace_callback(statements.append)
+        try:
+            states = file_state_manager.get_states_for_paths(files)
+        finally:
+            conn.set_trace_callback(None)
+        
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+        assert states[files[3]] == "entregado"
+        assert sum(1 for state in states.values() if state) == 1
+
+
 class TestCleanupMissingFiles:
     """Tests para cleanup_missing_files."""
     
@@ -247,6 +289,102 @@ class TestCache:
         # El file_id puede cambiar si cambia el contenido/metadata
 
 
+def _count_selects(run):
+    """Ejecutar `run` y contar los SELECT emitidos a SQLite."""
+    from app.services.file_state_storage_helpers import get_connection
+    
+    statements = []
+    conn = get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        result = run()
+    finally:
+        conn.set_trace_callback(None)
+    return result, sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+
+
+class TestLazyFolderLoading:
+    """Carga perezosa de estados por carpeta y gestor compartido."""
+    
+    def _make_files(self, folder, count):
+        paths = []
+        for i in range(count):
+            path = os.path.join(folder, f"file_{i}.txt")
+            with open(path, 'w') as f:
+                f.write('content')
+            paths.append(path)
+        return paths
+    
+    def test_no_states_loaded_at_startup(self, qapp, temp_folder):
+        """Un gestor nuevo no lee la tabla completa."""
+        FileStateManager().set_file_state(self._make_files(temp_folder, 1)[0], "pendiente")
+        
+        manager = FileStateManager()
+        
+        assert manager._state_cache == {}
+        assert manager.get_memory_usage()['loaded_folders'] == 0
+    
+    def test_folder_loaded_once(self, qapp, temp_folder):
+        """La primera consulta carga la carpeta; las siguientes no tocan SQLite."""
+        files = self._make_files(temp_folder, 20)
+        FileStateManager().set_file_state(files[5], "entregado")
+        manager = FileStateManager()
+        
+        states, selects = _count_selects(lambda: manager.get_states_for_paths(files))
+        assert selects == 1
+        assert states[files[5]] == "entregado"
+        assert sum(1 for state in states.values() if state) == 1
+        
+        _, selects = _count_selects(lambda: manager.get_states_for_paths(files))
+        assert selects == 0
+        _, selects = _count_selects(lambda: manager.get_file_state(files[0]))
+        assert selects == 0
+    
+    def test_folder_load_excludes_subfolders(self, qapp, temp_folder):
+        """Solo se cargan los hijos directos de la carpeta."""
+        subfolder = os.path.join(temp_folder, "sub")
+        os.mkdir(subfolder)
+        nested = self._make_files(subfolder, 1)[0]
+        top = self._make_files(temp_folder, 1)[0]
+        writer = FileStateManager()
+        writer.set_file_state(nested, "pendiente")
+        writer.set_file_state(top, "trabajado")
+        
+        manager = FileStateManager()
+        assert manager.get_file_state(top) == "trabajado"
+        assert manager.get_memory_usage()['cached_states'] == 1
+        assert manager.get_file_state(nested) == "pendiente"
+        assert manager.get_memory_usage()['loaded_folders'] == 2
+    
+    def test_record_rename_moves_cached_state(self, file_state_manager, temp_folder):
+        """record_rename mueve el estado en memoria a la nueva ruta."""
+        old_path = self._make_files(temp_folder, 1)[0]
+        file_state_manager.set_file_state(old_path, "pendiente")
+        old_id = file_state_manager._get_file_id(old_path)
+        new_path = os.path.join(temp_folder, "renamed.txt")
+        
+        file_state_manager.record_rename(old_path, old_id, new_path, "new-id", "pendiente")
+        
+        assert old_id not in file_state_manager._state_cache
+        assert file_state_manager._state_cache["new-id"] == "pendiente"
+    
+    def test_memory_usage_report(self, file_state_manager, temp_folder):
+        """El reporte de memoria refleja las entradas cacheadas."""
+        files = self._make_files(temp_folder, 3)
+        file_state_manager.set_files_state(files, "pendiente")
+        
+        usage = file_state_manager.get_memory_usage()
+        
+        assert usage['loaded_folders'] == 1
+        assert usage['cached_states'] == 3
+        assert usage['path_keys'] == 3
+        assert usage['approx_bytes'] > 0
+    
+    def test_shared_manager(self, qapp):
+        """get_file_state_manager devuelve siempre la misma instancia."""
+        assert get_file_state_manager() is get_file_state_manager()
+
+
 class TestEdgeCases:
     """Tests para casos límite."""
     
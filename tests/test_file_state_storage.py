@@ -16,6 +16,7 @@ from app.services.file_state_storage import (
     get_state_by_path,
     load_all_states,
     remove_state,
+    get_states_batch,
     set_states_batch,
     remove_states_batch,
     remove_missing_files,
@@ -59,7 +60,8 @@ def temp_db(monkeypatch):
     
     yield str(db_path)
     
-    # Cleanup
+    # Cleanup: cerrar conexiones del pool antes de borrar la DB
+    file_state_storage_helpers.close_all_connections()
     import shutil
     try:
         shutil.rmtree(temp_dir)
@@ -67,6 +69,19 @@ def temp_db(monkeypatch):
         pass
 
 
+@pytest.fixture
+def delete_db_files(temp_db):
+    """Borrar la DB temporal (y -wal/-shm) con el pool reiniciado: en Windows un handle abierto bloquea el borrado."""
+    from app.services.file_state_storage_helpers import close_all_connections
+    
+    def _delete():
+        close_all_connections()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{temp_db}{suffix}").unlink(missing_ok=True)
+    
+    return _delete
+
+
 class TestInitializeDatabase:
     """Tests para initialize_database."""
     
@@ -227,6 +242,32 @@ class TestBatchOperations:
                 except OSError:
                     pass
     
+    def test_get_states_batch_success(self, temp_db, temp_files):
+        """Obtener estados de varios archivos en una consulta."""
+        files, _ = temp_files
+        _helper_set_state(files[0], "pendiente")
+        _helper_set_state(files[1], "entregado")
+        
+        entries = [(f, get_file_id_from_path(f)) for f in files]
+        states = get_states_batch(entries)
+        
+        assert states[files[0]] == "pendiente"
+        assert states[files[1]] == "entregado"
+        assert all(states[f] is None for f in files[2:])
+    
+    def test_get_states_batch_path_fallback(self, temp_db, temp_file):
+        """Si el file_id cambió, el estado se encuentra por path."""
+        stat = os.stat(temp_file)
+        set_state("old-id", temp_file, stat.st_size, int(stat.st_mtime), "trabajado")
+        
+        states = get_states_batch([(temp_file, get_file_id_from_path(temp_file))])
+        
+        assert states[temp_file] == "trabajado"
+    
+    def test_get_states_batch_empty(self, temp_db):
+        """Lista vacía devuelve diccionario vacío."""
+        assert get_states_batch([]) == {}
+    
     def test_remove_states_batch_success(self, temp_db):
         """Eliminar múltiples estados en batch."""
         temp_files = []
@@ -409,3 +450,180 @@ class TestEdgeCases:
             except OSError:
                 pass
 
+
+
+class TestConnectionPool:
+    """Tests para el pool de conexiones por hilo."""
+    
+    def test_connection_reused_in_same_thread(self, temp_db):
+        """La misma conexión se reutiliza dentro de un hilo."""
+        from app.services.file_state_storage_helpers import get_connection
+        
+        assert get_connection() is get_connection()
+    
+    def test_connection_per_thread(self, temp_db):
+        """Cada hilo obtiene su propia conexión."""
+        import threading
+        from app.services.file_state_storage_helpers import get_connection
+        
+        main_conn = get_connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(get_connection()))
+        thread.start()
+        thread.join()
+        
+        assert other and other[0] is not main_conn
+    
+    def test_wal_journal_mode(self, temp_db):
+        """La conexión usa journal WAL y synchronous=NORMAL."""
+        from app.services.file_state_storage_helpers import get_connection
+        
+        conn = get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        # synchronous: 1 = NORMAL
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    
+    def test_close_all_connections_reopens(self, temp_db, temp_file):
+        """Tras cerrar el pool, las operaciones reabren la conexión."""
+        from app.services.file_state_storage_helpers import close_all_connections, get_connection
+        
+        first = get_connection()
+        close_all_connections()
+        
+        assert get_connection() is not first
+        _helper_set_state(temp_file, "trabajado")
+        assert get_state_by_path(temp_file) == "trabajado"
+
+    def test_thread_exit_releases_connections(self, temp_db):
+        """Las conexiones de un hilo terminado se cierran y salen del registro."""
+        import gc
+        import sqlite3
+        import threading
+        from app.services import file_state_storage_helpers
+
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(file_state_storage_helpers.get_connection())
+        )
+        thread.start()
+        thread.join()
+        del thread
+        gc.collect()
+
+        registered = [entry[2] for entry in file_state_storage_helpers._registry]
+        assert other[0] not in registered
+        with pytest.raises(sqlite3.ProgrammingError):
+            other[0].execute("SELECT 1")
+
+    def test_initialize_reopens_recreated_database(self, temp_db, delete_db_files, temp_file):
+        """initialize_database no sigue leyendo una DB borrada y recreada."""
+        _helper_set_state(temp_file, "trabajado")
+        delete_db_files()
+
+        initialize_database()
+
+        assert get_state_by_path(temp_file) is None
+
+    def test_initialize_reopens_only_calling_thread_connection(self, temp_db):
+        """initialize_database no cierra las conexiones de otros hilos (cola, índices)."""
+        import threading
+        from app.services.file_state_storage_helpers import get_connection
+
+        first = get_connection()
+        ready = threading.Event()
+        go = threading.Event()
+        results = []
+
+        def worker():
+            conn = get_connection()
+            ready.set()
+            go.wait(5)
+            results.append(conn.execute("SELECT COUNT(*) FROM file_states").fetchone()[0])
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert ready.wait(5)
+
+        initialize_database()
+        go.set()
+        thread.join(5)
+
+        assert results == [0]
+        assert get_connection() is not first
+
+
+class TestPathKeyMigration:
+    """Tests para la columna indexada path_key y su migración."""
+    
+    def test_migrates_legacy_database_in_place(self, monkeypatch):
+        """Una DB sin path_key se migra conservando los estados."""
+        import sqlite3
+        import shutil
+        from app.services import file_state_storage_helpers
+        
+        temp_dir = tempfile.mkdtemp()
+        db_path = Path(temp_dir) / 'legacy.db'
+        monkeypatch.setattr(file_state_storage_helpers, 'get_db_path', lambda: db_path)
+        
+        legacy_path = os.path.join(temp_dir, "Documento.TXT")
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""
+            CREATE TABLE file_states (
+                file_id TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER,
+                modified INTEGER, state TEXT NOT NULL, last_update INTEGER
+            )
+        """)
+        conn.execute("CREATE INDEX idx_path ON file_states(path)")
+        conn.execute(
+            "INSERT INTO file_states VALUES (?, ?, ?, ?, ?, ?)",
+            ("legacy-id", legacy_path, 1, 1, "pendiente", 1)
+        )
+        conn.commit()
+        conn.close()
+        
+        try:
+            initialize_database()
+            
+            assert load_all_states() == {"legacy-id": "pendiente"}
+            conn = file_state_storage_helpers.get_connection()
+            row = conn.execute("SELECT path_key FROM file_states").fetchone()
+            assert row[0] == file_state_storage_helpers.compute_path_key(legacy_path)
+            indexes = {r[1] for r in conn.execute("PRAGMA index_list(file_states)")}
+            assert "idx_path_key" in indexes
+        finally:
+            file_state_storage_helpers.close_all_connections()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_path_lookups_use_index_on_100k_rows(self, temp_db, temp_file):
+        """Las búsquedas por path de set_state/get_state_by_path no hacen full scan."""
+        from app.services.file_state_storage_helpers import compute_path_key, get_connection
+        
+        conn = get_connection()
+        conn.executemany(
+            "INSERT INTO file_states (file_id, path, size, modified, state, last_update, path_key) "
+            "VALUES (?, ?, 0, 0, 'pendiente', 0, ?)",
+            ((f"id-{i}", f"/data/file_{i}.txt", compute_path_key(f"/data/file_{i}.txt"))
+             for i in range(100_000))
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+        
+        # Forzar el fallback por path: estado guardado con un file_id antiguo
+        stat = os.stat(temp_file)
+        set_state("old-id", temp_file, stat.st_size, int(stat.st_mtime), "trabajado")
+        
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            # Fallback por path_key + migración silenciosa vía set_state
+            assert get_state_by_path(temp_file) == "trabajado"
+        finally:
+            conn.set_trace_callback(None)
+        
+        path_queries = [sql for sql in statements
+                        if sql.lstrip().upper().startswith("SELECT") and "path_key" in sql]
+        assert len(path_queries) >= 2
+        for sql in path_queries:
+            plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            assert "SCAN file_states" not in plan, plan
+            assert "idx_path_key" in plan, plan
@@ -0,0 +1,75 @@
+"""
+Benchmark de FileStateStorage: conexión por llamada vs pool de conexiones.
+
+Compara el throughput de set_state/get_state_by_path abriendo y cerrando
+SQLite en cada operación (comportamiento anterior) frente a la conexión
+persistente por hilo. Fuera de la ejecución por defecto: se activa con
+CLARITYDESK_BENCHMARKS=1.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import file_state_storage_helpers
+from app.services.file_state_storage import (
+    get_state_by_path,
+    initialize_database,
+    set_state,
+)
+from app.services.file_state_storage_helpers import close_all_connections, compute_file_id
+
+pytestmark = pytest.mark.benchmark
+
+OPERATIONS = 200
+
+
+@pytest.fixture
+def bench_env(monkeypatch):
+    """DB temporal y archivos de prueba para el benchmark."""
+    temp_dir = tempfile.mkdtemp()
+    db_path = Path(temp_dir) / 'bench_states.db'
+    monkeypatch.setattr(file_state_storage_helpers, 'get_db_path', lambda: db_path)
+    initialize_database()
+    
+    entries = []
+    for i in range(OPERATIONS):
+        file_path = os.path.join(temp_dir, f"file_{i}.txt")
+        with open(file_path, 'w') as f:
+            f.write('content')
+        stat = os.stat(file_path)
+        file_id = compute_file_id(file_path, stat.st_size, int(stat.st_mtime))
+        entries.append((file_id, file_path, stat.st_size, int(stat.st_mtime)))
+    
+    yield entries
+    
+    close_all_connections()
+    import shutil
+    try:
+        shutil.rmtree(temp_dir)
+    except OSError:
+        pass
+
+
+def _run_workload(entries, state: str, reconnect_each_call: bool) -> float:
+    """Ejecutar set_state + get_state_by_path y devolver segundos empleados."""
+    start = time.perf_counter()
+    for file_id, path, size, modified in entries:
+        set_state(file_id, path, size, modified, state)
+        if reconnect_each_call:
+            close_all_connections()
+        assert get_state_by_path(path) == state
+        if reconnect_each_call:
+            close_all_connections()
+    return time.perf_counter() - start
+
+
+def test_pooled_connection_throughput(bench_env):
+    """El pool de conexiones supera a abrir/cerrar SQLite en cada llamada."""
+    per_call = _run_workload(bench_env, "pendiente", reconnect_each_call=True)
+    pooled = _run_workload(bench_env, "entregado", reconnect_each_call=False)
+    
+    assert pooled < per_call
@@ -0,0 +1,256 @@
+"""
+Tests para StateWriteQueue (escrituras diferidas de estados).
+
+Cubre la coalescencia por file_id, flush explícito, el contador de escrituras
+pendientes y la integración con FileStateManager (cache y señales inmediatas,
+lecturas que ven lo encolado sin esperar al worker).
+"""
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.managers import file_state_manager
+from app.managers.file_state_manager import FileStateManager
+from app.services.file_identity_cache import clear_identity_cache
+from app.services.file_state_storage import close_all_connections, initialize_database
+from app.services.file_state_storage_crud import load_all_states
+from app.services.file_state_write_queue import StateWriteQueue
+
+# Suficiente para que nada se escriba sin flush durante el test
+SLOW_FLUSH_MS = 60_000
+
+
+@pytest.fixture
+def temp_db(monkeypatch):
+    """Base de datos temporal."""
+    temp_dir = tempfile.mkdtemp()
+    db_path = Path(temp_dir) / 'test_states.db'
+
+    from app.services import file_state_storage_helpers
+    monkeypatch.setattr(file_state_storage_helpers, 'get_db_path', lambda: db_path)
+    initialize_database()
+
+    yield str(db_path)
+
+    close_all_connections()
+    import shutil
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def queue(temp_db):
+    """Cola que solo escribe con flush explícito."""
+    queue = StateWriteQueue(flush_delay_ms=SLOW_FLUSH_MS)
+    yield queue
+    queue.shutdown(timeout=5)
+
+
+class TestStateWriteQueue:
+    """Tests de la cola en sí."""
+
+    def test_writes_wait_for_flush(self, queue):
+        """Las escrituras quedan pendientes hasta flush."""
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+
+        assert queue.pending_count() == 1
+        assert load_all_states() == {}
+
+        assert queue.flush(timeout=5) is True
+        assert queue.pending_count() == 0
+        assert load_all_states() == {"id-1": "pendiente"}
+
+    def test_coalesces_per_file_id(self, queue):
+        """Varias escrituras del mismo file_id se reducen a la última."""
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "trabajado")
+        queue.enqueue_set("id-2", "/tmp/b.txt", 1, 1, "entregado")
+
+        assert queue.pending_count() == 2
+        queue.flush(timeout=5)
+        assert load_all_states() == {"id-1": "trabajado", "id-2": "entregado"}
+
+    def test_remove_after_set(self, queue):
+        """Un borrado posterior anula la escritura pendiente."""
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+        queue.flush(timeout=5)
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "trabajado")
+        queue.enqueue_remove("id-1", "/tmp/a.txt")
+
+        queue.flush(timeout=5)
+        assert load_all_states() == {}
+
+    def test_pending_states_snapshot(self, queue):
+        """pending_states muestra lo no escrito, por file_id y en orden de escritura."""
+        queue.enqueue_set("id-1", "/tmp/A.txt", 1, 1, "pendiente")
+        queue.enqueue_set("id-2", "/tmp/b.txt", 1, 1, "entregado")
+        queue.enqueue_remove("id-1", "/tmp/A.txt")
+
+        assert queue.pending_states() == {
+            "id-2": ("/tmp/b.txt", "/tmp/b.txt", "entregado"),
+            "id-1": ("/tmp/A.txt", "/tmp/a.txt", None),
+        }
+        queue.flush(timeout=5)
+        assert queue.pending_states() == {}
+
+    def test_worker_flushes_after_delay(self, temp_db):
+        """Sin flush explícito el worker escribe tras el retardo."""
+        queue = StateWriteQueue(flush_delay_ms=10)
+        try:
+            queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+            assert queue.flush(timeout=5)
+            assert load_all_states() == {"id-1": "pendiente"}
+        finally:
+            queue.shutdown(timeout=5)
+
+    def test_shutdown_flushes_and_writes_synchronously_afterwards(self, queue):
+        """shutdown escribe lo pendiente; después las escrituras son síncronas."""
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+
+        assert queue.shutdown(timeout=5) is True
+        assert load_all_states() == {"id-1": "pendiente"}
+
+        queue.enqueue_set("id-2", "/tmp/b.txt", 1, 1, "entregado")
+        assert queue.pending_count() == 0
+        assert load_all_states()["id-2"] == "entregado"
+
+    def test_failed_batch_is_retried(self, queue, monkeypatch):
+        """Un lote que falla se reencola y se escribe en el reintento."""
+        from app.services import file_state_write_queue
+
+        real_set = file_state_write_queue.set_states_batch
+        calls = []
+
+        def _flaky_set(states, raise_on_error=False):
+            calls.append(len(states))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return real_set(states, raise_on_error=raise_on_error)
+
+        monkeypatch.setattr(file_state_write_queue, "set_states_batch", _flaky_set)
+        monkeypatch.setattr(file_state_write_queue, "STATE_WRITE_RETRY_DELAY_MS", 1)
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+
+        assert queue.flush(timeout=5) is True
+        assert calls == [1, 1]
+        assert load_all_states() == {"id-1": "pendiente"}
+
+    def test_persistent_failure_is_reported(self, queue, monkeypatch):
+        """Si el lote sigue fallando se descarta y flush devuelve False."""
+        from app.services import file_state_write_queue
+
+        def _failing_set(states, raise_on_error=False):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(file_state_write_queue, "set_states_batch", _failing_set)
+        monkeypatch.setattr(file_state_write_queue, "STATE_WRITE_RETRY_DELAY_MS", 1)
+        queue.enqueue_set("id-1", "/tmp/a.txt", 1, 1, "pendiente")
+
+        assert queue.flush(timeout=5) is False
+        assert queue.pending_count() == 0
+
+    def test_large_removal_batch(self, queue, monkeypatch):
+        """Un lote de borrados mayor que un trozo del IN se escribe entero, trozo a trozo."""
+        from app.services import file_state_storage_batch, file_state_storage_helpers
+
+        statements = []
+        real_open = file_state_storage_helpers.open_connection
+
+        def _traced_open(db_path):
+            conn = real_open(db_path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        monkeypatch.setattr(file_state_storage_helpers, 'open_connection', _traced_open)
+        monkeypatch.setattr(file_state_storage_batch, 'STATE_REMOVE_CHUNK_SIZE', 10)
+        for i in range(95):
+            queue.enqueue_set(f"id-{i}", f"/tmp/f{i}.txt", 1, 1, "pendiente")
+        assert queue.flush(timeout=5) is True
+        for i in range(95):
+            queue.enqueue_remove(f"id-{i}", f"/tmp/f{i}.txt")
+
+        assert queue.flush(timeout=5) is True
+        assert load_all_states() == {}
+        deletes = [sql for sql in statements if sql.startswith("DELETE FROM file_states WHERE file_id IN")]
+        assert len(deletes) == 10
+
+
+class TestManagerWriteBehind:
+    """FileStateManager actualiza cache y señales sin esperar a SQLite."""
+
+    @pytest.fixture
+    def manager(self, qapp, queue):
+        manager = FileStateManager()
+        manager._write_queue = queue
+        clear_identity_cache()
+        return manager
+
+    def test_set_file_state_is_deferred(self, manager, temp_file):
+        """El estado es visible y se emite la señal antes de escribir en SQLite."""
+        emitted = []
+        manager.state_changed.connect(lambda path, state: emitted.append((path, state)))
+
+        manager.set_file_state(temp_file, "pendiente")
+
+        assert emitted == [(temp_file, "pendiente")]
+        assert manager.get_file_state(temp_file) == "pendiente"
+        assert manager.pending_write_count() == 1
+        assert load_all_states() == {}
+
+        assert manager.flush(timeout=5)
+        assert list(load_all_states().values()) == ["pendiente"]
+
+    def test_set_files_state_is_deferred(self, manager, temp_folder):
+        """Un lote grande se encola y se escribe en un solo flush."""
+        paths = []
+        for i in range(50):
+            path = os.path.join(temp_folder, f"f{i}.txt")
+            with open(path, 'w') as f:
+                f.write('x')
+            paths.append(path)
+
+        assert manager.set_files_state(paths, "trabajado") == 50
+        assert manager.pending_write_count() == 50
+
+        manager.flush(timeout=5)
+        assert len(load_all_states()) == 50
+
+    def test_storage_reads_see_queued_writes(self, manager, temp_file):
+        """Las consultas a SQLite ven lo encolado sin esperar a que se escriba."""
+        manager.set_file_state(temp_file, "entregado")
+
+        assert manager.get_items_by_state("entregado") == [temp_file]
+        assert manager.pending_write_count() == 1
+        assert load_all_states() == {}
+
+    @pytest.mark.parametrize('max_folder_loads', [
+        file_state_manager.MAX_FOLDER_LOADS_PER_LOOKUP,
+        0,  # carpeta sin cargar: get_state_by_path / get_states_batch
+    ])
+    def test_unloaded_folder_sees_queued_writes(self, manager, queue, temp_folder,
+                                                monkeypatch, max_folder_loads):
+        """Otra carpeta (u otro manager) lee lo encolado sin flush: estados nuevos y borrados."""
+        tagged = os.path.join(temp_folder, "nuevo.txt")
+        cleared = os.path.join(temp_folder, "viejo.txt")
+        for path in (tagged, cleared):
+            with open(path, 'w') as f:
+                f.write('x')
+        manager.set_file_state(cleared, "pendiente")
+        assert manager.flush(timeout=5)
+        manager.set_file_state(tagged, "trabajado")
+        manager.set_file_state(cleared, None)
+
+        monkeypatch.setattr(file_state_manager, 'MAX_FOLDER_LOADS_PER_LOOKUP', max_folder_loads)
+        reader = FileStateManager()
+        reader._write_queue = queue
+
+        assert reader.get_file_state(tagged) == "trabajado"
+        assert reader.get_file_state(cleared) is None
+        assert reader.get_states_for_paths([tagged, cleared]) == {tagged: "trabajado", cleared: None}
+        assert reader.get_items_by_state("trabajado") == [tagged]
+        assert reader.get_items_by_state("pendiente") == []
+        assert queue.pending_count() == 2
+        assert list(load_all_states().values()) == ["pendiente"]
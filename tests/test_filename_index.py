@@ -0,0 +1,244 @@
+"""
+Tests para el índice persistente de nombres (búsqueda global).
+
+Cubre el rastreo del subárbol completo de cada raíz, búsquedas por subcadena
+(largas por trigramas y cortas por LIKE), la actualización incremental por
+mtime de carpeta y por deltas del watcher, la poda de raíces retiradas y la
+búsqueda en workspaces a través del índice.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.folder_delta import FolderDelta
+from app.services import filename_index_storage
+from app.services.file_state_storage_helpers import close_all_connections
+from app.services.filename_index import FilenameIndex, reduce_roots
+from app.services.search_service import search_in_workspaces
+
+WAIT = 10
+
+
+@pytest.fixture
+def index_db(monkeypatch):
+    """Base de datos del índice temporal."""
+    temp_dir = tempfile.mkdtemp()
+    db_path = Path(temp_dir) / 'test_index.db'
+    monkeypatch.setattr(filename_index_storage, 'get_index_db_path', lambda: db_path)
+    yield db_path
+    close_all_connections()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def index(index_db):
+    """Índice con su propio worker."""
+    index = FilenameIndex()
+    yield index
+    index.shutdown(timeout=WAIT)
+
+
+@pytest.fixture
+def tree(temp_folder):
+    """Árbol con archivos a varios niveles."""
+    layout = {
+        "Informe Anual.pdf": None,
+        "notas.txt": None,
+        "proyectos/alpha/Informe Final.docx": None,
+        "proyectos/alpha/datos.xlsx": None,
+        "proyectos/beta/informe-beta.pdf": None,
+        "otros/ignorado.xyz": None,
+    }
+    for relative in layout:
+        path = os.path.join(temp_folder, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write("x")
+    return temp_folder
+
+
+def _names(paths):
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def _touch_dir(path):
+    """Forzar un mtime de carpeta distinto (resolución gruesa de algunos FS)."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestReduceRoots:
+    """Deduplicación de raíces."""
+
+    def test_nested_roots_are_merged(self, temp_folder):
+        """Una raíz dentro de otra no se indexa dos veces."""
+        child = os.path.join(temp_folder, "sub")
+        roots = reduce_roots([child, temp_folder, temp_folder, "@state://pending", ""])
+        assert list(roots.values()) == [temp_folder]
+
+
+class TestFilenameIndex:
+    """Rastreo, búsqueda y actualización incremental."""
+
+    def test_indexes_full_subtree(self, index, tree):
+        """Encuentra coincidencias a cualquier profundidad, sin distinguir mayúsculas."""
+        index.set_roots([tree])
+        assert index.wait_idle(WAIT)
+
+        assert index.is_ready()
+        assert _names(index.search("informe", 100)) == [
+            "Informe Anual.pdf", "Informe Final.docx", "informe-beta.pdf"
+        ]
+
+    def test_short_queries_and_folders(self, index, tree):
+        """Consultas de menos de tres caracteres y carpetas también se encuentran."""
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        assert _names(index.search("ta", 100)) == ["beta", "informe-beta.pdf", "notas.txt"]
+        assert _names(index.search("alph", 100)) == ["alpha"]
+
+    def test_unsupported_extensions_are_not_indexed(self, index, tree):
+        """Solo se indexa lo que muestran los listados."""
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        assert index.search("ignorado", 100) == []
+
+    def test_refresh_rereads_only_changed_folders(self, index, tree, monkeypatch):
+        """refresh solo relee carpetas cuyo mtime cambió."""
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        beta = os.path.join(tree, "proyectos", "beta")
+        with open(os.path.join(beta, "nuevo informe.pdf"), 'w') as f:
+            f.write("x")
+        _touch_dir(beta)
+
+        from app.services import filename_index
+        read = []
+        original = filename_index.read_folder_entries
+        monkeypatch.setattr(
+            filename_index, "read_folder_entries", lambda path: read.append(path) or original(path)
+        )
+        index.refresh()
+        index.wait_idle(WAIT)
+
+        assert read == [beta]
+        assert "nuevo informe.pdf" in _names(index.search("informe", 100))
+
+    def test_delta_updates_folder(self, index, tree):
+        """Un delta del watcher añade y elimina entradas (y subárboles nuevos)."""
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        os.remove(os.path.join(tree, "notas.txt"))
+        new_folder = os.path.join(tree, "nueva")
+        os.makedirs(os.path.join(new_folder, "interior"))
+        with open(os.path.join(new_folder, "interior", "notas nuevas.txt"), 'w') as f:
+            f.write("x")
+        _touch_dir(tree)
+
+        index.apply_delta(FolderDelta(folder=tree, added=[new_folder], removed=[os.path.join(tree, "notas.txt")]))
+        index.wait_idle(WAIT)
+
+        assert _names(index.search("notas", 100)) == ["notas nuevas.txt"]
+
+    def test_removed_subfolder_drops_subtree(self, index, tree):
+        """Eliminar una carpeta elimina todo su subárbol del índice."""
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        shutil.rmtree(os.path.join(tree, "proyectos"))
+        _touch_dir(tree)
+        index.refresh()
+        index.wait_idle(WAIT)
+
+        assert _names(index.search("informe", 100)) == ["Informe Anual.pdf"]
+
+    def test_dropped_root_is_pruned(self, index, tree):
+        """Una raíz retirada deja de aparecer en los resultados y se poda."""
+        alpha = os.path.join(tree, "proyectos", "alpha")
+        index.set_roots([tree])
+        index.wait_idle(WAIT)
+
+        index.set_roots([alpha])
+        index.wait_idle(WAIT)
+
+        assert _names(index.search("informe", 100)) == ["Informe Final.docx"]
+        assert filename_index_storage.count_entries() == 2
+
+    def test_index_persists_between_sessions(self, index_db, tree):
+        """Un índice nuevo sobre la misma base está listo sin rastrear."""
+        first = FilenameIndex()
+        first.set_roots([tree])
+        first.wait_idle(WAIT)
+        first.shutdown(WAIT)
+
+        second = FilenameIndex()
+        try:
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr(second, "_wake", lambda: None)
+                second.set_roots([tree])
+                assert second.is_ready()
+                assert len(second.search("informe", 100)) == 3
+        finally:
+            second.shutdown(WAIT)
+
+
+class TestSearchInWorkspaces:
+    """search_in_workspaces a través del índice."""
+
+    def test_results_mapped_to_workspaces(self, index, tree):
+        """Cada resultado lleva el workspace cuyo árbol lo contiene."""
+        alpha = os.path.join(tree, "proyectos", "alpha")
+        beta = os.path.join(tree, "proyectos", "beta")
+        workspaces = [
+            SimpleNamespace(id="ws1", name="Uno", tabs=[alpha], focus_tree_paths=[]),
+            SimpleNamespace(id="ws2", name="Dos", tabs=[], focus_tree_paths=[beta]),
+        ]
+        manager = SimpleNamespace(
+            get_workspaces=lambda: workspaces, get_active_workspace_id=lambda: "ws1"
+        )
+        index.set_roots([alpha, beta])
+        index.wait_idle(WAIT)
+
+        results = search_in_workspaces("informe", manager, index=index)
+
+        assert sorted((os.path.basename(r.file_path), r.workspace_id) for r in results) == [
+            ("Informe Final.docx", "ws1"), ("informe-beta.pdf", "ws2")
+        ]
+
+
+class TestIndexQuerySpeed:
+    """Las consultas por subcadena no recorren todos los nombres."""
+
+    ENTRIES = 50_000
+
+    def test_substring_query_is_fast(self, index_db):
+        """Una subcadena sobre muchos nombres responde en milisegundos."""
+        if not filename_index_storage.initialize_index():
+            pytest.skip("SQLite sin FTS5 trigram")
+        conn = filename_index_storage.get_index_connection()
+        conn.executemany(
+            "INSERT INTO entries (path, path_key, parent_key, name, is_dir) VALUES (?, ?, ?, ?, 0)",
+            (
+                (f"/r/d{i % 500}/archivo_{i:06d}.pdf", f"/r/d{i % 500}/archivo_{i:06d}.pdf",
+                 f"/r/d{i % 500}", f"archivo_{i:06d}.pdf")
+                for i in range(self.ENTRIES)
+            )
+        )
+        conn.commit()
+
+        start = time.perf_counter()
+        paths = filename_index_storage.search_names("012345", 1000)
+        elapsed = time.perf_counter() - start
+
+        assert [os.path.basename(p) for p in paths] == ["archivo_012345.pdf"]
+        assert elapsed < 0.05
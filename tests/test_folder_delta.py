@@ -0,0 +1,153 @@
+"""
+Tests para los refrescos incrementales del watcher.
+
+Cubre el cálculo de FolderDelta entre snapshots y la aplicación del delta en
+FileListModel (solo se insertan/eliminan/recalculan las filas afectadas).
+"""
+
+import os
+
+import pytest
+from PySide6.QtCore import QPersistentModelIndex, Qt
+
+from app.models.folder_delta import FolderDelta
+from app.services.filesystem_watcher_service import FileSystemWatcherService
+from app.ui.widgets import file_list_model
+from app.ui.widgets.file_list_model import FileListModel
+
+
+@pytest.fixture
+def watcher(qapp):
+    """Watcher sin carpeta observada."""
+    return FileSystemWatcherService()
+
+
+@pytest.fixture
+def paths(temp_folder):
+    """Cinco archivos reales en orden."""
+    result = []
+    for name in ["a.txt", "b.txt", "c.txt", "d.txt", "e.txt"]:
+        path = os.path.join(temp_folder, name)
+        with open(path, 'w') as f:
+            f.write(name)
+        result.append(path)
+    return result
+
+
+@pytest.fixture
+def model(qapp, paths, monkeypatch):
+    """Modelo con los cinco archivos y sin pipeline de iconos real."""
+    monkeypatch.setattr(file_list_model, "get_list_icon", lambda *args, **kwargs: None)
+    model = FileListModel(icon_service=None)
+    model.set_files(paths)
+    return model
+
+
+@pytest.fixture
+def signals(model):
+    """Registrar las señales estructurales del modelo."""
+    events = []
+    model.modelReset.connect(lambda: events.append(("reset",)))
+    model.rowsInserted.connect(lambda parent, first, last: events.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(("remove", first, last)))
+    return events
+
+
+class TestFolderDelta:
+    """FolderDelta y su cálculo en el watcher."""
+
+    def test_empty_delta(self):
+        """Un delta sin cambios es vacío."""
+        assert FolderDelta(folder="C:/x").is_empty()
+        assert not FolderDelta(folder="C:/x", added=["C:/x/a"]).is_empty()
+
+    def test_changed_paths_excludes_added(self):
+        """Solo eliminados y modificados invalidan cachés."""
+        delta = FolderDelta(folder="f", added=["f/a"], removed=["f/r"], modified=["f/m"])
+        assert delta.changed_paths() == ["f/r", "f/m"]
+
+    def test_compute_delta(self, watcher, temp_folder):
+        """Detecta añadidos, eliminados y modificados (mtime, tamaño o tipo)."""
+        old = [("keep", 1.0, False, 10), ("gone", 1.0, False, 10),
+               ("edit", 1.0, False, 10), ("kind", 1.0, False, 0)]
+        new = [("keep", 1.0, False, 10), ("edit", 2.0, False, 10),
+               ("kind", 1.0, True, 0), ("new", 1.0, False, 5)]
+
+        delta = watcher._compute_delta(old, new, temp_folder)
+
+        assert delta.folder == temp_folder
+        assert delta.added == [os.path.join(temp_folder, "new")]
+        assert delta.removed == [os.path.join(temp_folder, "gone")]
+        assert sorted(delta.modified) == sorted(
+            [os.path.join(temp_folder, "edit"), os.path.join(temp_folder, "kind")]
+        )
+
+
+class TestModelApplyDelta:
+    """FileListModel.apply_delta toca solo las filas afectadas."""
+
+    def test_insert_without_reset(self, model, paths, signals, temp_folder):
+        """Un archivo nuevo se inserta en su posición sin resetear el modelo."""
+        new_path = os.path.join(temp_folder, "bb.txt")
+        files = paths[:2] + [new_path] + paths[2:]
+
+        model.apply_delta(files, added_states={new_path: "pending"})
+
+        assert signals == [("insert", 2, 2)]
+        assert model.files() == files
+        assert model.row_for_path(new_path) == 2
+        assert model.states()[new_path] == "pending"
+
+    def test_remove_contiguous_runs(self, model, paths, signals):
+        """Las filas eliminadas se quitan por tramos contiguos."""
+        files = [paths[0], paths[3]]
+
+        model.apply_delta(files)
+
+        assert signals == [("remove", 4, 4), ("remove", 1, 2)]
+        assert model.files() == files
+        assert model.row_for_path(paths[3]) == 1
+
+    def test_removed_rows_drop_caches_and_checks(self, model, paths):
+        """Eliminar una fila descarta su caché y su check."""
+        model.index(1, 1).data()
+        model.set_checked(paths[1], True)
+
+        model.apply_delta([p for p in paths if p != paths[1]])
+
+        assert paths[1] not in model._rows
+        assert paths[1] not in model._checked_paths
+
+    def test_unchanged_rows_keep_cache(self, model, paths):
+        """Las filas no afectadas conservan sus celdas calculadas."""
+        model.index(0, 1).data()
+        model.index(4, 1).data()
+
+        model.apply_delta(paths + [paths[0] + ".new"])
+
+        assert paths[0] in model._rows
+        assert paths[4] in model._rows
+
+    def test_modified_row_is_recomputed(self, model, paths):
+        """Una ruta modificada invalida su caché y repinta solo su fila."""
+        model.index(2, 1).data()
+        model.index(3, 1).data()
+        changes = []
+        model.dataChanged.connect(lambda top, bottom, roles: changes.append((top.row(), bottom.row())))
+
+        model.apply_delta(list(paths), modified=[paths[2]])
+
+        assert paths[2] not in model._rows
+        assert paths[3] in model._rows
+        assert changes == [(2, 2)]
+
+    def test_reorder_keeps_persistent_indexes(self, model, paths, signals):
+        """Un cambio de orden mueve filas sin reset y conserva índices persistentes."""
+        persistent = QPersistentModelIndex(model.index(0, 1))
+
+        model.apply_delta(list(reversed(paths)))
+
+        assert signals == []
+        assert model.files() == list(reversed(paths))
+        assert persistent.row() == 4
+        assert persistent.data(Qt.ItemDataRole.UserRole) == paths[0]
@@ -0,0 +1,164 @@
+"""
+Tests para IconImageCache.
+
+Cubre el LRU con presupuesto en bytes, la validación por (size, mtime),
+la expulsión desde el watcher y los contadores de diagnóstico.
+"""
+
+import os
+
+import pytest
+from PySide6.QtGui import QImage
+
+from app.services import icon_image_cache
+from app.services.file_identity_cache import clear_identity_cache, invalidate_path
+from app.services.icon_image_cache import IconImageCache
+
+
+def _image(width=16, height=16):
+    """Crear QImage opaca de prueba."""
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(0xFF336699)
+    return image
+
+
+@pytest.fixture
+def files(temp_folder):
+    """Archivos reales para validar la firma (size, mtime)."""
+    clear_identity_cache()
+    paths = []
+    for i in range(5):
+        path = os.path.join(temp_folder, f"image_{i}.png")
+        with open(path, 'wb') as f:
+            f.write(b'x' * (i + 1))
+        paths.append(path)
+    yield paths
+    clear_identity_cache()
+
+
+class TestIconImageCache:
+    """Tests básicos de get/put y contadores."""
+    
+    def test_miss_then_hit(self, qapp, files):
+        """Primera consulta falla, tras put acierta."""
+        cache = IconImageCache()
+        
+        assert cache.get(files[0], 16, 16) is None
+        cache.put(files[0], 16, 16, _image())
+        
+        assert cache.get(files[0], 16, 16) is not None
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+        assert stats['bytes'] == _image().sizeInBytes()
+    
+    def test_null_image_not_stored(self, qapp, files):
+        """Una imagen nula no se cachea."""
+        cache = IconImageCache()
+        
+        cache.put(files[0], 16, 16, QImage())
+        
+        assert cache.get_stats()['entries'] == 0
+    
+    def test_sizes_are_separate_entries(self, qapp, files):
+        """Cada tamaño de un mismo archivo es una entrada distinta."""
+        cache = IconImageCache()
+        cache.put(files[0], 16, 16, _image(16, 16))
+        
+        assert cache.get(files[0], 32, 32) is None
+        assert cache.get(files[0], 16, 16) is not None
+
+
+class TestByteBudget:
+    """Tests del LRU con presupuesto en bytes."""
+    
+    def test_evicts_least_recently_used(self, qapp, files):
+        """Al superar el presupuesto se expulsa la entrada menos usada."""
+        entry_bytes = _image().sizeInBytes()
+        cache = IconImageCache(max_bytes=entry_bytes * 3)
+        for path in files[:3]:
+            cache.put(path, 16, 16, _image())
+        cache.get(files[0], 16, 16)  # files[1] pasa a ser el menos usado
+        
+        cache.put(files[3], 16, 16, _image())
+        
+        assert cache.get(files[1], 16, 16) is None
+        assert cache.get(files[0], 16, 16) is not None
+        stats = cache.get_stats()
+        assert stats['evictions'] >= 1
+        assert stats['bytes'] <= entry_bytes * 3
+    
+    def test_memory_stays_bounded(self, qapp, files):
+        """Muchas inserciones no superan el presupuesto."""
+        entry_bytes = _image().sizeInBytes()
+        cache = IconImageCache(max_bytes=entry_bytes * 2)
+        
+        for size in range(16, 64):
+            cache.put(files[0], size, size, _image())
+        
+        assert cache.get_stats()['bytes'] <= entry_bytes * 2
+
+
+class TestSignatureValidation:
+    """Tests de validación por (size, mtime)."""
+    
+    def test_modified_file_is_invalidated(self, qapp, files):
+        """Si el archivo cambió desde el render la entrada se descarta."""
+        cache = IconImageCache()
+        cache.put(files[0], 16, 16, _image())
+        
+        with open(files[0], 'wb') as f:
+            f.write(b'changed content')
+        invalidate_path(files[0])  # como tras un nuevo listado
+        
+        assert cache.get(files[0], 16, 16) is None
+        stats = cache.get_stats()
+        assert stats['invalidations'] == 1
+        assert stats['entries'] == 0
+    
+    def test_deleted_file_is_invalidated(self, qapp, files):
+        """Un archivo eliminado no devuelve miniatura."""
+        cache = IconImageCache()
+        cache.put(files[0], 16, 16, _image())
+        
+        os.remove(files[0])
+        invalidate_path(files[0])
+        
+        assert cache.get(files[0], 16, 16) is None
+
+
+class TestWatcherEvictionHook:
+    """Tests del hook de expulsión usado por FileSystemWatcherService."""
+    
+    def test_evict_paths_reaches_every_cache(self, qapp, files):
+        """evict_paths expulsa todos los tamaños del path en todas las caches."""
+        first = IconImageCache()
+        second = IconImageCache()
+        for cache in (first, second):
+            cache.put(files[0], 16, 16, _image())
+            cache.put(files[0], 32, 32, _image(32, 32))
+            cache.put(files[1], 16, 16, _image())
+        
+        icon_image_cache.evict_paths([files[0]])
+        
+        for cache in (first, second):
+            stats = cache.get_stats()
+            assert stats['entries'] == 1
+            assert stats['invalidations'] == 2
+            assert cache.get(files[1], 16, 16) is not None
+    
+    def test_watcher_detects_changed_paths(self, qapp, temp_folder):
+        """El watcher calcula los paths modificados o eliminados del snapshot."""
+        from app.services.filesystem_watcher_service import FileSystemWatcherService
+        
+        watcher = FileSystemWatcherService()
+        old = [("a.png", 1.0, False, 10), ("b.png", 1.0, False, 10), ("c.png", 1.0, False, 10)]
+        new = [("a.png", 1.0, False, 10), ("b.png", 2.0, False, 12), ("d.png", 1.0, False, 5)]
+        
+        changed = watcher._compute_delta(old, new, temp_folder).changed_paths()
+        
+        assert sorted(changed) == [
+            os.path.join(temp_folder, "b.png"),
+            os.path.join(temp_folder, "c.png"),
+        ]
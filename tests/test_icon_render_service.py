@@ -483,3 +483,138 @@ class TestErrorHandling:
             # Aceptable si valida y retorna fallback
             pass
 
+
+
+class TestExtensionCache:
+    """Tests para la cache por extensión compartida entre workers."""
+    
+    @pytest.fixture(autouse=True)
+    def isolated_thumbnails(self, monkeypatch):
+        """Almacén persistente de miniaturas aislado por test."""
+        from app.services import thumbnail_disk_cache
+        from app.services.file_identity_cache import clear_identity_cache
+        
+        storage = Path(tempfile.mkdtemp())
+        monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', lambda: storage)
+        clear_identity_cache()
+        thumbnail_disk_cache.clear_thumbnail_cache()
+        yield storage
+        thumbnail_disk_cache.clear_thumbnail_cache()
+        clear_identity_cache()
+    
+    @pytest.fixture
+    def counted_preview(self, monkeypatch):
+        """Contar llamadas al pipeline de shell icon de preview_service."""
+        from app.services import icon_render_service
+        
+        calls = []
+        original = icon_render_service.get_file_preview
+        
+        def counting(path, size, icon_provider):
+            calls.append(path)
+            return original(path, size, icon_provider)
+        
+        monkeypatch.setattr(icon_render_service, 'get_file_preview', counting)
+        return calls
+    
+    def _create_files(self, folder, names):
+        paths = []
+        for name in names:
+            path = os.path.join(folder, name)
+            with open(path, 'w') as f:
+                f.write('content')
+            paths.append(path)
+        return paths
+    
+    def test_generic_extension_rendered_once(self, render_service, temp_folder, counted_preview):
+        """Archivos de la misma extensión genérica se renderizan una sola vez."""
+        paths = self._create_files(temp_folder, [f"doc_{i}.docx" for i in range(5)])
+        size = QSize(48, 48)
+        
+        pixmaps = [render_service.get_file_preview(path, size) for path in paths]
+        
+        assert len(counted_preview) == 1
+        assert all(not pixmap.isNull() for pixmap in pixmaps)
+    
+    def test_cache_is_per_size(self, render_service, temp_folder, counted_preview):
+        """Cada tamaño tiene su propia entrada de cache."""
+        path = self._create_files(temp_folder, ["sheet.xlsx"])[0]
+        
+        render_service.get_file_preview(path, QSize(48, 48))
+        render_service.get_file_preview(path, QSize(96, 96))
+        render_service.get_file_preview(path, QSize(96, 96))
+        
+        assert len(counted_preview) == 2
+    
+    def test_image_previews_not_cached(self, render_service, temp_folder, counted_preview):
+        """Las miniaturas de imagen dependen del archivo y no se cachean."""
+        paths = []
+        for i, color in enumerate(('red', 'blue')):
+            path = os.path.join(temp_folder, f"img_{i}.png")
+            pixmap = QPixmap(16, 16)
+            pixmap.fill(color)
+            pixmap.save(path)
+            paths.append(path)
+        
+        for path in paths:
+            render_service.get_file_preview(path, QSize(48, 48))
+        
+        assert len(counted_preview) == 2
+    
+    def test_image_previews_persist_across_instances(self, icon_service, temp_folder, counted_preview):
+        """Una miniatura de imagen se lee del almacén persistente en el siguiente arranque."""
+        path = os.path.join(temp_folder, "photo.png")
+        source = QPixmap(64, 64)
+        source.fill('red')
+        source.save(path)
+        size = QSize(48, 48)
+        
+        cold = IconRenderService(icon_service).get_file_preview(path, size)
+        warm = IconRenderService(icon_service).get_file_preview(path, size)
+        
+        assert len(counted_preview) == 1
+        assert warm.size() == cold.size()
+    
+    def test_nonexistent_file_not_cached(self, render_service, temp_folder, counted_preview):
+        """El fallback de un archivo inexistente no se cachea."""
+        missing = os.path.join(temp_folder, "missing.docx")
+        existing = self._create_files(temp_folder, ["real.docx"])[0]
+        
+        render_service.get_file_preview(missing, QSize(48, 48))
+        render_service.get_file_preview(existing, QSize(48, 48))
+        
+        assert len(counted_preview) == 2
+    
+    def test_preview_image_matches_pixmap(self, render_service, temp_folder):
+        """get_file_preview_image devuelve la misma imagen que get_file_preview."""
+        path = self._create_files(temp_folder, ["notes.docx"])[0]
+        size = QSize(48, 48)
+        
+        pixmap = render_service.get_file_preview(path, size)
+        image = render_service.get_file_preview_image(path, size)
+        
+        assert image == pixmap.toImage()
+    
+    def test_concurrent_workers_share_cache(self, render_service, temp_folder, counted_preview):
+        """Varios hilos comparten el servicio sin duplicar renders."""
+        import threading
+        
+        size = QSize(48, 48)
+        warm = self._create_files(temp_folder, ["warm.docx"])[0]
+        render_service.get_file_preview_image(warm, size)
+        paths = self._create_files(temp_folder, [f"doc_{i}.docx" for i in range(20)])
+        results = []
+        
+        def worker(chunk):
+            for path in chunk:
+                results.append(render_service.get_file_preview_image(path, size))
+        
+        threads = [threading.Thread(target=worker, args=(paths[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(results) == 20
+        assert all(not image.isNull() for image in results)
+        assert len(counted_preview) == 1
@@ -0,0 +1,249 @@
+"""
+Tests para el visor de imágenes grandes por tiles.
+
+Cubre la geometría de niveles de ImagePyramid, que cada tile coincide con el
+recorte de la imagen reducida, la decodificación reducida de JPEG (draft), la
+orientación EXIF, los niveles grandes en archivo mapeado, y la vista
+QuickPreviewTiledView cargando solo los tiles visibles con caché acotada.
+"""
+
+import builtins
+import os
+import time
+
+import pytest
+from PIL import Image, ImageChops
+from PIL.ImageQt import fromqimage
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage
+
+from app.services import image_pyramid
+from app.services.image_pyramid import ImagePyramid, should_tile_image
+from app.ui.windows.quick_preview_tiled_view import QuickPreviewTiledView
+
+WAIT = 5
+
+
+def write_gradient(path, size, fmt=None, exif=None):
+    """Imagen con degradado en ambos ejes: cada tile es distinto."""
+    width, height = size
+    gradient_x = Image.linear_gradient('L').resize((width, height))
+    gradient_y = gradient_x.transpose(Image.Transpose.ROTATE_90).resize((width, height))
+    image = Image.merge('RGB', (gradient_x, gradient_y, Image.new('L', (width, height), 128)))
+    kwargs = {'exif': exif} if exif is not None else {}
+    image.save(path, fmt, **kwargs)
+    return path
+
+
+def _to_rgb(image: QImage) -> Image.Image:
+    return fromqimage(image).convert('RGB')
+
+
+def _max_difference(first: Image.Image, second: Image.Image) -> int:
+    return max(high for _low, high in ImageChops.difference(first, second).getextrema())
+
+
+def _wait_for(qapp, condition):
+    deadline = time.monotonic() + WAIT
+    while not condition():
+        assert time.monotonic() < deadline
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+class TestImagePyramid:
+    """Niveles y tiles de ImagePyramid."""
+
+    def test_levels_halve_down_to_top_level(self, qapp, temp_folder):
+        """Cada nivel es la mitad del anterior (redondeando hacia arriba) hasta caber en 1024."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (5000, 3001))
+        pyramid = ImagePyramid(path, tile_size=256)
+
+        assert pyramid.level_count == 4
+        assert [(pyramid.level_size(level).width(), pyramid.level_size(level).height())
+                for level in range(4)] == [(5000, 3001), (2500, 1501), (1250, 751), (625, 376)]
+        assert pyramid.tile_grid(0) == (20, 12)
+        assert pyramid.level_for_scale(2.0) == 0
+        assert pyramid.level_for_scale(0.3) == 1
+        assert pyramid.level_for_scale(0.01) == pyramid.top_level
+        # Solo se ha leído la cabecera
+        assert not any(pyramid.is_level_ready(level) for level in range(4))
+
+    def test_tile_matches_reduced_image(self, qapp, temp_folder):
+        """Un tile es el recorte correspondiente del nivel reducido."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (2000, 1500))
+        pyramid = ImagePyramid(path, tile_size=256)
+
+        assert pyramid.build_level(1)
+        tile = pyramid.tile(1, 2, 1)
+
+        reference = Image.open(path).reduce(2).crop((512, 256, 768, 512))
+        assert (tile.width(), tile.height()) == (256, 256)
+        assert _max_difference(_to_rgb(tile), reference) <= 1
+        # Un formato sin draft deja también listos los niveles más pequeños
+        assert pyramid.is_level_ready(pyramid.top_level)
+        assert not pyramid.is_level_ready(0)
+
+    def test_edge_tile_is_cropped(self, qapp, temp_folder):
+        """El último tile de cada fila/columna tiene el tamaño restante."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (1300, 700))
+        pyramid = ImagePyramid(path, tile_size=256)
+        pyramid.build_level(0)
+
+        tile = pyramid.tile(0, 5, 2)
+
+        assert (tile.width(), tile.height()) == (20, 188)
+        assert pyramid.tile(0, 6, 0).isNull()
+
+    def test_jpeg_level_decoded_with_draft(self, qapp, temp_folder, monkeypatch):
+        """Un nivel reducido de un JPEG se decodifica ya reducido, sin la imagen completa."""
+        path = write_gradient(os.path.join(temp_folder, "foto.jpg"), (4000, 3000), 'JPEG')
+        drafts = []
+        original_open = Image.open
+
+        def tracking_open(*args, **kwargs):
+            img = original_open(*args, **kwargs)
+            original_draft = img.draft
+            img.draft = lambda mode, size: drafts.append(size) or original_draft(mode, size)
+            return img
+        monkeypatch.setattr(image_pyramid.Image, 'open', tracking_open)
+
+        pyramid = ImagePyramid(path)
+        assert pyramid.build_level(1)
+
+        assert drafts == [(2000, 1500)]
+        assert pyramid.is_level_ready(1)
+        assert not pyramid.is_level_ready(pyramid.top_level)
+        tile = pyramid.tile(1, 1, 1)
+        reference = Image.open(path).reduce(2).crop((256, 256, 512, 512))
+        assert _max_difference(_to_rgb(tile), reference) <= 16
+
+    def test_source_file_closed_after_decoding(self, qapp, temp_folder, monkeypatch):
+        """Tras decodificar un nivel el archivo queda cerrado (en Windows seguiría bloqueado)."""
+        path = os.path.join(temp_folder, "paginas.tif")
+        write_gradient(path, (2000, 1500), 'TIFF')
+        first_page = Image.open(path)
+        first_page.save(path + ".tmp", 'TIFF', save_all=True, append_images=[Image.new('RGB', (64, 64))])
+        first_page.close()
+        os.replace(path + ".tmp", path)
+        pyramid = ImagePyramid(path, tile_size=256)
+        opened = []
+        original_open = builtins.open
+
+        def tracking_open(file, *args, **kwargs):
+            handle = original_open(file, *args, **kwargs)
+            if file == path:
+                opened.append(handle)
+            return handle
+        monkeypatch.setattr(builtins, 'open', tracking_open)
+
+        assert pyramid.build_level(0)
+
+        assert opened and all(handle.closed for handle in opened)
+        tile = pyramid.tile(0, 1, 1)
+        with Image.open(path) as reference:
+            assert _max_difference(_to_rgb(tile), reference.convert('RGB').crop((256, 256, 512, 512))) <= 16
+
+    def test_exif_orientation_applied(self, qapp, temp_folder):
+        """Orientación 6 (girar 90°): niveles y tiles ya verticales."""
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        path = write_gradient(os.path.join(temp_folder, "foto.jpg"), (2400, 1600), 'JPEG', exif.tobytes())
+        pyramid = ImagePyramid(path, tile_size=256)
+
+        assert (pyramid.size.width(), pyramid.size.height()) == (1600, 2400)
+        pyramid.build_level(pyramid.top_level)
+        image = pyramid.level_image(pyramid.top_level)
+        assert (image.width(), image.height()) == (400, 600)
+
+    def test_large_level_is_memory_mapped(self, qapp, temp_folder):
+        """Los niveles grandes viven en un archivo temporal mapeado; close() los libera."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (3000, 2000))
+        pyramid = ImagePyramid(path)
+        pyramid.build_level(0)
+
+        assert pyramid.is_level_mapped(0)
+        assert not pyramid.is_level_mapped(pyramid.top_level)
+        assert not pyramid.tile(0, 3, 3).isNull()
+
+        pyramid.close()
+        assert pyramid.tile(0, 3, 3).isNull()
+        assert not pyramid.build_level(1)
+
+    def test_should_tile_only_large_rasters(self, qapp, temp_folder, monkeypatch):
+        """Solo imágenes raster por encima del umbral de megapíxeles."""
+        small = write_gradient(os.path.join(temp_folder, "pequena.png"), (800, 600))
+        large = write_gradient(os.path.join(temp_folder, "grande.png"), (2000, 1500))
+        monkeypatch.setattr(image_pyramid, 'TILED_IMAGE_MIN_MEGAPIXELS', 2)
+
+        assert should_tile_image(large)
+        assert not should_tile_image(small)
+        assert not should_tile_image(os.path.join(temp_folder, "no_existe.png"))
+
+
+class TestQuickPreviewTiledView:
+    """Vista por tiles: solo los tiles visibles, caché acotada."""
+
+    @pytest.fixture
+    def view(self, qapp):
+        view = QuickPreviewTiledView(max_cache_bytes=40 * 256 * 256 * 4)
+        view.resize(400, 300)
+        yield view
+        view.shutdown()
+
+    def _paint_until_loaded(self, qapp, view):
+        """Pintar hasta que todos los tiles visibles estén en caché."""
+        def loaded():
+            view.grab()
+            scale = view._scale()
+            level = view.pyramid.level_for_scale(scale)
+            return (view.pyramid.is_level_ready(level)
+                    and all(key in view._tiles for key in view._visible_tiles(level, scale)))
+        _wait_for(qapp, loaded)
+
+    def test_fit_shows_top_level_only(self, qapp, temp_folder, view):
+        """Ajustado a la vista basta el nivel superior: no se decodifica el nivel 0."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (4000, 3000))
+
+        assert view.set_image(path)
+        _wait_for(qapp, lambda: not view._top_image.isNull())
+
+        assert not view.pyramid.is_level_ready(0)
+        assert view.zoom() == 1.0
+
+    def test_zoom_loads_visible_tiles_of_finer_level(self, qapp, temp_folder, view):
+        """Con zoom se cargan solo los tiles visibles del nivel que corresponde."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (4000, 3000))
+        view.set_image(path)
+        zoom_changes = []
+        view.zoom_changed.connect(zoom_changes.append)
+
+        view.set_zoom(10.0, QPointF(100, 100))
+        self._paint_until_loaded(qapp, view)
+
+        level = view.pyramid.level_for_scale(view._scale())
+        assert level == 0
+        assert zoom_changes == [10.0]
+        columns, rows = view.pyramid.tile_grid(0)
+        assert 0 < len(view._tiles) < columns * rows
+
+    def test_tile_cache_stays_within_budget(self, qapp, temp_folder, view):
+        """Al recorrer la imagen la caché expulsa los tiles antiguos."""
+        path = write_gradient(os.path.join(temp_folder, "grande.png"), (4000, 3000))
+        view.set_image(path)
+        view.set_zoom(view._max_zoom())
+
+        for x in range(0, 4000, 500):
+            view._center = QPointF(x, 1500)
+            self._paint_until_loaded(qapp, view)
+
+        assert view.cache_bytes() <= view._max_cache_bytes
+        assert view.cache_bytes() == sum(image.sizeInBytes() for image in view._tiles.values())
+
+    def test_set_image_rejects_unreadable_file(self, qapp, temp_folder, view):
+        path = os.path.join(temp_folder, "rota.png")
+        with open(path, 'wb') as f:
+            f.write(b"no es una imagen")
+
+        assert not view.set_image(path)
+        assert view.pyramid is None
@@ -0,0 +1,231 @@
+"""
+Tests para las miniaturas rápidas de imágenes.
+
+Cubre la miniatura EXIF embebida, la decodificación reducida de JPEG (draft),
+la orientación EXIF aplicada al resultado, el lote por carpeta de
+GridIconLoader y un benchmark sobre una carpeta de fotos grandes.
+"""
+
+import io
+import os
+import struct
+import time
+
+import pytest
+from PIL import Image, ImageOps
+from PIL.ImageQt import ImageQt
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from app.services import icon_renderer_image
+from app.services.file_identity_cache import clear_identity_cache
+from app.services.icon_renderer_image import (
+    render_image_preview_image,
+    render_image_previews_image,
+)
+from app.ui.widgets.grid_icon_loader import GridIconLoader
+
+WAIT = 5
+TILE = QSize(96, 96)
+
+
+def _exif_with_thumbnail(orientation: int, thumbnail: bytes) -> bytes:
+    """Bloque EXIF (little endian) con orientación en IFD0 y miniatura JPEG en IFD1."""
+    ifd0 = struct.pack("<H", 1) + struct.pack("<HHII", 0x0112, 3, 1, orientation) + struct.pack("<I", 26)
+    thumb_offset = 8 + len(ifd0) + 30
+    ifd1 = (
+        struct.pack("<H", 2)
+        + struct.pack("<HHII", 0x0201, 4, 1, thumb_offset)
+        + struct.pack("<HHII", 0x0202, 4, 1, len(thumbnail))
+        + struct.pack("<I", 0)
+    )
+    return b"Exif\x00\x00" + b"II*\x00" + struct.pack("<I", 8) + ifd0 + ifd1 + thumbnail
+
+
+def write_camera_jpeg(path, size=(4000, 3000), color=(30, 90, 200), thumb_size=(160, 120),
+                      thumb_color=(200, 30, 30), orientation=1):
+    """JPEG como los de una cámara: foto grande y miniatura EXIF de otro color."""
+    thumb = io.BytesIO()
+    Image.new("RGB", thumb_size, thumb_color).save(thumb, "JPEG", quality=80)
+    image = Image.new("RGB", size, color)
+    # Degradado para que la decodificación no sea trivial
+    image.paste((color[0] // 2, color[1] // 2, color[2] // 2), (0, 0, size[0] // 2, size[1]))
+    image.save(path, "JPEG", quality=90, exif=_exif_with_thumbnail(orientation, thumb.getvalue()))
+    return path
+
+
+def _center_color(image: QImage) -> QColor:
+    return image.pixelColor(image.width() * 3 // 4, image.height() // 2)
+
+
+def _old_render(path: str, size: QSize) -> QImage:
+    """Camino anterior: decodificación completa, exif_transpose y LANCZOS."""
+    img = ImageOps.exif_transpose(Image.open(path))
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.thumbnail((size.width(), size.height()), Image.Resampling.LANCZOS)
+    return ImageQt(img).copy()
+
+
+class TestImageThumbnailFastPath:
+    """Miniatura EXIF, draft y orientación."""
+
+    def test_small_tile_uses_exif_thumbnail(self, qapp, temp_folder):
+        """Para un tile pequeño basta la miniatura EXIF (rojo), sin decodificar la foto (azul)."""
+        path = write_camera_jpeg(os.path.join(temp_folder, "foto.jpg"))
+
+        image = render_image_preview_image(path, TILE)
+
+        assert (image.width(), image.height()) == (96, 72)
+        assert _center_color(image).red() > 150
+
+    def test_large_preview_decodes_photo_with_draft(self, qapp, temp_folder, monkeypatch):
+        """Si la miniatura EXIF es pequeña se decodifica la foto, reducida al cargar."""
+        path = write_camera_jpeg(os.path.join(temp_folder, "foto.jpg"))
+        drafts = []
+        original_open = Image.open
+
+        def tracking_open(*args, **kwargs):
+            img = original_open(*args, **kwargs)
+            original_draft = img.draft
+            img.draft = lambda mode, size: drafts.append(size) or original_draft(mode, size)
+            return img
+        monkeypatch.setattr(icon_renderer_image.Image, 'open', tracking_open)
+
+        image = render_image_preview_image(path, QSize(400, 400))
+
+        assert (image.width(), image.height()) == (400, 300)
+        assert _center_color(image).blue() > 150
+        # El primero es el nuestro (el de thumbnail() ya no reduce más)
+        assert drafts[0] == (800, 600)
+
+    def test_padded_exif_thumbnail_is_ignored(self, qapp, temp_folder):
+        """Una miniatura con otra relación de aspecto (con bandas) no se usa."""
+        path = write_camera_jpeg(os.path.join(temp_folder, "foto.jpg"), thumb_size=(160, 160))
+
+        image = render_image_preview_image(path, TILE)
+
+        assert (image.width(), image.height()) == (96, 72)
+        assert _center_color(image).blue() > 150
+
+    @pytest.mark.parametrize("thumb_size", [(160, 120), (16, 12)])
+    def test_orientation_applied_to_result(self, qapp, temp_folder, thumb_size):
+        """Orientación 6 (girar 90°): la miniatura sale vertical, venga de EXIF o de la foto."""
+        path = write_camera_jpeg(os.path.join(temp_folder, "foto.jpg"), thumb_size=thumb_size, orientation=6)
+
+        image = render_image_preview_image(path, TILE)
+
+        assert (image.width(), image.height()) == (72, 96)
+
+    def test_png_still_rendered(self, qapp, temp_folder):
+        """Los formatos sin draft siguen funcionando."""
+        path = os.path.join(temp_folder, "dibujo.png")
+        Image.new("RGBA", (300, 150), (0, 255, 0, 255)).save(path)
+
+        image = render_image_preview_image(path, TILE)
+
+        assert (image.width(), image.height()) == (96, 48)
+
+    def test_batch_renders_every_file(self, qapp, temp_folder):
+        """El lote devuelve una miniatura por archivo; los ilegibles, vacía."""
+        paths = [write_camera_jpeg(os.path.join(temp_folder, f"foto{n}.jpg"), size=(1200, 900)) for n in range(5)]
+        broken = os.path.join(temp_folder, "rota.jpg")
+        with open(broken, 'wb') as f:
+            f.write(b"no es un jpeg")
+
+        results = dict(render_image_previews_image(paths + [broken], TILE, max_workers=3))
+
+        assert set(results) == set(paths) | {broken}
+        assert all((results[path].width(), results[path].height()) == (96, 72) for path in paths)
+        assert results[broken].isNull()
+
+
+class _FakeRenderService:
+    """Servicio de render falso: registra las llamadas por archivo y por lote."""
+
+    def __init__(self):
+        self.single = []
+        self.batches = []
+        self.icon_provider = None
+
+    def get_file_preview_image(self, path, size):
+        self.single.append(path)
+        image = QImage(size, QImage.Format.Format_ARGB32)
+        image.fill(0xFF00FF00)
+        return image
+
+    def get_file_preview_images(self, paths, size):
+        self.batches.append(list(paths))
+        for path in paths:
+            image = QImage(size, QImage.Format.Format_ARGB32)
+            image.fill(0xFFFF0000)
+            yield path, image
+
+
+class TestGridIconLoaderBatch:
+    """Lote de miniaturas por carpeta en GridIconLoader."""
+
+    def test_tiles_wait_for_folder_batch(self, qapp, temp_folder):
+        """Los tiles de imágenes del lote no lanzan su propio worker."""
+        clear_identity_cache()
+        photos = [os.path.join(temp_folder, f"foto{n}.jpg") for n in range(3)]
+        document = os.path.join(temp_folder, "notas.txt")
+        for path in photos + [document]:
+            with open(path, 'wb') as f:
+                f.write(b"x")
+
+        loader = GridIconLoader(max_threads=2)
+        service = _FakeRenderService()
+        loader._render_service = service
+        loaded = {}
+        loader.icon_loaded.connect(lambda tile_id, image, request_id: loaded.setdefault(tile_id, request_id))
+
+        assert loader.prefetch_icons(photos + [document], TILE) == 3
+        requests = {path: loader.request_icon(path, path, TILE) for path in photos + [document]}
+
+        deadline = time.monotonic() + WAIT
+        while len(loaded) < 4:
+            assert time.monotonic() < deadline
+            qapp.processEvents()
+            time.sleep(0.005)
+        loader._thread_pool.waitForDone()
+
+        assert service.batches == [photos]
+        assert service.single == [document]
+        assert loaded == requests
+        # Ya en caché: un segundo lote no hace nada
+        assert loader.prefetch_icons(photos, TILE) == 0
+
+
+@pytest.mark.benchmark
+class TestImageThumbnailBenchmark:
+    """Benchmark sobre una carpeta de fotos grandes (24 MP)."""
+
+    PHOTOS = 8
+
+    @pytest.fixture
+    def photo_folder(self, temp_folder):
+        paths = []
+        for number in range(self.PHOTOS):
+            # Sin miniatura EXIF útil en la mitad: mide también el camino draft
+            thumb_size = (160, 120) if number % 2 else (16, 12)
+            paths.append(write_camera_jpeg(
+                os.path.join(temp_folder, f"IMG_{number:04d}.jpg"), size=(6000, 4000), thumb_size=thumb_size
+            ))
+        return paths
+
+    def test_fast_path_throughput(self, qapp, photo_folder):
+        """Draft + miniatura EXIF supera a la decodificación completa; el lote las devuelve todas."""
+        start = time.perf_counter()
+        for path in photo_folder:
+            assert not _old_render(path, TILE).isNull()
+        old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in photo_folder:
+            assert not render_image_preview_image(path, TILE).isNull()
+        fast = time.perf_counter() - start
+
+        results = list(render_image_previews_image(photo_folder, TILE))
+        assert len(results) == self.PHOTOS
+        assert fast < old
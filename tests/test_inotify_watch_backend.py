@@ -0,0 +1,183 @@
+"""
+Tests para el backend inotify del watcher (solo Linux).
+
+Cubre la lectura de eventos exactos, el emparejamiento de renames por cookie
+(también entre carpetas observadas) y la actualización incremental del
+snapshot sin releer la carpeta.
+"""
+
+import os
+
+import pytest
+
+from app.services import filesystem_watcher_service
+from app.services.filesystem_watcher_service import FileSystemWatcherService
+from app.services.inotify_watch_backend import (
+    IN_CREATE,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    create_inotify_backend,
+    is_inotify_available,
+)
+from app.services.path_utils import normalize_path
+
+pytestmark = pytest.mark.skipif(
+    not is_inotify_available(), reason="inotify solo disponible en Linux"
+)
+
+
+@pytest.fixture
+def watcher(qapp):
+    """Watcher con backend inotify."""
+    watcher = FileSystemWatcherService(debounce_delay=10, backend="auto")
+    yield watcher
+    watcher.stop_all()
+
+
+@pytest.fixture
+def folders(temp_folder):
+    """Dos carpetas hermanas, la primera con una subcarpeta y un archivo."""
+    first = os.path.join(temp_folder, "uno")
+    second = os.path.join(temp_folder, "dos")
+    os.makedirs(os.path.join(first, "sub"))
+    os.makedirs(second)
+    with open(os.path.join(first, "a.txt"), 'w') as f:
+        f.write("a")
+    return first, second
+
+
+@pytest.fixture
+def signals(watcher):
+    """Registrar las señales de carpetas del watcher."""
+    events = []
+    watcher.folder_renamed.connect(lambda old, new: events.append(("renamed", old, new)))
+    watcher.folder_created.connect(lambda path: events.append(("created", path)))
+    watcher.folder_deleted.connect(lambda path: events.append(("deleted", path)))
+    watcher.structural_change_detected.connect(lambda path: events.append(("structural", path)))
+    return events
+
+
+def _process(watcher, folder):
+    watcher._process_folder(normalize_path(folder))
+
+
+class TestInotifyBackend:
+    """Eventos crudos del backend."""
+
+    def test_reports_exact_events(self, qapp, folders):
+        """Crea, mueve y empareja por cookie."""
+        backend = create_inotify_backend()
+        batches = []
+        backend.events_ready.connect(batches.append)
+        try:
+            assert backend.add_path(folders[0])
+            os.makedirs(os.path.join(folders[0], "nueva"))
+            os.rename(os.path.join(folders[0], "a.txt"), os.path.join(folders[0], "b.txt"))
+
+            backend.read_events()
+            events = [event for batch in batches for event in batch]
+
+            created = [e for e in events if e.mask & IN_CREATE]
+            assert [(e.name, e.is_dir) for e in created] == [("nueva", True)]
+            moved_from = next(e for e in events if e.mask & IN_MOVED_FROM)
+            moved_to = next(e for e in events if e.mask & IN_MOVED_TO)
+            assert (moved_from.name, moved_to.name) == ("a.txt", "b.txt")
+            assert moved_from.cookie == moved_to.cookie != 0
+        finally:
+            backend.close()
+
+
+class TestWatcherWithInotify:
+    """Señales del watcher a partir de eventos exactos."""
+
+    def test_uses_inotify_backend(self, watcher):
+        """En Linux se usa inotify por defecto."""
+        assert watcher.get_backend() == "inotify"
+
+    def test_exact_rename_among_other_changes(self, watcher, folders, signals):
+        """Un rename se detecta aunque aparezcan otras carpetas a la vez."""
+        watcher.watch_folder(folders[0])
+        os.rename(os.path.join(folders[0], "sub"), os.path.join(folders[0], "renombrada"))
+        os.makedirs(os.path.join(folders[0], "otra"))
+
+        _process(watcher, folders[0])
+
+        assert ("renamed", os.path.join(folders[0], "sub"), os.path.join(folders[0], "renombrada")) in signals
+        assert ("created", os.path.join(folders[0], "otra")) in signals
+        assert ("structural", folders[0]) in signals
+        assert not [e for e in signals if e[0] == "deleted"]
+
+    def test_simple_rename_is_not_structural(self, watcher, folders, signals):
+        """Un rename 1:1 solo emite folder_renamed."""
+        watcher.watch_folder(folders[0])
+        os.rename(os.path.join(folders[0], "sub"), os.path.join(folders[0], "nueva"))
+
+        _process(watcher, folders[0])
+
+        assert signals == [("renamed", os.path.join(folders[0], "sub"), os.path.join(folders[0], "nueva"))]
+
+    def test_move_between_watched_folders(self, watcher, folders, signals):
+        """Mover una carpeta entre carpetas observadas es un rename, no un borrado."""
+        watcher.set_watched_folders("tabs", list(folders))
+        old_path = os.path.join(folders[0], "sub")
+        new_path = os.path.join(folders[1], "sub")
+        os.rename(old_path, new_path)
+
+        _process(watcher, folders[0])
+        _process(watcher, folders[1])
+
+        assert ("renamed", old_path, new_path) in signals
+        assert ("structural", folders[0]) in signals
+        assert ("structural", folders[1]) in signals
+        assert not [e for e in signals if e[0] == "deleted"]
+
+    def test_incremental_snapshot_stats_only_changed_entries(self, watcher, folders, monkeypatch):
+        """El snapshot se actualiza sin releer la carpeta entera."""
+        watcher.watch_folder(folders[0])
+        monkeypatch.setattr(
+            filesystem_watcher_service, "read_folder_entries",
+            lambda *args: pytest.fail("rescan completo con inotify")
+        )
+        deltas = []
+        watcher.folder_delta.connect(deltas.append)
+        with open(os.path.join(folders[0], "a.txt"), 'a') as f:
+            f.write("mas")
+        with open(os.path.join(folders[0], "c.txt"), 'w') as f:
+            f.write("c")
+
+        _process(watcher, folders[0])
+
+        assert deltas[0].added == [os.path.join(folders[0], "c.txt")]
+        assert deltas[0].modified == [os.path.join(folders[0], "a.txt")]
+        monkeypatch.undo()
+        assert watcher._folders[normalize_path(folders[0])].snapshot == watcher._take_snapshot(folders[0])
+
+    def test_changes_while_ignoring_are_not_lost(self, watcher, folders):
+        """Los cambios con eventos bloqueados se reportan al reactivarlos."""
+        watcher.watch_folder(folders[0])
+        changed = []
+        watcher.filesystem_changed.connect(changed.append)
+
+        watcher.ignore_events(True)
+        with open(os.path.join(folders[0], "c.txt"), 'w') as f:
+            f.write("c")
+        _process(watcher, folders[0])
+        watcher.ignore_events(False)
+        _process(watcher, folders[0])
+
+        assert changed == [folders[0]]
+
+    def test_attribute_change_on_watched_folder_is_ignored(self, watcher, folders, signals):
+        """chmod/utime sobre la propia carpeta no añade una entrada vacía."""
+        watcher.watch_folder(folders[0])
+        deltas = []
+        watcher.folder_delta.connect(deltas.append)
+        os.chmod(folders[0], 0o755)
+        os.utime(folders[0])
+
+        _process(watcher, folders[0])
+
+        assert not [delta for delta in deltas if delta.added]
+        assert signals == []
+        names = [entry[0] for entry in watcher._folders[normalize_path(folders[0])].snapshot]
+        assert "" not in names
@@ -0,0 +1,200 @@
+"""
+Tests para el watcher multi-carpeta y la caché de listados.
+
+Cubre varias carpetas con snapshots independientes, el límite por prioridad,
+que stop_watching conserve los tabs abiertos, la emisión por carpeta y la
+invalidación de los listados cacheados de carpetas observadas.
+"""
+
+import os
+
+import pytest
+
+from app.services import folder_listing_cache
+from app.services.file_list_service import get_files
+from app.services.filesystem_watcher_service import (
+    WATCH_PRIORITY_BACKGROUND,
+    WATCH_PRIORITY_TAB,
+    FileSystemWatcherService,
+)
+from app.services.path_utils import normalize_path
+
+
+@pytest.fixture(autouse=True)
+def clean_listing_cache():
+    """Caché de listados vacía en cada test."""
+    folder_listing_cache.clear_listing_cache()
+    yield
+    folder_listing_cache.clear_listing_cache()
+
+
+@pytest.fixture
+def folders(temp_folder):
+    """Cuatro subcarpetas reales con un archivo cada una."""
+    result = []
+    for name in ["uno", "dos", "tres", "cuatro"]:
+        path = os.path.join(temp_folder, name)
+        os.makedirs(path)
+        with open(os.path.join(path, "a.txt"), 'w') as f:
+            f.write(name)
+        result.append(path)
+    return result
+
+
+@pytest.fixture
+def watcher(qapp):
+    """Watcher con debounce corto."""
+    watcher = FileSystemWatcherService(debounce_delay=10)
+    yield watcher
+    watcher.stop_all()
+
+
+def _write(path: str, content: str = "x") -> None:
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+class TestWatchedFolders:
+    """Registro de carpetas por fuente y prioridad."""
+
+    def test_active_and_tabs_are_watched_together(self, watcher, folders):
+        """El tab activo y los demás tabs se observan a la vez."""
+        watcher.set_watched_folders("tabs", folders[1:3])
+        assert watcher.watch_folder(folders[0]) is True
+
+        assert watcher.get_watched_folder() == folders[0]
+        assert watcher.get_watched_folders() == folders[:3]
+
+    def test_stop_watching_keeps_tabs(self, watcher, folders):
+        """stop_watching solo deja de observar la carpeta activa."""
+        watcher.set_watched_folders("tabs", [folders[1]])
+        watcher.watch_folder(folders[0])
+
+        watcher.stop_watching()
+
+        assert watcher.get_watched_folder() is None
+        assert watcher.get_watched_folders() == [folders[1]]
+
+        watcher.stop_all()
+        assert watcher.get_watched_folders() == []
+
+    def test_cap_keeps_highest_priority(self, qapp, folders):
+        """Con el límite alcanzado se descartan las carpetas menos prioritarias."""
+        watcher = FileSystemWatcherService(debounce_delay=10, max_folders=2)
+        try:
+            watcher.set_watched_folders("state", [folders[3]], WATCH_PRIORITY_BACKGROUND)
+            watcher.set_watched_folders("tabs", folders[1:3], WATCH_PRIORITY_TAB)
+            watcher.watch_folder(folders[0])
+
+            assert watcher.get_watched_folders() == [folders[0], folders[1]]
+
+            # Al cerrar tabs vuelve a caber la carpeta de fondo
+            watcher.set_watched_folders("tabs", [])
+            assert watcher.get_watched_folders() == [folders[0], folders[3]]
+        finally:
+            watcher.stop_all()
+
+    def test_reregistering_keeps_snapshot(self, watcher, folders):
+        """Volver a registrar una carpeta no pierde los cambios pendientes."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        _write(os.path.join(folders[0], "nuevo.txt"))
+
+        # El tab pasa a ser el activo: mismo snapshot base
+        watcher.watch_folder(folders[0])
+        deltas = []
+        watcher.folder_delta.connect(deltas.append)
+        watcher._process_folder(normalize_path(folders[0]))
+
+        assert [d.added for d in deltas] == [[os.path.join(folders[0], "nuevo.txt")]]
+
+    def test_state_paths_are_not_watched(self, watcher):
+        """Los contextos de estado no se observan."""
+        assert watcher.watch_folder("@state://pending") is True
+        assert watcher.get_watched_folders() == []
+
+
+class TestPerFolderEvents:
+    """Cada carpeta compara contra su propio snapshot."""
+
+    def test_delta_per_folder(self, watcher, folders):
+        """Solo emite la carpeta que cambió, con su propia ruta."""
+        watcher.set_watched_folders("tabs", folders[:2])
+        deltas, changed = [], []
+        watcher.folder_delta.connect(deltas.append)
+        watcher.filesystem_changed.connect(changed.append)
+
+        _write(os.path.join(folders[1], "b.txt"))
+        for folder in folders[:2]:
+            watcher._process_folder(normalize_path(folder))
+
+        assert changed == [folders[1]]
+        assert deltas[0].folder == folders[1]
+        assert deltas[0].added == [os.path.join(folders[1], "b.txt")]
+
+        # El snapshot avanzó: sin cambios nuevos no se emite otra vez
+        watcher._process_folder(normalize_path(folders[1]))
+        assert changed == [folders[1]]
+
+    def test_ignored_events_do_not_emit(self, watcher, folders):
+        """Con eventos bloqueados no se procesa ninguna carpeta."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        changed = []
+        watcher.filesystem_changed.connect(changed.append)
+
+        watcher.ignore_events(True)
+        _write(os.path.join(folders[0], "b.txt"))
+        watcher._process_folder(normalize_path(folders[0]))
+
+        assert changed == []
+
+
+class TestFolderListingCache:
+    """Listados cacheados de carpetas observadas."""
+
+    def test_untracked_folder_is_not_cached(self, folders):
+        """Sin watcher no se cachea nada."""
+        get_files(folders[0], {'.txt'})
+        assert folder_listing_cache.get_listing_signature(folders[0]) is None
+
+    def test_watched_folder_listing_is_reused(self, watcher, folders, monkeypatch):
+        """Un segundo listado de una carpeta observada no vuelve a escanear."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        first = get_files(folders[0], {'.txt'})
+
+        from app.services import file_list_service
+        monkeypatch.setattr(
+            file_list_service, "filter_folder_entries_by_extensions",
+            lambda *args: pytest.fail("rescan de una carpeta cacheada")
+        )
+        assert get_files(folders[0], {'.txt'}) == first
+
+    def test_watcher_event_invalidates_listing(self, watcher, folders):
+        """Un evento del watcher descarta el listado cacheado."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        get_files(folders[0], {'.txt'})
+        signature = folder_listing_cache.get_listing_signature(folders[0])
+
+        watcher._on_directory_changed(folders[0])
+
+        assert folder_listing_cache.get_listing(folders[0], (frozenset({'.txt'}), False), signature) is None
+
+    def test_folder_mtime_invalidates_listing(self, watcher, folders):
+        """Cambios propios de la app se ven aunque el evento no haya llegado."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        get_files(folders[0], {'.txt'})
+
+        new_path = os.path.join(folders[0], "b.txt")
+        _write(new_path)
+        stat = os.stat(folders[0])
+        os.utime(folders[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert new_path in get_files(folders[0], {'.txt'})
+
+    def test_unwatched_folder_drops_listing(self, watcher, folders):
+        """Dejar de observar una carpeta descarta sus listados."""
+        watcher.set_watched_folders("tabs", [folders[0]])
+        get_files(folders[0], {'.txt'})
+
+        watcher.set_watched_folders("tabs", [])
+
+        assert not folder_listing_cache.is_tracked(folders[0])
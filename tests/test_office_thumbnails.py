@@ -0,0 +1,149 @@
+"""
+Tests para las miniaturas embebidas de documentos Office y OpenDocument.
+
+Cubre la lectura de docProps/thumbnail.jpeg (OOXML) y Thumbnails/thumbnail.png
+(ODF) sin extraer el paquete, el resultado vacío cuando no hay miniatura (el
+llamador usa el icono) y los paquetes corruptos.
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+from PySide6.QtCore import QSize
+
+from app.services import icon_renderer_office
+from app.services.file_identity_cache import clear_identity_cache, invalidate_path
+from app.services.icon_renderer_office import (
+    clear_embedded_thumbnail_cache,
+    has_embedded_thumbnail,
+    render_office_thumbnail,
+    render_office_thumbnail_image,
+)
+
+TILE = QSize(96, 96)
+
+
+def _image_bytes(size, color, fmt):
+    data = io.BytesIO()
+    Image.new("RGB", size, color).save(data, fmt)
+    return data.getvalue()
+
+
+def write_package(path, members):
+    """Paquete zip con los miembros dados (nombre -> bytes)."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_embedded_thumbnail_cache()
+    clear_identity_cache()
+    yield
+    clear_embedded_thumbnail_cache()
+    clear_identity_cache()
+
+
+class TestOfficeThumbnails:
+    """Miniatura embebida en paquetes OOXML y ODF."""
+
+    def test_ooxml_thumbnail(self, qapp, temp_folder):
+        """Un .docx con docProps/thumbnail.jpeg se muestra con esa miniatura, reducida."""
+        path = write_package(os.path.join(temp_folder, "informe.docx"), {
+            'word/document.xml': '<document/>',
+            'docProps/thumbnail.jpeg': _image_bytes((192, 256), (200, 30, 30), 'JPEG'),
+        })
+
+        image = render_office_thumbnail_image(path, TILE)
+
+        assert (image.width(), image.height()) == (72, 96)
+        assert image.pixelColor(36, 48).red() > 150
+        assert has_embedded_thumbnail(path)
+
+    def test_odf_thumbnail(self, qapp, temp_folder):
+        """Un .ods con Thumbnails/thumbnail.png; nunca se amplía por encima de su tamaño."""
+        path = write_package(os.path.join(temp_folder, "cuentas.ods"), {
+            'content.xml': '<office:document-content/>',
+            'Thumbnails/thumbnail.png': _image_bytes((256, 181), (30, 200, 30), 'PNG'),
+        })
+
+        pixmap = render_office_thumbnail(path, QSize(800, 600))
+
+        assert (pixmap.width(), pixmap.height()) == (256, 181)
+
+    def test_package_without_thumbnail(self, qapp, temp_folder):
+        """Sin miniatura el resultado es vacío: el llamador usa el icono."""
+        path = write_package(os.path.join(temp_folder, "datos.xlsx"), {'xl/workbook.xml': '<workbook/>'})
+
+        assert render_office_thumbnail_image(path, TILE).isNull()
+        assert render_office_thumbnail(path, TILE).isNull()
+        assert not has_embedded_thumbnail(path)
+
+    def test_only_thumbnail_member_is_read(self, qapp, temp_folder, monkeypatch):
+        """Solo se lee el miembro de la miniatura, no el contenido del documento."""
+        path = write_package(os.path.join(temp_folder, "presentacion.pptx"), {
+            'ppt/media/image1.png': _image_bytes((2000, 2000), (0, 0, 0), 'PNG'),
+            'docProps/thumbnail.jpeg': _image_bytes((256, 192), (30, 30, 200), 'JPEG'),
+        })
+        read_members = []
+        original_read = zipfile.ZipFile.read
+        monkeypatch.setattr(
+            zipfile.ZipFile, 'read',
+            lambda archive, name, pwd=None: read_members.append(getattr(name, 'filename', name))
+            or original_read(archive, name, pwd)
+        )
+
+        assert not render_office_thumbnail_image(path, TILE).isNull()
+        assert read_members == ['docProps/thumbnail.jpeg']
+
+    def test_oversized_thumbnail_is_ignored(self, qapp, temp_folder, monkeypatch):
+        """Una miniatura por encima del límite se ignora (paquete malformado)."""
+        path = write_package(os.path.join(temp_folder, "informe.docx"), {
+            'docProps/thumbnail.jpeg': _image_bytes((256, 192), (200, 30, 30), 'JPEG'),
+        })
+        monkeypatch.setattr(icon_renderer_office, '_MAX_THUMBNAIL_BYTES', 100)
+
+        assert render_office_thumbnail_image(path, TILE).isNull()
+        assert not has_embedded_thumbnail(path)
+
+    def test_corrupt_package_and_other_types(self, qapp, temp_folder):
+        """Un paquete corrupto o un tipo no Office no lanzan excepciones."""
+        broken = os.path.join(temp_folder, "roto.docx")
+        with open(broken, 'wb') as f:
+            f.write(b"no es un zip")
+        zipped_text = write_package(os.path.join(temp_folder, "notas.zip"), {
+            'docProps/thumbnail.jpeg': _image_bytes((64, 64), (0, 0, 0), 'JPEG'),
+        })
+
+        assert render_office_thumbnail_image(broken, TILE).isNull()
+        assert not has_embedded_thumbnail(broken)
+        assert render_office_thumbnail_image(zipped_text, TILE).isNull()
+        assert render_office_thumbnail_image(os.path.join(temp_folder, "no_existe.odt"), TILE).isNull()
+
+    def test_thumbnail_check_is_cached_per_file_version(self, qapp, temp_folder, monkeypatch):
+        """has_embedded_thumbnail abre el zip una vez por versión del archivo."""
+        path = write_package(os.path.join(temp_folder, "datos.xlsx"), {'xl/workbook.xml': '<workbook/>'})
+        opened = []
+        original_zipfile = zipfile.ZipFile
+        monkeypatch.setattr(
+            zipfile, 'ZipFile',
+            lambda file, mode='r', *args, **kwargs: (mode == 'r' and opened.append(file))
+            or original_zipfile(file, mode, *args, **kwargs)
+        )
+
+        assert not has_embedded_thumbnail(path)
+        assert not has_embedded_thumbnail(path)
+        assert opened == [path]
+
+        write_package(path, {'docProps/thumbnail.jpeg': _image_bytes((64, 64), (0, 0, 0), 'JPEG')})
+        os.utime(path, (1_700_000_000, 1_700_000_000))
+        invalidate_path(path)
+
+        assert has_embedded_thumbnail(path)
+        assert opened == [path, path]
@@ -0,0 +1,190 @@
+"""
+Tests para PdfDocumentPool.
+
+Cubre la reutilización de documentos abiertos, la expulsión LRU, la
+reapertura cuando cambia el archivo, el cierre diferido de documentos en
+uso y el uso compartido desde PdfRenderer.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QSize
+
+from app.services.pdf_document_pool import PdfDocumentPool
+
+
+class _FakeDocument:
+    """Documento falso que registra su cierre."""
+
+    def __init__(self, path):
+        self.path = path
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened():
+    """Documentos abiertos por el pool, en orden."""
+    return []
+
+
+@pytest.fixture
+def pool(opened):
+    def open_document(path):
+        document = _FakeDocument(path)
+        opened.append(document)
+        return document
+    return PdfDocumentPool(open_document, max_documents=2)
+
+
+@pytest.fixture
+def pdfs(temp_folder):
+    """Tres archivos (el contenido no importa al pool)."""
+    paths = []
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        path = os.path.join(temp_folder, name)
+        with open(path, 'wb') as f:
+            f.write(b"%PDF")
+        paths.append(path)
+    return paths
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestPdfDocumentPool:
+    """Apertura, reutilización y cierre de documentos."""
+
+    def test_document_is_reused(self, pool, pdfs, opened):
+        """Varios usos del mismo PDF comparten un único documento abierto."""
+        for _ in range(5):
+            with pool.document(pdfs[0]) as doc:
+                assert doc.path == pdfs[0]
+        assert len(opened) == 1
+
+    def test_lru_eviction_closes_oldest(self, pool, pdfs, opened):
+        """Por encima del límite se cierra el documento menos usado."""
+        with pool.document(pdfs[0]):
+            pass
+        with pool.document(pdfs[1]):
+            pass
+        with pool.document(pdfs[0]):
+            pass
+        with pool.document(pdfs[2]):
+            pass
+
+        assert [doc.closed for doc in opened] == [False, True, False]
+        assert pool.open_count() == 2
+
+    def test_changed_file_is_reopened(self, pool, pdfs, opened):
+        """Un PDF modificado se vuelve a abrir y se cierra la versión anterior."""
+        with pool.document(pdfs[0]):
+            pass
+        _bump_mtime(pdfs[0])
+        with pool.document(pdfs[0]) as doc:
+            assert doc is opened[1]
+
+        assert opened[0].closed
+        assert pool.open_count() == 1
+
+    def test_document_in_use_closes_on_release(self, pool, pdfs, opened):
+        """close_all no cierra un documento mientras se usa; lo cierra su último usuario."""
+        with pool.document(pdfs[0]) as doc:
+            pool.close_all()
+            assert not doc.closed
+        assert doc.closed
+        assert pool.open_count() == 0
+
+    def test_missing_file_raises(self, pool, temp_folder):
+        """Un archivo inexistente lanza OSError sin abrir nada."""
+        with pytest.raises(OSError):
+            with pool.document(os.path.join(temp_folder, "no.pdf")):
+                pass
+
+    def test_same_document_is_used_by_one_thread_at_a_time(self, pool, pdfs):
+        """Dos hilos no usan el mismo documento a la vez."""
+        active = []
+        overlaps = []
+
+        def use():
+            with pool.document(pdfs[0]) as doc:
+                active.append(doc)
+                if len(active) > 1:
+                    overlaps.append(True)
+                time.sleep(0.01)
+                active.remove(doc)
+
+        threads = [threading.Thread(target=use) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert overlaps == []
+
+    def test_library_lock_serializes_different_documents(self, pdfs):
+        """Con lock de biblioteca, abrir, usar y cerrar lo mantienen tomado."""
+        library_lock = threading.RLock()
+        held = []
+
+        class _CheckedDocument(_FakeDocument):
+            def close(self):
+                held.append(library_lock._is_owned())
+                super().close()
+
+        def open_document(path):
+            held.append(library_lock._is_owned())
+            return _CheckedDocument(path)
+
+        pool = PdfDocumentPool(open_document, max_documents=1, library_lock=library_lock)
+        for path in pdfs[:2]:
+            with pool.document(path):
+                held.append(library_lock._is_owned())
+        pool.close_all()
+
+        assert held and all(held)
+
+
+class TestPdfRendererPool:
+    """PdfRenderer comparte el pool entre número de páginas y miniaturas."""
+
+    @pytest.fixture
+    def pdf_file(self, temp_folder):
+        fitz = pytest.importorskip("fitz")
+        path = os.path.join(temp_folder, "paginas.pdf")
+        doc = fitz.open()
+        for number in range(5):
+            doc.new_page().insert_text((72, 72), f"Página {number}")
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_thumbnails_parse_pdf_once(self, qapp, pdf_file, temp_folder, monkeypatch):
+        """El número de páginas y todas las miniaturas abren el PDF una sola vez."""
+        from app.services import pdf_renderer, thumbnail_disk_cache
+        from app.services.pdf_renderer import PdfRenderer
+        from pathlib import Path
+
+        monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', lambda: Path(temp_folder))
+        opens = []
+        original_open = pdf_renderer.fitz.open
+        monkeypatch.setattr(
+            pdf_renderer.fitz, 'open', lambda path: opens.append(path) or original_open(path)
+        )
+        PdfRenderer.close_documents()
+        try:
+            total = PdfRenderer.get_page_count(pdf_file)
+            thumbnails = [PdfRenderer.render_thumbnail(pdf_file, n, QSize(60, 80)) for n in range(total)]
+        finally:
+            PdfRenderer.close_documents()
+
+        assert total == 5
+        assert all(not thumbnail.isNull() for thumbnail in thumbnails)
+        assert opens == [pdf_file]
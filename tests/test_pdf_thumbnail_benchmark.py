@@ -0,0 +1,105 @@
+"""
+Benchmark de miniaturas PDF: PPM + reescalado vs renderizado directo.
+
+Compara, sobre un PDF de 200 páginas, el camino anterior (renderizar a zoom
+0.5, codificar/decodificar PPM, reescalar con SmoothTransformation y pasar a
+QImage) frente a renderizar cada página al tamaño final y envolver las
+muestras de PyMuPDF en un QImage. Si la máquina tiene núcleos para el pool
+de procesos, también mide PdfThumbnailsWorker completo. Fuera de la
+ejecución por defecto: se activa con CLARITYDESK_BENCHMARKS=1.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QPixmap
+
+from app.services import thumbnail_disk_cache
+from app.services.file_identity_cache import clear_identity_cache
+from app.services.pdf_renderer import PdfRenderer
+from app.services.pdf_thumbnail_pool import fit_zoom, shutdown_thumbnail_processes
+from app.services.pdf_thumbnails_worker import PdfThumbnailsWorker
+from app.services.thumbnail_disk_cache import clear_thumbnail_cache
+
+fitz = pytest.importorskip("fitz")
+
+pytestmark = pytest.mark.benchmark
+
+PAGES = 200
+SIZE = QSize(100, 120)
+
+
+@pytest.fixture
+def bench_pdf(temp_folder, monkeypatch):
+    """PDF de 200 páginas con texto y dibujos, y almacén de miniaturas vacío."""
+    path = os.path.join(temp_folder, "bench.pdf")
+    doc = fitz.open()
+    for number in range(PAGES):
+        page = doc.new_page()
+        for line in range(40):
+            page.insert_text((40, 30 + line * 18), f"Línea {line} de la página {number} " * 4, fontsize=9)
+        page.draw_circle((300, 400), 100 + number % 50, color=(1, 0, 0), fill=(0.2, 0.5, 0.9))
+    doc.save(path)
+    doc.close()
+
+    storage = Path(temp_folder) / "storage"
+    storage.mkdir()
+    monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', lambda: storage)
+    clear_identity_cache()
+    clear_thumbnail_cache()
+    yield path
+    PdfRenderer.close_documents()
+    clear_thumbnail_cache()
+    clear_identity_cache()
+
+
+def _ppm_thumbnail(doc, page_num):
+    """Camino anterior: zoom 0.5 -> PPM -> QPixmap -> reescalado -> QImage."""
+    pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(0.5, 0.5))
+    pixmap = QPixmap()
+    pixmap.loadFromData(pix.tobytes("ppm"), "PPM")
+    return pixmap.scaled(
+        SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+    ).toImage()
+
+
+def _direct_thumbnail(doc, page_num):
+    """Camino nuevo: zoom final y muestras envueltas en QImage."""
+    rect = doc[page_num].rect
+    zoom = fit_zoom(rect.width, rect.height, SIZE.width(), SIZE.height())
+    return PdfRenderer._render_page_to_image(doc, page_num, zoom)
+
+
+def _time_pages(pdf_path, render) -> float:
+    doc = fitz.open(pdf_path)
+    try:
+        start = time.perf_counter()
+        for page_num in range(PAGES):
+            assert not render(doc, page_num).isNull()
+        return time.perf_counter() - start
+    finally:
+        doc.close()
+
+
+def test_direct_thumbnail_throughput(qapp, bench_pdf):
+    """Renderizar al tamaño final sin PPM supera al camino anterior."""
+    ppm = _time_pages(bench_pdf, _ppm_thumbnail)
+    direct = _time_pages(bench_pdf, _direct_thumbnail)
+
+    assert direct < ppm
+
+
+def test_worker_throughput(qapp, bench_pdf):
+    """PdfThumbnailsWorker completo (procesos si hay núcleos libres)."""
+    worker = PdfThumbnailsWorker(bench_pdf, PAGES, SIZE, "bench")
+    pages = []
+    worker.progress.connect(lambda page_num, image, request_id: pages.append(page_num))
+    try:
+        worker.run()
+    finally:
+        shutdown_thumbnail_processes()
+
+    assert sorted(pages) == list(range(PAGES))
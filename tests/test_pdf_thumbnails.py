@@ -0,0 +1,150 @@
+"""
+Tests para la generación de miniaturas PDF.
+
+Cubre la conversión directa de muestras de PyMuPDF a QImage, el renderizado
+al tamaño final de la miniatura, el orden por prioridad (páginas visibles
+primero) y el reparto entre procesos de PdfThumbnailsWorker.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from app.services import pdf_thumbnail_pool, pdf_thumbnails_worker, thumbnail_disk_cache
+from app.services.file_identity_cache import clear_identity_cache
+from app.services.pdf_renderer import PdfRenderer
+from app.services.pdf_thumbnail_pool import shutdown_thumbnail_processes
+from app.services.pdf_thumbnails_worker import PdfThumbnailsWorker
+from app.services.thumbnail_disk_cache import clear_thumbnail_cache
+
+fitz = pytest.importorskip("fitz")
+
+SIZE = QSize(100, 120)
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Página {number}", fontsize=24)
+        page.draw_rect((72, 120, 300, 400), color=(0, 0, 1), fill=(0.9, 0.3, 0.1))
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture
+def thumb_store(temp_folder, monkeypatch):
+    """Almacén de miniaturas en carpeta temporal."""
+    storage = Path(temp_folder) / "storage"
+    storage.mkdir()
+    monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', lambda: storage)
+    clear_identity_cache()
+    clear_thumbnail_cache()
+    PdfRenderer.close_documents()
+    yield storage
+    PdfRenderer.close_documents()
+    clear_thumbnail_cache()
+    clear_identity_cache()
+
+
+@pytest.fixture
+def pdf_file(temp_folder):
+    path = os.path.join(temp_folder, "paginas.pdf")
+    _write_pdf(path, 10)
+    return path
+
+
+def _run(worker):
+    """Ejecutar el worker en este hilo y devolver las páginas emitidas en orden."""
+    emitted = []
+    worker.progress.connect(lambda page_num, image, request_id: emitted.append((page_num, image)))
+    worker.run()
+    return emitted
+
+
+class TestPdfRendererImages:
+    """Conversión de páginas a QImage."""
+
+    def test_page_image_matches_ppm_decoding(self, qapp, thumb_store, pdf_file):
+        """Envolver las muestras da la misma imagen que codificar y decodificar PPM."""
+        doc = fitz.open(pdf_file)
+        image = PdfRenderer._render_page_to_image(doc, 0, 0.5)
+        ppm = doc[0].get_pixmap(matrix=fitz.Matrix(0.5, 0.5), alpha=False).tobytes("ppm")
+        doc.close()
+        decoded = QImage.fromData(ppm, "PPM").convertToFormat(QImage.Format.Format_RGB888)
+
+        assert image.format() == QImage.Format.Format_RGB888
+        assert image == decoded
+
+    def test_thumbnail_rendered_at_target_size(self, qapp, thumb_store, pdf_file):
+        """La miniatura sale ya ajustada al tamaño pedido, sin reescalar."""
+        thumbnail = PdfRenderer.render_thumbnail_image(pdf_file, 0, SIZE)
+
+        # A4 es más alto que 100x120: manda la altura
+        assert thumbnail.height() == SIZE.height()
+        assert thumbnail.width() <= SIZE.width()
+
+
+class TestPdfThumbnailsWorker:
+    """Orden y reparto de las miniaturas."""
+
+    def test_all_pages_in_order_without_priority(self, qapp, thumb_store, pdf_file):
+        """Sin prioridad las páginas se generan de la primera a la última."""
+        emitted = _run(PdfThumbnailsWorker(pdf_file, 10, SIZE, "r1"))
+
+        assert [page for page, _ in emitted] == list(range(10))
+
+    def test_visible_pages_first(self, qapp, thumb_store, pdf_file):
+        """Las páginas prioritarias (visibles) se generan antes que el resto."""
+        emitted = _run(PdfThumbnailsWorker(pdf_file, 10, SIZE, "r1", priority_pages=[6, 7]))
+
+        assert [page for page, _ in emitted] == [6, 7, 0, 1, 2, 3, 4, 5, 8, 9]
+
+    def test_priority_change_applies_to_next_page(self, qapp, thumb_store, pdf_file):
+        """Un cambio de prioridad (scroll) durante la generación se aplica enseguida."""
+        worker = PdfThumbnailsWorker(pdf_file, 10, SIZE, "r1")
+        order = []
+
+        def on_progress(page_num, image, request_id):
+            order.append(page_num)
+            if len(order) == 1:
+                worker.set_priority_pages([9, 8])
+
+        worker.progress.connect(on_progress)
+        worker.run()
+
+        assert order == [0, 9, 8, 1, 2, 3, 4, 5, 6, 7]
+
+    def test_process_pool_renders_every_page(self, qapp, thumb_store, temp_folder, monkeypatch):
+        """Con procesos se generan todas las páginas igual que en el hilo y quedan en disco."""
+        from app.services import pdf_renderer
+
+        path = os.path.join(temp_folder, "largo.pdf")
+        _write_pdf(path, 20)
+        copy_path = os.path.join(temp_folder, "copia.pdf")
+        shutil.copyfile(path, copy_path)
+        expected = PdfRenderer.render_thumbnail_image(copy_path, 3, SIZE)
+
+        monkeypatch.setattr(pdf_thumbnail_pool, 'thumbnail_process_count', lambda: 2)
+        # Un bloque en vuelo cada vez: orden de llegada determinista
+        monkeypatch.setattr(pdf_thumbnails_worker, 'thumbnail_process_count', lambda: 1)
+        try:
+            emitted = _run(PdfThumbnailsWorker(path, 20, SIZE, "r1", priority_pages=[15]))
+        finally:
+            shutdown_thumbnail_processes()
+
+        assert sorted(page for page, _ in emitted) == list(range(20))
+        assert emitted[0][0] == 15
+        assert dict(emitted)[3] == expected
+
+        # Segunda vez: todo sale del almacén sin abrir el PDF
+        def fail_open(*args, **kwargs):
+            raise AssertionError("PDF reabierto")
+        monkeypatch.setattr(pdf_thumbnails_worker, 'get_thumbnail_executor', lambda: None)
+        monkeypatch.setattr(pdf_renderer.fitz, 'open', fail_open)
+        cached = _run(PdfThumbnailsWorker(path, 20, SIZE, "r2"))
+        assert [page for page, _ in cached] == list(range(20))
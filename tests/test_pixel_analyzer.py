@@ -0,0 +1,106 @@
+"""
+Tests para PixelAnalyzer.
+
+Verifica que el análisis vectorizado (NumPy) da los mismos resultados que
+el recorrido píxel a píxel e incluye un microbenchmark de ambos.
+"""
+
+import random
+import time
+
+import pytest
+from PySide6.QtGui import QColor, QImage
+
+from app.services import pixel_analyzer
+from app.services.pixel_analyzer import (
+    analyze_content,
+    count_content_pixels,
+    find_content_bounds,
+)
+
+
+def _make_icon(size: int, seed: int, fmt=QImage.Format.Format_ARGB32_Premultiplied) -> QImage:
+    """Crear icono sintético: fondo transparente/blanco y un bloque de contenido."""
+    rng = random.Random(seed)
+    image = QImage(size, size, fmt)
+    image.fill(QColor(255, 255, 255, 0))
+    x0, y0 = rng.randint(0, size // 2), rng.randint(0, size // 2)
+    x1, y1 = rng.randint(x0, size - 1), rng.randint(y0, size - 1)
+    for y in range(y0, y1 + 1):
+        for x in range(x0, x1 + 1):
+            roll = rng.random()
+            if roll < 0.6:
+                image.setPixelColor(x, y, QColor(rng.randint(0, 200), 80, 120, rng.randint(6, 255)))
+            elif roll < 0.8:
+                image.setPixelColor(x, y, QColor(250, 250, 250, 255))  # blanco: no es contenido
+            else:
+                image.setPixelColor(x, y, QColor(10, 10, 10, 3))  # casi transparente
+    return image
+
+
+def _loop_analysis(image: QImage):
+    """Resultado de referencia con la implementación píxel a píxel."""
+    return (
+        pixel_analyzer._find_content_bounds_loop(image),
+        pixel_analyzer._count_content_pixels_loop(image),
+    )
+
+
+@pytest.mark.skipif(not pixel_analyzer.NUMPY_AVAILABLE, reason="NumPy no disponible")
+class TestVectorizedAnalysis:
+    """Tests de equivalencia del análisis vectorizado."""
+    
+    @pytest.mark.parametrize("seed", range(8))
+    def test_matches_loop_implementation(self, qapp, seed):
+        """Bounds y conteo idénticos a la implementación original."""
+        image = _make_icon(48, seed)
+        
+        assert analyze_content(image) == _loop_analysis(image)
+    
+    @pytest.mark.parametrize("fmt", [
+        QImage.Format.Format_ARGB32,
+        QImage.Format.Format_RGB32,
+        QImage.Format.Format_RGBA8888,
+    ])
+    def test_matches_loop_other_formats(self, qapp, fmt):
+        """Formatos distintos de ARGB32 se analizan igual."""
+        image = _make_icon(40, 42, fmt)
+        
+        assert analyze_content(image) == _loop_analysis(image)
+    
+    def test_empty_image_bounds(self, qapp):
+        """Imagen sin contenido devuelve los mismos bounds que el bucle."""
+        image = QImage(32, 32, QImage.Format.Format_ARGB32)
+        image.fill(QColor(255, 255, 255, 255))
+        
+        assert find_content_bounds(image) == (32, 32, 0, 0)
+        assert count_content_pixels(image) == 0
+        assert analyze_content(image) == _loop_analysis(image)
+    
+    def test_odd_width_stride(self, qapp):
+        """Anchos impares (con stride) no desplazan filas."""
+        image = QImage(37, 21, QImage.Format.Format_ARGB32)
+        image.fill(QColor(0, 0, 0, 0))
+        image.setPixelColor(36, 20, QColor(0, 0, 0, 255))
+        image.setPixelColor(3, 5, QColor(0, 0, 0, 255))
+        
+        assert analyze_content(image) == ((3, 5, 36, 20), 2)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not pixel_analyzer.NUMPY_AVAILABLE, reason="NumPy no disponible")
+def test_benchmark_vectorized_vs_loop(qapp):
+    """Microbenchmark: análisis de un icono de 256px con ambas implementaciones."""
+    image = _make_icon(256, 7)
+    
+    start = time.perf_counter()
+    expected = _loop_analysis(image)
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(10):
+        result = analyze_content(image)
+    vectorized_time = (time.perf_counter() - start) / 10
+    
+    assert result == expected
+    assert vectorized_time < loop_time
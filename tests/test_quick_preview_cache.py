@@ -0,0 +1,156 @@
+"""
+Tests para QuickPreviewCache.
+
+Cubre las claves por archivo (no por índice), la invalidación al cambiar el
+archivo, el renderizado en segundo plano, la ventana de precarga en el
+sentido de navegación y la expulsión por presupuesto de bytes.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from app.services.file_identity_cache import clear_identity_cache
+from app.ui.windows.quick_preview_cache import QuickPreviewCache
+
+WAIT = 5
+SIZE = QSize(200, 150)
+
+
+class _FakePreviewService:
+    """Servicio de preview falso: registra los renders y puede bloquearlos."""
+
+    def __init__(self):
+        self.started = []
+        self.rendered = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.threads = set()
+
+    def get_quicklook_image(self, path, max_size):
+        self.started.append(os.path.basename(path))
+        self.gate.wait(WAIT)
+        self.rendered.append(os.path.basename(path))
+        self.threads.add(threading.get_ident())
+        image = QImage(max_size, QImage.Format.Format_RGB32)
+        image.fill(0xFF000000 | (len(self.rendered) * 40))
+        return image
+
+    def get_pdf_page_count(self, path):
+        return 1
+
+
+@pytest.fixture
+def service():
+    return _FakePreviewService()
+
+
+@pytest.fixture
+def cache(qapp, service):
+    clear_identity_cache()
+    cache = QuickPreviewCache(service, SIZE, prefetch_ahead=2)
+    yield cache
+    cache.shutdown()
+    clear_identity_cache()
+
+
+@pytest.fixture
+def images(temp_folder):
+    """Seis archivos de imagen (el servicio falso no los lee)."""
+    paths = []
+    for number in range(6):
+        path = os.path.join(temp_folder, f"foto{number}.png")
+        with open(path, 'wb') as f:
+            f.write(b"png" * (number + 1))
+        paths.append(path)
+    return paths
+
+
+def _wait_for(qapp, condition):
+    deadline = time.monotonic() + WAIT
+    while not condition():
+        assert time.monotonic() < deadline
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+class TestQuickPreviewCache:
+    """Caché por archivo con renderizado en segundo plano."""
+
+    def test_request_renders_in_background(self, qapp, cache, service, images):
+        """Un fallo de caché no renderiza en el hilo GUI; avisa al terminar."""
+        ready = []
+        assert cache.request_pixmap(images[0], lambda path, pixmap: ready.append((path, pixmap))) is None
+        _wait_for(qapp, lambda: ready)
+
+        path, pixmap = ready[0]
+        assert path == images[0]
+        assert pixmap.size() == SIZE
+        assert threading.get_ident() not in service.threads
+        assert cache.get_cached_pixmap(images[0]) is not None
+
+    def test_entries_are_keyed_by_path(self, qapp, cache, service, images):
+        """Reordenar la lista no devuelve la preview de otro archivo."""
+        ready = []
+        cache.request_pixmap(images[0], lambda path, pixmap: ready.append(path))
+        _wait_for(qapp, lambda: ready)
+
+        assert cache.get_cached_pixmap(images[1]) is None
+        assert cache.request_pixmap(images[0], lambda path, pixmap: None) is not None
+        assert service.rendered == ["foto0.png"]
+
+    def test_changed_file_is_rendered_again(self, qapp, cache, images):
+        """Si cambia el archivo (mtime/tamaño) la entrada deja de valer."""
+        ready = []
+        cache.request_pixmap(images[0], lambda path, pixmap: ready.append(path))
+        _wait_for(qapp, lambda: ready)
+
+        with open(images[0], 'ab') as f:
+            f.write(b"mas")
+        clear_identity_cache()
+
+        assert cache.get_cached_pixmap(images[0]) is None
+
+    def test_prefetch_follows_navigation_direction(self, qapp, cache, service, images):
+        """La precarga cubre los siguientes en el sentido de avance y uno detrás."""
+        cache.prefetch(4, images)
+        _wait_for(qapp, lambda: not cache._pending)
+        assert sorted(service.rendered) == ["foto3.png", "foto5.png"]
+
+        # Retroceso: 2 y 1 por delante, 4 por detrás; 0 queda fuera
+        cache.prefetch(3, images)
+        _wait_for(qapp, lambda: not cache._pending)
+        assert sorted(service.rendered[2:]) == ["foto1.png", "foto2.png", "foto4.png"]
+
+    def test_prefetch_cancels_queued_renders_outside_window(self, qapp, cache, service, images):
+        """Saltar lejos cancela lo encolado que ya no hace falta."""
+        service.gate.clear()
+        cache.prefetch(0, images)
+        # Los dos hilos quedan ocupados con 1 y 2
+        _wait_for(qapp, lambda: len(service.started) == 2)
+        cache.prefetch(5, images)
+        cache.prefetch(1, images)
+        service.gate.set()
+        _wait_for(qapp, lambda: not cache._pending)
+
+        # 4 (ventana de 5) se encoló y se canceló al volver a 1
+        assert sorted(service.rendered) == ["foto0.png", "foto1.png", "foto2.png"]
+
+    def test_byte_budget_evicts_oldest(self, qapp, service, images):
+        """Por encima del presupuesto se expulsan las previews menos usadas."""
+        entry_bytes = SIZE.width() * SIZE.height() * 4
+        cache = QuickPreviewCache(service, SIZE, max_bytes=entry_bytes * 2)
+        try:
+            for path in images[:3]:
+                ready = []
+                cache.request_pixmap(path, lambda p, pixmap: ready.append(p))
+                _wait_for(qapp, lambda: ready)
+
+            assert cache.get_cached_pixmap(images[0]) is None
+            assert cache.get_cached_pixmap(images[2]) is not None
+        finally:
+            cache.shutdown()
@@ -0,0 +1,251 @@
+"""
+Tests para la búsqueda en paralelo y por lotes de SearchManager.
+
+Cubre la entrega parcial de resultados mientras quedan carpetas por leer,
+la deduplicación y el orden de workspaces, y la cancelación del trabajo
+pendiente cuando llega una consulta nueva.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.managers import search_manager as search_manager_module
+from app.managers.search_manager import SearchManager
+from app.services.search_service import SearchResult
+
+WAIT = 5
+
+
+class _FakeIndex:
+    """Índice sin rastrear: la búsqueda recurre a los listados de los tabs."""
+
+    def set_roots(self, paths):
+        list(paths)
+
+    def refresh(self):
+        pass
+
+    def apply_delta(self, delta):
+        pass
+
+    def is_ready(self):
+        return False
+
+    def search(self, query, limit):
+        return []
+
+
+def _workspace_manager(*workspaces):
+    return SimpleNamespace(
+        get_workspaces=lambda: list(workspaces),
+        get_active_workspace_id=lambda: workspaces[0].id,
+    )
+
+
+def _workspace(workspace_id, tabs):
+    return SimpleNamespace(id=workspace_id, name=workspace_id, tabs=tabs, focus_tree_paths=[])
+
+
+def _wait_for(qapp, condition, timeout=WAIT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        qapp.processEvents()
+        time.sleep(0.005)
+    return True
+
+
+def _run_query(manager, query):
+    manager.search(query)
+    manager._debounce_timer.stop()
+    manager._execute_search()
+
+
+@pytest.fixture
+def emitted(qapp):
+    """Listas emitidas por search_results_changed."""
+    return []
+
+
+@pytest.fixture
+def make_manager(qapp, emitted):
+    managers = []
+
+    def make(*workspaces):
+        manager = SearchManager(
+            _workspace_manager(*workspaces), index=_FakeIndex(), content_index=_FakeIndex()
+        )
+        manager.search_results_changed.connect(emitted.append)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.clear_search()
+        manager._executor.shutdown(wait=True)
+
+
+class TestStreamingSearch:
+    """Resultados entregados por lotes."""
+
+    def test_partial_results_before_slow_folder(self, qapp, make_manager, emitted, monkeypatch):
+        """Los resultados de carpetas rápidas llegan antes de terminar la lenta."""
+        release = threading.Event()
+
+        def fake_search_folder(query, folder_path, workspace_id, cache, cancel_event):
+            if folder_path == "/lenta":
+                release.wait(WAIT)
+            return [SearchResult(file_path=f"{folder_path}/{query}.txt", workspace_id=workspace_id)]
+
+        monkeypatch.setattr(search_manager_module, "search_folder", fake_search_folder)
+        manager = make_manager(_workspace("ws1", ["/lenta", "/rapida"]))
+
+        _run_query(manager, "informe")
+        assert _wait_for(qapp, lambda: emitted)
+        assert [r.file_path for r in emitted[-1]] == ["/rapida/informe.txt"]
+
+        release.set()
+        assert _wait_for(qapp, lambda: len(emitted[-1]) == 2)
+        assert sorted(r.file_path for r in manager.get_current_results()) == [
+            "/lenta/informe.txt", "/rapida/informe.txt"
+        ]
+
+    def test_shared_folder_searched_once(self, qapp, make_manager, emitted, monkeypatch):
+        """Una carpeta abierta en dos workspaces se busca una vez, para el primero."""
+        calls = []
+
+        def fake_search_folder(query, folder_path, workspace_id, cache, cancel_event):
+            calls.append((folder_path, workspace_id))
+            return [SearchResult(file_path=f"{folder_path}/a.txt", workspace_id=workspace_id)]
+
+        monkeypatch.setattr(search_manager_module, "search_folder", fake_search_folder)
+        manager = make_manager(_workspace("ws1", ["/comun"]), _workspace("ws2", ["/comun", "/otra"]))
+
+        _run_query(manager, "a")
+        assert _wait_for(qapp, lambda: emitted and len(emitted[-1]) == 2)
+
+        assert sorted(calls) == [("/comun", "ws1"), ("/otra", "ws2")]
+
+    def test_empty_result_is_emitted(self, qapp, make_manager, emitted, monkeypatch):
+        """Sin coincidencias se emite una lista vacía al terminar."""
+        monkeypatch.setattr(search_manager_module, "search_folder", lambda *args: [])
+        manager = make_manager(_workspace("ws1", ["/uno", "/dos"]))
+
+        _run_query(manager, "nada")
+
+        assert _wait_for(qapp, lambda: emitted == [[]])
+
+
+class TestSearchCancellation:
+    """Una consulta nueva detiene la anterior."""
+
+    def test_new_query_cancels_queued_folders(self, qapp, make_manager, emitted, monkeypatch):
+        """Las carpetas aún no empezadas de la consulta anterior no se leen."""
+        release = threading.Event()
+        calls = []
+
+        def fake_search_folder(query, folder_path, workspace_id, cache, cancel_event):
+            calls.append((query, folder_path))
+            if query == "vieja":
+                release.wait(WAIT)
+            return [SearchResult(file_path=f"{folder_path}/{query}.txt", workspace_id=workspace_id)]
+
+        monkeypatch.setattr(search_manager_module, "search_folder", fake_search_folder)
+        folders = [f"/carpeta{i}" for i in range(20)]
+        manager = make_manager(_workspace("ws1", folders))
+
+        _run_query(manager, "vieja")
+        assert _wait_for(qapp, lambda: len(calls) >= 3)
+        _run_query(manager, "nueva")
+        release.set()
+
+        assert _wait_for(qapp, lambda: emitted and len(emitted[-1]) == len(folders))
+        # Solo las carpetas que ya estaban en curso llegaron a leerse para la consulta vieja
+        assert len([c for c in calls if c[0] == "vieja"]) < len(folders)
+        for _ in range(10):
+            qapp.processEvents()
+        assert all(r.file_path.endswith("nueva.txt") for batch in emitted for r in batch)
+
+    def test_clear_search_drops_running_results(self, qapp, make_manager, emitted, monkeypatch):
+        """Salir del modo búsqueda descarta los resultados en curso."""
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+
+        def fake_search_folder(query, folder_path, workspace_id, cache, cancel_event):
+            started.set()
+            release.wait(WAIT)
+            finished.set()
+            return [SearchResult(file_path=f"{folder_path}/x.txt", workspace_id=workspace_id)]
+
+        monkeypatch.setattr(search_manager_module, "search_folder", fake_search_folder)
+        manager = make_manager(_workspace("ws1", ["/uno"]))
+
+        _run_query(manager, "x")
+        assert started.wait(WAIT)
+        manager.clear_search()
+        release.set()
+        assert finished.wait(WAIT)
+        for _ in range(10):
+            qapp.processEvents()
+            time.sleep(0.01)
+
+        assert emitted == []
+        assert manager.get_current_results() == []
+
+    def test_superseded_scan_stops(self, qapp, make_manager, monkeypatch):
+        """El evento de cancelación llega a search_folder y detiene el recorrido."""
+        from app.services import search_service
+
+        listing = [f"/uno/informe{i}.txt" for i in range(1000)]
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_listing(folder_path, cache):
+            started.set()
+            release.wait(WAIT)
+            return listing
+
+        monkeypatch.setattr(search_service, "_get_files_cached", slow_listing)
+        results = []
+        original = search_service.search_folder
+        monkeypatch.setattr(
+            search_manager_module, "search_folder",
+            lambda *args: results.append(original(*args)) or results[-1]
+        )
+        manager = make_manager(_workspace("ws1", ["/uno"]))
+
+        _run_query(manager, "informe")
+        assert started.wait(WAIT)
+        manager.clear_search()
+        release.set()
+
+        assert _wait_for(qapp, lambda: results)
+        assert results == [[]]
+
+
+class TestSearchThreading:
+    """El estado de workspaces y tabs solo se lee en el hilo de UI."""
+
+    def test_scopes_are_built_on_ui_thread(self, qapp, make_manager, emitted, monkeypatch):
+        """Los workers reciben las rutas ya calculadas."""
+        main_thread = threading.current_thread()
+        readers = []
+        monkeypatch.setattr(search_manager_module, "search_folder", lambda *args: [])
+        manager = make_manager(_workspace("ws1", ["/uno"]))
+        workspaces = manager._workspace_manager.get_workspaces()
+
+        def get_workspaces():
+            readers.append(threading.current_thread())
+            return workspaces
+
+        manager._workspace_manager.get_workspaces = get_workspaces
+
+        _run_query(manager, "a")
+        assert _wait_for(qapp, lambda: emitted == [[]])
+
+        assert readers and all(thread is main_thread for thread in readers)
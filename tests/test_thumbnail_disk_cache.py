@@ -0,0 +1,183 @@
+"""
+Tests para ThumbnailDiskCache.
+
+Cubre el almacén persistente de miniaturas: claves por versión de archivo,
+tamaño y variante, expulsión LRU por tamaño y uso desde PdfRenderer.
+"""
+
+import os
+import time
+
+import pytest
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+
+from app.services import thumbnail_disk_cache
+from app.services.file_identity_cache import clear_identity_cache, invalidate_path
+from app.services.thumbnail_disk_cache import (
+    clear_thumbnail_cache,
+    get_thumbnail_cache_stats,
+    load_thumbnail,
+    store_thumbnail,
+)
+
+
+def _image(color=0xFF336699, size=32):
+    """Crear QImage opaca de prueba."""
+    image = QImage(size, size, QImage.Format.Format_ARGB32)
+    image.fill(color)
+    return image
+
+
+@pytest.fixture
+def thumb_store(temp_folder, monkeypatch):
+    """Almacén de miniaturas en carpeta temporal."""
+    from pathlib import Path
+    storage = Path(temp_folder) / "storage"
+    storage.mkdir()
+    monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', lambda: storage)
+    clear_identity_cache()
+    clear_thumbnail_cache()
+    yield storage / thumbnail_disk_cache.THUMBNAIL_DIR_NAME
+    clear_thumbnail_cache()
+    clear_identity_cache()
+
+
+@pytest.fixture
+def source_files(temp_folder):
+    """Archivos de origen de las miniaturas."""
+    paths = []
+    for i in range(4):
+        path = os.path.join(temp_folder, f"photo_{i}.jpg")
+        with open(path, 'wb') as f:
+            f.write(b'jpeg' * (i + 1))
+        paths.append(path)
+    return paths
+
+
+class TestLoadStore:
+    """Tests de lectura y escritura."""
+    
+    def test_miss_then_hit(self, qapp, thumb_store, source_files):
+        """Tras guardar, la miniatura se lee del disco."""
+        size = QSize(32, 32)
+        
+        assert load_thumbnail(source_files[0], size) is None
+        assert store_thumbnail(source_files[0], size, _image())
+        loaded = load_thumbnail(source_files[0], size)
+        
+        assert loaded is not None
+        assert loaded.pixel(5, 5) == _image().pixel(5, 5)
+        stats = get_thumbnail_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['writes'] == 1
+        assert stats['bytes'] > 0
+    
+    def test_size_and_variant_are_part_of_key(self, qapp, thumb_store, source_files):
+        """Otro tamaño u otra variante no reutiliza la miniatura."""
+        store_thumbnail(source_files[0], QSize(32, 32), _image())
+        
+        assert load_thumbnail(source_files[0], QSize(64, 64)) is None
+        assert load_thumbnail(source_files[0], QSize(32, 32), "pdf-page-1") is None
+    
+    def test_modified_file_misses(self, qapp, thumb_store, source_files):
+        """Un archivo modificado tiene otra clave."""
+        size = QSize(32, 32)
+        store_thumbnail(source_files[0], size, _image())
+        
+        with open(source_files[0], 'wb') as f:
+            f.write(b'edited photo content')
+        invalidate_path(source_files[0])
+        
+        assert load_thumbnail(source_files[0], size) is None
+    
+    def test_missing_file_is_not_stored(self, qapp, thumb_store, temp_folder):
+        """Sin archivo de origen no hay clave."""
+        missing = os.path.join(temp_folder, "missing.jpg")
+        
+        assert store_thumbnail(missing, QSize(32, 32), _image()) is False
+        assert load_thumbnail(missing, QSize(32, 32)) is None
+    
+    def test_null_image_is_not_stored(self, qapp, thumb_store, source_files):
+        """Una imagen nula no se guarda."""
+        assert store_thumbnail(source_files[0], QSize(32, 32), QImage()) is False
+    
+    def test_storage_unavailable(self, qapp, source_files, monkeypatch):
+        """Sin directorio de storage la cache se comporta como miss."""
+        def unavailable():
+            raise RuntimeError("no storage")
+        monkeypatch.setattr(thumbnail_disk_cache, 'get_storage_dir', unavailable)
+        
+        assert store_thumbnail(source_files[0], QSize(32, 32), _image()) is False
+        assert load_thumbnail(source_files[0], QSize(32, 32)) is None
+    
+    def test_survives_process_state_reset(self, qapp, thumb_store, source_files):
+        """La miniatura persiste aunque se pierda el estado en memoria."""
+        size = QSize(32, 32)
+        store_thumbnail(source_files[0], size, _image())
+        
+        clear_identity_cache()
+        thumbnail_disk_cache._accounted_dir = None
+        
+        assert load_thumbnail(source_files[0], size) is not None
+
+
+class TestEviction:
+    """Tests de expulsión LRU por tamaño total."""
+    
+    def test_cap_evicts_least_recently_used(self, qapp, thumb_store, source_files, monkeypatch):
+        """Al superar el límite se borran las entradas menos usadas."""
+        size = QSize(32, 32)
+        store_thumbnail(source_files[0], size, _image())
+        entry_bytes = get_thumbnail_cache_stats()['bytes']
+        monkeypatch.setattr(thumbnail_disk_cache, 'MAX_CACHE_BYTES', int(entry_bytes * 2.5))
+        
+        store_thumbnail(source_files[1], size, _image(0xFF00FF00))
+        # Envejecer entradas y usar la primera: la segunda pasa a ser la más antigua
+        old = time.time() - 100
+        for root, _, names in os.walk(thumb_store):
+            for name in names:
+                os.utime(os.path.join(root, name), (old, old))
+        assert load_thumbnail(source_files[0], size) is not None
+        
+        store_thumbnail(source_files[2], size, _image(0xFFFF0000))
+        
+        assert load_thumbnail(source_files[0], size) is not None
+        assert load_thumbnail(source_files[1], size) is None
+        assert load_thumbnail(source_files[2], size) is not None
+        stats = get_thumbnail_cache_stats()
+        assert stats['evictions'] >= 1
+        assert stats['bytes'] <= stats['max_bytes']
+
+
+class TestPdfThumbnails:
+    """Tests de PdfRenderer.render_thumbnail con el almacén persistente."""
+    
+    @pytest.fixture
+    def pdf_file(self, temp_folder):
+        fitz = pytest.importorskip("fitz")
+        path = os.path.join(temp_folder, "doc.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        page.insert_text((72, 72), "Hola")
+        doc.save(path)
+        doc.close()
+        return path
+    
+    def test_warm_thumbnail_skips_pymupdf(self, qapp, thumb_store, pdf_file, monkeypatch):
+        """La segunda miniatura sale del disco sin abrir el PDF."""
+        from app.services import pdf_renderer
+        from app.services.pdf_renderer import PdfRenderer
+        
+        size = QSize(80, 100)
+        cold = PdfRenderer.render_thumbnail(pdf_file, 0, size)
+        assert not cold.isNull()
+        
+        def fail_open(*args, **kwargs):
+            raise AssertionError("PDF reabierto")
+        monkeypatch.setattr(pdf_renderer.fitz, 'open', fail_open)
+        
+        warm = PdfRenderer.render_thumbnail(pdf_file, 0, size)
+        
+        assert warm.size() == cold.size()